@@ -9,9 +9,7 @@ import re
 import socket
 import ssl
 import sys
-import tempfile
 import webbrowser
-import zipfile
 from contextlib import closing
 from threading import Timer
 from typing import Any, Optional
@@ -24,7 +22,12 @@ from bs4 import BeautifulSoup
 from fastapi import FastAPI, Request, WebSocket, WebSocketDisconnect
 from fastapi.middleware.cors import CORSMiddleware
 from fastapi.templating import Jinja2Templates
-from starlette.responses import HTMLResponse, JSONResponse, Response
+from starlette.responses import (
+    HTMLResponse,
+    JSONResponse,
+    Response,
+    StreamingResponse,
+)
 from starlette.staticfiles import StaticFiles
 from starlette.websockets import WebSocketState
 
@@ -33,6 +36,7 @@ from src.backends.crawl4ai_backend import Crawl4AIBackend as Crawler
 from src.backends.crawl4ai_backend import Crawl4AIConfig as Config
 from src.backends.selector import BackendSelector
 from src.utils.search import DuckDuckGoSearch
+from src.utils.streaming import iter_docs_archive_entries, iter_zip
 from src.utils.url.factory import create_url_info
 
 # Configure logging
@@ -815,76 +819,15 @@ async def export_docs(request: Request):
         if not base_url or not results:
             return JSONResponse({"error": "Missing data"}, status_code=400)
 
-        # Create a temporary directory for the documentation
-        with tempfile.TemporaryDirectory() as temp_dir:
-            # Get domain name for the folder
-            domain = urlparse(base_url).netloc
-            docs_dir = os.path.join(temp_dir, f"{domain}_Documentation")
-            os.makedirs(docs_dir, exist_ok=True)
-
-            # Create README.md
-            with open(os.path.join(docs_dir, "README.md"), "w", encoding="utf-8") as f:
-                f.write(f"# {domain} Documentation\n\n")
-                f.write(f"Documentation exported from {base_url}\n\n")
-                f.write("## Contents\n\n")
-
-            # Process each URL and create corresponding files
-            for url, content in results.items():
-                try:
-                    # Create a suitable filename from the URL
-                    parsed = urlparse(url)
-                    path_parts = [p for p in parsed.path.split("/") if p]
-
-                    if not path_parts:
-                        path_parts = ["index"]
-
-                    # Create subdirectories if needed
-                    current_dir = docs_dir
-                    for part in path_parts[:-1]:
-                        current_dir = os.path.join(current_dir, part)
-                        os.makedirs(current_dir, exist_ok=True)
-
-                    # Create the markdown file
-                    filename = path_parts[-1] + ".md"
-                    file_path = os.path.join(current_dir, filename)
-
-                    with open(file_path, "w", encoding="utf-8") as f:
-                        # Add metadata at the top
-                        f.write("---\n")
-                        f.write(f"source: {url}\n")
-                        f.write("---\n\n")
-                        f.write(content)
-
-                    # Update README with link
-                    rel_path = os.path.relpath(file_path, docs_dir)
-                    with open(
-                        os.path.join(docs_dir, "README.md"), "a", encoding="utf-8"
-                    ) as f:
-                        f.write(f"- [{' > '.join(path_parts)}]({rel_path})\n")
-
-                except Exception as e:
-                    logger.error(f"Error processing URL {url}: {str(e)}")
-
-            # Create a zip file
-            zip_path = os.path.join(temp_dir, "documentation.zip")
-            with zipfile.ZipFile(zip_path, "w", zipfile.ZIP_DEFLATED) as zf:
-                for root, _, files in os.walk(docs_dir):
-                    for file in files:
-                        file_path = os.path.join(root, file)
-                        arc_name = os.path.relpath(file_path, temp_dir)
-                        zf.write(file_path, arc_name)
-
-            # Read the zip file
-            with open(zip_path, "rb") as f:
-                content = f.read()
-
-            return Response(
-                content=content,
-                media_type="application/zip",
-                headers={
-                    "Content-Disposition": f'attachment; filename="{domain}_documentation.zip"'
-                },
-            )
+        # Build the archive while it is sent instead of on disk
+        domain = urlparse(base_url).netloc
+        return StreamingResponse(
+            iter_zip(iter_docs_archive_entries(base_url, results)),
+            media_type="application/zip",
+            headers={
+                "Content-Disposition": f'attachment; filename="{domain}_documentation.zip"'
+            },
+        )
 
     except Exception as e:
         logger.error(f"Export error: {str(e)}")
@@ -0,0 +1,144 @@
+#!/usr/bin/env python3
+"""
+Bounded time-series counters for analytics.
+
+Both counters use constant memory regardless of how many events they see,
+and both accept events with past timestamps so persisted history can be
+replayed in any order.
+"""
+
+from typing import Any, Optional
+
+
+class RollingCounter:
+    """Ring buffer of event counts in fixed-width time slots."""
+
+    __slots__ = ("slot_seconds", "counts", "head")
+
+    def __init__(self, num_slots: int, slot_seconds: float):
+        """
+        Initialize the counter.
+
+        Args:
+            num_slots: Number of slots kept; older slots are overwritten
+            slot_seconds: Width of each slot in seconds
+        """
+        self.slot_seconds = slot_seconds
+        self.counts = [0] * num_slots
+        self.head: Optional[int] = None  # Absolute index of the newest slot
+
+    def add(self, timestamp: float, count: int = 1):
+        """
+        Count events at a point in time.
+
+        Args:
+            timestamp: POSIX timestamp of the events
+            count: Number of events
+        """
+        slot = int(timestamp // self.slot_seconds)
+        self._advance(slot)
+
+        if slot <= self.head - len(self.counts):
+            return  # Older than the window
+
+        self.counts[slot % len(self.counts)] += count
+
+    def total(self, now: float, num_slots: int) -> int:
+        """
+        Sum the most recent slots.
+
+        Args:
+            now: POSIX timestamp whose slot is the last one summed
+            num_slots: Number of slots to sum, ending with the slot of ``now``
+
+        Returns:
+            Number of events counted in those slots
+        """
+        if self.head is None:
+            return 0
+
+        size = len(self.counts)
+        now_slot = int(now // self.slot_seconds)
+        first = max(now_slot - num_slots + 1, self.head - size + 1)
+        last = min(now_slot, self.head)
+
+        return sum(self.counts[slot % size] for slot in range(first, last + 1))
+
+    def _advance(self, slot: int):
+        """Move the head forward to a slot, clearing the slots it passes."""
+        if self.head is None:
+            self.head = slot
+            return
+        if slot <= self.head:
+            return
+
+        size = len(self.counts)
+        if slot - self.head >= size:
+            self.counts = [0] * size
+        else:
+            for skipped in range(self.head + 1, slot + 1):
+                self.counts[skipped % size] = 0
+        self.head = slot
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the counter state."""
+        return {"head": self.head, "counts": list(self.counts)}
+
+    def load(self, data: dict[str, Any]):
+        """Restore state produced by ``to_dict`` into a counter of the same shape."""
+        if len(data["counts"]) == len(self.counts):
+            self.head = data["head"]
+            self.counts = list(data["counts"])
+
+
+class DecayedCounter:
+    """Exponentially decayed accumulator with a fixed half-life."""
+
+    __slots__ = ("half_life", "value", "updated")
+
+    def __init__(self, half_life: float):
+        """
+        Initialize the accumulator.
+
+        Args:
+            half_life: Seconds after which a contribution counts half as much
+        """
+        self.half_life = half_life
+        self.value = 0.0
+        self.updated: Optional[float] = None  # POSIX timestamp of ``value``
+
+    def add(self, timestamp: float, weight: float = 1.0):
+        """
+        Add a weighted contribution at a point in time.
+
+        Args:
+            timestamp: POSIX timestamp of the contribution
+            weight: Undecayed weight of the contribution
+        """
+        if self.updated is None:
+            self.value = weight
+            self.updated = timestamp
+        elif timestamp >= self.updated:
+            self.value = self.value * self._decay(timestamp - self.updated) + weight
+            self.updated = timestamp
+        else:
+            self.value += weight * self._decay(self.updated - timestamp)
+
+    def value_at(self, timestamp: float) -> float:
+        """Return the decayed value as seen at a point in time."""
+        if self.updated is None:
+            return 0.0
+        return self.value * self._decay(max(0.0, timestamp - self.updated))
+
+    def _decay(self, elapsed: float) -> float:
+        """Return the decay factor for an elapsed number of seconds."""
+        return 0.5 ** (elapsed / self.half_life)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the accumulator state."""
+        return {"value": self.value, "updated": self.updated}
+
+    def load(self, data: dict[str, Any]):
+        """Restore state produced by ``to_dict``."""
+        self.value = data["value"]
+        self.updated = data["updated"]
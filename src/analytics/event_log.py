@@ -0,0 +1,153 @@
+#!/usr/bin/env python3
+"""
+Append-only event log for analytics persistence.
+
+Events are buffered in memory and appended to an NDJSON log in batches, so
+recording an event never rewrites existing history. The owner periodically
+compacts the log into a snapshot of its pre-aggregated state, after which the
+log is truncated.
+"""
+
+import json
+import logging
+import os
+import time
+import weakref
+from pathlib import Path
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class EventLog:
+    """Batched NDJSON event log with snapshot compaction."""
+
+    def __init__(
+        self,
+        snapshot_file: str,
+        batch_size: int = 100,
+        flush_interval: float = 5.0,
+        compact_threshold: int = 10000,
+    ):
+        """
+        Initialize the event log.
+
+        Args:
+            snapshot_file: File holding the compacted snapshot. Events are
+                appended to a sibling file with a ``.log`` suffix.
+            batch_size: Number of buffered events that triggers a flush
+            flush_interval: Maximum seconds an event may stay buffered
+            compact_threshold: Number of logged events after which
+                ``needs_compaction`` becomes true
+        """
+        self.snapshot_path = Path(snapshot_file)
+        self.log_path = self.snapshot_path.with_name(self.snapshot_path.name + ".log")
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval
+        self.compact_threshold = compact_threshold
+
+        self._buffer: list[str] = []
+        self._last_flush = time.monotonic()
+        self._logged_events = 0
+
+        # Write whatever is still buffered when the log is collected or the
+        # interpreter exits
+        weakref.finalize(self, self._write_lines, self.log_path, self._buffer)
+
+    @staticmethod
+    def _write_lines(log_path: Path, lines: list[str]):
+        """Append lines to the log file and clear them from the buffer."""
+        if not lines:
+            return
+        with open(log_path, "a", encoding="utf-8") as f:
+            f.write("\n".join(lines) + "\n")
+        lines.clear()
+
+    @property
+    def needs_compaction(self) -> bool:
+        """Whether enough events have accumulated to warrant a compaction."""
+        return self._logged_events + len(self._buffer) >= self.compact_threshold
+
+    def append(self, event: dict[str, Any]):
+        """
+        Append an event to the log.
+
+        Args:
+            event: JSON-serializable event record
+        """
+        self._buffer.append(json.dumps(event, separators=(",", ":"), default=str))
+        if (
+            len(self._buffer) >= self.batch_size
+            or time.monotonic() - self._last_flush >= self.flush_interval
+        ):
+            self.flush()
+
+    def flush(self):
+        """Write buffered events to the log file."""
+        self._last_flush = time.monotonic()
+        try:
+            pending = len(self._buffer)
+            self._write_lines(self.log_path, self._buffer)
+            self._logged_events += pending
+        except Exception as e:
+            logger.warning(f"Failed to flush event log {self.log_path}: {e}")
+
+    def load(self) -> tuple[Optional[dict[str, Any]], list[dict[str, Any]]]:
+        """
+        Load the snapshot and the events logged since it was written.
+
+        Returns:
+            Tuple of (snapshot or None, list of events in append order)
+        """
+        snapshot = None
+        events: list[dict[str, Any]] = []
+
+        try:
+            with open(self.snapshot_path, encoding="utf-8") as f:
+                snapshot = json.load(f)
+        except FileNotFoundError:
+            pass
+        except Exception as e:
+            logger.warning(f"Failed to load snapshot {self.snapshot_path}: {e}")
+
+        try:
+            with open(self.log_path, encoding="utf-8") as f:
+                for line_number, line in enumerate(f, 1):
+                    line = line.strip()
+                    if not line:
+                        continue
+                    try:
+                        events.append(json.loads(line))
+                    except json.JSONDecodeError:
+                        # A torn write can only affect the tail of the log
+                        logger.warning(
+                            f"Skipping corrupt event at {self.log_path}:{line_number}"
+                        )
+        except FileNotFoundError:
+            pass
+
+        self._logged_events = len(events)
+        return snapshot, events
+
+    def compact(self, snapshot: dict[str, Any]):
+        """
+        Replace the snapshot and truncate the log.
+
+        The snapshot must already reflect every appended event, including
+        those still buffered; the buffer is discarded.
+
+        Args:
+            snapshot: JSON-serializable state to persist
+        """
+        tmp_path = self.snapshot_path.with_name(self.snapshot_path.name + ".tmp")
+        try:
+            with open(tmp_path, "w", encoding="utf-8") as f:
+                json.dump(snapshot, f, separators=(",", ":"), default=str)
+            os.replace(tmp_path, self.snapshot_path)
+            with open(self.log_path, "w", encoding="utf-8"):
+                pass
+            self._buffer.clear()
+            self._logged_events = 0
+            self._last_flush = time.monotonic()
+        except Exception as e:
+            logger.warning(f"Failed to compact event log {self.log_path}: {e}")
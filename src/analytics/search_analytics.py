@@ -5,32 +5,213 @@ Search Analytics for Advanced Search & Discovery
 Tracks and analyzes search patterns, queries, and user behavior.
 """
 
-import json
 import logging
-from collections import Counter, defaultdict
+from collections import Counter, defaultdict, deque
+from dataclasses import dataclass, field
 from datetime import datetime, timedelta
 from typing import Any, Optional
 
+from .event_log import EventLog
+
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_VERSION = 2
+
+
+def _hour_index(timestamp: datetime) -> int:
+    """Return the index of the hour bucket containing a timestamp."""
+    return int(timestamp.timestamp() // 3600)
+
+
+def _hour_start(hour: int) -> datetime:
+    """Return the start of an hour bucket as a naive local datetime."""
+    return datetime.fromtimestamp(hour * 3600)
+
+
+@dataclass
+class QueryRollup:
+    """Pre-aggregated search statistics for one hour bucket."""
+
+    count: int = 0
+    results_total: int = 0
+    zero_results: int = 0
+    queries_with_filters: int = 0
+    query_counts: Counter = field(default_factory=Counter)
+    query_results: Counter = field(default_factory=Counter)
+    zero_terms: Counter = field(default_factory=Counter)
+    zero_samples: list[str] = field(default_factory=list)
+    length_counts: Counter = field(default_factory=Counter)
+    filter_counts: Counter = field(default_factory=Counter)
+
+    def add(self, query: str, results_count: int, filters: dict[str, Any]):
+        """Add a single query to the rollup."""
+        self.count += 1
+        self.results_total += results_count
+        self.query_counts[query] += 1
+        self.query_results[query] += results_count
+        self.length_counts[len(query.split())] += 1
+
+        if filters:
+            self.queries_with_filters += 1
+            self.filter_counts.update(filters.keys())
+
+        if results_count == 0:
+            self.zero_results += 1
+            self.zero_terms.update(query.lower().split())
+            if len(self.zero_samples) < 5:
+                self.zero_samples.append(query)
+
+    def merge(self, other: "QueryRollup"):
+        """Merge another rollup into this one."""
+        self.count += other.count
+        self.results_total += other.results_total
+        self.zero_results += other.zero_results
+        self.queries_with_filters += other.queries_with_filters
+        self.query_counts.update(other.query_counts)
+        self.query_results.update(other.query_results)
+        self.zero_terms.update(other.zero_terms)
+        self.zero_samples.extend(other.zero_samples[: 5 - len(self.zero_samples)])
+        self.length_counts.update(other.length_counts)
+        self.filter_counts.update(other.filter_counts)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the rollup to a JSON-compatible dict."""
+        return {
+            "count": self.count,
+            "results_total": self.results_total,
+            "zero_results": self.zero_results,
+            "queries_with_filters": self.queries_with_filters,
+            "query_counts": dict(self.query_counts),
+            "query_results": dict(self.query_results),
+            "zero_terms": dict(self.zero_terms),
+            "zero_samples": self.zero_samples,
+            "length_counts": dict(self.length_counts),
+            "filter_counts": dict(self.filter_counts),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QueryRollup":
+        """Deserialize a rollup produced by ``to_dict``."""
+        return cls(
+            count=data["count"],
+            results_total=data["results_total"],
+            zero_results=data["zero_results"],
+            queries_with_filters=data["queries_with_filters"],
+            query_counts=Counter(data["query_counts"]),
+            query_results=Counter(data["query_results"]),
+            zero_terms=Counter(data["zero_terms"]),
+            zero_samples=list(data["zero_samples"]),
+            # JSON object keys are always strings
+            length_counts=Counter(
+                {int(length): n for length, n in data["length_counts"].items()}
+            ),
+            filter_counts=Counter(data["filter_counts"]),
+        )
+
+
+@dataclass
+class QueryStats:
+    """All-time statistics for a single query string."""
+
+    count: int = 0
+    results_total: int = 0
+    zero_results: int = 0
+    min_results: Optional[int] = None
+    max_results: Optional[int] = None
+    first_search: Optional[datetime] = None
+    last_search: Optional[datetime] = None
+
+    def add(self, results_count: int, timestamp: datetime):
+        """Add a single search of this query."""
+        self.count += 1
+        self.results_total += results_count
+        if results_count == 0:
+            self.zero_results += 1
+        if self.min_results is None or results_count < self.min_results:
+            self.min_results = results_count
+        if self.max_results is None or results_count > self.max_results:
+            self.max_results = results_count
+        if self.first_search is None or timestamp < self.first_search:
+            self.first_search = timestamp
+        if self.last_search is None or timestamp > self.last_search:
+            self.last_search = timestamp
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the statistics to a JSON-compatible dict."""
+        return {
+            "count": self.count,
+            "results_total": self.results_total,
+            "zero_results": self.zero_results,
+            "min_results": self.min_results,
+            "max_results": self.max_results,
+            "first_search": self.first_search.isoformat(),
+            "last_search": self.last_search.isoformat(),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "QueryStats":
+        """Deserialize statistics produced by ``to_dict``."""
+        return cls(
+            count=data["count"],
+            results_total=data["results_total"],
+            zero_results=data["zero_results"],
+            min_results=data["min_results"],
+            max_results=data["max_results"],
+            first_search=datetime.fromisoformat(data["first_search"]),
+            last_search=datetime.fromisoformat(data["last_search"]),
+        )
+
 
 class SearchAnalytics:
     """Analytics engine for tracking and analyzing search behavior."""
 
-    def __init__(self, data_file: Optional[str] = None):
+    def __init__(
+        self,
+        data_file: Optional[str] = None,
+        max_recent_events: int = 10000,
+        retention_days: int = 365,
+        batch_size: int = 100,
+        compact_threshold: int = 10000,
+    ):
         """
         Initialize search analytics.
 
+        Recorded events are appended to an event log next to ``data_file``
+        and folded into hourly rollups, so recording is O(1) and insights
+        are computed from the rollups rather than from raw history.
+
         Args:
             data_file: Optional file to persist analytics data
+            max_recent_events: Number of raw query/click records kept in memory
+            retention_days: Age after which hourly rollups are dropped on compaction
+            batch_size: Number of events buffered before they are written
+            compact_threshold: Number of logged events that triggers a compaction
         """
         self.data_file = data_file
+        self.max_recent_events = max_recent_events
+        self.retention_days = retention_days
 
         # Storage for analytics data
-        self.queries = []  # List of query records
-        self.query_results = defaultdict(list)  # query -> [result_counts]
-        self.click_through_data = defaultdict(list)  # query -> [clicked_results]
-        self.zero_result_queries = []  # Queries that returned no results
+        self.queries = deque(maxlen=max_recent_events)  # Recent query records
+        self.query_stats: dict[str, QueryStats] = {}  # query -> all-time stats
+        self.hourly_rollups: dict[int, QueryRollup] = {}  # hour index -> rollup
+        self.click_through_data = defaultdict(
+            lambda: deque(maxlen=100)
+        )  # query -> recent clicked results
+        self.click_stats = defaultdict(
+            lambda: {"count": 0, "position_total": 0}
+        )  # query -> click aggregates
+        self.zero_result_queries = deque(
+            maxlen=max_recent_events
+        )  # Recent queries that returned no results
+
+        self._event_log = (
+            EventLog(
+                data_file, batch_size=batch_size, compact_threshold=compact_threshold
+            )
+            if data_file
+            else None
+        )
 
         # Load existing data if available
         if data_file:
@@ -65,21 +246,10 @@ class SearchAnalytics:
             "filters": filters or {},
         }
 
-        self.queries.append(query_record)
-        self.query_results[query].append(results_count)
-
-        # Track zero-result queries
-        if results_count == 0:
-            self.zero_result_queries.append(
-                {
-                    "query": query,
-                    "timestamp": timestamp,
-                    "user_id": user_id,
-                    "filters": filters or {},
-                }
-            )
-
-        self._save_data()
+        self._apply_query(query_record)
+        self._log_event(
+            {"type": "query", **query_record, "timestamp": timestamp.isoformat()}
+        )
         logger.debug(f"Recorded query: {query} ({results_count} results)")
 
     def record_click_through(
@@ -107,16 +277,31 @@ class SearchAnalytics:
             "timestamp": timestamp,
         }
 
-        self.click_through_data[query].append(click_record)
-        self._save_data()
+        self._apply_click(query, click_record)
+        self._log_event(
+            {
+                "type": "click",
+                "query": query,
+                **click_record,
+                "timestamp": timestamp.isoformat(),
+            }
+        )
         logger.debug(
             f"Recorded click-through for query: {query} at position {position}"
         )
 
+    def flush(self):
+        """Write any buffered events to the event log."""
+        if self._event_log:
+            self._event_log.flush()
+
     def get_insights(self, period_days: int = 30) -> dict[str, Any]:
         """
         Get search analytics insights for a specific period.
 
+        The period is resolved to whole hour buckets, so the oldest hour of
+        the period is included in full.
+
         Args:
             period_days: Number of days to analyze (default: 30)
 
@@ -124,12 +309,19 @@ class SearchAnalytics:
             Dictionary with analytics insights
         """
         try:
-            cutoff_date = datetime.now() - timedelta(days=period_days)
-
-            # Filter queries by period
-            recent_queries = [q for q in self.queries if q["timestamp"] >= cutoff_date]
-
-            if not recent_queries:
+            cutoff_hour = _hour_index(datetime.now() - timedelta(days=period_days))
+
+            # Select the hourly rollups that fall within the period
+            buckets = [
+                (hour, rollup)
+                for hour, rollup in sorted(self.hourly_rollups.items())
+                if hour >= cutoff_hour
+            ]
+            period = QueryRollup()
+            for _, rollup in buckets:
+                period.merge(rollup)
+
+            if not period.count:
                 return {
                     "period_days": period_days,
                     "total_queries": 0,
@@ -139,17 +331,15 @@ class SearchAnalytics:
             # Calculate insights
             insights = {
                 "period_days": period_days,
-                "total_queries": len(recent_queries),
-                "unique_queries": len(set(q["query"] for q in recent_queries)),
-                "popular_queries": self._get_popular_queries(recent_queries),
-                "search_trends": self._analyze_search_trends(recent_queries),
-                "zero_result_queries": self._get_zero_result_insights(period_days),
-                "average_results_per_query": self._calculate_average_results(
-                    recent_queries
-                ),
-                "query_length_stats": self._analyze_query_lengths(recent_queries),
-                "filter_usage": self._analyze_filter_usage(recent_queries),
-                "temporal_patterns": self._analyze_temporal_patterns(recent_queries),
+                "total_queries": period.count,
+                "unique_queries": len(period.query_counts),
+                "popular_queries": self._get_popular_queries(period),
+                "search_trends": self._analyze_search_trends(buckets),
+                "zero_result_queries": self._get_zero_result_insights(period),
+                "average_results_per_query": self._calculate_average_results(period),
+                "query_length_stats": self._analyze_query_lengths(period),
+                "filter_usage": self._analyze_filter_usage(period),
+                "temporal_patterns": self._analyze_temporal_patterns(buckets),
             }
 
             return insights
@@ -169,39 +359,31 @@ class SearchAnalytics:
             Performance metrics for the query
         """
         try:
-            # Get all instances of this query
-            query_instances = [q for q in self.queries if q["query"] == query]
+            stats = self.query_stats.get(query)
 
-            if not query_instances:
+            if not stats:
                 return {"error": f"No data found for query: {query}"}
 
             # Calculate metrics
-            result_counts = [q["results_count"] for q in query_instances]
-            click_throughs = self.click_through_data.get(query, [])
+            clicks = self.click_stats.get(query, {"count": 0, "position_total": 0})
 
             performance = {
                 "query": query,
-                "total_searches": len(query_instances),
-                "average_results": sum(result_counts) / len(result_counts),
-                "min_results": min(result_counts),
-                "max_results": max(result_counts),
-                "zero_result_rate": len([r for r in result_counts if r == 0])
-                / len(result_counts),
-                "click_through_rate": len(click_throughs) / len(query_instances)
-                if query_instances
-                else 0,
-                "average_click_position": self._calculate_average_click_position(
-                    click_throughs
-                ),
-                "first_search": min(q["timestamp"] for q in query_instances),
-                "last_search": max(q["timestamp"] for q in query_instances),
-                "search_frequency": len(query_instances)
-                / max(
-                    (
-                        datetime.now() - min(q["timestamp"] for q in query_instances)
-                    ).days,
-                    1,
-                ),
+                "total_searches": stats.count,
+                "average_results": stats.results_total / stats.count,
+                "min_results": stats.min_results,
+                "max_results": stats.max_results,
+                "zero_result_rate": stats.zero_results / stats.count,
+                "click_through_rate": clicks["count"] / stats.count,
+                "average_click_position": round(
+                    clicks["position_total"] / clicks["count"], 1
+                )
+                if clicks["count"]
+                else 0.0,
+                "first_search": stats.first_search,
+                "last_search": stats.last_search,
+                "search_frequency": stats.count
+                / max((datetime.now() - stats.first_search).days, 1),
             }
 
             return performance
@@ -225,11 +407,10 @@ class SearchAnalytics:
 
         # Find matching queries
         matching_queries = []
-        query_counts = Counter(q["query"] for q in self.queries)
 
-        for query, count in query_counts.items():
+        for query, stats in self.query_stats.items():
             if partial_lower in query.lower():
-                matching_queries.append((query, count))
+                matching_queries.append((query, stats.count))
 
         # Sort by frequency and relevance
         matching_queries.sort(
@@ -238,41 +419,75 @@ class SearchAnalytics:
 
         return [query for query, count in matching_queries[:limit]]
 
+    def _apply_query(self, query_record: dict[str, Any]):
+        """Fold a query record into the in-memory aggregates."""
+        query = query_record["query"]
+        results_count = query_record["results_count"]
+        timestamp = query_record["timestamp"]
+
+        self.queries.append(query_record)
+
+        if query not in self.query_stats:
+            self.query_stats[query] = QueryStats()
+        self.query_stats[query].add(results_count, timestamp)
+
+        hour = _hour_index(timestamp)
+        if hour not in self.hourly_rollups:
+            self.hourly_rollups[hour] = QueryRollup()
+        self.hourly_rollups[hour].add(query, results_count, query_record["filters"])
+
+        # Track zero-result queries
+        if results_count == 0:
+            self.zero_result_queries.append(
+                {
+                    "query": query,
+                    "timestamp": timestamp,
+                    "user_id": query_record["user_id"],
+                    "filters": query_record["filters"],
+                }
+            )
+
+    def _apply_click(self, query: str, click_record: dict[str, Any]):
+        """Fold a click-through record into the in-memory aggregates."""
+        self.click_through_data[query].append(click_record)
+        self.click_stats[query]["count"] += 1
+        self.click_stats[query]["position_total"] += click_record["position"]
+
     def _get_popular_queries(
-        self, queries: list[dict[str, Any]], limit: int = 10
+        self, period: QueryRollup, limit: int = 10
     ) -> list[dict[str, Any]]:
         """Get most popular queries in the given period."""
-        query_counts = Counter(q["query"] for q in queries)
         popular = []
 
-        for query, count in query_counts.most_common(limit):
-            # Calculate additional metrics
-            query_instances = [q for q in queries if q["query"] == query]
-            avg_results = sum(q["results_count"] for q in query_instances) / len(
-                query_instances
-            )
+        for query, count in period.query_counts.most_common(limit):
+            avg_results = period.query_results[query] / count
 
             popular.append(
                 {
                     "query": query,
                     "count": count,
                     "average_results": round(avg_results, 1),
-                    "percentage": round((count / len(queries)) * 100, 1),
+                    "percentage": round((count / period.count) * 100, 1),
                 }
             )
 
         return popular
 
-    def _analyze_search_trends(self, queries: list[dict[str, Any]]) -> dict[str, Any]:
+    def _analyze_search_trends(
+        self, buckets: list[tuple[int, QueryRollup]]
+    ) -> dict[str, Any]:
         """Analyze search trends over time."""
-        if not queries:
+        if not buckets:
             return {}
 
-        # Group queries by day
+        # Group hourly buckets by day
         daily_counts = defaultdict(int)
-        for query in queries:
-            day = query["timestamp"].date()
-            daily_counts[day] += 1
+        for hour, rollup in buckets:
+            if rollup.count:
+                daily_counts[_hour_start(hour).date()] += rollup.count
+
+        if not daily_counts:
+            return {}
 
         # Calculate trend
         days = sorted(daily_counts.keys())
@@ -305,103 +520,78 @@ class SearchAnalytics:
             "peak_count": max(daily_counts.values()),
         }
 
-    def _get_zero_result_insights(self, period_days: int) -> dict[str, Any]:
+    def _get_zero_result_insights(self, period: QueryRollup) -> dict[str, Any]:
         """Analyze zero-result queries."""
-        cutoff_date = datetime.now() - timedelta(days=period_days)
-        recent_zero_results = [
-            q for q in self.zero_result_queries if q["timestamp"] >= cutoff_date
-        ]
-
-        if not recent_zero_results:
+        if not period.zero_results:
             return {"count": 0, "rate": 0}
 
         # Find common patterns in zero-result queries
-        zero_queries = [q["query"] for q in recent_zero_results]
-        common_terms = []
-
-        # Simple term frequency analysis
-        all_terms = []
-        for query in zero_queries:
-            all_terms.extend(query.lower().split())
-
-        term_counts = Counter(all_terms)
         common_terms = [
-            {"term": term, "count": count} for term, count in term_counts.most_common(5)
+            {"term": term, "count": count}
+            for term, count in period.zero_terms.most_common(5)
         ]
 
-        total_queries_in_period = len(
-            [q for q in self.queries if q["timestamp"] >= cutoff_date]
-        )
-        zero_result_rate = (
-            len(recent_zero_results) / total_queries_in_period
-            if total_queries_in_period > 0
-            else 0
-        )
+        zero_result_rate = period.zero_results / period.count if period.count else 0
 
         return {
-            "count": len(recent_zero_results),
+            "count": period.zero_results,
             "rate": round(zero_result_rate * 100, 1),
             "common_terms": common_terms,
-            "sample_queries": zero_queries[:5],
+            "sample_queries": period.zero_samples[:5],
         }
 
-    def _calculate_average_results(self, queries: list[dict[str, Any]]) -> float:
+    def _calculate_average_results(self, period: QueryRollup) -> float:
         """Calculate average number of results per query."""
-        if not queries:
+        if not period.count:
             return 0.0
 
-        total_results = sum(q["results_count"] for q in queries)
-        return round(total_results / len(queries), 1)
+        return round(period.results_total / period.count, 1)
 
-    def _analyze_query_lengths(self, queries: list[dict[str, Any]]) -> dict[str, Any]:
+    def _analyze_query_lengths(self, period: QueryRollup) -> dict[str, Any]:
         """Analyze query length statistics."""
-        if not queries:
+        if not period.count:
             return {}
 
-        lengths = [len(q["query"].split()) for q in queries]
+        lengths = period.length_counts
+        total_words = sum(length * count for length, count in lengths.items())
 
         return {
-            "average_length": round(sum(lengths) / len(lengths), 1),
+            "average_length": round(total_words / period.count, 1),
             "min_length": min(lengths),
             "max_length": max(lengths),
-            "single_word_queries": len([l for l in lengths if l == 1]),
-            "multi_word_queries": len([l for l in lengths if l > 1]),
+            "single_word_queries": lengths.get(1, 0),
+            "multi_word_queries": sum(
+                count for length, count in lengths.items() if length > 1
+            ),
         }
 
-    def _analyze_filter_usage(self, queries: list[dict[str, Any]]) -> dict[str, Any]:
+    def _analyze_filter_usage(self, period: QueryRollup) -> dict[str, Any]:
         """Analyze how filters are used in searches."""
-        filter_usage = defaultdict(int)
-        queries_with_filters = 0
-
-        for query in queries:
-            filters = query.get("filters", {})
-            if filters:
-                queries_with_filters += 1
-                for filter_name in filters.keys():
-                    filter_usage[filter_name] += 1
-
-        filter_rate = queries_with_filters / len(queries) if queries else 0
+        filter_rate = period.queries_with_filters / period.count if period.count else 0
 
         return {
             "filter_usage_rate": round(filter_rate * 100, 1),
-            "popular_filters": dict(Counter(filter_usage).most_common(5)),
-            "queries_with_filters": queries_with_filters,
+            "popular_filters": dict(period.filter_counts.most_common(5)),
+            "queries_with_filters": period.queries_with_filters,
         }
 
     def _analyze_temporal_patterns(
-        self, queries: list[dict[str, Any]]
+        self, buckets: list[tuple[int, QueryRollup]]
     ) -> dict[str, Any]:
         """Analyze temporal patterns in search behavior."""
-        if not queries:
+        if not buckets:
             return {}
 
         # Analyze by hour of day
         hour_counts = defaultdict(int)
         day_counts = defaultdict(int)
 
-        for query in queries:
-            hour_counts[query["timestamp"].hour] += 1
-            day_counts[query["timestamp"].weekday()] += 1
+        for hour, rollup in buckets:
+            if not rollup.count:
+                continue
+            hour_start = _hour_start(hour)
+            hour_counts[hour_start.hour] += rollup.count
+            day_counts[hour_start.weekday()] += rollup.count
 
         # Find peak hours and days
         peak_hour = max(hour_counts, key=hour_counts.get) if hour_counts else 0
@@ -426,84 +616,130 @@ class SearchAnalytics:
             },
         }
 
-    def _calculate_average_click_position(
-        self, click_throughs: list[dict[str, Any]]
-    ) -> float:
-        """Calculate average position of clicked results."""
-        if not click_throughs:
-            return 0.0
+    def _log_event(self, event: dict[str, Any]):
+        """Append an event to the log, compacting it when it grows too large."""
+        if not self._event_log:
+            return
 
-        positions = [ct["position"] for ct in click_throughs]
-        return round(sum(positions) / len(positions), 1)
+        self._event_log.append(event)
+        if self._event_log.needs_compaction:
+            self._save_data()
 
     def _save_data(self):
-        """Save analytics data to file."""
-        if not self.data_file:
+        """Compact analytics data into a snapshot file."""
+        if not self._event_log:
             return
 
-        try:
-            data = {
-                "queries": [
-                    {
-                        "query": q["query"],
-                        "results_count": q["results_count"],
-                        "timestamp": q["timestamp"].isoformat(),
-                        "user_id": q["user_id"],
-                        "filters": q["filters"],
-                    }
-                    for q in self.queries
-                ],
-                "zero_result_queries": [
-                    {
-                        "query": q["query"],
-                        "timestamp": q["timestamp"].isoformat(),
-                        "user_id": q["user_id"],
-                        "filters": q["filters"],
-                    }
-                    for q in self.zero_result_queries
-                ],
-            }
+        # Drop rollups that fell out of the retention window
+        cutoff_hour = _hour_index(datetime.now() - timedelta(days=self.retention_days))
+        self.hourly_rollups = {
+            hour: rollup
+            for hour, rollup in self.hourly_rollups.items()
+            if hour >= cutoff_hour
+        }
 
-            with open(self.data_file, "w") as f:
-                json.dump(data, f, indent=2)
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "hourly_rollups": {
+                str(hour): rollup.to_dict()
+                for hour, rollup in self.hourly_rollups.items()
+            },
+            "query_stats": {
+                query: stats.to_dict() for query, stats in self.query_stats.items()
+            },
+            "queries": [
+                {**q, "timestamp": q["timestamp"].isoformat()} for q in self.queries
+            ],
+            "zero_result_queries": [
+                {**q, "timestamp": q["timestamp"].isoformat()}
+                for q in self.zero_result_queries
+            ],
+            "click_stats": dict(self.click_stats),
+            "click_through_data": {
+                query: [{**c, "timestamp": c["timestamp"].isoformat()} for c in clicks]
+                for query, clicks in self.click_through_data.items()
+            },
+        }
 
-        except Exception as e:
-            logger.warning(f"Failed to save analytics data: {e}")
+        self._event_log.compact(snapshot)
 
     def _load_data(self):
-        """Load analytics data from file."""
-        if not self.data_file:
+        """Load analytics data from the snapshot and replay the event log."""
+        if not self._event_log:
             return
 
-        try:
-            with open(self.data_file) as f:
-                data = json.load(f)
-
-            # Load queries
-            for q_data in data.get("queries", []):
-                query_record = {
-                    "query": q_data["query"],
-                    "results_count": q_data["results_count"],
-                    "timestamp": datetime.fromisoformat(q_data["timestamp"]),
-                    "user_id": q_data["user_id"],
-                    "filters": q_data["filters"],
-                }
-                self.queries.append(query_record)
-                self.query_results[q_data["query"]].append(q_data["results_count"])
-
-            # Load zero result queries
-            for q_data in data.get("zero_result_queries", []):
-                zero_query = {
-                    "query": q_data["query"],
-                    "timestamp": datetime.fromisoformat(q_data["timestamp"]),
-                    "user_id": q_data["user_id"],
-                    "filters": q_data["filters"],
-                }
-                self.zero_result_queries.append(zero_query)
+        snapshot, events = self._event_log.load()
 
-            logger.info(f"Loaded analytics data from {self.data_file}")
+        try:
+            if snapshot and snapshot.get("version") == SNAPSHOT_VERSION:
+                self._restore_snapshot(snapshot)
+            elif snapshot:
+                # Legacy format: a plain dump of every recorded query
+                for q_data in snapshot.get("queries", []):
+                    self._apply_query(
+                        {
+                            "query": q_data["query"],
+                            "results_count": q_data["results_count"],
+                            "timestamp": datetime.fromisoformat(q_data["timestamp"]),
+                            "user_id": q_data["user_id"],
+                            "filters": q_data["filters"],
+                        }
+                    )
+
+            for event in events:
+                timestamp = datetime.fromisoformat(event["timestamp"])
+                if event["type"] == "query":
+                    self._apply_query(
+                        {
+                            "query": event["query"],
+                            "results_count": event["results_count"],
+                            "timestamp": timestamp,
+                            "user_id": event["user_id"],
+                            "filters": event["filters"],
+                        }
+                    )
+                elif event["type"] == "click":
+                    self._apply_click(
+                        event["query"],
+                        {
+                            "clicked_result": event["clicked_result"],
+                            "position": event["position"],
+                            "timestamp": timestamp,
+                        },
+                    )
+
+            if snapshot is not None or events:
+                logger.info(f"Loaded analytics data from {self.data_file}")
+            else:
+                logger.info(f"No existing analytics data found at {self.data_file}")
 
-        except FileNotFoundError:
-            logger.info(f"No existing analytics data found at {self.data_file}")
         except Exception as e:
             logger.warning(f"Failed to load analytics data: {e}")
+
+    def _restore_snapshot(self, snapshot: dict[str, Any]):
+        """Restore in-memory aggregates from a compacted snapshot."""
+        self.hourly_rollups = {
+            int(hour): QueryRollup.from_dict(data)
+            for hour, data in snapshot["hourly_rollups"].items()
+        }
+        self.query_stats = {
+            query: QueryStats.from_dict(data)
+            for query, data in snapshot["query_stats"].items()
+        }
+
+        for q_data in snapshot["queries"]:
+            self.queries.append(
+                {**q_data, "timestamp": datetime.fromisoformat(q_data["timestamp"])}
+            )
+        for q_data in snapshot["zero_result_queries"]:
+            self.zero_result_queries.append(
+                {**q_data, "timestamp": datetime.fromisoformat(q_data["timestamp"])}
+            )
+
+        for query, stats in snapshot["click_stats"].items():
+            self.click_stats[query].update(stats)
+        for query, clicks in snapshot["click_through_data"].items():
+            self.click_through_data[query].extend(
+                {**c, "timestamp": datetime.fromisoformat(c["timestamp"])}
+                for c in clicks
+            )
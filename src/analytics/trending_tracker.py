@@ -5,32 +5,136 @@ Trending Libraries Tracker for Advanced Search & Discovery
 Tracks library usage patterns, searches, views, and downloads to identify trending libraries.
 """
 
-import json
 import logging
-from collections import defaultdict
-from datetime import datetime, timedelta
+from collections import Counter, defaultdict
+from datetime import datetime
 from typing import Any, Optional
 
+from .counters import DecayedCounter, RollingCounter
+from .event_log import EventLog
+
 logger = logging.getLogger(__name__)
 
+SNAPSHOT_VERSION = 3
+
+# Weight of each interaction type in the trending score
+INTERACTION_WEIGHTS = {"searches": 1.0, "views": 2.0, "downloads": 5.0}
+
+# Ring buffer and number of its slots overlapping each period. A period
+# covers every slot it overlaps, so "day" spans 25 hourly slots.
+PERIOD_WINDOWS = {
+    "hour": ("hourly", 2),
+    "day": ("hourly", 25),
+    "week": ("daily", 8),
+    "month": ("daily", 31),
+}
+
+# Half-life in seconds of the decayed trending score for each period
+PERIOD_HALF_LIVES = {
+    "hour": 15 * 60,
+    "day": 6 * 3600,
+    "week": 42 * 3600,
+    "month": 180 * 3600,
+}
+
+
+class LibraryActivity:
+    """Bounded rolling counters and decayed scores for one library."""
+
+    __slots__ = ("hourly", "daily", "scores")
+
+    def __init__(self):
+        self.hourly = {
+            interaction_type: RollingCounter(25, 3600)
+            for interaction_type in INTERACTION_WEIGHTS
+        }
+        self.daily = {
+            interaction_type: RollingCounter(31, 86400)
+            for interaction_type in INTERACTION_WEIGHTS
+        }
+        self.scores = {
+            period: DecayedCounter(half_life)
+            for period, half_life in PERIOD_HALF_LIVES.items()
+        }
+
+    def record(self, interaction_type: str, timestamp: float, count: int = 1):
+        """Count interactions of one type at a POSIX timestamp."""
+        self.hourly[interaction_type].add(timestamp, count)
+        self.daily[interaction_type].add(timestamp, count)
+        weight = INTERACTION_WEIGHTS[interaction_type] * count
+        for score in self.scores.values():
+            score.add(timestamp, weight)
+
+    def counts(self, period: str, now: float) -> dict[str, int]:
+        """Return interaction counts per type within a period."""
+        window, num_slots = PERIOD_WINDOWS[period]
+        counters = getattr(self, window)
+        return {
+            interaction_type: counter.total(now, num_slots)
+            for interaction_type, counter in counters.items()
+        }
+
+    def score(self, period: str, now: float) -> float:
+        """Return the decayed, weighted interaction score for a period."""
+        return self.scores[period].value_at(now)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Serialize the counters."""
+        return {
+            "hourly": {t: c.to_dict() for t, c in self.hourly.items()},
+            "daily": {t: c.to_dict() for t, c in self.daily.items()},
+            "scores": {p: c.to_dict() for p, c in self.scores.items()},
+        }
+
+    def load(self, data: dict[str, Any]):
+        """Restore counters produced by ``to_dict``."""
+        for attribute in self.__slots__:
+            counters = getattr(self, attribute)
+            for key, state in data[attribute].items():
+                if key in counters:
+                    counters[key].load(state)
+
 
 class TrendingLibrariesTracker:
     """Tracker for identifying trending libraries based on user interactions."""
 
-    def __init__(self, data_file: Optional[str] = None):
+    def __init__(
+        self,
+        data_file: Optional[str] = None,
+        batch_size: int = 100,
+        compact_threshold: int = 10000,
+    ):
         """
         Initialize the trending libraries tracker.
 
+        Interactions are appended to an event log next to ``data_file`` and
+        folded into fixed-size rolling counters and decayed scores per
+        library, so recording is O(1), trending queries are O(libraries) and
+        memory does not grow with traffic.
+
         Args:
             data_file: Optional file to persist tracking data
+            batch_size: Number of events buffered before they are written
+            compact_threshold: Number of logged events that triggers a compaction
         """
         self.data_file = data_file
 
         # Storage for different types of interactions
-        self.searches = defaultdict(list)  # library_name -> [timestamps]
-        self.views = defaultdict(list)  # library_name -> [timestamps]
-        self.downloads = defaultdict(list)  # library_name -> [timestamps]
-        self.ratings = defaultdict(list)  # library_name -> [rating_values]
+        self.activity: dict[str, LibraryActivity] = {}  # library_name -> counters
+        self.totals = {
+            interaction_type: Counter() for interaction_type in INTERACTION_WEIGHTS
+        }  # interaction_type -> {library_name: all-time count}
+        self.ratings = defaultdict(
+            lambda: {"count": 0, "total": 0.0}
+        )  # library_name -> rating aggregates
+
+        self._event_log = (
+            EventLog(
+                data_file, batch_size=batch_size, compact_threshold=compact_threshold
+            )
+            if data_file
+            else None
+        )
 
         # Load existing data if available
         if data_file:
@@ -47,8 +151,14 @@ class TrendingLibrariesTracker:
         if timestamp is None:
             timestamp = datetime.now()
 
-        self.searches[library_name].append(timestamp)
-        self._save_data()
+        self._apply_interaction("searches", library_name, timestamp)
+        self._log_event(
+            {
+                "type": "searches",
+                "library": library_name,
+                "timestamp": timestamp.isoformat(),
+            }
+        )
         logger.debug(f"Recorded search for {library_name}")
 
     def record_view(self, library_name: str, timestamp: Optional[datetime] = None):
@@ -62,8 +172,14 @@ class TrendingLibrariesTracker:
         if timestamp is None:
             timestamp = datetime.now()
 
-        self.views[library_name].append(timestamp)
-        self._save_data()
+        self._apply_interaction("views", library_name, timestamp)
+        self._log_event(
+            {
+                "type": "views",
+                "library": library_name,
+                "timestamp": timestamp.isoformat(),
+            }
+        )
         logger.debug(f"Recorded view for {library_name}")
 
     def record_download(self, library_name: str, timestamp: Optional[datetime] = None):
@@ -77,8 +193,14 @@ class TrendingLibrariesTracker:
         if timestamp is None:
             timestamp = datetime.now()
 
-        self.downloads[library_name].append(timestamp)
-        self._save_data()
+        self._apply_interaction("downloads", library_name, timestamp)
+        self._log_event(
+            {
+                "type": "downloads",
+                "library": library_name,
+                "timestamp": timestamp.isoformat(),
+            }
+        )
         logger.debug(f"Recorded download for {library_name}")
 
     def record_rating(self, library_name: str, rating: float):
@@ -89,10 +211,15 @@ class TrendingLibrariesTracker:
             library_name: Name of the library that was rated
             rating: Rating value (typically 1-5)
         """
-        self.ratings[library_name].append(rating)
-        self._save_data()
+        self._apply_rating(library_name, rating)
+        self._log_event({"type": "rating", "library": library_name, "rating": rating})
         logger.debug(f"Recorded rating {rating} for {library_name}")
 
+    def flush(self):
+        """Write any buffered events to the event log."""
+        if self._event_log:
+            self._event_log.flush()
+
     def get_trending_libraries(
         self, period: str = "day", limit: int = 10
     ) -> list[dict[str, Any]]:
@@ -107,34 +234,20 @@ class TrendingLibrariesTracker:
             List of trending libraries with scores and interaction counts
         """
         try:
-            # Calculate time cutoff
-            now = datetime.now()
-            if period == "hour":
-                cutoff = now - timedelta(hours=1)
-            elif period == "day":
-                cutoff = now - timedelta(days=1)
-            elif period == "week":
-                cutoff = now - timedelta(weeks=1)
-            elif period == "month":
-                cutoff = now - timedelta(days=30)
-            else:
-                cutoff = now - timedelta(days=1)  # Default to day
+            if period not in PERIOD_WINDOWS:
+                period = "day"  # Default to day
+            now = datetime.now().timestamp()
 
             # Calculate trending scores
             trending_scores = {}
-            all_libraries = set()
-            all_libraries.update(self.searches.keys())
-            all_libraries.update(self.views.keys())
-            all_libraries.update(self.downloads.keys())
-
-            for library in all_libraries:
-                score = self._calculate_trending_score(library, cutoff)
-                if score > 0:
-                    interactions = self._get_interaction_counts(library, cutoff)
+            for library, activity in self.activity.items():
+                interactions = activity.counts(period, now)
+                total_interactions = sum(interactions.values())
+                if total_interactions:
                     trending_scores[library] = {
-                        "score": score,
+                        "score": self._calculate_trending_score(library, period, now),
                         "interactions": interactions,
-                        "total_interactions": sum(interactions.values()),
+                        "total_interactions": total_interactions,
                     }
 
             # Sort by score and return top results
@@ -171,27 +284,23 @@ class TrendingLibrariesTracker:
             Dictionary with detailed analytics
         """
         try:
-            now = datetime.now()
-            periods = {
-                "hour": now - timedelta(hours=1),
-                "day": now - timedelta(days=1),
-                "week": now - timedelta(weeks=1),
-                "month": now - timedelta(days=30),
-            }
+            now = datetime.now().timestamp()
 
             analytics = {
                 "library": library_name,
-                "total_searches": len(self.searches[library_name]),
-                "total_views": len(self.views[library_name]),
-                "total_downloads": len(self.downloads[library_name]),
+                "total_searches": self.totals["searches"][library_name],
+                "total_views": self.totals["views"][library_name],
+                "total_downloads": self.totals["downloads"][library_name],
                 "average_rating": self._calculate_average_rating(library_name),
                 "periods": {},
             }
 
             # Calculate metrics for each period
-            for period_name, cutoff in periods.items():
-                interactions = self._get_interaction_counts(library_name, cutoff)
-                score = self._calculate_trending_score(library_name, cutoff)
+            for period_name in PERIOD_WINDOWS:
+                interactions = self._get_interaction_counts(
+                    library_name, period_name, now
+                )
+                score = self._calculate_trending_score(library_name, period_name, now)
 
                 analytics["periods"][period_name] = {
                     "interactions": interactions,
@@ -213,10 +322,6 @@ class TrendingLibrariesTracker:
             Dictionary with trending insights and statistics
         """
         try:
-            now = datetime.now()
-            day_cutoff = now - timedelta(days=1)
-            week_cutoff = now - timedelta(weeks=1)
-
             # Get trending libraries for different periods
             daily_trending = self.get_trending_libraries("day", 5)
             weekly_trending = self.get_trending_libraries("week", 10)
@@ -259,11 +364,7 @@ class TrendingLibrariesTracker:
                     {"library": lib, "growth_rate": rate}
                     for lib, rate in fastest_growing
                 ],
-                "total_tracked_libraries": len(
-                    set().union(
-                        self.searches.keys(), self.views.keys(), self.downloads.keys()
-                    )
-                ),
+                "total_tracked_libraries": len(self.activity),
                 "most_searched": self._get_most_interacted("searches"),
                 "most_viewed": self._get_most_interacted("views"),
                 "most_downloaded": self._get_most_interacted("downloads"),
@@ -275,139 +376,135 @@ class TrendingLibrariesTracker:
             logger.error(f"Error getting trending insights: {e}")
             return {"error": str(e)}
 
-    def _calculate_trending_score(self, library_name: str, cutoff: datetime) -> float:
+    def _calculate_trending_score(
+        self, library_name: str, period: str, now: float
+    ) -> float:
         """Calculate trending score for a library within a time period."""
-        # Get interactions within the time period
-        recent_searches = [ts for ts in self.searches[library_name] if ts >= cutoff]
-        recent_views = [ts for ts in self.views[library_name] if ts >= cutoff]
-        recent_downloads = [ts for ts in self.downloads[library_name] if ts >= cutoff]
-
-        # Weight different types of interactions
-        search_weight = 1.0
-        view_weight = 2.0
-        download_weight = 5.0
-
-        # Calculate base score
-        score = (
-            len(recent_searches) * search_weight
-            + len(recent_views) * view_weight
-            + len(recent_downloads) * download_weight
-        )
-
-        # Apply time decay (more recent interactions have higher weight)
-        now = datetime.now()
-        time_weighted_score = 0
+        activity = self.activity.get(library_name)
+        if activity is None:
+            return 0.0
 
-        for interaction_list, weight in [
-            (recent_searches, search_weight),
-            (recent_views, view_weight),
-            (recent_downloads, download_weight),
-        ]:
-            for timestamp in interaction_list:
-                hours_ago = (now - timestamp).total_seconds() / 3600
-                time_decay = max(0, 1 - (hours_ago / 24))  # Decay over 24 hours
-                time_weighted_score += weight * time_decay
+        # Recent interactions weigh more; the decay half-life scales with the period
+        score = activity.score(period, now)
 
         # Apply rating boost
         avg_rating = self._calculate_average_rating(library_name)
         if avg_rating > 0:
             rating_multiplier = 1 + (avg_rating - 3) * 0.2  # Boost for ratings above 3
-            time_weighted_score *= rating_multiplier
+            score *= rating_multiplier
 
-        return round(time_weighted_score, 2)
+        return round(score, 2)
 
     def _get_interaction_counts(
-        self, library_name: str, cutoff: datetime
+        self, library_name: str, period: str, now: float
     ) -> dict[str, int]:
         """Get interaction counts for a library within a time period."""
-        return {
-            "searches": len([ts for ts in self.searches[library_name] if ts >= cutoff]),
-            "views": len([ts for ts in self.views[library_name] if ts >= cutoff]),
-            "downloads": len(
-                [ts for ts in self.downloads[library_name] if ts >= cutoff]
-            ),
-        }
+        activity = self.activity.get(library_name)
+        if activity is None:
+            return dict.fromkeys(INTERACTION_WEIGHTS, 0)
+        return activity.counts(period, now)
 
     def _calculate_average_rating(self, library_name: str) -> float:
         """Calculate average rating for a library."""
-        ratings = self.ratings[library_name]
-        if not ratings:
+        ratings = self.ratings.get(library_name)
+        if not ratings or not ratings["count"]:
             return 0.0
-        return sum(ratings) / len(ratings)
+        return ratings["total"] / ratings["count"]
 
     def _get_most_interacted(self, interaction_type: str) -> list[dict[str, Any]]:
         """Get most interacted libraries for a specific interaction type."""
-        if interaction_type == "searches":
-            data = self.searches
-        elif interaction_type == "views":
-            data = self.views
-        elif interaction_type == "downloads":
-            data = self.downloads
-        else:
+        if interaction_type not in self.totals:
             return []
 
-        # Count total interactions
-        counts = {lib: len(interactions) for lib, interactions in data.items()}
-        sorted_counts = sorted(counts.items(), key=lambda x: x[1], reverse=True)
+        return [
+            {"library": lib, "count": count}
+            for lib, count in self.totals[interaction_type].most_common(5)
+        ]
+
+    def _apply_interaction(
+        self, interaction_type: str, library_name: str, timestamp: datetime
+    ):
+        """Count an interaction in the library's rolling counters and totals."""
+        if library_name not in self.activity:
+            self.activity[library_name] = LibraryActivity()
+        self.activity[library_name].record(interaction_type, timestamp.timestamp())
+        self.totals[interaction_type][library_name] += 1
+
+    def _apply_rating(self, library_name: str, rating: float):
+        """Fold a rating into the per-library rating aggregates."""
+        self.ratings[library_name]["count"] += 1
+        self.ratings[library_name]["total"] += rating
+
+    def _log_event(self, event: dict[str, Any]):
+        """Append an event to the log, compacting it when it grows too large."""
+        if not self._event_log:
+            return
 
-        return [{"library": lib, "count": count} for lib, count in sorted_counts[:5]]
+        self._event_log.append(event)
+        if self._event_log.needs_compaction:
+            self._save_data()
 
     def _save_data(self):
-        """Save tracking data to file."""
-        if not self.data_file:
+        """Compact tracking data into a snapshot file."""
+        if not self._event_log:
             return
 
-        try:
-            data = {
-                "searches": {
-                    lib: [ts.isoformat() for ts in timestamps]
-                    for lib, timestamps in self.searches.items()
-                },
-                "views": {
-                    lib: [ts.isoformat() for ts in timestamps]
-                    for lib, timestamps in self.views.items()
-                },
-                "downloads": {
-                    lib: [ts.isoformat() for ts in timestamps]
-                    for lib, timestamps in self.downloads.items()
-                },
-                "ratings": dict(self.ratings),
-            }
-
-            with open(self.data_file, "w") as f:
-                json.dump(data, f, indent=2)
+        snapshot = {
+            "version": SNAPSHOT_VERSION,
+            "activity": {
+                lib: activity.to_dict() for lib, activity in self.activity.items()
+            },
+            "totals": {
+                interaction_type: dict(counts)
+                for interaction_type, counts in self.totals.items()
+            },
+            "ratings": dict(self.ratings),
+        }
 
-        except Exception as e:
-            logger.warning(f"Failed to save tracking data: {e}")
+        self._event_log.compact(snapshot)
 
     def _load_data(self):
-        """Load tracking data from file."""
-        if not self.data_file:
+        """Load tracking data from the snapshot and replay the event log."""
+        if not self._event_log:
             return
 
-        try:
-            with open(self.data_file) as f:
-                data = json.load(f)
-
-            # Load searches
-            for lib, timestamps in data.get("searches", {}).items():
-                self.searches[lib] = [datetime.fromisoformat(ts) for ts in timestamps]
-
-            # Load views
-            for lib, timestamps in data.get("views", {}).items():
-                self.views[lib] = [datetime.fromisoformat(ts) for ts in timestamps]
-
-            # Load downloads
-            for lib, timestamps in data.get("downloads", {}).items():
-                self.downloads[lib] = [datetime.fromisoformat(ts) for ts in timestamps]
+        snapshot, events = self._event_log.load()
 
-            # Load ratings
-            for lib, ratings in data.get("ratings", {}).items():
-                self.ratings[lib] = ratings
+        try:
+            if snapshot and snapshot.get("version") == SNAPSHOT_VERSION:
+                for lib, data in snapshot["activity"].items():
+                    self.activity[lib] = LibraryActivity()
+                    self.activity[lib].load(data)
+                for interaction_type, counts in snapshot["totals"].items():
+                    self.totals[interaction_type].update(counts)
+                for lib, ratings in snapshot["ratings"].items():
+                    self.ratings[lib].update(ratings)
+            elif snapshot:
+                # Legacy format: raw timestamps and ratings per library
+                for interaction_type in INTERACTION_WEIGHTS:
+                    for lib, timestamps in snapshot.get(interaction_type, {}).items():
+                        for ts in timestamps:
+                            self._apply_interaction(
+                                interaction_type, lib, datetime.fromisoformat(ts)
+                            )
+                for lib, ratings in snapshot.get("ratings", {}).items():
+                    for rating in ratings:
+                        self._apply_rating(lib, rating)
+
+            for event in events:
+                if event["type"] == "rating":
+                    self._apply_rating(event["library"], event["rating"])
+                else:
+                    self._apply_interaction(
+                        event["type"],
+                        event["library"],
+                        datetime.fromisoformat(event["timestamp"]),
+                    )
 
-            logger.info(f"Loaded tracking data from {self.data_file}")
+            if snapshot is not None or events:
+                logger.info(f"Loaded tracking data from {self.data_file}")
+            else:
+                logger.info(f"No existing tracking data found at {self.data_file}")
 
-        except FileNotFoundError:
-            logger.info(f"No existing tracking data found at {self.data_file}")
         except Exception as e:
             logger.warning(f"Failed to load tracking data: {e}")
@@ -1,5 +1,6 @@
 """Base components for the documentation crawler backends."""
 
+import inspect
 import logging  # Added import for logger
 from abc import ABC, abstractmethod
 from datetime import datetime, timezone
@@ -7,6 +8,7 @@ from typing import TYPE_CHECKING, Any, Optional, Union  # Added Type
 
 from pydantic import BaseModel, Field, field_validator
 
+from ..utils.tracing import SPAN_KIND_CLIENT, traced
 from ..utils.url import URLInfo
 
 # Forward reference for type hinting
@@ -69,6 +71,17 @@ class CrawlerBackend(ABC):
         self.name = name
         self.reset_metrics()
 
+    def __init_subclass__(cls, **kwargs: Any) -> None:
+        """Trace the crawl coroutine of every backend implementation."""
+        super().__init_subclass__(**kwargs)
+        crawl = cls.__dict__.get("crawl")
+        if inspect.iscoroutinefunction(crawl) and not getattr(
+            crawl, "__isabstractmethod__", False
+        ):
+            cls.crawl = traced(
+                "backend.crawl", SPAN_KIND_CLIENT, _crawl_span_attributes
+            )(crawl)
+
     @abstractmethod
     # Updated signature to match actual usage by the crawler
     async def crawl(self, url_info: URLInfo, config: "CrawlerConfig") -> CrawlResult:
@@ -175,6 +188,17 @@ class CrawlerBackend(ABC):
         # Default implementation - no cleanup needed for base class
 
 
+def _crawl_span_attributes(
+    backend: CrawlerBackend, url: Any = None, *args: Any, **kwargs: Any
+) -> dict[str, Any]:
+    """Span attributes of a backend crawl call."""
+    url = kwargs.get("url_info", kwargs.get("url", url))
+    return {
+        "backend.name": getattr(backend, "name", type(backend).__name__),
+        "url.full": str(getattr(url, "normalized_url", None) or url),
+    }
+
+
 # Moved from selector.py to base.py to resolve circular import
 _registered_backends: dict[str, type[CrawlerBackend]] = {}
 
@@ -0,0 +1,219 @@
+"""
+Multiplexed Chrome DevTools Protocol client.
+
+One websocket carries the commands of many targets at once: every command
+gets a connection-unique id, a single reader task routes each response to
+the future waiting for that id, and events are routed by session id and
+method. Targets attached with flatten=True get their own CDPSession, whose
+commands carry the session id, so pages render concurrently over one
+connection instead of one command at a time.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+
+class CDPError(RuntimeError):
+    """Error response to a CDP command, or a lost connection."""
+
+
+class CDPConnection:
+    """CDP client multiplexing commands and sessions over one websocket."""
+
+    def __init__(self, ws: aiohttp.ClientWebSocketResponse, timeout: float = 30.0):
+        """
+        Start routing the messages of a connected websocket.
+
+        Args:
+            ws: Websocket connected to the browser endpoint
+            timeout: Default command timeout in seconds
+        """
+        self.ws = ws
+        self.timeout = timeout
+        self._ids = itertools.count(1)
+        self._pending: dict[int, asyncio.Future] = {}
+        self._waiters: dict[tuple[Optional[str], str], list[asyncio.Future]] = {}
+        self._send_lock = asyncio.Lock()
+        self._closed = False
+        self._reader = asyncio.create_task(self._read())
+
+    @property
+    def closed(self) -> bool:
+        return self._closed or self.ws.closed
+
+    async def send(
+        self,
+        method: str,
+        params: Optional[dict[str, Any]] = None,
+        session_id: Optional[str] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """
+        Send a command and wait for its response.
+
+        Args:
+            method: CDP method, e.g. "Page.navigate"
+            params: Command parameters
+            session_id: Session of the target to send to; None for the browser
+            timeout: Seconds to wait for the response (defaults to the
+                connection's timeout)
+
+        Returns:
+            Result of the command
+
+        Raises:
+            CDPError: If the browser answers with an error or the connection
+                is lost
+            asyncio.TimeoutError: If no response arrives in time
+        """
+        if self.closed:
+            raise CDPError("CDP connection is closed")
+        command_id = next(self._ids)
+        message: dict[str, Any] = {
+            "id": command_id,
+            "method": method,
+            "params": params or {},
+        }
+        if session_id:
+            message["sessionId"] = session_id
+
+        future = asyncio.get_running_loop().create_future()
+        self._pending[command_id] = future
+        try:
+            async with self._send_lock:
+                await self.ws.send_str(json.dumps(message))
+            return await asyncio.wait_for(future, timeout or self.timeout)
+        finally:
+            self._pending.pop(command_id, None)
+
+    def expect_event(
+        self, method: str, session_id: Optional[str] = None
+    ) -> asyncio.Future:
+        """
+        Register for the next occurrence of an event.
+
+        Register before sending the command that causes the event, then
+        await the future (see wait_event).
+
+        Args:
+            method: Event method, e.g. "Page.loadEventFired"
+            session_id: Session the event must come from
+
+        Returns:
+            Future resolving to the event parameters
+        """
+        future = asyncio.get_running_loop().create_future()
+        self._waiters.setdefault((session_id, method), []).append(future)
+        return future
+
+    async def wait_event(
+        self, future: asyncio.Future, timeout: Optional[float] = None
+    ) -> dict[str, Any]:
+        """
+        Wait for an event registered with expect_event.
+
+        Args:
+            future: Future from expect_event
+            timeout: Seconds to wait (defaults to the connection's timeout)
+
+        Returns:
+            Event parameters
+        """
+        try:
+            return await asyncio.wait_for(future, timeout or self.timeout)
+        finally:
+            for waiters in self._waiters.values():
+                if future in waiters:
+                    waiters.remove(future)
+
+    async def create_session(self, target_id: str) -> "CDPSession":
+        """
+        Attach to a target in flat mode.
+
+        Args:
+            target_id: Target to attach to
+
+        Returns:
+            Session sending its commands to the target
+        """
+        result = await self.send(
+            "Target.attachToTarget", {"targetId": target_id, "flatten": True}
+        )
+        return CDPSession(self, result["sessionId"], target_id)
+
+    async def close(self) -> None:
+        """Close the websocket and fail the commands still waiting."""
+        self._closed = True
+        await self.ws.close()
+        self._reader.cancel()
+        try:
+            await self._reader
+        except asyncio.CancelledError:
+            pass
+        self._fail_pending("CDP connection closed")
+
+    async def _read(self) -> None:
+        """Route responses by id and events by session and method."""
+        try:
+            async for msg in self.ws:
+                if msg.type != aiohttp.WSMsgType.TEXT:
+                    continue
+                data = json.loads(msg.data)
+                if "id" in data:
+                    future = self._pending.get(data["id"])
+                    if future is None or future.done():
+                        continue
+                    if "error" in data:
+                        future.set_exception(
+                            CDPError(f"Command error: {data['error']}")
+                        )
+                    else:
+                        future.set_result(data.get("result", {}))
+                else:
+                    key = (data.get("sessionId"), data.get("method"))
+                    for future in self._waiters.pop(key, []):
+                        if not future.done():
+                            future.set_result(data.get("params", {}))
+        except Exception as e:
+            logger.warning(f"CDP connection failed: {e}")
+        finally:
+            self._closed = True
+            self._fail_pending("CDP connection lost")
+
+    def _fail_pending(self, reason: str) -> None:
+        futures = list(self._pending.values())
+        for waiters in self._waiters.values():
+            futures.extend(waiters)
+        self._waiters.clear()
+        for future in futures:
+            if not future.done():
+                future.set_exception(CDPError(reason))
+
+
+class CDPSession:
+    """Commands and events of one attached target."""
+
+    def __init__(self, connection: CDPConnection, session_id: str, target_id: str):
+        self.connection = connection
+        self.session_id = session_id
+        self.target_id = target_id
+
+    async def send(
+        self,
+        method: str,
+        params: Optional[dict[str, Any]] = None,
+        timeout: Optional[float] = None,
+    ) -> dict[str, Any]:
+        """Send a command to the target; see CDPConnection.send."""
+        return await self.connection.send(method, params, self.session_id, timeout)
+
+    def expect_event(self, method: str) -> asyncio.Future:
+        """Register for the next occurrence of an event of the target."""
+        return self.connection.expect_event(method, self.session_id)
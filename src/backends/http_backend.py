@@ -2,6 +2,7 @@
 
 import asyncio  # Added asyncio for TimeoutError
 import logging
+import time
 from dataclasses import dataclass
 from typing import TYPE_CHECKING, Any, Optional
 
@@ -14,6 +15,7 @@ from aiohttp import (
 # Import CrawlerConfig from crawler conditionally for type hinting
 if TYPE_CHECKING:
     from ..crawler import CrawlerConfig
+from ..utils.tracing import aiohttp_trace_config, tracer
 from ..utils.url import URLInfo  # Import URLInfo
 from .base import CrawlerBackend, CrawlResult
 
@@ -74,6 +76,8 @@ class HTTPBackend(CrawlerBackend):
                 self.session = aiohttp.ClientSession(
                     timeout=aiohttp.ClientTimeout(total=current_config.timeout),
                     headers=headers_to_use,
+                    # Break requests down into DNS, connect and wait spans
+                    trace_configs=[aiohttp_trace_config()] if tracer.enabled else None,
                 )
 
             async with self.session.get(
@@ -84,7 +88,12 @@ class HTTPBackend(CrawlerBackend):
                 allow_redirects=current_config.follow_redirects,  # Use current_config
                 params=params,
             ) as response:
+                # Read the body first so decoding it can be timed on its own;
+                # text() decodes the already read body
+                await response.read()
+                decode_start = time.perf_counter()
                 content = await response.text()
+                decode_time = time.perf_counter() - decode_start
                 # The URL in CrawlResult should be the final URL after redirects
                 final_url = str(response.url)
                 return CrawlResult(
@@ -94,6 +103,7 @@ class HTTPBackend(CrawlerBackend):
                         "status": response.status,
                         "headers": dict(response.headers),
                         "content_type": response.headers.get("content-type", ""),
+                        "decode_time": decode_time,
                     },
                     status=response.status,
                 )
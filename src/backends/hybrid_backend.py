@@ -0,0 +1,321 @@
+"""
+Hybrid backend fetching over HTTP and rendering with a browser only when needed.
+
+Most documentation pages are static HTML, but sites built as single page
+applications serve an empty shell that JavaScript fills in. The hybrid
+backend fetches every page with the HTTP backend first and inspects the
+HTML: an empty framework mount point, a framework bootstrap marker with
+hardly any text, or a tiny text-to-markup ratio mark a client-rendered
+shell, which is then fetched again through a browser backend.
+
+Outcomes are remembered per path prefix (host plus leading directories).
+Once a prefix has produced the same outcome several times in a row, its
+pages go straight to the browser, or stay on HTTP without further checks.
+"""
+
+import logging
+import re
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+from pydantic import BaseModel
+
+from ..utils.url import URLInfo
+from .base import CrawlerBackend, CrawlResult
+from .http_backend import HTTPBackend, HTTPBackendConfig
+
+logger = logging.getLogger(__name__)
+
+_HIDDEN_RE = re.compile(
+    r"<(script|style|noscript|template)\b[^>]*>.*?</\1\s*>", re.IGNORECASE | re.DOTALL
+)
+_TAG_RE = re.compile(r"<[^>]*>")
+# Framework mount points left empty for client-side rendering
+_EMPTY_MOUNT_RE = re.compile(
+    r"<div\b[^>]*\bid\s*=\s*[\"']?(?:root|app|__next|__nuxt|___gatsby|svelte)"
+    r"[\"']?[^>]*>\s*(?:<!--.*?-->\s*)*</div>"
+    r"|<(app-root)\b[^>]*>\s*</\1>",
+    re.IGNORECASE | re.DOTALL,
+)
+# Markers of pages that boot a framework in the browser
+_BOOTSTRAP_RE = re.compile(
+    r"<noscript\b[^>]*>[^<]*(?:enable|requires?)\s+javascript"
+    r"|\bid\s*=\s*[\"']__NEXT_DATA__"
+    r"|window\.__(?:NUXT|INITIAL_STATE|APOLLO_STATE|PRELOADED_STATE)__"
+    r"|\bng-app\b",
+    re.IGNORECASE,
+)
+
+RENDER_HTTP = "http"
+RENDER_BROWSER = "browser"
+
+
+class HybridConfig(BaseModel):
+    """Configuration for the hybrid backend."""
+
+    # Pages with less visible text (in characters) may be shells
+    min_text_length: int = 200
+    # Visible text characters per character of HTML below which a page with
+    # little text is a shell
+    min_text_ratio: float = 0.05
+    # Leading directories of the URL path forming the remembered prefix
+    prefix_depth: int = 2
+    # Consecutive equal outcomes after which a prefix's decision is kept
+    remember_after: int = 3
+    # Factor by which the rendered text must exceed the fetched text for an
+    # escalation to count as JavaScript rendering
+    min_render_gain: float = 1.5
+
+
+def visible_text_length(html: str) -> int:
+    """
+    Count the visible text characters of an HTML document.
+
+    Args:
+        html: HTML source
+
+    Returns:
+        Number of non-whitespace characters outside tags, scripts and styles
+    """
+    text = _TAG_RE.sub(" ", _HIDDEN_RE.sub(" ", html))
+    return len("".join(text.split()))
+
+
+def detect_client_rendered(
+    html: str, min_text_length: int = 200, min_text_ratio: float = 0.05
+) -> Optional[str]:
+    """
+    Detect an HTML document that needs JavaScript to show its content.
+
+    Args:
+        html: HTML source as served over HTTP
+        min_text_length: Visible text length below which a page may be a shell
+        min_text_ratio: Text-to-markup ratio below which a page may be a shell
+
+    Returns:
+        Reason the page looks client-rendered, or None if it looks static
+    """
+    text_length = visible_text_length(html)
+    ratio = text_length / max(len(html), 1)
+    if text_length >= min_text_length and ratio >= min_text_ratio:
+        return None
+    if _EMPTY_MOUNT_RE.search(html):
+        return "empty_mount_point"
+    if text_length < min_text_length:
+        if _BOOTSTRAP_RE.search(html):
+            return "framework_bootstrap"
+        if ratio < min_text_ratio:
+            return "low_text_ratio"
+    return None
+
+
+def path_prefix(url: str, depth: int) -> str:
+    """
+    Get the remembered prefix of a URL.
+
+    Args:
+        url: Page URL
+        depth: Maximum number of leading directories
+
+    Returns:
+        Host and up to depth leading directories, e.g. "docs.example.com/api/"
+    """
+    parsed = urlparse(url)
+    directories = parsed.path.split("/")[1:-1]
+    prefix = "/".join(directories[:depth])
+    return f"{parsed.netloc}/{prefix}/" if prefix else f"{parsed.netloc}/"
+
+
+class _PrefixMemory:
+    """Streak of equal outcomes of one path prefix."""
+
+    __slots__ = ("outcome", "streak")
+
+    def __init__(self):
+        self.outcome: Optional[str] = None
+        self.streak = 0
+
+    def record(self, outcome: str) -> None:
+        if outcome == self.outcome:
+            self.streak += 1
+        else:
+            self.outcome = outcome
+            self.streak = 1
+
+
+class HybridBackend(CrawlerBackend):
+    """Backend fetching over HTTP and escalating client-rendered pages to a browser."""
+
+    def __init__(
+        self,
+        http_backend: Optional[CrawlerBackend] = None,
+        browser_backend: Optional[CrawlerBackend] = None,
+        config: Optional[HybridConfig] = None,
+    ):
+        """
+        Initialize the hybrid backend.
+
+        Args:
+            http_backend: Backend for plain fetches (defaults to HTTPBackend)
+            browser_backend: Backend rendering JavaScript (defaults to a
+                LightpandaBackend created on the first escalation)
+            config: Detection and memory settings
+        """
+        super().__init__(name="hybrid")
+        self.config = config or HybridConfig()
+        self.http_backend = http_backend or HTTPBackend(HTTPBackendConfig())
+        self.browser_backend = browser_backend
+        self._prefixes: dict[str, _PrefixMemory] = {}
+        self.render_stats = {
+            "http": 0,
+            "escalated": 0,
+            "browser_direct": 0,
+            "false_escalations": 0,
+        }
+
+    def decision_for(self, url: str) -> Optional[str]:
+        """
+        Get the remembered rendering decision for a URL.
+
+        Args:
+            url: Page URL
+
+        Returns:
+            RENDER_HTTP or RENDER_BROWSER once the URL's prefix has a
+            decision, otherwise None
+        """
+        memory = self._prefixes.get(path_prefix(url, self.config.prefix_depth))
+        if memory and memory.streak >= self.config.remember_after:
+            return memory.outcome
+        return None
+
+    def get_prefix_decisions(self) -> dict[str, str]:
+        """Get the remembered decision of every decided path prefix."""
+        return {
+            prefix: memory.outcome
+            for prefix, memory in self._prefixes.items()
+            if memory.streak >= self.config.remember_after
+        }
+
+    async def crawl(self, url_info: URLInfo, config=None) -> CrawlResult:
+        """
+        Crawl a URL over HTTP, rendering it in a browser if it is a shell.
+
+        Args:
+            url_info: URLInfo object representing the URL to crawl
+            config: Optional crawler configuration
+
+        Returns:
+            CrawlResult of the HTTP fetch or of the browser render
+        """
+        url = url_info.normalized_url
+        decision = self.decision_for(url)
+
+        reason = None
+        if decision == RENDER_BROWSER:
+            result = await self._render(url_info, config)
+            if result is not None:
+                self.render_stats["browser_direct"] += 1
+                return self._annotate(result, RENDER_BROWSER, "remembered")
+            reason = "browser_failed"
+        elif decision == RENDER_HTTP:
+            reason = "remembered"
+
+        result = await self.http_backend.crawl(url_info, config)
+        if decision is not None or not self._is_html(result):
+            self.render_stats["http"] += 1
+            return self._annotate(result, RENDER_HTTP, reason)
+
+        html = result.content["html"]
+        reason = detect_client_rendered(
+            html, self.config.min_text_length, self.config.min_text_ratio
+        )
+        if reason is None:
+            self._remember(url, RENDER_HTTP)
+            self.render_stats["http"] += 1
+            return self._annotate(result, RENDER_HTTP, None)
+
+        logger.debug(f"Rendering {url} in a browser: {reason}")
+        rendered = await self._render(url_info, config)
+        if rendered is None:
+            self.render_stats["http"] += 1
+            return self._annotate(result, RENDER_HTTP, reason)
+
+        self.render_stats["escalated"] += 1
+        rendered_length = visible_text_length(rendered.content["html"])
+        fetched_length = max(visible_text_length(html), 1)
+        if rendered_length >= self.config.min_render_gain * fetched_length:
+            self._remember(url, RENDER_BROWSER)
+        else:
+            # The browser found no more text; the page was static after all
+            self.render_stats["false_escalations"] += 1
+            self._remember(url, RENDER_HTTP)
+        return self._annotate(rendered, RENDER_BROWSER, reason)
+
+    async def validate(self, content: CrawlResult) -> bool:
+        """Validate the crawled content."""
+        return bool(content and content.is_success() and content.content.get("html"))
+
+    async def process(self, content: CrawlResult) -> dict[str, Any]:
+        """Process the crawled content."""
+        if not await self.validate(content):
+            return {}
+
+        return {
+            "url": content.url,
+            "html": content.content["html"],
+            "metadata": content.metadata,
+        }
+
+    async def close(self) -> None:
+        """Close the HTTP and browser backends."""
+        await self.http_backend.close()
+        if self.browser_backend is not None:
+            await self.browser_backend.close()
+
+    async def _render(self, url_info: URLInfo, config: Any) -> Optional[CrawlResult]:
+        """Fetch a URL through the browser backend, None if that fails."""
+        if self.browser_backend is None:
+            from .lightpanda_backend import LightpandaBackend
+
+            self.browser_backend = LightpandaBackend()
+        try:
+            result = await self.browser_backend.crawl(url_info, config)
+        except Exception as e:
+            logger.warning(
+                f"Browser rendering of {url_info.normalized_url} failed: {e}"
+            )
+            return None
+        if not self._is_html(result):
+            logger.warning(
+                f"Browser rendering of {url_info.normalized_url} failed: "
+                f"{result.error or result.status}"
+            )
+            return None
+        return result
+
+    def _remember(self, url: str, outcome: str) -> None:
+        prefix = path_prefix(url, self.config.prefix_depth)
+        memory = self._prefixes.get(prefix)
+        if memory is None:
+            memory = self._prefixes[prefix] = _PrefixMemory()
+        memory.record(outcome)
+        if memory.streak == self.config.remember_after:
+            logger.info(f"Using {outcome} rendering for {prefix}")
+
+    @staticmethod
+    def _is_html(result: CrawlResult) -> bool:
+        """Check for a successful result with HTML content."""
+        if not result.is_success() or not result.content.get("html"):
+            return False
+        content_type = result.content_type or result.metadata.get("content_type", "")
+        return not content_type or "html" in content_type
+
+    @staticmethod
+    def _annotate(
+        result: CrawlResult, rendering: str, reason: Optional[str]
+    ) -> CrawlResult:
+        result.metadata["rendering"] = rendering
+        if reason:
+            result.metadata["render_reason"] = reason
+        return result
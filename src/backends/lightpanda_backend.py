@@ -4,13 +4,12 @@ This backend is optimized for JavaScript-heavy documentation sites.
 """
 
 import asyncio
-import json
 import logging
 import os
 import subprocess
 import time
 from typing import Any, Optional
-from urllib.parse import urljoin
+from urllib.parse import urljoin, urlparse
 
 import aiohttp
 from bs4 import BeautifulSoup
@@ -21,6 +20,7 @@ from ..utils.circuit_breaker import CircuitBreaker
 from ..utils.retry import ExponentialBackoff
 from ..utils.url import URLInfo
 from .base import CrawlerBackend, CrawlResult
+from .cdp import CDPConnection, CDPError
 
 logger = logging.getLogger(__name__)
 
@@ -51,6 +51,25 @@ class LightpandaConfig(BaseModel):
     extract_code_blocks: bool = True
     screenshots: bool = False
     screenshot_path: str = "screenshots"
+    # Browser processes to start, on consecutive ports from port; pages are
+    # spread over them
+    processes: int = 1
+    # Already running CDP endpoints (e.g. "http://127.0.0.1:9222") to use
+    # instead of starting processes
+    cdp_urls: list[str] = Field(default_factory=list)
+
+
+class _BrowserEndpoint:
+    """Browser serving CDP, with its connection and open target count."""
+
+    __slots__ = ("url", "process", "connection", "browser_context_id", "active")
+
+    def __init__(self, url: str, process: Optional[subprocess.Popen] = None):
+        self.url = url
+        self.process = process
+        self.connection: Optional[CDPConnection] = None
+        self.browser_context_id: Optional[str] = None
+        self.active = 0
 
 
 class LightpandaBackend(CrawlerBackend):
@@ -63,14 +82,14 @@ class LightpandaBackend(CrawlerBackend):
         """Initialize the Lightpanda backend."""
         super().__init__(name="lightpanda")
         self.config = config or LightpandaConfig()
-        self._process = None
-        self._ws_endpoint = None
+        self._browsers: list[_BrowserEndpoint] = []
         self._session = None
-        self._ws = None
-        self._browser_context_id = None
+        self._connect_lock = asyncio.Lock()
         self._processing_semaphore = asyncio.Semaphore(self.config.concurrent_requests)
         self._rate_limiter = asyncio.Lock()
         self._last_request = 0.0
+        # Next free request slot per host
+        self._request_slots: dict[str, float] = {}
         self._crawled_urls: set[str] = set()
         self.content_processor = ContentProcessor()
 
@@ -85,11 +104,8 @@ class LightpandaBackend(CrawlerBackend):
             reset_timeout=self.config.circuit_breaker_reset_timeout,
         )
 
-    async def _start_browser(self) -> str:
-        """Start the Lightpanda browser process and return the WebSocket endpoint."""
-        if self._process is not None:
-            return self._ws_endpoint
-
+    def _start_process(self, port: int) -> subprocess.Popen:
+        """Start a Lightpanda browser process serving CDP on a port."""
         # Check if executable exists
         if not os.path.exists(self.config.executable_path) and not self._is_in_path(
             self.config.executable_path
@@ -98,47 +114,42 @@ class LightpandaBackend(CrawlerBackend):
                 f"Lightpanda executable not found at {self.config.executable_path}"
             )
 
-        # Start Lightpanda process
         cmd = [
             self.config.executable_path,
             "serve",
             "--host",
             self.config.host,
             "--port",
-            str(self.config.port),
+            str(port),
         ]
         cmd.extend(self.config.extra_args)
 
         logger.info(f"Starting Lightpanda browser: {' '.join(cmd)}")
 
         # Start process with stdout/stderr redirection
-        self._process = subprocess.Popen(
+        return subprocess.Popen(
             cmd, stdout=subprocess.PIPE, stderr=subprocess.PIPE, text=True
         )
 
-        # Wait for browser to start
+    async def _get_ws_endpoint(self, endpoint: "_BrowserEndpoint") -> str:
+        """Wait for a browser to serve CDP and return its WebSocket endpoint."""
         for _ in range(10):  # Try 10 times with 0.5s delay
             try:
-                async with aiohttp.ClientSession() as session:
-                    async with session.get(
-                        f"http://{self.config.host}:{self.config.port}/json/version"
-                    ) as response:
-                        if response.status == 200:
-                            data = await response.json()
-                            self._ws_endpoint = data.get("webSocketDebuggerUrl")
-                            if self._ws_endpoint:
-                                logger.info(
-                                    f"Lightpanda started with WebSocket endpoint: {self._ws_endpoint}"
-                                )
-                                return self._ws_endpoint
+                async with self._session.get(
+                    f"{endpoint.url}/json/version"
+                ) as response:
+                    if response.status == 200:
+                        data = await response.json()
+                        ws_endpoint = data.get("webSocketDebuggerUrl")
+                        if ws_endpoint:
+                            logger.info(f"Lightpanda WebSocket endpoint: {ws_endpoint}")
+                            return ws_endpoint
             except aiohttp.ClientError:
                 pass
 
             await asyncio.sleep(0.5)
 
-        # If we get here, browser didn't start properly
-        self._cleanup_process()
-        raise RuntimeError("Failed to start Lightpanda browser")
+        raise RuntimeError(f"Failed to start Lightpanda browser at {endpoint.url}")
 
     def _is_in_path(self, executable: str) -> bool:
         """Check if the executable is in the system PATH."""
@@ -148,66 +159,181 @@ class LightpandaBackend(CrawlerBackend):
         )
 
     def _cleanup_process(self):
-        """Clean up the browser process."""
-        if self._process:
-            try:
-                self._process.terminate()
-                self._process.wait(timeout=5)
-            except subprocess.TimeoutExpired:
-                self._process.kill()
-            self._process = None
-
-    async def _wait_rate_limit(self):
-        """Enforce rate limiting between requests."""
-        async with self._rate_limiter:
-            now = time.time()
-            if self._last_request > 0:
-                elapsed = now - self._last_request
-                required_interval = 1.0 / self.config.rate_limit
-
-                if elapsed < required_interval:
-                    await asyncio.sleep(required_interval - elapsed)
+        """Clean up the browser processes."""
+        for endpoint in self._browsers:
+            if endpoint.process:
+                try:
+                    endpoint.process.terminate()
+                    endpoint.process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    endpoint.process.kill()
+                endpoint.process = None
+
+    async def _close_connections(self):
+        """Close the WebSocket connections to the browsers."""
+        for endpoint in self._browsers:
+            if endpoint.connection is not None:
+                try:
+                    await endpoint.connection.close()
+                except Exception as e:
+                    logger.error(f"Error closing WebSocket connection: {str(e)}")
+                endpoint.connection = None
+
+    async def _wait_rate_limit(self, host: str = ""):
+        """
+        Enforce rate limiting between requests to the same host.
 
-            self._last_request = time.time()
+        Requests reserve start slots under the lock and wait outside it, so
+        requests to other hosts are not held up.
 
-    async def _connect_browser(self):
-        """Connect to the browser via WebSocket."""
-        if self._session is not None:
+        Args:
+            host: Host the request goes to
+        """
+        if self.config.rate_limit <= 0:
             return
+        async with self._rate_limiter:
+            now = time.time()
+            slot = max(now, self._request_slots.get(host, 0.0))
+            self._request_slots[host] = slot + 1.0 / self.config.rate_limit
+            self._last_request = slot
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
-        ws_endpoint = await self._start_browser()
-        self._session = aiohttp.ClientSession()
-        self._ws = await self._session.ws_connect(ws_endpoint)
-
-        # Create a browser context
-        context_response = await self._send_command("Target.createBrowserContext")
-        self._browser_context_id = context_response.get("browserContextId")
+    async def _connect_browser(self):
+        """Start or reconnect the browsers and open a browser context in each."""
+        async with self._connect_lock:
+            if self._session is None:
+                self._session = aiohttp.ClientSession()
+
+            if not self._browsers:
+                if self.config.cdp_urls:
+                    self._browsers = [
+                        _BrowserEndpoint(url.rstrip("/"))
+                        for url in self.config.cdp_urls
+                    ]
+                else:
+                    for index in range(max(1, self.config.processes)):
+                        port = self.config.port + index
+                        self._browsers.append(
+                            _BrowserEndpoint(
+                                f"http://{self.config.host}:{port}",
+                                self._start_process(port),
+                            )
+                        )
 
-    async def _send_command(
-        self, method: str, params: dict[str, Any] = None
-    ) -> dict[str, Any]:
-        """Send a command to the browser and wait for the response."""
-        if self._ws is None:
+            for endpoint in self._browsers:
+                if endpoint.connection is not None and not endpoint.connection.closed:
+                    continue
+                try:
+                    ws_endpoint = await self._get_ws_endpoint(endpoint)
+                except RuntimeError:
+                    await self._close_connections()
+                    self._cleanup_process()
+                    self._browsers = []
+                    raise
+                # Rendered pages can exceed the default 4 MB message limit
+                ws = await self._session.ws_connect(ws_endpoint, max_msg_size=0)
+                endpoint.connection = CDPConnection(ws, timeout=self.config.timeout)
+                context_response = await endpoint.connection.send(
+                    "Target.createBrowserContext"
+                )
+                endpoint.browser_context_id = context_response.get("browserContextId")
+
+    def _pick_browser(self) -> "_BrowserEndpoint":
+        """Choose the connected browser with the fewest open targets."""
+        connected = [
+            endpoint
+            for endpoint in self._browsers
+            if endpoint.connection is not None and not endpoint.connection.closed
+        ]
+        if not connected:
             raise RuntimeError("WebSocket connection not established")
+        return min(connected, key=lambda endpoint: endpoint.active)
+
+    async def _render(
+        self, endpoint: "_BrowserEndpoint", url: str
+    ) -> tuple[str, Optional[str]]:
+        """Render a URL in a new target of a browser; return HTML and screenshot."""
+        connection = endpoint.connection
+        target = await connection.send(
+            "Target.createTarget",
+            {"url": "about:blank", "browserContextId": endpoint.browser_context_id},
+        )
+        target_id = target.get("targetId")
+        try:
+            session = await connection.create_session(target_id)
+
+            # Independent setup commands are in flight together
+            setup = await asyncio.gather(
+                session.send("Page.enable"),
+                session.send(
+                    "Emulation.setDeviceMetricsOverride",
+                    {
+                        "width": self.config.viewport_width,
+                        "height": self.config.viewport_height,
+                        "deviceScaleFactor": 1,
+                        "mobile": False,
+                    },
+                ),
+                session.send(
+                    "Network.setUserAgentOverride",
+                    {"userAgent": self.config.user_agent},
+                ),
+                return_exceptions=True,
+            )
+            for error in setup:
+                if isinstance(error, Exception):
+                    logger.debug(f"Target setup command failed for {url}: {error}")
+
+            loaded = session.expect_event("Page.loadEventFired")
+            navigation = await session.send("Page.navigate", {"url": url})
+            if navigation.get("errorText"):
+                raise CDPError(f"Navigation failed: {navigation['errorText']}")
+            try:
+                await connection.wait_event(loaded, self.config.timeout)
+            except asyncio.TimeoutError:
+                logger.debug(f"No load event for {url}, reading content anyway")
+
+            # Give scripts time to render after the load event
+            if self.config.wait_for_load and self.config.wait_time > 0:
+                await asyncio.sleep(self.config.wait_time)
+
+            content_response = await session.send(
+                "Runtime.evaluate",
+                {
+                    "expression": "document.documentElement.outerHTML",
+                    "returnByValue": True,
+                },
+            )
+            html_content = content_response.get("result", {}).get("value", "")
+
+            # Take screenshot if configured
+            screenshot = None
+            if self.config.screenshots:
+                os.makedirs(self.config.screenshot_path, exist_ok=True)
+                screenshot_response = await session.send(
+                    "Page.captureScreenshot",
+                    {"format": "png", "quality": 80, "fromSurface": True},
+                )
 
-        command_id = id(method) + id(params or {})
-        message = {"id": command_id, "method": method, "params": params or {}}
-
-        await self._ws.send_json(message)
+                if "data" in screenshot_response:
+                    import base64
 
-        # Wait for response with matching id
-        async for msg in self._ws:
-            if msg.type == aiohttp.WSMsgType.TEXT:
-                data = json.loads(msg.data)
-                if data.get("id") == command_id:
-                    if "error" in data:
-                        logger.error(
-                            f"Error executing command {method}: {data['error']}"
-                        )
-                        raise RuntimeError(f"Command error: {data['error']}")
-                    return data.get("result", {})
+                    screenshot_file = os.path.join(
+                        self.config.screenshot_path,
+                        f"{hash(url)}_{int(time.time())}.png",
+                    )
+                    with open(screenshot_file, "wb") as f:
+                        f.write(base64.b64decode(screenshot_response["data"]))
+                    screenshot = screenshot_file
 
-        raise RuntimeError(f"No response received for command {method}")
+            return html_content, screenshot
+        finally:
+            # Always close the page to avoid leaking resources
+            try:
+                await connection.send("Target.closeTarget", {"targetId": target_id})
+            except Exception as close_error:
+                logger.warning(f"Error closing target: {str(close_error)}")
 
     async def _navigate_with_retry(self, url: str) -> dict[str, Any]:
         """Navigate to a URL with retry logic and circuit breaker protection."""
@@ -222,106 +348,29 @@ class LightpandaBackend(CrawlerBackend):
                 "screenshot": None,
             }
 
-        await self._connect_browser()
-        await self._wait_rate_limit()
+        await self._wait_rate_limit(urlparse(url).netloc)
 
         for attempt in range(self.config.max_retries + 1):
             try:
+                # Reconnects browsers whose connection was lost
+                await self._connect_browser()
                 async with self._processing_semaphore:
-                    # Create a new page
-                    create_target_response = await self._send_command(
-                        "Target.createTarget",
-                        {
-                            "url": "about:blank",
-                            "browserContextId": self._browser_context_id,
-                        },
-                    )
-                    target_id = create_target_response.get("targetId")
-
+                    endpoint = self._pick_browser()
+                    endpoint.active += 1
                     try:
-                        # Attach to the page
-                        await self._send_command(
-                            "Target.attachToTarget",
-                            {"targetId": target_id, "flatten": True},
-                        )
-
-                        # Set viewport size
-                        await self._send_command(
-                            "Emulation.setDeviceMetricsOverride",
-                            {
-                                "width": self.config.viewport_width,
-                                "height": self.config.viewport_height,
-                                "deviceScaleFactor": 1,
-                                "mobile": False,
-                            },
-                        )
-
-                        # Set user agent
-                        await self._send_command(
-                            "Network.setUserAgentOverride",
-                            {"userAgent": self.config.user_agent},
-                        )
-
-                        # Navigate to URL
-                        await self._send_command("Page.navigate", {"url": url})
-
-                        # Wait for page to load
-                        if self.config.wait_for_load:
-                            await asyncio.sleep(self.config.wait_time)
-
-                        # Get page content
-                        content_response = await self._send_command(
-                            "Runtime.evaluate",
-                            {
-                                "expression": "document.documentElement.outerHTML",
-                                "returnByValue": True,
-                            },
-                        )
-
-                        html_content = content_response.get("result", {}).get(
-                            "value", ""
-                        )
+                        html_content, screenshot = await self._render(endpoint, url)
+                    finally:
+                        endpoint.active -= 1
 
-                        # Take screenshot if configured
-                        screenshot = None
-                        if self.config.screenshots:
-                            os.makedirs(self.config.screenshot_path, exist_ok=True)
-                            screenshot_response = await self._send_command(
-                                "Page.captureScreenshot",
-                                {"format": "png", "quality": 80, "fromSurface": True},
-                            )
+                # Record success in circuit breaker
+                self.circuit_breaker.record_success()
 
-                            if "data" in screenshot_response:
-                                import base64
-
-                                screenshot_file = os.path.join(
-                                    self.config.screenshot_path,
-                                    f"{hash(url)}_{int(time.time())}.png",
-                                )
-                                with open(screenshot_file, "wb") as f:
-                                    f.write(
-                                        base64.b64decode(screenshot_response["data"])
-                                    )
-                                screenshot = screenshot_file
-
-                        # Record success in circuit breaker
-                        self.circuit_breaker.record_success()
-
-                        return {
-                            "success": True,
-                            "status": 200,
-                            "content": html_content,
-                            "screenshot": screenshot,
-                            "target_id": target_id,
-                        }
-                    finally:
-                        # Always close the page to avoid leaking resources
-                        try:
-                            await self._send_command(
-                                "Target.closeTarget", {"targetId": target_id}
-                            )
-                        except Exception as close_error:
-                            logger.warning(f"Error closing target: {str(close_error)}")
+                return {
+                    "success": True,
+                    "status": 200,
+                    "content": html_content,
+                    "screenshot": screenshot,
+                }
             except Exception as e:
                 # Record failure in circuit breaker
                 self.circuit_breaker.record_failure()
@@ -507,13 +556,8 @@ class LightpandaBackend(CrawlerBackend):
         """Clean up resources."""
         logger.info("Closing Lightpanda backend resources")
 
-        # Close WebSocket connection
-        if hasattr(self, "_ws") and self._ws:
-            try:
-                await self._ws.close()
-            except Exception as e:
-                logger.error(f"Error closing WebSocket connection: {str(e)}")
-            self._ws = None
+        # Close WebSocket connections
+        await self._close_connections()
 
         # Close HTTP session
         if self._session:
@@ -523,12 +567,13 @@ class LightpandaBackend(CrawlerBackend):
                 logger.error(f"Error closing HTTP session: {str(e)}")
             self._session = None
 
-        # Clean up browser process
+        # Clean up browser processes
         self._cleanup_process()
 
         # Reset state
-        self._browser_context_id = None
+        self._browsers = []
         self._crawled_urls.clear()
         self._last_request = 0.0
+        self._request_slots.clear()
 
         logger.info("Lightpanda backend resources closed")
@@ -5,9 +5,12 @@ This backend provides full browser automation capabilities for JavaScript-heavy
 
 import asyncio
 import logging
+import math
 import os
 import time
+from collections.abc import Awaitable, Callable
 from typing import Any, Optional
+from urllib.parse import urlparse
 
 from bs4 import BeautifulSoup
 from pydantic import BaseModel, Field
@@ -38,6 +41,26 @@ except ImportError:
 
 logger = logging.getLogger(__name__)
 
+# Analytics, advertising and session recording hosts never needed for content
+TRACKER_HOSTS = [
+    "google-analytics.com",
+    "googletagmanager.com",
+    "doubleclick.net",
+    "googlesyndication.com",
+    "connect.facebook.net",
+    "hotjar.com",
+    "segment.io",
+    "segment.com",
+    "mixpanel.com",
+    "amplitude.com",
+    "fullstory.com",
+    "clarity.ms",
+    "plausible.io",
+    "newrelic.com",
+    "nr-data.net",
+    "sentry.io",
+]
+
 
 class PlaywrightConfig(BaseModel):
     """Configuration for the Playwright backend."""
@@ -66,6 +89,139 @@ class PlaywrightConfig(BaseModel):
     extract_images: bool = True
     extract_metadata: bool = True
     extract_code_blocks: bool = True
+    # Pages are pooled across up to this many browser contexts
+    browser_contexts: int = 1
+    # Concurrent pages per context; defaults to concurrent_requests spread
+    # over the contexts
+    pages_per_context: Optional[int] = None
+    # Navigations after which a pooled page is closed and replaced
+    max_page_uses: int = 50
+    # Request interception; resource types as reported by Playwright
+    blocked_resource_types: list[str] = Field(
+        default_factory=lambda: ["image", "media", "font"]
+    )
+    blocked_hosts: list[str] = Field(default_factory=lambda: list(TRACKER_HOSTS))
+    # Also block subresources from other sites than the page's (may break
+    # sites loading their scripts from a CDN)
+    block_third_party: bool = False
+
+
+def _site(host: str) -> str:
+    """Approximate the registrable domain of a host by its last two labels."""
+    return ".".join(host.split(".")[-2:])
+
+
+class _ContextSlot:
+    """Browser context of a page pool with its idle pages."""
+
+    __slots__ = ("context", "idle", "active")
+
+    def __init__(self, context: Any):
+        self.context = context
+        self.idle: list[Any] = []
+        self.active = 0
+
+
+class _PagePool:
+    """Reusable pages spread over a bounded number of browser contexts."""
+
+    def __init__(
+        self,
+        first_context: Any,
+        new_context: Callable[[], Awaitable[Any]],
+        max_contexts: int,
+        pages_per_context: int,
+        max_page_uses: int,
+    ):
+        """
+        Initialize the pool.
+
+        Args:
+            first_context: Context to start with
+            new_context: Creates a further context when all are busy
+            max_contexts: Maximum number of contexts
+            pages_per_context: Maximum number of concurrently used pages per
+                context
+            max_page_uses: Navigations after which a page is replaced
+        """
+        self._slots = [_ContextSlot(first_context)]
+        self._new_context = new_context
+        self.max_contexts = max(1, max_contexts)
+        self.pages_per_context = max(1, pages_per_context)
+        self.max_page_uses = max_page_uses
+        self._condition = asyncio.Condition()
+        self._owners: dict[Any, _ContextSlot] = {}
+        self._uses: dict[Any, int] = {}
+
+    async def acquire(self) -> Any:
+        """Get an idle page, waiting while every context is at capacity."""
+        async with self._condition:
+            while True:
+                slot = min(self._slots, key=lambda s: s.active)
+                if slot.active and len(self._slots) < self.max_contexts:
+                    # Spread concurrent pages over separate contexts
+                    slot = _ContextSlot(await self._new_context())
+                    self._slots.append(slot)
+                if slot.active < self.pages_per_context:
+                    break
+                await self._condition.wait()
+            slot.active += 1
+            page = slot.idle.pop() if slot.idle else None
+
+        if page is None:
+            try:
+                page = await slot.context.new_page()
+            except BaseException:
+                await self._release_slot(slot)
+                raise
+            self._owners[page] = slot
+            self._uses[page] = 0
+        self._uses[page] += 1
+        return page
+
+    async def release(self, page: Any, reusable: bool = True) -> None:
+        """
+        Return a page to the pool.
+
+        Args:
+            page: Page from acquire
+            reusable: False to close the page, e.g. after a failed navigation
+        """
+        slot = self._owners.get(page)
+        if slot is None:
+            return
+        if reusable and self._uses[page] < self.max_page_uses:
+            slot.idle.append(page)
+        else:
+            del self._owners[page]
+            del self._uses[page]
+            try:
+                await page.close()
+            except Exception as e:
+                logger.debug(f"Error closing page: {e}")
+        await self._release_slot(slot)
+
+    async def close(self) -> None:
+        """Close all idle pages and the contexts created by the pool."""
+        for index, slot in enumerate(self._slots):
+            for page in slot.idle:
+                try:
+                    await page.close()
+                except Exception as e:
+                    logger.debug(f"Error closing page: {e}")
+            slot.idle.clear()
+            if index:
+                try:
+                    await slot.context.close()
+                except Exception as e:
+                    logger.debug(f"Error closing browser context: {e}")
+        self._owners.clear()
+        self._uses.clear()
+
+    async def _release_slot(self, slot: _ContextSlot) -> None:
+        async with self._condition:
+            slot.active -= 1
+            self._condition.notify()
 
 
 class PlaywrightBackend(CrawlerBackend):
@@ -84,6 +240,10 @@ class PlaywrightBackend(CrawlerBackend):
         self._processing_semaphore = asyncio.Semaphore(self.config.concurrent_requests)
         self._rate_limiter = asyncio.Lock()
         self._last_request = 0.0
+        # Next free request slot per host
+        self._request_slots: dict[str, float] = {}
+        self._page_pool: Optional[_PagePool] = None
+        self.blocked_requests = 0
         self._crawled_urls = set()
         self.content_processor = ContentProcessor()
 
@@ -132,15 +292,8 @@ class PlaywrightBackend(CrawlerBackend):
                 ignore_https_errors=self.config.ignore_https_errors,
             )
 
-            # Create browser context
-            self._context = await self._browser.new_context(
-                viewport={
-                    "width": self.config.viewport_width,
-                    "height": self.config.viewport_height,
-                },
-                user_agent=self.config.user_agent,
-                extra_http_headers=self.config.extra_http_headers,
-            )
+            # Create the first browser context; the page pool adds more
+            self._context = await self._new_context()
 
             logger.info(f"Playwright {self.config.browser_type} browser launched")
         except Exception as e:
@@ -150,18 +303,89 @@ class PlaywrightBackend(CrawlerBackend):
                 self._playwright = None
             raise
 
-    async def _wait_rate_limit(self):
-        """Enforce rate limiting between requests."""
-        async with self._rate_limiter:
-            now = time.time()
-            if self._last_request > 0:
-                elapsed = now - self._last_request
-                required_interval = 1.0 / self.config.rate_limit
+    async def _new_context(self):
+        """Create a browser context with request interception installed."""
+        context = await self._browser.new_context(
+            viewport={
+                "width": self.config.viewport_width,
+                "height": self.config.viewport_height,
+            },
+            user_agent=self.config.user_agent,
+            extra_http_headers=self.config.extra_http_headers,
+        )
+        if (
+            self.config.blocked_resource_types
+            or self.config.blocked_hosts
+            or self.config.block_third_party
+        ):
+            await context.route("**/*", self._route_request)
+        return context
+
+    def _should_block(self, request) -> bool:
+        """Check whether a request is not needed to render the page's content."""
+        resource_type = request.resource_type
+        if resource_type == "document":
+            return False
+        if resource_type in self.config.blocked_resource_types:
+            return True
+        host = urlparse(request.url).hostname or ""
+        if any(
+            host == blocked or host.endswith("." + blocked)
+            for blocked in self.config.blocked_hosts
+        ):
+            return True
+        if self.config.block_third_party:
+            page_host = urlparse(request.frame.url).hostname
+            return bool(page_host) and _site(host) != _site(page_host)
+        return False
+
+    async def _route_request(self, route) -> None:
+        """Abort blocked requests and let the others continue."""
+        try:
+            blocked = self._should_block(route.request)
+        except Exception:
+            blocked = False
+        if blocked:
+            self.blocked_requests += 1
+            await route.abort()
+        else:
+            await route.continue_()
+
+    def _get_page_pool(self) -> _PagePool:
+        """Get the page pool, starting it from the current context."""
+        if self._page_pool is None:
+            contexts = max(1, self.config.browser_contexts)
+            pages_per_context = self.config.pages_per_context or math.ceil(
+                self.config.concurrent_requests / contexts
+            )
+            self._page_pool = _PagePool(
+                self._context,
+                self._new_context,
+                contexts,
+                pages_per_context,
+                self.config.max_page_uses,
+            )
+        return self._page_pool
 
-                if elapsed < required_interval:
-                    await asyncio.sleep(required_interval - elapsed)
+    async def _wait_rate_limit(self, host: str = ""):
+        """
+        Enforce rate limiting between requests to the same host.
 
-            self._last_request = time.time()
+        Requests reserve start slots under the lock and wait outside it, so
+        requests to other hosts are not held up.
+
+        Args:
+            host: Host the request goes to
+        """
+        if self.config.rate_limit <= 0:
+            return
+        async with self._rate_limiter:
+            now = time.time()
+            slot = max(now, self._request_slots.get(host, 0.0))
+            self._request_slots[host] = slot + 1.0 / self.config.rate_limit
+            self._last_request = slot
+        if slot > now:
+            await asyncio.sleep(slot - now)
 
     async def _navigate_with_retry(self, url: str) -> dict[str, Any]:
         """Navigate to a URL with retry logic and circuit breaker protection."""
@@ -177,13 +401,15 @@ class PlaywrightBackend(CrawlerBackend):
             }
 
         await self._ensure_browser()
-        await self._wait_rate_limit()
+        await self._wait_rate_limit(urlparse(url).netloc)
 
         for attempt in range(self.config.max_retries + 1):
             try:
                 async with self._processing_semaphore:
-                    # Create a new page
-                    page = await self._context.new_page()
+                    # Reuse a pooled page
+                    pool = self._get_page_pool()
+                    page = await pool.acquire()
+                    reusable = False
 
                     try:
                         # Navigate to URL
@@ -213,6 +439,7 @@ class PlaywrightBackend(CrawlerBackend):
 
                         # Record success in circuit breaker
                         self.circuit_breaker.record_success()
+                        reusable = True
 
                         return {
                             "success": True,
@@ -223,7 +450,8 @@ class PlaywrightBackend(CrawlerBackend):
                             "headers": dict(response.headers) if response else {},
                         }
                     finally:
-                        await page.close()
+                        # Pages of failed navigations may be in any state
+                        await pool.release(page, reusable)
             except Exception as e:
                 # Check if this is a timeout error when Playwright is available
                 is_timeout_error = (
@@ -433,6 +661,10 @@ class PlaywrightBackend(CrawlerBackend):
 
     async def close(self) -> None:
         """Clean up resources."""
+        if self._page_pool is not None:
+            await self._page_pool.close()
+            self._page_pool = None
+
         if self._browser:
             try:
                 await self._browser.close()
@@ -451,3 +683,4 @@ class PlaywrightBackend(CrawlerBackend):
         self._context = None
         self._crawled_urls.clear()
         self._last_request = 0.0
+        self._request_slots.clear()
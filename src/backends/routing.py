@@ -0,0 +1,261 @@
+"""
+Precompiled routing of URLs to registered backends.
+
+BackendSelector used to test every URL against the criteria of every
+registered backend. RoutingTable compiles the criteria once instead: routes
+are sorted by selection preference (priority, then backend number, then
+registration order) so the first matching route wins, they are indexed by
+scheme and by host, and the glob url_patterns of each route are translated
+into a single regular expression. The candidate routes of a (scheme,
+netloc) pair are resolved once and cached, as are selections that do not
+depend on the URL path.
+
+A table is immutable; BackendSelector builds a new one whenever its criteria
+change.
+"""
+
+import fnmatch
+import math
+import re
+from collections.abc import Container, Mapping
+from typing import Any, Optional
+from urllib.parse import urlparse
+
+# Content types for which any registered backend is better than none
+XML_FALLBACK_CONTENT_TYPES = frozenset(
+    {"application/xml", "application/xhtml+xml", "text/xml"}
+)
+
+
+def backend_number(name: str) -> float:
+    """
+    Get the tie-breaking number of a backend name.
+
+    Args:
+        name: Backend name
+
+    Returns:
+        N for names of the form "backendN", infinity otherwise
+    """
+    suffix = name[7:]
+    if name.startswith("backend") and suffix.isdigit():
+        return int(suffix)
+    return math.inf
+
+
+class Route:
+    """Compiled criteria of one backend."""
+
+    __slots__ = (
+        "name",
+        "priority",
+        "schemes",
+        "domains",
+        "paths",
+        "has_patterns",
+        "scheme_prefixes",
+        "pattern_regex",
+        "content_types",
+        "accepts_any_type",
+        "handles_html",
+    )
+
+    def __init__(self, name: str, criteria: Any):
+        """
+        Compile the criteria of a backend.
+
+        Args:
+            name: Backend name
+            criteria: BackendCriteria of the backend
+        """
+        self.name = name
+        self.priority = criteria.priority
+        self.schemes = frozenset(criteria.schemes or ())
+        self.domains = frozenset(criteria.domains or ())
+        self.paths = tuple(criteria.paths or ())
+
+        patterns = list(criteria.url_patterns or ())
+        self.has_patterns = bool(patterns)
+        # "https://" style patterns are plain prefix tests
+        self.scheme_prefixes = tuple(
+            pattern
+            for pattern in patterns
+            if pattern.endswith("://")
+            and not any(char in pattern[:-3] for char in "*?[]")
+        )
+        globs = [pattern for pattern in patterns if pattern not in self.scheme_prefixes]
+        self.pattern_regex = (
+            re.compile("|".join(fnmatch.translate(glob) for glob in globs))
+            if globs
+            else None
+        )
+
+        self.content_types = tuple(criteria.content_types or ())
+        self.accepts_any_type = not self.content_types or "*/*" in self.content_types
+        self.handles_html = "text/html" in self.content_types
+
+    def accepts_content_type(self, content_type: str) -> bool:
+        """Check whether the route handles a (non-empty) content type."""
+        if self.accepts_any_type or content_type in self.content_types:
+            return True
+        return any(
+            accepted.endswith("/*") and content_type.startswith(accepted[:-1])
+            for accepted in self.content_types
+        )
+
+    def matches_host(self, scheme: str, hostname: Optional[str]) -> bool:
+        """Check the scheme and domain criteria."""
+        if scheme and self.schemes and scheme not in self.schemes:
+            return False
+        return not self.domains or hostname in self.domains
+
+
+class _Candidate:
+    """Route that matches a host, with the checks left for each URL."""
+
+    __slots__ = ("route", "check_patterns", "url_dependent")
+
+    def __init__(self, route: Route, netloc: str):
+        self.route = route
+        # A glob pattern matching the netloc satisfies url_patterns for
+        # every URL of the host
+        self.check_patterns = route.has_patterns and not (
+            netloc
+            and route.pattern_regex is not None
+            and route.pattern_regex.match(netloc)
+        )
+        self.url_dependent = self.check_patterns or bool(route.paths)
+
+    def matches(self, url: str, path: str) -> bool:
+        """Check the path and url_patterns criteria."""
+        route = self.route
+        if route.paths and not path.startswith(route.paths):
+            return False
+        if not self.check_patterns:
+            return True
+        if url.startswith(route.scheme_prefixes):
+            return True
+        return route.pattern_regex is not None and bool(route.pattern_regex.match(url))
+
+
+class RoutingTable:
+    """Criteria of all backends compiled for fast URL routing."""
+
+    def __init__(self, criteria: Mapping[str, Any], max_cached_hosts: int = 4096):
+        """
+        Compile the criteria of all backends.
+
+        Args:
+            criteria: Backend name to BackendCriteria, in registration order
+            max_cached_hosts: Number of (scheme, netloc) pairs to cache before
+                the caches are cleared
+        """
+        compiled = [Route(name, c) for name, c in criteria.items()]
+        # Stable sort, so registration order breaks the remaining ties
+        self.routes: list[Route] = sorted(
+            compiled, key=lambda route: (-route.priority, backend_number(route.name))
+        )
+        self.max_cached_hosts = max_cached_hosts
+
+        # Indexes into self.routes, so merged candidates keep their order
+        self._any_scheme: set[int] = set()
+        self._by_scheme: dict[str, set[int]] = {}
+        self._any_host: set[int] = set()
+        self._by_host: dict[str, set[int]] = {}
+        for index, route in enumerate(self.routes):
+            if route.schemes:
+                for scheme in route.schemes:
+                    self._by_scheme.setdefault(scheme, set()).add(index)
+            else:
+                self._any_scheme.add(index)
+            if route.domains:
+                for domain in route.domains:
+                    self._by_host.setdefault(domain, set()).add(index)
+            else:
+                self._any_host.add(index)
+
+        self._candidates: dict[tuple[str, str], list[_Candidate]] = {}
+        self._decisions: dict[tuple[str, str, Optional[str]], Optional[str]] = {}
+
+    def select(
+        self,
+        url: str,
+        content_type: Optional[str] = None,
+        instantiated: Container[str] = (),
+    ) -> Optional[str]:
+        """
+        Select the backend for a URL.
+
+        The highest priority backend whose URL criteria match and which
+        handles the content type is chosen. Without a content type, backends
+        handling text/html are preferred. For XML content types that no
+        matching backend handles, the best instantiated backend is chosen.
+
+        Args:
+            url: URL to route
+            content_type: Optional content type of the URL
+            instantiated: Names of the backends that have instances
+
+        Returns:
+            Name of the selected backend, or None
+        """
+        parsed = urlparse(url)
+        key = (parsed.scheme, parsed.netloc, content_type)
+        if key in self._decisions:
+            return self._decisions[key]
+
+        url_dependent = False
+        selected = None
+        candidates = self._host_candidates(
+            parsed.scheme, parsed.netloc, parsed.hostname
+        )
+        for candidate in candidates:
+            route = candidate.route
+            if content_type:
+                if not route.accepts_content_type(content_type):
+                    continue
+            elif selected is not None and not route.handles_html:
+                # Already have a match; only an HTML handler can beat it
+                continue
+            url_dependent = url_dependent or candidate.url_dependent
+            if not candidate.matches(url, parsed.path):
+                continue
+            if content_type or route.handles_html:
+                selected = route.name
+                break
+            selected = route.name
+        else:
+            if selected is None and content_type in XML_FALLBACK_CONTENT_TYPES:
+                # Depends on the instances, which change without the criteria
+                for route in self.routes:
+                    if route.name in instantiated:
+                        return route.name
+                return None
+
+        if not url_dependent:
+            if len(self._decisions) >= self.max_cached_hosts:
+                self._decisions.clear()
+            self._decisions[key] = selected
+        return selected
+
+    def _host_candidates(
+        self, scheme: str, netloc: str, hostname: Optional[str]
+    ) -> list[_Candidate]:
+        """Get the routes matching the scheme and host, in preference order."""
+        key = (scheme, netloc)
+        candidates = self._candidates.get(key)
+        if candidates is None:
+            if scheme:
+                indexes = self._any_scheme | self._by_scheme.get(scheme, set())
+            else:
+                indexes = set(range(len(self.routes)))
+            indexes &= self._any_host | self._by_host.get(hostname, set())
+            candidates = [
+                _Candidate(self.routes[index], netloc)
+                for index in sorted(indexes)
+                if self.routes[index].matches_host(scheme, hostname)
+            ]
+            if len(self._candidates) >= self.max_cached_hosts:
+                self._candidates.clear()
+            self._candidates[key] = candidates
+        return candidates
@@ -8,6 +8,7 @@ from urllib.parse import urlparse
 from pydantic import BaseModel, field_validator
 
 from .base import CrawlerBackend
+from .routing import RoutingTable
 
 logger = logging.getLogger(__name__)  # Define logger for this module
 
@@ -37,6 +38,52 @@ class BackendCriteria(BaseModel):
         return v
 
 
+class _CriteriaRegistry(dict):
+    """Dictionary of backend criteria that counts its modifications."""
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.version = 0
+
+    def _modified(self) -> None:
+        self.version += 1
+
+    def __setitem__(self, key, value):
+        super().__setitem__(key, value)
+        self._modified()
+
+    def __delitem__(self, key):
+        super().__delitem__(key)
+        self._modified()
+
+    def pop(self, *args):
+        result = super().pop(*args)
+        self._modified()
+        return result
+
+    def popitem(self):
+        result = super().popitem()
+        self._modified()
+        return result
+
+    def setdefault(self, key, default=None):
+        result = super().setdefault(key, default)
+        self._modified()
+        return result
+
+    def update(self, *args, **kwargs):
+        super().update(*args, **kwargs)
+        self._modified()
+
+    def __ior__(self, other):
+        self.update(other)
+        return self
+
+    def clear(self):
+        super().clear()
+        self._modified()
+
+
 class BackendSelector:
     def __init__(self):
         self._backends: dict[str, type[CrawlerBackend]] = {}
@@ -46,6 +93,24 @@ class BackendSelector:
         self._initialized_backends = False
         self.performance_tracker = None  # Will be set externally
 
+    @property
+    def criteria(self) -> dict[str, Any]:
+        """Backend name to BackendCriteria, in registration order."""
+        return self._criteria
+
+    @criteria.setter
+    def criteria(self, value: dict[str, Any]) -> None:
+        self._criteria = _CriteriaRegistry(value)
+        self._routing: Optional[RoutingTable] = None
+
+    def _routing_table(self) -> RoutingTable:
+        """Get the routing table, recompiling it after criteria changes."""
+        version = self._criteria.version
+        if self._routing is None or self._routing_version != version:
+            self._routing = RoutingTable(self._criteria)
+            self._routing_version = version
+        return self._routing
+
     def select_backend_for_url(self, url: str, content_type: Optional[str] = None):
         """
         Select a backend instance matching the given URL and optional content type.
@@ -55,360 +120,18 @@ class BackendSelector:
         1. First try to find a backend that matches both the URL and content_type exactly
         2. If no exact match, find backends that match the URL and can handle any content type
         3. If none found, find a backend with the lowest priority as fallback
-        """
-        parsed = urlparse(url)
-        exact_matches = []
-        url_matches = []
-        fallback_backends = []
-
-        logger.debug(
-            f"Selecting backend for URL '{url}' with content_type '{content_type}'"
-        )
-        # Log all available criteria for debugging
-        # for n, c in getattr(self, "criteria", {}).items():
-        #     logger.debug(f"Available criteria for backend \'{n}\': schemes={c.schemes}, domains={c.domains}, paths={c.paths}, url_patterns={c.url_patterns}, content_types={c.content_types}")
 
-        for i, (name, criteria) in enumerate(getattr(self, "criteria", {}).items()):
-            url_match = True
-
-            if name == "mock_crawler":
-                logger.debug(
-                    f"MockCrawler START: url_match={url_match}, criteria_schemes={criteria.schemes}"
-                )  # DEBUG MOCK
-            if (
-                parsed.scheme
-                and criteria.schemes
-                and parsed.scheme not in criteria.schemes
-            ):
-                url_match = False
-                if name == "HTTPBackend":
-                    logger.debug(
-                        f"HTTPBackend: FAILED scheme check. parsed.scheme='{parsed.scheme}', criteria.schemes={criteria.schemes}"
-                    )
-                if name == "mock_crawler":
-                    logger.debug(
-                        f"MockCrawler: FAILED scheme check. parsed.scheme='{parsed.scheme}', criteria.schemes={criteria.schemes}"
-                    )  # DEBUG MOCK
-
-            if name == "mock_crawler":
-                logger.debug(
-                    f"MockCrawler AfterSchemeCheck: url_match={url_match}, criteria_domains={criteria.domains}"
-                )  # DEBUG MOCK
-            if (
-                url_match
-                and criteria.domains
-                and parsed.hostname not in criteria.domains
-            ):
-                url_match = False
-                if name == "HTTPBackend":
-                    logger.debug(
-                        f"HTTPBackend: FAILED domain check. parsed.hostname='{parsed.hostname}', criteria.domains={criteria.domains}"
-                    )
-                if name == "mock_crawler":
-                    logger.debug(
-                        f"MockCrawler: FAILED domain check. parsed.hostname='{parsed.hostname}', criteria.domains={criteria.domains}"
-                    )  # DEBUG MOCK
-
-            if name == "mock_crawler":
-                logger.debug(
-                    f"MockCrawler AfterDomainCheck: url_match={url_match}, criteria_paths={criteria.paths}"
-                )  # DEBUG MOCK
-            if (
-                url_match
-                and criteria.paths
-                and not any(parsed.path.startswith(p) for p in criteria.paths)
-            ):
-                url_match = False
-                if name == "HTTPBackend":
-                    logger.debug(
-                        f"HTTPBackend: FAILED path check. parsed.path='{parsed.path}', criteria.paths={criteria.paths}"
-                    )
-                if name == "mock_crawler":
-                    logger.debug(
-                        f"MockCrawler: FAILED path check. parsed.path='{parsed.path}', criteria.paths={criteria.paths}"
-                    )  # DEBUG MOCK
-
-            if name == "mock_crawler":
-                logger.debug(
-                    f"MockCrawler AfterPathCheck: url_match={url_match}, criteria_url_patterns={criteria.url_patterns}"
-                )  # DEBUG MOCK
-            if url_match and criteria.url_patterns:
-                pattern_matched_for_this_criterion = False
-                for pat_idx, pat in enumerate(criteria.url_patterns):
-                    is_simple_scheme_prefix = pat.endswith("://") and not any(
-                        glob_char in pat[:-3] for glob_char in "*?[]"
-                    )
-                    match_attempted = False
-                    current_pat_match = False
-
-                    if is_simple_scheme_prefix:
-                        match_attempted = True
-                        if url.startswith(pat):
-                            pattern_matched_for_this_criterion = True
-                            current_pat_match = True
-                            if name == "HTTPBackend":
-                                logger.debug(
-                                    f"HTTPBackend: Matched simple scheme prefix '{pat}' for url '{url}'"
-                                )
-                            if name == "mock_crawler":
-                                logger.debug(
-                                    f"MockCrawler: Matched simple scheme prefix '{pat}' for url '{url}'"
-                                )  # DEBUG MOCK
-                            break
-                    else:
-                        match_attempted = True
-                        if fnmatch.fnmatch(url, pat) or (
-                            parsed.netloc and fnmatch.fnmatch(parsed.netloc, pat)
-                        ):
-                            pattern_matched_for_this_criterion = True
-                            current_pat_match = True
-                            if name == "HTTPBackend":
-                                logger.debug(
-                                    f"HTTPBackend: Matched fnmatch pattern '{pat}' for url '{url}' or netloc '{parsed.netloc}'"
-                                )
-                            if name == "mock_crawler":
-                                logger.debug(
-                                    f"MockCrawler: Matched fnmatch pattern '{pat}' for url '{url}' or netloc '{parsed.netloc}'"
-                                )  # DEBUG MOCK
-                            break
-
-                    if name == "HTTPBackend" and match_attempted:
-                        logger.debug(
-                            f"HTTPBackend: Pattern '{pat}' (idx {pat_idx}, simple_scheme={is_simple_scheme_prefix}) did not match url '{url}'. current_pat_match={current_pat_match}"
-                        )
-                    if name == "mock_crawler" and match_attempted:  # DEBUG MOCK
-                        logger.debug(
-                            f"MockCrawler: Pattern '{pat}' (idx {pat_idx}, simple_scheme={is_simple_scheme_prefix}) did not match url '{url}'. current_pat_match={current_pat_match}"
-                        )
-
-                if not pattern_matched_for_this_criterion:
-                    url_match = False
-                    if name == "HTTPBackend":
-                        logger.debug(
-                            f"HTTPBackend: FAILED url_patterns check. No pattern in {criteria.url_patterns} matched url '{url}'"
-                        )
-                    if name == "mock_crawler":
-                        logger.debug(
-                            f"MockCrawler: FAILED url_patterns check. No pattern in {criteria.url_patterns} matched url '{url}'"
-                        )  # DEBUG MOCK
-
-            if name == "HTTPBackend":
-                logger.debug(
-                    f"HTTPBackend: Final pre-continue url_match state: {url_match} for url '{url}'"
-                )
-            if name == "mock_crawler":
-                logger.debug(
-                    f"MockCrawler: Final pre-continue url_match state: {url_match} for url '{url}'"
-                )  # DEBUG MOCK
-
-            if not url_match:
-                continue
-
-            # Check content type matching
-            content_type_matched = (
-                True  # Default to True if no content_type is specified
-            )
-
-            if content_type and criteria.content_types:
-                content_type_matched = False
-                for crit_ct in criteria.content_types:
-                    if crit_ct == content_type:
-                        content_type_matched = True
-                        break
-                    if crit_ct == "*/*":
-                        content_type_matched = True
-                        break
-                    # Handle 'type/*' by checking if content_type starts with 'type/'
-                    if crit_ct.endswith("/*") and content_type.startswith(crit_ct[:-1]):
-                        content_type_matched = True
-                        break
-
-            # Enhanced debugging
-            logger.debug(
-                f"Backend '{name}': content_type='{content_type}', content_type_matched={content_type_matched}, criteria.content_types={criteria.content_types}, exact_matches_len={len(exact_matches)}, url_matches_len={len(url_matches)}, fallback_backends_len={len(fallback_backends)}, criteria.paths={criteria.paths}, priority={criteria.priority}"
-            )
-
-            # Only add to url_matches if content_type matches or no content_type specified
-            if content_type is None or content_type_matched:
-                url_matches.append(
-                    (criteria.priority, name, i)
-                )  # Add index for debugging
-                logger.debug(
-                    f"Added backend '{name}' (index {i}) to url_matches based on URL match. Current url_matches: {url_matches}"
-                )
-
-                # Add to fallback_backends only if content_type matched or is not specified
-                fallback_backends.append(
-                    (criteria.priority, name, i)
-                )  # Add index for debugging
-                if name == "HTTPBackend":
-                    logger.debug(
-                        f"HTTPBackend: Added to fallback_backends. Current fallback_backends: {fallback_backends}"
-                    )
-                if name == "mock_crawler":
-                    logger.debug(
-                        f"MockCrawler: Added to fallback_backends. Current fallback_backends: {fallback_backends}"
-                    )  # DEBUG MOCK
-
-            # Add to exact_matches if both URL and content_type match
-            if content_type and content_type_matched:
-                exact_matches.append((criteria.priority, name))
-                logger.debug(
-                    f"Exact match found for backend '{name}' (priority {criteria.priority})"
-                )
-            elif not content_type:
-                if (
-                    criteria.content_types and "text/html" in criteria.content_types
-                ):  # Added criteria.content_types check
-                    exact_matches.append((criteria.priority, name))
-                    logger.debug(
-                        f"Selected HTML handler backend '{name}' (priority {criteria.priority}) for unknown content type"
-                    )
-
-        # Log final lists before selection
+        Criteria are compiled into a RoutingTable when first needed after a
+        change to self.criteria; re-register a backend after modifying its
+        criteria in place.
+        """
+        name = self._routing_table().select(url, content_type, self._backend_instances)
         logger.debug(
-            f"Final selection lists: exact_matches={exact_matches}, url_matches={url_matches}, fallback_backends={fallback_backends}"
+            f"Selected backend '{name}' for URL '{url}' with content_type '{content_type}'"
         )
-
-        if exact_matches:
-            # Sort by priority (highest first)
-            exact_matches.sort(key=lambda x: x[0], reverse=True)
-
-            # Get all backends with the highest priority
-            highest_priority = exact_matches[0][0]
-            highest_priority_backends = [
-                b for b in exact_matches if b[0] == highest_priority
-            ]
-
-            # Sort by backend number to ensure consistent selection (backend0 has precedence over backend1)
-            highest_priority_backends.sort(
-                key=lambda x: int(x[1].replace("backend", ""))
-                if x[1].startswith("backend") and x[1][7:].isdigit()
-                else float("inf")
-            )
-            best_match = highest_priority_backends[0]
-
-            logger.info(
-                f"Selected backend '{best_match[1]}' as exact match with priority {best_match[0]}"
-            )
-            return self._backend_instances.get(best_match[1])
-
-        # Use URL matches ordered by priority; for unknown content type apply HTML preference only when content_type is None
-        if url_matches:
-            # Sort by priority (highest first)
-            url_matches.sort(key=lambda x: x[0], reverse=True)
-
-            # Get all backends with the highest priority
-            highest_priority = url_matches[0][0]
-            highest_priority_matches = [
-                b for b in url_matches if b[0] == highest_priority
-            ]
-
-            if not content_type and highest_priority_matches:
-                # For equal priority, prefer HTML handlers when content_type is None
-                html_handlers = [
-                    match
-                    for match in highest_priority_matches
-                    if "text/html" in self.criteria[match[1]].content_types
-                ]
-                if html_handlers:
-                    # Sort by backend number to ensure consistent selection
-                    html_handlers.sort(
-                        key=lambda x: int(x[1].replace("backend", ""))
-                        if x[1].startswith("backend") and x[1][7:].isdigit()
-                        else float("inf")
-                    )
-                    best_match = html_handlers[0]
-                else:
-                    # Sort by backend number to ensure consistent selection
-                    highest_priority_matches.sort(
-                        key=lambda x: int(x[1].replace("backend", ""))
-                        if x[1].startswith("backend") and x[1][7:].isdigit()
-                        else float("inf")
-                    )
-                    best_match = highest_priority_matches[0]
-            else:
-                # Sort by backend number to ensure consistent selection
-                highest_priority_matches.sort(
-                    key=lambda x: int(x[1].replace("backend", ""))
-                    if x[1].startswith("backend") and x[1][7:].isdigit()
-                    else float("inf")
-                )
-                best_match = highest_priority_matches[0]
-
-            logger.info(
-                f"Selected backend '{best_match[1]}' with priority {best_match[0]}"
-            )
-            return self._backend_instances.get(best_match[1])
-
-        # If no exact or URL matches, try to use a fallback backend
-        if fallback_backends:
-            # Sort by priority (highest first) - ensure we're strictly sorting by priority
-            fallback_backends.sort(key=lambda x: x[0], reverse=True)
-
-            # Get the highest priority backend
-            highest_priority = fallback_backends[0][0]
-            highest_priority_backends = [
-                b for b in fallback_backends if b[0] == highest_priority
-            ]
-
-            # Sort by backend number to ensure consistent selection (backend0 has precedence over backend1)
-            highest_priority_backends.sort(
-                key=lambda x: int(x[1].replace("backend", ""))
-                if x[1].startswith("backend") and x[1][7:].isdigit()
-                else float("inf")
-            )
-            best_match = highest_priority_backends[0]
-
-            logger.info(
-                f"Selected fallback backend '{best_match[1]}' with priority {best_match[0]}"
-            )
-            return self._backend_instances.get(best_match[1])
-
-        # If no backend is found after all checks, try a final fallback to any available backend
-        # This handles cases where a specific content_type is requested but no backend supports it
-        # Only apply this fallback for common web content types to avoid breaking property tests
-        if content_type and content_type in [
-            "application/xml",
-            "application/xhtml+xml",
-            "text/xml",
-        ]:
-            logger.debug(
-                f"No backend found for content_type '{content_type}', trying final fallback for web content"
-            )
-            all_backends = []
-            for name, criteria in self.criteria.items():
-                if name in self._backend_instances:
-                    all_backends.append((criteria.priority, name))
-
-            if all_backends:
-                # Sort by priority (highest first)
-                all_backends.sort(key=lambda x: x[0], reverse=True)
-
-                # Get the highest priority backend
-                highest_priority = all_backends[0][0]
-                highest_priority_backends = [
-                    b for b in all_backends if b[0] == highest_priority
-                ]
-
-                # Sort by backend number to ensure consistent selection
-                highest_priority_backends.sort(
-                    key=lambda x: int(x[1].replace("backend", ""))
-                    if x[1].startswith("backend") and x[1][7:].isdigit()
-                    else float("inf")
-                )
-                best_match = highest_priority_backends[0]
-
-                logger.info(
-                    f"Selected final fallback backend '{best_match[1]}' with priority {best_match[0]} for unsupported web content_type '{content_type}'"
-                )
-                return self._backend_instances.get(best_match[1])
-
-        # If no backend is found after all checks, log and return None
-        logger.info(
-            f"No suitable backend found for URL '{url}' with content_type '{content_type}'"
-        )
-        return None
+        if name is None:
+            return None
+        return self._backend_instances.get(name)
 
     # Support both (name, backend_class) and (name, backend_instance, criteria)
     def register_backend(self, name: str, backend, criteria: "BackendCriteria" = None):
@@ -573,8 +296,8 @@ class BackendSelector:
                 domain = parsed.netloc
 
                 # Get performance-optimized backend recommendation
-                recommended_backend_name = (
-                    self.performance_tracker.get_best_backend_for_domain(domain)
+                recommended_backend_name = self.performance_tracker.select_backend(
+                    domain, list(self._backend_instances)
                 )
 
                 # Check if recommended backend is available
@@ -0,0 +1,248 @@
+"""
+Compression benchmarking module for comparing CompressedStorage formats.
+
+Compresses each page of a crawl independently, the way stored pages are
+compressed, and reports compression ratio and throughput for every format
+and preset. zstd is additionally measured with a dictionary trained on a
+sample of the pages; every variant is measured on the pages held out from
+that sample so the results are comparable.
+"""
+
+import argparse
+import logging
+import os
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Optional
+
+from pydantic import BaseModel
+
+from ..storage.compressed.storage import (
+    PRESET_LEVELS,
+    ZSTD_AVAILABLE,
+    CompressedStorage,
+    CompressionConfig,
+    CompressionFormat,
+    CompressionPreset,
+)
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_EXTENSIONS = (".md", ".html", ".htm", ".json", ".txt")
+
+
+class CompressionBenchmarkResult(BaseModel):
+    """Model for storing compression benchmark results."""
+
+    format: str
+    preset: str
+    level: int
+    dictionary: bool
+    documents: int
+    original_bytes: int
+    compressed_bytes: int
+    ratio: float
+    compress_mb_s: float
+    decompress_mb_s: float
+
+
+def load_crawl_pages(
+    directory: str,
+    extensions: Iterable[str] = DEFAULT_EXTENSIONS,
+    limit: Optional[int] = None,
+) -> list[bytes]:
+    """
+    Load the pages of a crawl output directory.
+
+    Args:
+        directory: Directory written by a crawl
+        extensions: File extensions to include
+        limit: Maximum number of pages to load
+
+    Returns:
+        Page contents in path order
+    """
+    extensions = tuple(extensions)
+    paths = []
+    for root, _, files in os.walk(directory):
+        for name in files:
+            if name.lower().endswith(extensions):
+                paths.append(os.path.join(root, name))
+    paths.sort()
+    if limit is not None:
+        paths = paths[:limit]
+
+    pages = []
+    for path in paths:
+        with open(path, "rb") as f:
+            pages.append(f.read())
+    return pages
+
+
+class CompressionBenchmark:
+    """
+    Benchmark CompressedStorage formats and presets on a set of pages.
+    """
+
+    def __init__(
+        self,
+        pages: list[bytes],
+        dictionary_sample_fraction: float = 0.2,
+        repeat: int = 3,
+    ):
+        """
+        Initialize the benchmark.
+
+        Args:
+            pages: Page contents, e.g. from load_crawl_pages
+            dictionary_sample_fraction: Fraction of pages used to train zstd
+                dictionaries; the remaining pages are measured
+            repeat: Timing repetitions; the fastest run is reported
+        """
+        if len(pages) < 2:
+            raise ValueError("At least two pages are needed for a benchmark")
+
+        sample_size = max(1, int(len(pages) * dictionary_sample_fraction))
+        self.sample_pages = pages[:sample_size]
+        self.test_pages = pages[sample_size:]
+        self.repeat = repeat
+        self.results: list[CompressionBenchmarkResult] = []
+
+    def run(
+        self,
+        formats: Optional[Iterable[CompressionFormat]] = None,
+        presets: Optional[Iterable[CompressionPreset]] = None,
+    ) -> list[CompressionBenchmarkResult]:
+        """
+        Run the benchmark.
+
+        Args:
+            formats: Formats to measure (defaults to every available format)
+            presets: Presets to measure (defaults to all presets)
+
+        Returns:
+            Results of this run
+        """
+        if formats is None:
+            formats = [
+                fmt
+                for fmt in CompressionFormat
+                if fmt != CompressionFormat.NONE
+                and (fmt != CompressionFormat.ZSTD or ZSTD_AVAILABLE)
+            ]
+        presets = list(presets or CompressionPreset)
+
+        results = []
+        for fmt in formats:
+            fmt = CompressionFormat(fmt)
+            for preset in presets:
+                storage = CompressedStorage(
+                    CompressionConfig(
+                        format=fmt, preset=preset, min_size_for_compression=0
+                    )
+                )
+                results.append(self._measure(storage, fmt, preset, dictionary=False))
+
+                if fmt == CompressionFormat.ZSTD:
+                    try:
+                        storage.train_dictionary(self.sample_pages)
+                    except Exception as e:
+                        logger.warning(f"Could not train zstd dictionary: {e}")
+                        continue
+                    results.append(self._measure(storage, fmt, preset, dictionary=True))
+
+        self.results.extend(results)
+        return results
+
+    def _measure(
+        self,
+        storage: CompressedStorage,
+        fmt: CompressionFormat,
+        preset: CompressionPreset,
+        dictionary: bool,
+    ) -> CompressionBenchmarkResult:
+        """Compress and decompress every test page with one configuration."""
+        original_bytes = sum(len(page) for page in self.test_pages)
+
+        compress_time = float("inf")
+        compressed: list[bytes] = []
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            compressed = [storage.compress_data(page)[0] for page in self.test_pages]
+            compress_time = min(compress_time, time.perf_counter() - start)
+
+        decompress_time = float("inf")
+        for _ in range(self.repeat):
+            start = time.perf_counter()
+            for data in compressed:
+                storage.decompress_data(data, format=fmt)
+            decompress_time = min(decompress_time, time.perf_counter() - start)
+
+        compressed_bytes = sum(len(data) for data in compressed)
+        megabytes = original_bytes / (1024 * 1024)
+
+        return CompressionBenchmarkResult(
+            format=fmt.value,
+            preset=preset.value,
+            level=PRESET_LEVELS[fmt.value][preset.value],
+            dictionary=dictionary,
+            documents=len(self.test_pages),
+            original_bytes=original_bytes,
+            compressed_bytes=compressed_bytes,
+            ratio=original_bytes / compressed_bytes if compressed_bytes else 0.0,
+            compress_mb_s=megabytes / compress_time if compress_time else 0.0,
+            decompress_mb_s=megabytes / decompress_time if decompress_time else 0.0,
+        )
+
+    def generate_report(self, output_file: Optional[str] = None) -> str:
+        """
+        Generate a benchmark report.
+
+        Args:
+            output_file: Optional file path to save the report
+
+        Returns:
+            Report as a string
+        """
+        if not self.results:
+            return "No benchmark results available."
+
+        report = "# Compression Benchmark Report\n\n"
+        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        report += f"Dictionary training pages: {len(self.sample_pages)}\n"
+        report += f"Measured pages: {len(self.test_pages)}\n\n"
+
+        report += "| Format | Preset | Level | Dictionary | Ratio | Compress MB/s | Decompress MB/s |\n"
+        report += "|---|---|---|---|---|---|---|\n"
+        for result in sorted(self.results, key=lambda r: r.ratio, reverse=True):
+            report += (
+                f"| {result.format} | {result.preset} | {result.level} "
+                f"| {'yes' if result.dictionary else 'no'} | {result.ratio:.2f} "
+                f"| {result.compress_mb_s:.1f} | {result.decompress_mb_s:.1f} |\n"
+            )
+
+        if output_file:
+            with open(output_file, "w") as f:
+                f.write(report)
+
+        return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run the compression benchmark on a crawl output directory."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("directory", help="Crawl output directory")
+    parser.add_argument("--limit", type=int, help="Maximum number of pages")
+    parser.add_argument("--output", help="File to save the Markdown report to")
+    parser.add_argument("--repeat", type=int, default=3, help="Timing repetitions")
+    args = parser.parse_args(argv)
+
+    pages = load_crawl_pages(args.directory, limit=args.limit)
+    benchmark = CompressionBenchmark(pages, repeat=args.repeat)
+    benchmark.run()
+    print(benchmark.generate_report(args.output))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,572 @@
+"""
+Offline crawl benchmark against a local synthetic documentation site.
+
+A FixtureSite serves generated documentation pages from an in-process
+aiohttp server. Backends reach it under a public-looking host name through
+a resolver that maps only that host to the server, so the URL checks of the
+crawler apply as usual and nothing leaves the machine. Every backend is
+measured with full Crawler.crawl runs at each concurrency level, and the
+results can be saved as a JSON baseline and compared against later runs.
+
+Peak RSS and CPU are measured for the whole process, which includes the
+fixture server.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import random
+import socket
+import sys
+import time
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+import aiohttp
+import psutil
+from aiohttp import web
+from aiohttp.abc import AbstractResolver
+from pydantic import BaseModel
+
+from ..backends.base import CrawlerBackend
+from ..backends.http_backend import HTTPBackend, HTTPBackendConfig
+from ..crawler.crawler import Crawler
+from ..crawler.models import CrawlConfig, CrawlTarget
+
+logger = logging.getLogger(__name__)
+
+# Host name the fixture site is served under
+FIXTURE_HOST = "docs.example.com"
+
+# Metrics compared against a baseline, and whether higher values are better
+BASELINE_METRICS = {
+    "pages_per_second": True,
+    "latency_p50_ms": False,
+    "latency_p95_ms": False,
+    "latency_p99_ms": False,
+    "peak_rss_mb": False,
+}
+
+_WORDS = (
+    "api function class method parameter returns example install configure "
+    "module package import request response client server option default "
+    "value error exception guide tutorial reference version release"
+).split()
+
+
+class FixtureSiteConfig(BaseModel):
+    """Shape of the synthetic documentation site."""
+
+    pages: int = 100
+    page_size: int = 4096  # approximate bytes of text per page
+    fan_out: int = 5  # links from each page to further pages
+    latency: float = 0.0  # seconds added to every response
+    latency_jitter: float = 0.0  # random extra seconds, up to this much
+    error_rate: float = 0.0  # fraction of pages answering 500
+    seed: int = 0
+
+
+class FixtureResolver(AbstractResolver):
+    """Resolves the fixture host to the local server and nothing else."""
+
+    async def resolve(
+        self, host: str, port: int = 0, family: int = socket.AF_INET
+    ) -> list[dict[str, Any]]:
+        if host != FIXTURE_HOST:
+            raise OSError(f"Offline benchmark cannot resolve {host}")
+        return [
+            {
+                "hostname": host,
+                "host": "127.0.0.1",
+                "port": port,
+                "family": socket.AF_INET,
+                "proto": 0,
+                "flags": socket.AI_NUMERICHOST,
+            }
+        ]
+
+    async def close(self) -> None:
+        pass
+
+
+class FixtureSite:
+    """Local aiohttp server for a synthetic documentation site."""
+
+    def __init__(self, config: Optional[FixtureSiteConfig] = None):
+        """
+        Initialize the site; call start (or use async with) to serve it.
+
+        Args:
+            config: Site shape; pages link to one another as a tree with
+                config.fan_out children per page, plus a link back to the
+                index page
+        """
+        self.config = config or FixtureSiteConfig()
+        rng = random.Random(self.config.seed)
+        # The index page never fails so every run can start
+        error_count = min(
+            int(self.config.pages * self.config.error_rate),
+            max(0, self.config.pages - 1),
+        )
+        self.error_pages = set(rng.sample(range(1, self.config.pages), error_count))
+        self.requests_served = 0
+        self.port: Optional[int] = None
+        self._rng = random.Random(self.config.seed)
+        self._runner: Optional[web.AppRunner] = None
+
+    async def __aenter__(self) -> "FixtureSite":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def base_url(self) -> str:
+        return f"http://{FIXTURE_HOST}:{self.port}"
+
+    @property
+    def start_url(self) -> str:
+        return self.base_url + self.page_path(0)
+
+    @property
+    def max_depth(self) -> int:
+        """Link depth needed to reach every page from the index."""
+        depth, reachable, level = 0, 1, 1
+        while reachable < self.config.pages:
+            level *= max(1, self.config.fan_out)
+            reachable += level
+            depth += 1
+        return depth
+
+    def page_path(self, number: int) -> str:
+        return f"/docs/page{number}.html"
+
+    def page_links(self, number: int) -> list[int]:
+        """Pages linked from a page."""
+        fan_out = self.config.fan_out
+        children = range(number * fan_out + 1, number * fan_out + fan_out + 1)
+        return [child for child in children if child < self.config.pages] + [0]
+
+    def render_page(self, number: int) -> str:
+        """Render a page deterministically from its number and the seed."""
+        rng = random.Random(f"{self.config.seed}:{number}")
+        paragraphs = []
+        size = 0
+        while size < self.config.page_size:
+            paragraph = " ".join(rng.choice(_WORDS) for _ in range(60))
+            paragraphs.append(f"<p>{paragraph}.</p>")
+            size += len(paragraph)
+        links = "".join(
+            f'<li><a href="{self.page_path(link)}">Page {link}</a></li>'
+            for link in self.page_links(number)
+        )
+        return (
+            f"<html><head><title>Page {number}</title></head><body>"
+            f"<nav><ul>{links}</ul></nav><main><h1>Page {number}</h1>"
+            f"<h2>Overview</h2>{''.join(paragraphs)}</main></body></html>"
+        )
+
+    async def _handle_page(self, request: web.Request) -> web.Response:
+        self.requests_served += 1
+        delay = self.config.latency + self._rng.uniform(0, self.config.latency_jitter)
+        if delay:
+            await asyncio.sleep(delay)
+
+        number = int(request.match_info["number"])
+        if not 0 <= number < self.config.pages:
+            raise web.HTTPNotFound()
+        if number in self.error_pages:
+            raise web.HTTPInternalServerError(text="Injected error")
+        return web.Response(text=self.render_page(number), content_type="text/html")
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        app = web.Application()
+        app.router.add_get("/docs/page{number:\\d+}.html", self._handle_page)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Fixture site with {self.config.pages} pages on port {self.port}")
+
+    async def close(self) -> None:
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    def client_session(self, **kwargs: Any) -> aiohttp.ClientSession:
+        """Create a client session that reaches the site and nothing else."""
+        return aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(resolver=FixtureResolver()), **kwargs
+        )
+
+
+def http_backend_factory(site: FixtureSite) -> CrawlerBackend:
+    """Create an HTTPBackend wired to the fixture site."""
+    backend = HTTPBackend(HTTPBackendConfig())
+    backend.session = site.client_session()
+    return backend
+
+
+# Backends benchmarked by default; other backends can be added with a
+# factory that points them at the fixture site
+DEFAULT_BACKENDS: dict[str, Callable[[FixtureSite], CrawlerBackend]] = {
+    "http": http_backend_factory,
+}
+
+
+class _TimedBackend:
+    """Backend proxy recording the latency of every fetch."""
+
+    def __init__(self, backend: CrawlerBackend):
+        self._backend = backend
+        self.latencies: list[float] = []
+
+    def __getattr__(self, name: str) -> Any:
+        return getattr(self._backend, name)
+
+    async def crawl(self, *args: Any, **kwargs: Any) -> Any:
+        start = time.perf_counter()
+        try:
+            return await self._backend.crawl(*args, **kwargs)
+        finally:
+            self.latencies.append(time.perf_counter() - start)
+
+
+class _ResourceSampler:
+    """Samples the process's RSS and CPU time while a run is in progress."""
+
+    def __init__(self, interval: float = 0.01):
+        self.interval = interval
+        self.process = psutil.Process()
+        self.peak_rss = 0
+        self._task: Optional[asyncio.Task] = None
+
+    def _sample(self) -> None:
+        self.peak_rss = max(self.peak_rss, self.process.memory_info().rss)
+
+    async def _run(self) -> None:
+        while True:
+            self._sample()
+            await asyncio.sleep(self.interval)
+
+    def start(self) -> None:
+        self._cpu_start = sum(self.process.cpu_times()[:2])
+        self._wall_start = time.perf_counter()
+        self._sample()
+        self._task = asyncio.create_task(self._run())
+
+    async def stop(self) -> tuple[float, float]:
+        """Stop sampling; returns (peak RSS in MB, CPU percent of one core)."""
+        self._task.cancel()
+        await asyncio.gather(self._task, return_exceptions=True)
+        self._sample()
+        cpu = sum(self.process.cpu_times()[:2]) - self._cpu_start
+        wall = time.perf_counter() - self._wall_start
+        return self.peak_rss / (1024 * 1024), 100.0 * cpu / wall if wall else 0.0
+
+
+def percentile(values: list[float], pct: float) -> float:
+    """
+    Percentile with linear interpolation between closest ranks.
+
+    Args:
+        values: Samples
+        pct: Percentile between 0 and 100
+
+    Returns:
+        The percentile, or 0.0 without samples
+    """
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = (len(ordered) - 1) * pct / 100.0
+    lower = int(rank)
+    upper = min(lower + 1, len(ordered) - 1)
+    return ordered[lower] + (ordered[upper] - ordered[lower]) * (rank - lower)
+
+
+class CrawlBenchmarkResult(BaseModel):
+    """Model for storing crawl benchmark results."""
+
+    backend: str
+    concurrency: int
+    pages_crawled: int
+    errors: int
+    requests: int
+    duration: float
+    pages_per_second: float
+    latency_p50_ms: float
+    latency_p95_ms: float
+    latency_p99_ms: float
+    peak_rss_mb: float
+    cpu_percent: float
+
+
+class CrawlBenchmark:
+    """
+    Benchmark full crawls of a fixture site per backend and concurrency level.
+    """
+
+    def __init__(
+        self,
+        site_config: Optional[FixtureSiteConfig] = None,
+        backends: Optional[dict[str, Callable[[FixtureSite], CrawlerBackend]]] = None,
+        concurrency_levels: Iterable[int] = (1, 4),
+        repeat: int = 1,
+    ):
+        """
+        Initialize the benchmark.
+
+        Args:
+            site_config: Shape of the fixture site
+            backends: Backend name to factory creating a backend that
+                reaches the site (defaults to DEFAULT_BACKENDS)
+            concurrency_levels: CrawlConfig.concurrent_requests values
+            repeat: Runs per combination; the fastest run is reported
+        """
+        self.site_config = site_config or FixtureSiteConfig()
+        self.backends = backends or DEFAULT_BACKENDS
+        self.concurrency_levels = list(concurrency_levels)
+        self.repeat = repeat
+        self.results: list[CrawlBenchmarkResult] = []
+
+    async def run(self) -> list[CrawlBenchmarkResult]:
+        """
+        Run the benchmark.
+
+        Returns:
+            Results of this run
+        """
+        results = []
+        async with FixtureSite(self.site_config) as site:
+            for name, factory in self.backends.items():
+                for concurrency in self.concurrency_levels:
+                    runs = [
+                        await self._run_once(site, name, factory, concurrency)
+                        for _ in range(self.repeat)
+                    ]
+                    results.append(max(runs, key=lambda r: r.pages_per_second))
+
+        self.results.extend(results)
+        return results
+
+    async def _run_once(
+        self,
+        site: FixtureSite,
+        name: str,
+        factory: Callable[[FixtureSite], CrawlerBackend],
+        concurrency: int,
+    ) -> CrawlBenchmarkResult:
+        """Crawl the whole site once with one backend."""
+        backend = _TimedBackend(factory(site))
+        crawler = Crawler(
+            config=CrawlConfig(
+                concurrent_requests=concurrency,
+                rate_limit=1e-6,  # effectively unlimited
+                max_retries=1,
+                use_duckduckgo=False,
+            ),
+            backend=backend,
+        )
+        target = CrawlTarget(
+            url=site.start_url,
+            depth=site.max_depth,
+            max_pages=self.site_config.pages,
+        )
+        requests_before = site.requests_served
+
+        sampler = _ResourceSampler()
+        sampler.start()
+        start = time.perf_counter()
+        try:
+            result = await crawler.crawl(target)
+        finally:
+            duration = time.perf_counter() - start
+            peak_rss_mb, cpu_percent = await sampler.stop()
+            await crawler.cleanup()
+            if hasattr(backend, "close"):
+                await backend.close()
+
+        pages = len(result.crawled_urls)
+        latencies = backend.latencies
+        return CrawlBenchmarkResult(
+            backend=name,
+            concurrency=concurrency,
+            pages_crawled=pages,
+            errors=max(len(result.errors), result.stats.failed_crawls),
+            requests=site.requests_served - requests_before,
+            duration=duration,
+            pages_per_second=pages / duration if duration else 0.0,
+            latency_p50_ms=percentile(latencies, 50) * 1000,
+            latency_p95_ms=percentile(latencies, 95) * 1000,
+            latency_p99_ms=percentile(latencies, 99) * 1000,
+            peak_rss_mb=peak_rss_mb,
+            cpu_percent=cpu_percent,
+        )
+
+    def to_baseline(self) -> dict[str, Any]:
+        """Describe the results as a JSON-serializable baseline."""
+        return {
+            "created": datetime.now().isoformat(),
+            "site": self.site_config.model_dump(),
+            "results": [result.model_dump() for result in self.results],
+        }
+
+    def save_baseline(self, path: str) -> None:
+        """
+        Save the results as a JSON baseline.
+
+        Args:
+            path: File to write
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_baseline(), f, indent=2)
+
+    def compare_to_baseline(
+        self, baseline: dict[str, Any], tolerance: float = 0.1
+    ) -> list[str]:
+        """
+        Compare the results with a baseline.
+
+        Args:
+            baseline: Baseline from to_baseline, e.g. loaded from a file
+            tolerance: Allowed relative change in the worse direction
+
+        Returns:
+            Descriptions of the metrics that regressed beyond the tolerance
+        """
+        if baseline.get("site") != self.site_config.model_dump():
+            logger.warning("Baseline was recorded with a different fixture site")
+
+        previous = {
+            (entry["backend"], entry["concurrency"]): entry
+            for entry in baseline.get("results", [])
+        }
+        regressions = []
+        for result in self.results:
+            entry = previous.get((result.backend, result.concurrency))
+            if entry is None:
+                continue
+            for metric, higher_is_better in BASELINE_METRICS.items():
+                old, new = entry[metric], getattr(result, metric)
+                if not old:
+                    continue
+                change = (new - old) / old
+                if (-change if higher_is_better else change) > tolerance:
+                    regressions.append(
+                        f"{result.backend} x{result.concurrency} {metric}: "
+                        f"{old:.2f} -> {new:.2f} ({change:+.0%})"
+                    )
+        return regressions
+
+    def generate_report(self, output_file: Optional[str] = None) -> str:
+        """
+        Generate a benchmark report.
+
+        Args:
+            output_file: Optional file path to save the report
+
+        Returns:
+            Report as a string
+        """
+        if not self.results:
+            return "No benchmark results available."
+
+        site = self.site_config
+        report = "# Crawl Benchmark Report\n\n"
+        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        report += (
+            f"Fixture site: {site.pages} pages of ~{site.page_size} bytes, "
+            f"fan-out {site.fan_out}, latency {site.latency * 1000:.0f} ms "
+            f"(+{site.latency_jitter * 1000:.0f} ms jitter), "
+            f"error rate {site.error_rate:.0%}\n\n"
+        )
+
+        report += "| Backend | Concurrency | Pages | Errors | Pages/s | p50 ms | p95 ms | p99 ms | Peak RSS MB | CPU % |\n"
+        report += "|---|---|---|---|---|---|---|---|---|---|\n"
+        for r in self.results:
+            report += (
+                f"| {r.backend} | {r.concurrency} | {r.pages_crawled} | {r.errors} "
+                f"| {r.pages_per_second:.1f} | {r.latency_p50_ms:.1f} "
+                f"| {r.latency_p95_ms:.1f} | {r.latency_p99_ms:.1f} "
+                f"| {r.peak_rss_mb:.1f} | {r.cpu_percent:.0f} |\n"
+            )
+
+        if output_file:
+            with open(output_file, "w") as f:
+                f.write(report)
+
+        return report
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run the crawl benchmark against a local fixture site."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument("--pages", type=int, default=100, help="Pages in the site")
+    parser.add_argument(
+        "--page-size", type=int, default=4096, help="Bytes of text per page"
+    )
+    parser.add_argument("--fan-out", type=int, default=5, help="Links per page")
+    parser.add_argument(
+        "--latency", type=float, default=0.0, help="Seconds added to each response"
+    )
+    parser.add_argument(
+        "--jitter", type=float, default=0.0, help="Maximum random extra latency"
+    )
+    parser.add_argument(
+        "--error-rate", type=float, default=0.0, help="Fraction of failing pages"
+    )
+    parser.add_argument("--seed", type=int, default=0, help="Site generation seed")
+    parser.add_argument(
+        "--concurrency",
+        type=int,
+        nargs="+",
+        default=[1, 4],
+        help="Concurrency levels to measure",
+    )
+    parser.add_argument("--repeat", type=int, default=1, help="Runs per combination")
+    parser.add_argument("--output", help="File to save the Markdown report to")
+    parser.add_argument("--save-baseline", help="File to save a JSON baseline to")
+    parser.add_argument("--compare", help="JSON baseline to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.1,
+        help="Allowed relative regression when comparing (default 0.1)",
+    )
+    args = parser.parse_args(argv)
+
+    benchmark = CrawlBenchmark(
+        FixtureSiteConfig(
+            pages=args.pages,
+            page_size=args.page_size,
+            fan_out=args.fan_out,
+            latency=args.latency,
+            latency_jitter=args.jitter,
+            error_rate=args.error_rate,
+            seed=args.seed,
+        ),
+        concurrency_levels=args.concurrency,
+        repeat=args.repeat,
+    )
+    asyncio.run(benchmark.run())
+    print(benchmark.generate_report(args.output))
+
+    if args.save_baseline:
+        benchmark.save_baseline(args.save_baseline)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = benchmark.compare_to_baseline(json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,201 @@
+"""
+Local stand-in for a browser serving the Chrome DevTools Protocol.
+
+A FixtureBrowser answers the subset of CDP that LightpandaBackend uses
+(browser contexts, targets attached in flat mode, navigation, load events
+and Runtime.evaluate) from an in-process aiohttp server. Navigations take a
+configurable render time and run concurrently, so tests and benchmarks can
+check that responses are routed to the right target and that throughput
+grows with the number of open targets, without a browser installed.
+"""
+
+import asyncio
+import itertools
+import json
+import logging
+from typing import Any, Callable, Optional
+
+from aiohttp import web
+
+logger = logging.getLogger(__name__)
+
+
+class _UnknownMethod(Exception):
+    """CDP method the stand-in does not implement."""
+
+
+def default_page(url: str) -> str:
+    """Render a minimal page naming its URL."""
+    return (
+        f"<html><head><title>{url}</title></head>"
+        f"<body><main><h1>{url}</h1></main></body></html>"
+    )
+
+
+class FixtureBrowser:
+    """In-process CDP endpoint rendering pages from a function."""
+
+    def __init__(
+        self,
+        pages: Optional[Callable[[str], str]] = None,
+        render_delay: float = 0.0,
+    ):
+        """
+        Initialize the browser; call start (or use async with) to serve it.
+
+        Args:
+            pages: Function returning the rendered HTML of a URL
+            render_delay: Seconds each navigation takes before its load event
+        """
+        self.pages = pages or default_page
+        self.render_delay = render_delay
+        self.port: Optional[int] = None
+        self.navigations = 0
+        self.active_navigations = 0
+        self.peak_navigations = 0
+        self.open_targets: set[str] = set()
+        self._ids = itertools.count(1)
+        # Session id to target id
+        self._sessions: dict[str, str] = {}
+        # Target id to the URL it shows
+        self._target_urls: dict[str, str] = {}
+        # Pending navigations, referenced until they finish
+        self._loads: set[asyncio.Task] = set()
+        self._runner: Optional[web.AppRunner] = None
+
+    async def __aenter__(self) -> "FixtureBrowser":
+        await self.start()
+        return self
+
+    async def __aexit__(self, *exc_info) -> None:
+        await self.close()
+
+    @property
+    def url(self) -> str:
+        """HTTP base URL, as passed to LightpandaConfig.cdp_urls."""
+        return f"http://127.0.0.1:{self.port}"
+
+    async def start(self) -> None:
+        """Start serving on a free local port."""
+        app = web.Application()
+        app.router.add_get("/json/version", self._handle_version)
+        app.router.add_get("/devtools/browser", self._handle_ws)
+        self._runner = web.AppRunner(app, access_log=None)
+        await self._runner.setup()
+        site = web.TCPSite(self._runner, "127.0.0.1", 0)
+        await site.start()
+        self.port = self._runner.addresses[0][1]
+        logger.info(f"Fixture browser on port {self.port}")
+
+    async def close(self) -> None:
+        for task in self._loads:
+            task.cancel()
+        if self._runner is not None:
+            await self._runner.cleanup()
+            self._runner = None
+
+    async def _handle_version(self, request: web.Request) -> web.Response:
+        return web.json_response(
+            {
+                "Browser": "FixtureBrowser/1.0",
+                "webSocketDebuggerUrl": f"ws://127.0.0.1:{self.port}/devtools/browser",
+            }
+        )
+
+    async def _handle_ws(self, request: web.Request) -> web.WebSocketResponse:
+        ws = web.WebSocketResponse(max_msg_size=0)
+        await ws.prepare(request)
+        tasks = set()
+        async for msg in ws:
+            # Commands are answered concurrently, like a browser does
+            task = asyncio.create_task(self._answer(ws, json.loads(msg.data)))
+            tasks.add(task)
+            task.add_done_callback(tasks.discard)
+        for task in tasks:
+            task.cancel()
+        return ws
+
+    async def _answer(self, ws: web.WebSocketResponse, message: dict) -> None:
+        session_id = message.get("sessionId")
+        response: dict[str, Any] = {"id": message["id"]}
+        if session_id:
+            response["sessionId"] = session_id
+        try:
+            response["result"] = await self._execute(
+                ws, message["method"], message.get("params", {}), session_id
+            )
+        except KeyError as e:
+            response["error"] = {"code": -32000, "message": f"Unknown {e}"}
+        except _UnknownMethod:
+            response["error"] = {
+                "code": -32601,
+                "message": f"'{message['method']}' wasn't found",
+            }
+        if not ws.closed:
+            await ws.send_str(json.dumps(response))
+
+    async def _execute(
+        self,
+        ws: web.WebSocketResponse,
+        method: str,
+        params: dict[str, Any],
+        session_id: Optional[str],
+    ) -> dict[str, Any]:
+        if method == "Target.createBrowserContext":
+            return {"browserContextId": f"context-{next(self._ids)}"}
+        if method == "Target.createTarget":
+            target_id = f"target-{next(self._ids)}"
+            self.open_targets.add(target_id)
+            self._target_urls[target_id] = params.get("url", "about:blank")
+            return {"targetId": target_id}
+        if method == "Target.attachToTarget":
+            if params["targetId"] not in self.open_targets:
+                raise KeyError(params["targetId"])
+            attached = f"session-{next(self._ids)}"
+            self._sessions[attached] = params["targetId"]
+            return {"sessionId": attached}
+        if method == "Target.closeTarget":
+            self.open_targets.discard(params["targetId"])
+            self._target_urls.pop(params["targetId"], None)
+            return {"success": True}
+        if method.startswith(("Emulation.", "Network.")) or method == "Page.enable":
+            return {}
+        if session_id is None:
+            raise _UnknownMethod(method)
+
+        target_id = self._sessions[session_id]
+        if method == "Page.navigate":
+            task = asyncio.create_task(
+                self._load(ws, session_id, target_id, params["url"])
+            )
+            self._loads.add(task)
+            task.add_done_callback(self._loads.discard)
+            return {"frameId": target_id, "loaderId": f"loader-{next(self._ids)}"}
+        if method == "Runtime.evaluate":
+            html = self.pages(self._target_urls[target_id])
+            return {"result": {"type": "string", "value": html}}
+        raise _UnknownMethod(method)
+
+    async def _load(
+        self, ws: web.WebSocketResponse, session_id: str, target_id: str, url: str
+    ) -> None:
+        """Render a page, then send its load event."""
+        self.navigations += 1
+        self.active_navigations += 1
+        self.peak_navigations = max(self.peak_navigations, self.active_navigations)
+        try:
+            if self.render_delay:
+                await asyncio.sleep(self.render_delay)
+            self._target_urls[target_id] = url
+        finally:
+            self.active_navigations -= 1
+        if not ws.closed:
+            await ws.send_str(
+                json.dumps(
+                    {
+                        "method": "Page.loadEventFired",
+                        "params": {"timestamp": 0},
+                        "sessionId": session_id,
+                    }
+                )
+            )
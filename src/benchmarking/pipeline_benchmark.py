@@ -0,0 +1,426 @@
+"""
+Content pipeline benchmark over a checked-in corpus of documentation pages.
+
+Every page of the corpus (pages generated by Sphinx, MkDocs, Docusaurus,
+rustdoc and javadoc, a large API reference page, and Markdown,
+reStructuredText and AsciiDoc sources) is run through the stages a crawled
+page goes through: format detection, the format handler, ContentProcessor,
+QualityChecker and DocumentOrganizer. Each stage is timed separately, and a
+separate pass under tracemalloc records the memory each stage allocates, so
+timings are not skewed by allocation tracing. Results can be saved as a
+JSON baseline and compared against later runs.
+
+The HTML format handler delegates to ContentProcessor, so for HTML pages the
+handler stage is not measured separately.
+"""
+
+import argparse
+import asyncio
+import json
+import logging
+import os
+import statistics
+import sys
+import time
+import tracemalloc
+from collections.abc import Iterable, Iterator
+from contextlib import AbstractContextManager, contextmanager
+from datetime import datetime
+from typing import Any, Callable, Optional
+
+from pydantic import BaseModel
+
+from ..organizers.doc_organizer import DocumentOrganizer
+from ..processors.content.format_detector import FormatDetector
+from ..processors.content.format_handlers import (
+    AsciiDocHandler,
+    HTMLHandler,
+    MarkdownHandler,
+    ReStructuredTextHandler,
+)
+from ..processors.content_processor import ContentProcessor
+from ..processors.quality_checker import QualityChecker
+
+logger = logging.getLogger(__name__)
+
+# Corpus shipped with the package
+CORPUS_DIR = os.path.join(os.path.dirname(__file__), "corpus")
+
+# Content type passed to the pipeline for each corpus file extension
+CONTENT_TYPES = {
+    ".html": "text/html",
+    ".htm": "text/html",
+    ".md": "text/markdown",
+    ".rst": "text/x-rst",
+    ".adoc": "text/asciidoc",
+}
+
+STAGES = ("detect", "handler", "process", "quality", "organize")
+
+# Metrics compared against a baseline; lower is better for all of them
+BASELINE_METRICS = ("median_ms", "peak_kb")
+
+
+class CorpusPage(BaseModel):
+    """A page of the benchmark corpus."""
+
+    name: str
+    content_type: str
+    content: str
+
+
+class PipelineBenchmarkResult(BaseModel):
+    """Model for storing the measurements of one stage on one page."""
+
+    page: str
+    format: str
+    stage: str
+    size_bytes: int
+    median_ms: float
+    min_ms: float
+    peak_kb: float
+    retained_kb: float
+
+
+def load_corpus(
+    directory: str = CORPUS_DIR, names: Optional[Iterable[str]] = None
+) -> list[CorpusPage]:
+    """
+    Load the pages of a benchmark corpus.
+
+    Args:
+        directory: Directory of pages; files with an extension that is not
+            in CONTENT_TYPES are ignored
+        names: Only load the pages with these file names
+
+    Returns:
+        Pages in file name order
+    """
+    wanted = set(names) if names is not None else None
+    pages = []
+    for name in sorted(os.listdir(directory)):
+        content_type = CONTENT_TYPES.get(os.path.splitext(name)[1].lower())
+        if content_type is None or (wanted is not None and name not in wanted):
+            continue
+        with open(os.path.join(directory, name), encoding="utf-8") as f:
+            pages.append(
+                CorpusPage(name=name, content_type=content_type, content=f.read())
+            )
+    return pages
+
+
+class PipelineBenchmark:
+    """
+    Benchmark the content pipeline stages on a corpus of pages.
+    """
+
+    def __init__(self, pages: list[CorpusPage], repeat: int = 5):
+        """
+        Initialize the benchmark.
+
+        Args:
+            pages: Pages to measure, e.g. from load_corpus
+            repeat: Timed runs per page; the median and fastest run are
+                reported
+        """
+        if not pages:
+            raise ValueError("At least one page is needed for a benchmark")
+        self.pages = pages
+        self.repeat = max(1, repeat)
+        self.results: list[PipelineBenchmarkResult] = []
+
+        self.processor = ContentProcessor()
+        self.quality_checker = QualityChecker()
+        # Same handlers, in the same order, as ContentProcessor registers
+        self.detector = FormatDetector()
+        self.detector.register_handler(HTMLHandler(self.processor))
+        self.detector.register_handler(MarkdownHandler())
+        self.detector.register_handler(ReStructuredTextHandler())
+        self.detector.register_handler(AsciiDocHandler())
+
+    async def run(self) -> list[PipelineBenchmarkResult]:
+        """
+        Run the benchmark.
+
+        Each page is run once untimed to warm up caches and lazy imports
+        before it is measured.
+
+        Returns:
+            Results of this run, one per page and measured stage
+        """
+        results = []
+        for page in self.pages:
+            results.extend(await self._measure(page))
+        self.results.extend(results)
+        return results
+
+    async def _measure(self, page: CorpusPage) -> list[PipelineBenchmarkResult]:
+        """Time and trace every stage on one page."""
+        await self._run_pipeline(page, _no_probe)
+
+        timings: dict[str, list[float]] = {}
+        for _ in range(self.repeat):
+            format_name = await self._run_pipeline(page, _timing_probe(timings))
+
+        allocations: dict[str, tuple[int, int]] = {}
+        tracemalloc.start()
+        try:
+            await self._run_pipeline(page, _allocation_probe(allocations))
+        finally:
+            tracemalloc.stop()
+
+        size_bytes = len(page.content.encode("utf-8"))
+        results = []
+        for stage in STAGES:
+            if stage not in timings:
+                continue
+            peak, retained = allocations.get(stage, (0, 0))
+            results.append(
+                PipelineBenchmarkResult(
+                    page=page.name,
+                    format=format_name,
+                    stage=stage,
+                    size_bytes=size_bytes,
+                    median_ms=statistics.median(timings[stage]) * 1000,
+                    min_ms=min(timings[stage]) * 1000,
+                    peak_kb=peak / 1024,
+                    retained_kb=retained / 1024,
+                )
+            )
+        return results
+
+    async def _run_pipeline(
+        self, page: CorpusPage, probe: Callable[[str], AbstractContextManager]
+    ) -> str:
+        """
+        Run one page through every stage.
+
+        Args:
+            page: Page to process
+            probe: Called with each stage name; the returned context manager
+                wraps the stage
+
+        Returns:
+            Name of the detected format
+        """
+        url = f"https://docs.example.com/{page.name}"
+        organizer = DocumentOrganizer()
+
+        with probe("detect"):
+            handler = self.detector.detect_format(page.content, page.content_type)
+        format_name = handler.get_format_name() if handler else "unknown"
+
+        if handler is not None and format_name != "HTML":
+            with probe("handler"):
+                await handler.process(page.content, url)
+
+        with probe("process"):
+            processed = await self.processor.process(
+                page.content, base_url=url, content_type=page.content_type
+            )
+        with probe("quality"):
+            await self.quality_checker.check_quality(processed)
+        with probe("organize"):
+            organizer.add_document(processed)
+
+        return format_name
+
+    def to_baseline(self) -> dict[str, Any]:
+        """Describe the results as a JSON-serializable baseline."""
+        return {
+            "created": datetime.now().isoformat(),
+            "repeat": self.repeat,
+            "results": [result.model_dump() for result in self.results],
+        }
+
+    def save_baseline(self, path: str) -> None:
+        """
+        Save the results as a JSON baseline.
+
+        Args:
+            path: File to write
+        """
+        with open(path, "w") as f:
+            json.dump(self.to_baseline(), f, indent=2)
+
+    def compare_to_baseline(
+        self, baseline: dict[str, Any], tolerance: float = 0.2
+    ) -> list[str]:
+        """
+        Compare the results with a baseline.
+
+        Args:
+            baseline: Baseline from to_baseline, e.g. loaded from a file
+            tolerance: Allowed relative increase of a metric
+
+        Returns:
+            Descriptions of the metrics that regressed beyond the tolerance
+        """
+        previous = {
+            (entry["page"], entry["stage"]): entry
+            for entry in baseline.get("results", [])
+        }
+        regressions = []
+        for result in self.results:
+            entry = previous.get((result.page, result.stage))
+            if entry is None:
+                continue
+            if entry["size_bytes"] != result.size_bytes:
+                logger.warning(f"Baseline was recorded with a different {result.page}")
+                continue
+            for metric in BASELINE_METRICS:
+                old, new = entry[metric], getattr(result, metric)
+                if not old:
+                    continue
+                change = (new - old) / old
+                if change > tolerance:
+                    regressions.append(
+                        f"{result.page} {result.stage} {metric}: "
+                        f"{old:.2f} -> {new:.2f} ({change:+.0%})"
+                    )
+        return regressions
+
+    def stage_totals(self) -> dict[str, dict[str, float]]:
+        """
+        Sum each stage's median time and peak allocation over all pages.
+
+        Returns:
+            Mapping of stage name to its median_ms and peak_kb totals
+        """
+        totals: dict[str, dict[str, float]] = {}
+        for result in self.results:
+            total = totals.setdefault(result.stage, {"median_ms": 0.0, "peak_kb": 0.0})
+            total["median_ms"] += result.median_ms
+            total["peak_kb"] += result.peak_kb
+        return {stage: totals[stage] for stage in STAGES if stage in totals}
+
+    def generate_report(self, output_file: Optional[str] = None) -> str:
+        """
+        Generate a benchmark report.
+
+        Args:
+            output_file: Optional file path to save the report
+
+        Returns:
+            Report as a string
+        """
+        if not self.results:
+            return "No benchmark results available."
+
+        report = "# Content Pipeline Benchmark Report\n\n"
+        report += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        report += f"Pages: {len(self.pages)}, timed runs per page: {self.repeat}\n\n"
+
+        report += "## Totals per Stage\n\n"
+        report += "| Stage | Median ms | Peak KB |\n"
+        report += "|---|---|---|\n"
+        for stage, total in self.stage_totals().items():
+            report += (
+                f"| {stage} | {total['median_ms']:.2f} | {total['peak_kb']:.1f} |\n"
+            )
+
+        report += "\n## Per Page\n\n"
+        report += "| Page | Format | Size KB | Stage | Median ms | Min ms | Peak KB | Retained KB |\n"
+        report += "|---|---|---|---|---|---|---|---|\n"
+        for r in self.results:
+            report += (
+                f"| {r.page} | {r.format} | {r.size_bytes / 1024:.1f} | {r.stage} "
+                f"| {r.median_ms:.2f} | {r.min_ms:.2f} "
+                f"| {r.peak_kb:.1f} | {r.retained_kb:.1f} |\n"
+            )
+
+        if output_file:
+            with open(output_file, "w") as f:
+                f.write(report)
+
+        return report
+
+
+@contextmanager
+def _no_probe(stage: str) -> Iterator[None]:
+    yield
+
+
+def _timing_probe(
+    timings: dict[str, list[float]],
+) -> Callable[[str], AbstractContextManager]:
+    """Build a probe that appends each stage's duration to timings."""
+
+    @contextmanager
+    def probe(stage: str) -> Iterator[None]:
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            timings.setdefault(stage, []).append(time.perf_counter() - start)
+
+    return probe
+
+
+def _allocation_probe(
+    allocations: dict[str, tuple[int, int]],
+) -> Callable[[str], AbstractContextManager]:
+    """
+    Build a probe that records each stage's allocations.
+
+    tracemalloc must be tracing while the probe is used. For each stage the
+    peak of memory allocated above the level at its start, and the memory
+    still held at its end, are recorded in bytes.
+    """
+
+    @contextmanager
+    def probe(stage: str) -> Iterator[None]:
+        tracemalloc.reset_peak()
+        before, _ = tracemalloc.get_traced_memory()
+        try:
+            yield
+        finally:
+            current, peak = tracemalloc.get_traced_memory()
+            allocations[stage] = (peak - before, max(0, current - before))
+
+    return probe
+
+
+def main(argv: Optional[list[str]] = None) -> None:
+    """Run the content pipeline benchmark on the corpus."""
+    parser = argparse.ArgumentParser(description=__doc__.strip().splitlines()[0])
+    parser.add_argument(
+        "--corpus", default=CORPUS_DIR, help="Directory of pages to measure"
+    )
+    parser.add_argument(
+        "--page", action="append", help="Only measure this page (repeatable)"
+    )
+    parser.add_argument("--repeat", type=int, default=5, help="Timed runs per page")
+    parser.add_argument("--output", help="File to save the Markdown report to")
+    parser.add_argument("--save-baseline", help="File to save a JSON baseline to")
+    parser.add_argument("--compare", help="JSON baseline to compare against")
+    parser.add_argument(
+        "--tolerance",
+        type=float,
+        default=0.2,
+        help="Allowed relative regression when comparing (default 0.2)",
+    )
+    args = parser.parse_args(argv)
+
+    # The pipeline logs every page; at DEBUG level that would dominate timings
+    logging.getLogger().setLevel(logging.WARNING)
+
+    benchmark = PipelineBenchmark(
+        load_corpus(args.corpus, names=args.page), repeat=args.repeat
+    )
+    asyncio.run(benchmark.run())
+    print(benchmark.generate_report(args.output))
+
+    if args.save_baseline:
+        benchmark.save_baseline(args.save_baseline)
+    if args.compare:
+        with open(args.compare) as f:
+            regressions = benchmark.compare_to_baseline(json.load(f), args.tolerance)
+        for regression in regressions:
+            print(f"REGRESSION: {regression}")
+        if regressions:
+            sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
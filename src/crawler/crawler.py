@@ -4,6 +4,8 @@ Crawler implementation for lib2docScrape.
 
 import asyncio
 import logging
+import time
+from collections.abc import Callable
 from datetime import datetime
 from typing import Any, Optional, Union  # Keep Union for config_or_depth
 from urllib.parse import urlparse
@@ -24,6 +26,9 @@ from src.utils.helpers import RateLimiter, RetryStrategy  # Combined imports
 # from src.utils.helpers import RetryStrategy # Already imported
 from src.utils.project_identifier import ProjectIdentifier
 from src.utils.search import DuckDuckGoSearch
+from src.utils.stage_metrics import StageMetrics
+from src.utils.stage_metrics import stage_metrics as shared_stage_metrics
+from src.utils.tracing import current_span, traced
 from src.utils.url.factory import create_url_info
 
 from ..processors.quality_checker import IssueLevel, IssueType
@@ -75,8 +80,13 @@ class Crawler:
         document_organizer: Optional[DocumentOrganizer] = None,
         loop: Optional[asyncio.AbstractEventLoop] = None,
         backend: Optional[Any] = None,
+        stage_metrics: Optional[StageMetrics] = None,
     ) -> None:
         self.config: CrawlConfig = config or CrawlConfig()
+        # Per-stage latency histograms, shared by all crawlers by default
+        self.stage_metrics: StageMetrics = (
+            stage_metrics if stage_metrics is not None else shared_stage_metrics
+        )
 
         self.backend_selector: BackendSelector = backend_selector or BackendSelector()
         self.content_processor: ContentProcessor = (
@@ -97,6 +107,8 @@ class Crawler:
 
         self.visited_urls: set[str] = set()
         self.crawl_queue: list[CrawlTarget] = []  # Use list
+        # Called with each page's CrawlResult as soon as it is processed
+        self.result_listeners: list[Callable[[CrawlResult], None]] = []
 
         http_backend = HTTPBackend(
             HTTPBackendConfig(
@@ -137,9 +149,42 @@ class Crawler:
             f"Crawler initialized with max_depth={self.config.max_depth}, max_pages={self.config.max_pages}"
         )
 
+    def _notify_result_listeners(self, result: CrawlResult) -> None:
+        """Pass a page's result to every listener, logging listener errors."""
+        for listener in self.result_listeners:
+            try:
+                listener(result)
+            except Exception as e:
+                logger.error(f"Result listener {listener!r} failed: {e}")
+
     def add_target(self, target: CrawlTarget):
         self.crawl_queue.append(target)
 
+    @staticmethod
+    def _backend_label(backend: Any) -> str:
+        """Name of a backend for metric labels."""
+        name = getattr(backend, "name", None)
+        return name if isinstance(name, str) else type(backend).__name__
+
+    @staticmethod
+    def _host_label(url_info: Any) -> str:
+        """Host of a URL for metric labels."""
+        host = getattr(url_info, "hostname", None)
+        return host if isinstance(host, str) else ""
+
+    def _record_fetch_metrics(
+        self, backend_result: Any, backend: str, host: str, elapsed: float
+    ) -> None:
+        """Record a backend call as fetch time plus the decode time it reports."""
+        metadata = getattr(backend_result, "metadata", None)
+        decode_time = (
+            metadata.get("decode_time") if isinstance(metadata, dict) else None
+        )
+        if isinstance(decode_time, (int, float)):
+            self.stage_metrics.record("decode", decode_time, backend, host)
+            elapsed -= decode_time
+        self.stage_metrics.record("fetch", elapsed, backend, host)
+
     async def crawl(
         self,
         target_url_or_target: Union[str, CrawlTarget, None] = None,
@@ -323,11 +368,21 @@ class Crawler:
                 if not any(item[0] == url_item_ddg_add for item in queue):
                     queue.append((url_item_ddg_add, 0))  # Add with depth 0
 
+        # When each queued URL was queued, for the frontier wait metric
+        frontier_start = time.perf_counter()
+        enqueued_at: dict[str, float] = {}
+
         while queue and (
             current_target.max_pages is None
             or len(visited_urls_session) < current_target.max_pages
         ):
             url_to_crawl, current_depth_val = queue.pop(0)
+            if self.stage_metrics.enabled:
+                self.stage_metrics.record(
+                    "frontier_wait",
+                    time.perf_counter() - enqueued_at.pop(url_to_crawl, frontier_start),
+                    host=urlparse(url_to_crawl).hostname or "",
+                )
 
             # Pass current_target (which holds specific rules for this crawl)
             # and effective_config (which holds broader settings like quality)
@@ -344,6 +399,7 @@ class Crawler:
                 logger.debug(f"Error recorded for URL {url_to_crawl}: {error}")
 
             if result_data is not None:
+                self._notify_result_listeners(result_data)
                 if result_data.documents:
                     all_documents_session.extend(result_data.documents)
                 crawled_urls_list_session.append(url_to_crawl)
@@ -361,6 +417,8 @@ class Crawler:
                     for link_url_item in new_links:
                         if not any(item[0] == link_url_item for item in queue):
                             queue.append((link_url_item, current_depth_val + 1))
+                            if self.stage_metrics.enabled:
+                                enqueued_at[link_url_item] = time.perf_counter()
 
         from datetime import UTC, datetime  # Keep import here for now
 
@@ -932,6 +990,8 @@ class Crawler:
 
         # Attempt to get ProcessedContent from backend or process raw content
         final_processed_content: Optional[ProcessedContent] = None
+        backend_label = self._backend_label(backend)
+        host_label = self._host_label(url_info)
 
         # Scenario 1: Backend already returned ProcessedContent(s)
         backend_docs = getattr(current_backend_result, "documents", None)
@@ -989,9 +1049,12 @@ class Crawler:
                         elif isinstance(headers, dict) and "Content-Type" in headers:
                             content_type_for_processor = headers["Content-Type"]
 
-                    final_processed_content = await self.content_processor.process(
-                        raw_html_from_backend, final_url_str, content_type_for_processor
-                    )
+                    with self.stage_metrics.time("process", backend_label, host_label):
+                        final_processed_content = await self.content_processor.process(
+                            raw_html_from_backend,
+                            final_url_str,
+                            content_type_for_processor,
+                        )
                 except Exception as e_proc_raw:
                     logger.error(
                         f"Content processor failed for {final_url_str}: {e_proc_raw}"
@@ -1072,10 +1135,13 @@ class Crawler:
 
                 # check_quality only expects ProcessedContent
                 # It should return (list[ProcessorQualityIssue], dict_metrics)
-                (
-                    quality_issues_qc,
-                    quality_metrics_qc,
-                ) = await self.quality_checker.check_quality(final_processed_content)
+                with self.stage_metrics.time("quality", backend_label, host_label):
+                    (
+                        quality_issues_qc,
+                        quality_metrics_qc,
+                    ) = await self.quality_checker.check_quality(
+                        final_processed_content
+                    )
 
                 # Add issues from quality checker to the ProcessedContent object itself
                 if quality_issues_qc:
@@ -1155,6 +1221,7 @@ class Crawler:
             None,
         )
 
+    @traced("crawler.process_url")
     async def _process_url(
         self,
         url: str,
@@ -1163,6 +1230,9 @@ class Crawler:
         stats: CrawlStats,
         visited_urls_session: set[str],  # Use session set
     ) -> tuple[Optional[CrawlResult], list[str], dict[str, Any], Optional[Exception]]:
+        span = current_span()
+        span.set_attribute("url.full", url)
+        span.set_attribute("crawler.depth", current_depth)
         url_info_obj = create_url_info(url)
         logger.debug(
             f"_process_url: Processing URL {url}, normalized: {url_info_obj.normalized_url if url_info_obj else 'N/A'}, is_valid: {url_info_obj.is_valid if url_info_obj else False}"
@@ -1199,6 +1269,8 @@ class Crawler:
             return None, [], {}, None
 
         visited_urls_session.add(normalized_url_str)  # Add to session's visited set
+        host_label = self._host_label(url_info_obj)
+        backend_label = ""
 
         last_exception: Optional[Exception] = None
         processed_content_final: Optional[ProcessedContent] = None
@@ -1215,7 +1287,8 @@ class Crawler:
                 if (
                     hasattr(self, "rate_limiter") and self.rate_limiter
                 ):  # Check existence
-                    await self.rate_limiter.acquire()
+                    with self.stage_metrics.time("rate_limit_wait", host=host_label):
+                        await self.rate_limiter.acquire()
 
                 selected_backend = self.backend  # Use instance override if set
                 if not selected_backend:
@@ -1235,9 +1308,19 @@ class Crawler:
                 # Fetch raw data using backend first
                 # This might return a simple response object or a more complex one
                 # depending on the backend (e.g. HTTPBackendResult)
+                backend_label = self._backend_label(selected_backend)
+                span.set_attribute("backend.name", backend_label)
+                fetch_start = time.perf_counter()
                 backend_fetch_result = await selected_backend.crawl(
                     url_info_obj
                 )  # Pass UrlInfo object
+                if self.stage_metrics.enabled:
+                    self._record_fetch_metrics(
+                        backend_fetch_result,
+                        backend_label,
+                        host_label,
+                        time.perf_counter() - fetch_start,
+                    )
 
                 if (
                     backend_fetch_result
@@ -1479,9 +1562,10 @@ class Crawler:
             if self.document_organizer:
                 try:
                     # Pass the ProcessedContent object directly
-                    doc_id_org = self.document_organizer.add_document(
-                        processed_content_final
-                    )
+                    with self.stage_metrics.time("organize", backend_label, host_label):
+                        doc_id_org = self.document_organizer.add_document(
+                            processed_content_final
+                        )
                     doc_data["doc_id"] = doc_id_org  # Update doc_id in the dict
                     logger.debug(
                         f"Added document {normalized_url_str} to organizer with id {doc_id_org}"
@@ -11,19 +11,22 @@ from typing import Any, Optional
 import yaml
 from fastapi import (
     BackgroundTasks,
+    Body,
     FastAPI,
     HTTPException,
     Request,
+    Response,
     WebSocket,
     WebSocketDisconnect,
 )
-from fastapi.responses import HTMLResponse, JSONResponse, PlainTextResponse
+from fastapi.responses import HTMLResponse, StreamingResponse
 from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
 from .backends.crawl4ai_backend import Crawl4AIBackend, Crawl4AIConfig
 from .backends.file_backend import FileBackend
+from .backends.hybrid_backend import HybridBackend
 from .backends.lightpanda_backend import LightpandaBackend, LightpandaConfig
 from .backends.selector import BackendCriteria, BackendSelector
 from .benchmarking.backend_benchmark import BackendBenchmark
@@ -32,16 +35,43 @@ from .organizers.doc_organizer import DocumentOrganizer, OrganizationConfig
 from .processors.content.models import ProcessorConfig as ProcessingConfig
 from .processors.content_processor import ContentProcessor
 from .processors.quality_checker import QualityChecker, QualityConfig
+from .storage.columnar import CrawlResultExporter
+from .storage.results import ResultsStore, create_results_store
+from .utils.broadcast import BroadcastHub
 from .utils.helpers import setup_logging
+from .utils.job_scheduler import (
+    Job,
+    JobContext,
+    JobQueueFullError,
+    JobScheduler,
+    JobStatus,
+)
+from .utils.stage_metrics import OPENMETRICS_CONTENT_TYPE, StageMetrics, stage_metrics
+from .utils.streaming import (
+    iter_html,
+    iter_json_object,
+    iter_json_result,
+    iter_markdown,
+    iter_ndjson,
+)
+from .utils.tracing import configure_tracing
 
 # Set up logging
 logging.basicConfig(level=logging.INFO)
 logger = logging.getLogger(__name__)
 
-# In-memory storage for web interface
-scraping_results_storage: dict[str, dict] = {}
+# Scraping results for the web interface, persisted in SQLite by default
+# (see LIB2DOCSCRAPE_RESULTS_STORE)
+scraping_results_storage: ResultsStore = create_results_store()
+
+# Media types of the /api/scraping/download/{format} exports
+DOWNLOAD_MEDIA_TYPES = {
+    "json": "application/json",
+    "ndjson": "application/x-ndjson",
+    "markdown": "text/markdown; charset=utf-8",
+    "html": "text/html; charset=utf-8",
+}
 active_scraper = None
-is_scraping = False
 library_operations: dict[str, dict] = {}
 
 
@@ -122,10 +152,22 @@ class LibraryOperation(BaseModel):
 
 
 class ConnectionManager:
-    def __init__(self):
+    def __init__(self, max_rate: float = 10.0, queue_size: int = 100):
+        """
+        Initialize the connection manager.
+
+        Args:
+            max_rate: Maximum progress flushes per second to scraping clients;
+                progress of one crawl job is coalesced to its latest state
+            queue_size: Messages buffered per client before the oldest are
+                dropped
+        """
         self.active_connections: list[WebSocket] = []
         self.scraping_connections: list[WebSocket] = []
         self.library_connections: list[WebSocket] = []
+        self.scraping_hub = BroadcastHub(
+            max_rate=max_rate, queue_size=queue_size, on_disconnect=self.disconnect
+        )
         self.scraping_metrics = {
             "pages_scraped": 0,
             "current_depth": 0,
@@ -146,6 +188,7 @@ class ConnectionManager:
             await websocket.send_json(
                 {"type": "connection_established", "data": self.scraping_status}
             )
+            self.scraping_hub.add(websocket)
         elif connection_type == "library":
             self.library_connections.append(websocket)
             logging.info("Library connection established")
@@ -156,6 +199,7 @@ class ConnectionManager:
     def disconnect(self, websocket: WebSocket):
         if websocket in self.scraping_connections:
             self.scraping_connections.remove(websocket)
+            self.scraping_hub.remove(websocket)
         if websocket in self.library_connections:
             self.library_connections.remove(websocket)
 
@@ -163,30 +207,33 @@ class ConnectionManager:
         if not self.scraping_connections:
             return
 
-        for connection in self.scraping_connections:
-            try:
-                await connection.send_json(
-                    {"type": "metrics", "data": self.scraping_metrics}
-                )
-            except WebSocketDisconnect:
-                self.disconnect(connection)
+        self.scraping_hub.publish(
+            {"type": "metrics", "data": dict(self.scraping_metrics)}, key="metrics"
+        )
 
     async def broadcast_scraping_update(self, update: dict):
+        await self.broadcast_scraping_message("scraping_progress", update)
+
+    async def broadcast_scraping_message(self, message_type: str, data: dict):
+        """
+        Broadcast a message to scraping clients without waiting on them.
+
+        Progress of a crawl job is coalesced per job; any other message for
+        the job replaces its pending progress and is sent at once.
+        """
         if not self.scraping_connections:
-            logging.info("No scraping connections available for broadcast")
+            logging.debug("No scraping connections available for broadcast")
             return
 
-        logging.info(
-            f"Broadcasting scraping update to {len(self.scraping_connections)} connections: {update}"
+        logging.debug(
+            f"Broadcasting {message_type} to {len(self.scraping_connections)} connections: {data}"
+        )
+        job_id = data.get("job_id")
+        self.scraping_hub.publish(
+            {"type": message_type, "data": data},
+            key=f"job:{job_id}" if job_id else None,
+            urgent=message_type != "scraping_progress",
         )
-        for connection in self.scraping_connections:
-            try:
-                await connection.send_json(
-                    {"type": "scraping_progress", "data": update}
-                )
-            except WebSocketDisconnect:
-                logging.warning("WebSocket disconnected during broadcast")
-                self.disconnect(connection)
 
     def update_metrics(self, status: str):
         self.scraping_metrics["pages_scraped"] += 1
@@ -216,6 +263,142 @@ app.mount("/static", StaticFiles(directory="static"), name="static")
 manager = ConnectionManager()
 
 
+async def _publish_crawl_job(job: Job) -> None:
+    """Mirror a crawl job's state into the scraping status and websockets."""
+    running = crawl_jobs.list_jobs(kind="crawl", status=JobStatus.RUNNING)
+    if running:
+        manager.scraping_status.update(
+            {
+                "is_running": True,
+                "current_url": running[-1].params.get("url"),
+                "progress": running[-1].progress,
+            }
+        )
+    else:
+        manager.scraping_status.update(
+            {"is_running": False, "current_url": "", "progress": job.progress}
+        )
+    manager.scraping_status["active_jobs"] = len(crawl_jobs.active_jobs("crawl"))
+
+    data = job.to_dict()
+    if job.status is JobStatus.COMPLETED:
+        await manager.broadcast_scraping_message(
+            "scraping_complete", {**data, **(job.result or {})}
+        )
+    elif job.status is JobStatus.FAILED:
+        await manager.broadcast_scraping_message("scraping_error", data)
+    else:
+        await manager.broadcast_scraping_update(data)
+
+
+# Background crawls started by POST /crawl
+crawl_jobs = JobScheduler(
+    max_workers=int(os.environ.get("LIB2DOCSCRAPE_CRAWL_WORKERS", "2")),
+    on_update=_publish_crawl_job,
+)
+
+# Per-stage crawl latencies served on /metrics
+stage_metrics.enabled = os.environ.get("LIB2DOCSCRAPE_STAGE_METRICS", "1") != "0"
+
+
+def _create_backend(backend_type: str):
+    """Create the crawl backend named in a /crawl request."""
+    if backend_type == "crawl4ai":
+        return Crawl4AIBackend()
+    if backend_type == "file":
+        return FileBackend()
+    if backend_type in ("lightpanda", "hybrid"):
+        try:
+            browser = LightpandaBackend()
+        except Exception as e:
+            raise HTTPException(
+                status_code=500,
+                detail=f"Failed to initialize Lightpanda backend: {str(e)}",
+            ) from e
+        if backend_type == "hybrid":
+            # Only pages that plain HTTP cannot render go to the browser
+            return HybridBackend(browser_backend=browser)
+        return browser
+    raise HTTPException(status_code=400, detail="Invalid backend type")
+
+
+async def _submit_crawl(request: dict, response: Response) -> dict[str, Any]:
+    """
+    Validate a /crawl request and queue it as a background job.
+
+    Args:
+        request: Request body with url and optional backend, max_depth and
+            priority
+        response: Response whose status is set to 202 once the job is queued
+
+    Returns:
+        The queued job's IDs, or an error status
+    """
+    try:
+        url = request.get("url")
+        if not url:
+            raise HTTPException(status_code=400, detail="URL is required")
+
+        backend_type = request.get("backend", "crawl4ai")
+        max_depth = request.get("max_depth", 10)
+        priority = int(request.get("priority", 0))
+        backend = _create_backend(backend_type)
+
+        async def crawl_task(context: JobContext) -> dict[str, Any]:
+            await context.update(progress=0, pages_crawled=0)
+            results = await backend.crawl(url, max_depth=max_depth)
+
+            scraping_id = context.job.job_id.replace("crawl_", "scrape_", 1)
+            scraping_results_storage[scraping_id] = {
+                "scraping_id": scraping_id,
+                "timestamp": datetime.now().isoformat(),
+                "url": url,
+                "status": "completed",
+                "results": [result.model_dump() for result in results],
+            }
+            await context.update(progress=100, pages_crawled=len(results))
+            return {"scraping_id": scraping_id, "page_count": len(results)}
+
+        job = await crawl_jobs.submit(
+            "crawl",
+            crawl_task,
+            priority=priority,
+            params={"url": url, "backend": backend_type, "max_depth": max_depth},
+        )
+    except (HTTPException, JobQueueFullError, ValueError) as e:
+        message = e.detail if isinstance(e, HTTPException) else str(e)
+        logging.error(f"Error starting crawl: {message}")
+        return {"status": "error", "message": message}
+
+    response.status_code = 202
+    response.headers["Location"] = f"/api/libraries/operation/{job.job_id}"
+    return {
+        "status": "accepted",
+        "job_id": job.job_id,
+        "operation_id": job.job_id,
+        "status_url": f"/api/libraries/operation/{job.job_id}",
+    }
+
+
+def _get_operation_status(operation_id: str) -> dict[str, Any]:
+    """Get the status of a crawl job or library operation."""
+    job = crawl_jobs.get(operation_id)
+    if job is not None:
+        return job.to_dict()
+    if operation_id not in library_operations:
+        raise HTTPException(status_code=404, detail="Operation not found")
+    return library_operations[operation_id]
+
+
+async def _cancel_crawls(job_id: Optional[str] = None) -> list[str]:
+    """Cancel one crawl job, or every unfinished one; returns the IDs cancelled."""
+    if job_id is not None:
+        job_ids = [job_id]
+    else:
+        job_ids = [job.job_id for job in crawl_jobs.active_jobs("crawl")]
+    return [job_id for job_id in job_ids if await crawl_jobs.cancel(job_id)]
+
+
 # Basic routes for testing and default functionality
 @app.get("/", response_class=HTMLResponse)
 async def home(request: Request):
@@ -241,7 +424,7 @@ async def get_available_backends():
             check=False,
         )
         if result.returncode == 0:
-            backends.append("lightpanda")
+            backends.extend(["lightpanda", "hybrid"])
     except (FileNotFoundError, subprocess.SubprocessError):
         pass
 
@@ -254,21 +437,121 @@ async def get_scraping_status():
     return manager.scraping_status
 
 
-@app.get("/api/scraping/results")
-async def list_scraping_results():
-    """Get all scraping results."""
-    return [
-        {
-            "id": result_id,
-            "url": data.get("url", ""),
-            "title": data.get("title", ""),
-            "status": data.get("status", "unknown"),
-            "timestamp": data["timestamp"].isoformat()
-            if isinstance(data.get("timestamp"), datetime)
-            else data.get("timestamp"),
-        }
-        for result_id, data in scraping_results_storage.items()
+def _serialize_datetimes(result: dict[str, Any]) -> dict[str, Any]:
+    """Convert the datetimes of a stored result to ISO strings."""
+    if isinstance(result.get("timestamp"), datetime):
+        result["timestamp"] = result["timestamp"].isoformat()
+
+    # Also serialize datetime in nested structures if necessary, for example, in 'results' list
+    if "results" in result and isinstance(result["results"], list):
+        for item in result["results"]:
+            _serialize_page_datetimes(item)
+    return result
+
+
+def _serialize_page_datetimes(item: dict[str, Any]) -> dict[str, Any]:
+    """Convert the datetimes of a stored result page to ISO strings."""
+    if isinstance(item.get("timestamp"), datetime):
+        item["timestamp"] = item["timestamp"].isoformat()
+    if isinstance(item.get("content"), dict) and isinstance(
+        item["content"].get("last_modified"), datetime
+    ):
+        item["content"]["last_modified"] = item["content"]["last_modified"].isoformat()
+    return item
+
+
+def _list_results(
+    response: Response,
+    limit: Optional[int],
+    cursor: Optional[str],
+    fields: Optional[str],
+    default_fields: list[str],
+) -> list[dict[str, Any]]:
+    """
+    List stored result summaries, one page at a time if limit is given.
+
+    The cursor of the next page is returned in the X-Next-Cursor header.
+
+    Args:
+        response: Response to add the cursor header to
+        limit: Maximum number of summaries
+        cursor: Cursor from a previous X-Next-Cursor header
+        fields: Comma-separated summary fields to include
+        default_fields: Fields included when fields is not given
+
+    Returns:
+        Result summaries
+    """
+    if limit is not None and limit < 1:
+        raise HTTPException(status_code=400, detail="limit must be positive")
+    requested = (
+        [field.strip() for field in fields.split(",") if field.strip()]
+        if fields
+        else default_fields
+    )
+    try:
+        summaries, next_cursor = scraping_results_storage.list_summaries(
+            limit=limit, cursor=cursor, fields=requested
+        )
+    except ValueError as e:
+        raise HTTPException(status_code=400, detail="Invalid cursor") from e
+
+    if next_cursor is not None:
+        response.headers["X-Next-Cursor"] = next_cursor
+    for summary in summaries:
+        if isinstance(summary.get("timestamp"), datetime):
+            summary["timestamp"] = summary["timestamp"].isoformat()
+    return summaries
+
+
+def _get_result(scraping_id: str, include_pages: bool) -> dict[str, Any]:
+    """Get a stored result, optionally without its pages."""
+    if not include_pages:
+        summary = scraping_results_storage.get_summary(scraping_id)
+        if summary is None:
+            raise HTTPException(status_code=404, detail="Scraping results not found")
+        return _serialize_datetimes(summary)
+
+    if scraping_id not in scraping_results_storage:
+        raise HTTPException(status_code=404, detail="Scraping results not found")
+    return _serialize_datetimes(scraping_results_storage[scraping_id])
+
+
+def _get_result_pages(scraping_id: str, offset: int, limit: int) -> dict[str, Any]:
+    """Get one page of the scraped pages of a stored result."""
+    summary = scraping_results_storage.get_summary(scraping_id)
+    if summary is None:
+        raise HTTPException(status_code=404, detail="Scraping results not found")
+    if offset < 0 or limit < 1:
+        raise HTTPException(status_code=400, detail="Invalid offset or limit")
+
+    pages = [
+        _serialize_page_datetimes(page)
+        for page in scraping_results_storage.iter_pages(scraping_id, offset, limit)
     ]
+    return {
+        "scraping_id": scraping_id,
+        "offset": offset,
+        "total": summary["pages_processed"],
+        "results": pages,
+    }
+
+
+@app.get("/api/scraping/results")
+async def list_scraping_results(
+    response: Response,
+    limit: Optional[int] = None,
+    cursor: Optional[str] = None,
+    fields: Optional[str] = None,
+):
+    """List stored scraping results, paginated when a limit is given."""
+    return _list_results(
+        response,
+        limit,
+        cursor,
+        fields,
+        default_fields=["id", "url", "title", "status", "timestamp"],
+    )
 
 
 @app.get("/api/scraping/download/json")
@@ -277,8 +560,9 @@ async def download_results_json():
     if not scraping_results_storage:
         raise HTTPException(status_code=500, detail="No scraping results available")
 
-    return JSONResponse(
-        content=scraping_results_storage,
+    return StreamingResponse(
+        iter_json_object(scraping_results_storage.items()),
+        media_type="application/json",
         headers={"Content-Disposition": "attachment; filename=scraping_results.json"},
     )
 
@@ -303,6 +587,8 @@ async def scraping_websocket_endpoint(websocket: WebSocket):
                 )
                 # Also broadcast to other connected clients
                 await manager.broadcast_scraping_update(data["data"])
+            elif data["type"] == "stop_scraping":
+                await _cancel_crawls(data.get("job_id"))
     except WebSocketDisconnect:
         manager.disconnect(websocket)
 
@@ -329,31 +615,17 @@ async def store_scraping_results(results: dict):
 
 
 @app.get("/api/scraping/results/{scraping_id}")
-async def get_scraping_results(scraping_id: str):
-    """Get scraping results by ID."""
-    if scraping_id not in scraping_results_storage:
-        raise HTTPException(status_code=404, detail="Scraping results not found")
-
-    # Ensure datetime is serialized
-    result = scraping_results_storage[scraping_id]
-    if isinstance(result.get("timestamp"), datetime):
-        result["timestamp"] = result["timestamp"].isoformat()
+async def get_scraping_results(scraping_id: str, include_pages: bool = True):
+    """Get scraping results by ID, optionally without the scraped pages."""
+    return _get_result(scraping_id, include_pages)
 
-    # Also serialize datetime in nested structures if necessary, for example, in 'results' list
-    if "results" in result and isinstance(result["results"], list):
-        for item in result["results"]:
-            if isinstance(
-                item.get("timestamp"), datetime
-            ):  # Assuming items might have timestamps
-                item["timestamp"] = item["timestamp"].isoformat()
-            if isinstance(item.get("content"), dict) and isinstance(
-                item["content"].get("last_modified"), datetime
-            ):
-                item["content"]["last_modified"] = item["content"][
-                    "last_modified"
-                ].isoformat()
 
-    return result
+@app.get("/api/scraping/results/{scraping_id}/pages")
+async def get_scraping_result_pages(
+    scraping_id: str, offset: int = 0, limit: int = 100
+):
+    """Get a range of the scraped pages of a result."""
+    return _get_result_pages(scraping_id, offset, limit)
 
 
 @app.post("/api/libraries/{package_name}")
@@ -472,32 +744,32 @@ async def remove_library_docs(package_name: str, background_tasks: BackgroundTas
 
 @app.get("/api/libraries/operation/{operation_id}")
 async def get_library_operation_status(operation_id: str):
-    """Get status of a library operation."""
-    if operation_id not in library_operations:
-        raise HTTPException(status_code=404, detail="Operation not found")
-
-    return library_operations[operation_id]
+    """Get status of a library operation or crawl job."""
+    return _get_operation_status(operation_id)
 
 
 @app.post("/api/scraping/stop")
-async def stop_scraping():
-    """Stop the current scraping operation."""
-    global is_scraping
-
-    if not is_scraping:
+async def stop_scraping(request: Optional[dict] = Body(default=None)):
+    """Cancel a crawl job by job_id, or every queued and running crawl."""
+    job_id = (request or {}).get("job_id")
+    cancelled = await _cancel_crawls(job_id)
+    if not cancelled:
         raise HTTPException(status_code=400, detail="No scraping operation in progress")
 
-    is_scraping = False
-    manager.scraping_status.update(
-        {"is_running": False, "current_url": "", "progress": 0}
-    )
-
     # Broadcast stop message
     await manager.broadcast_scraping_update(
-        {"type": "stopped", "message": "Scraping operation stopped by user"}
+        {
+            "type": "stopped",
+            "message": "Scraping operation stopped by user",
+            "job_ids": cancelled,
+        }
     )
 
-    return {"status": "success", "message": "Scraping stopped"}
+    return {
+        "status": "success",
+        "message": "Scraping stopped",
+        "cancelled": cancelled,
+    }
 
 
 @app.post("/api/benchmark/start")
@@ -650,73 +922,23 @@ async def test_endpoint():
 
 
 @app.post("/crawl")
-async def start_crawl(request: dict):
-    """Start a crawl for a given URL."""
-    global is_scraping
-
-    try:
-        url = request.get("url")
-        if not url:
-            raise HTTPException(status_code=400, detail="URL is required")
-
-        backend_type = request.get("backend", "crawl4ai")
-        max_depth = request.get("max_depth", 10)
-
-        is_scraping = True
-        manager.scraping_status.update(
-            {"is_running": True, "current_url": url, "progress": 0}
-        )
-
-        # Create a backend based on selection
-        backend = None
-        if backend_type == "crawl4ai":
-            backend = Crawl4AIBackend()
-        elif backend_type == "file":
-            from .backends.file import FileBackend
-
-            backend = FileBackend()
-        elif backend_type == "lightpanda":
-            try:
-                backend = LightpandaBackend()
-            except Exception as e:
-                raise HTTPException(
-                    status_code=500,
-                    detail=f"Failed to initialize Lightpanda backend: {str(e)}",
-                ) from e
-        else:
-            raise HTTPException(status_code=400, detail="Invalid backend type")
+async def start_crawl(request: dict, response: Response):
+    """Queue a crawl for a given URL; progress is reported per job."""
+    return await _submit_crawl(request, response)
 
-        # Start crawling
-        results = await backend.crawl(url, max_depth=max_depth)
 
-        # Store results
-        scraping_id = f"scrape_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-        scraping_results_storage[scraping_id] = {
-            "scraping_id": scraping_id,
-            "timestamp": datetime.now().isoformat(),
-            "url": url,
-            "status": "completed",
-            "results": [result.model_dump() for result in results],
-        }
+@app.get("/api/scraping/jobs")
+async def list_crawl_jobs(status: Optional[JobStatus] = None):
+    """List queued, running and recently finished crawl jobs."""
+    return [job.to_dict() for job in crawl_jobs.list_jobs("crawl", status)]
 
-        # Update status
-        is_scraping = False
-        manager.scraping_status.update(
-            {"is_running": False, "current_url": "", "progress": 100}
-        )
 
-        return {
-            "status": "success",
-            "scraping_id": scraping_id,
-            "results": [result.model_dump() for result in results],
-        }
-    except Exception as e:
-        is_scraping = False
-        manager.scraping_status.update(
-            {"is_running": False, "current_url": "", "progress": 0}
-        )
-        logging.error(f"Error during crawl: {str(e)}", exc_info=True)
-        return {"status": "error", "message": str(e)}
+@app.get("/metrics")
+async def openmetrics():
+    """Crawl stage latency histograms in the OpenMetrics text format."""
+    return Response(
+        stage_metrics.render_openmetrics(), media_type=OPENMETRICS_CONTENT_TYPE
+    )
 
 
 # CLI Functions
@@ -846,88 +1068,62 @@ def create_app(config_path: Optional[str] = None) -> FastAPI:
         return manager.scraping_status
 
     @app.get("/api/scraping/results")
-    async def list_scraping_results():
-        """Get all scraping results."""
+    async def list_scraping_results(
+        response: Response,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[str] = None,
+    ):
+        """List stored scraping results, paginated when a limit is given."""
+        summaries = _list_results(
+            response,
+            limit,
+            cursor,
+            fields,
+            default_fields=["id", "timestamp", "url", "status", "pages_processed"],
+        )
+        # This API names the ID field scraping_id
         return [
-            {
-                "scraping_id": scraping_id,
-                "timestamp": data["timestamp"].isoformat()
-                if isinstance(data.get("timestamp"), datetime)
-                else data.get("timestamp"),
-                "url": data.get("url"),  # Use .get() for safety
-                "status": data.get("status"),  # Use .get() for safety
-                "pages_processed": len(data.get("results", [])),
-            }
-            for scraping_id, data in scraping_results_storage.items()
+            {("scraping_id" if key == "id" else key): value for key, value in s.items()}
+            for s in summaries
         ]
 
     @app.get("/api/scraping/results/{scraping_id}")
-    async def get_scraping_results(scraping_id: str):
-        """Get scraping results by ID."""
-        if scraping_id not in scraping_results_storage:
-            raise HTTPException(status_code=404, detail="Scraping results not found")
+    async def get_scraping_results(scraping_id: str, include_pages: bool = True):
+        """Get scraping results by ID, optionally without the scraped pages."""
+        return _get_result(scraping_id, include_pages)
 
-        # Ensure datetime is serialized
-        result = scraping_results_storage[scraping_id]
-        if isinstance(result.get("timestamp"), datetime):
-            result["timestamp"] = result["timestamp"].isoformat()
-
-        # Also serialize datetime in nested structures if necessary, for example, in 'results' list
-        if "results" in result and isinstance(result["results"], list):
-            for item in result["results"]:
-                if isinstance(
-                    item.get("timestamp"), datetime
-                ):  # Assuming items might have timestamps
-                    item["timestamp"] = item["timestamp"].isoformat()
-                if isinstance(item.get("content"), dict) and isinstance(
-                    item["content"].get("last_modified"), datetime
-                ):
-                    item["content"]["last_modified"] = item["content"][
-                        "last_modified"
-                    ].isoformat()
-
-        return result
+    @app.get("/api/scraping/results/{scraping_id}/pages")
+    async def get_scraping_result_pages(
+        scraping_id: str, offset: int = 0, limit: int = 100
+    ):
+        """Get a range of the scraped pages of a result."""
+        return _get_result_pages(scraping_id, offset, limit)
 
     @app.get("/api/scraping/download/{format}")
     async def download_results(format: str):
-        """Download scraping results in specified format."""
-        if format not in ["json", "markdown", "html"]:
+        """Download the latest scraping results in the specified format."""
+        if format not in DOWNLOAD_MEDIA_TYPES:
             raise HTTPException(status_code=400, detail="Invalid format specified")
 
-        try:
-            if not scraping_results_storage:
-                raise HTTPException(
-                    status_code=404, detail="No scraping results available"
-                )
+        if not scraping_results_storage:
+            raise HTTPException(status_code=404, detail="No scraping results available")
 
-            latest_id = max(scraping_results_storage.keys())
-            results = scraping_results_storage[latest_id]
-
-            if format == "json":
-                return JSONResponse(content=results)
-            elif format == "markdown":
-                markdown_content = "# Documentation Export\n\n"
-                for doc in results["results"]:
-                    markdown_content += (
-                        f"## {doc.get('content', {}).get('title', 'Untitled')}\n\n"
-                    )
-                    markdown_content += f"{doc.get('content', {}).get('text', '')}\n\n"
-                return PlainTextResponse(content=markdown_content)
-            else:  # html
-                html_content = "<html><body>"
-                for doc in results["results"]:
-                    html_content += (
-                        f"<h2>{doc.get('content', {}).get('title', 'Untitled')}</h2>"
-                    )
-                    html_content += (
-                        f"<div>{doc.get('content', {}).get('text', '')}</div>"
-                    )
-                html_content += "</body></html>"
-                return HTMLResponse(content=html_content)
+        latest_id = scraping_results_storage.latest_id()
+        # Chunks are generated, and pages loaded, as the response is sent
+        if format == "json":
+            chunks = iter_json_result(
+                scraping_results_storage.get_summary(latest_id),
+                scraping_results_storage.iter_pages(latest_id),
+            )
+        elif format == "ndjson":
+            chunks = iter_ndjson(scraping_results_storage.iter_pages(latest_id))
+        elif format == "markdown":
+            chunks = iter_markdown(scraping_results_storage.iter_pages(latest_id))
+        else:  # html
+            chunks = iter_html(scraping_results_storage.iter_pages(latest_id))
 
-        except Exception as e:
-            logging.error(f"Error downloading results: {str(e)}")
-            raise HTTPException(status_code=500, detail=str(e)) from e
+        return StreamingResponse(chunks, media_type=DOWNLOAD_MEDIA_TYPES[format])
 
     @app.get("/libraries", response_class=HTMLResponse)
     async def libraries(request: Request):
@@ -945,71 +1141,9 @@ def create_app(config_path: Optional[str] = None) -> FastAPI:
             manager.disconnect(websocket)
 
     @app.post("/crawl")
-    async def start_crawl(request: dict):
-        """Start a crawl for a given URL."""
-        global is_scraping
-
-        try:
-            url = request.get("url")
-            if not url:
-                raise HTTPException(status_code=400, detail="URL is required")
-
-            backend_type = request.get("backend", "crawl4ai")
-            max_depth = request.get("max_depth", 10)
-
-            is_scraping = True
-            manager.scraping_status.update(
-                {"is_running": True, "current_url": url, "progress": 0}
-            )
-
-            # Create a backend based on selection
-            backend = None
-            if backend_type == "crawl4ai":
-                backend = Crawl4AIBackend()
-            elif backend_type == "file":
-                backend = FileBackend()
-            elif backend_type == "lightpanda":
-                try:
-                    backend = LightpandaBackend()
-                except Exception as e:
-                    raise HTTPException(
-                        status_code=500,
-                        detail=f"Failed to initialize Lightpanda backend: {str(e)}",
-                    ) from e
-            else:
-                raise HTTPException(status_code=400, detail="Invalid backend type")
-
-            # Start crawling
-            results = await backend.crawl(url, max_depth=max_depth)
-
-            # Store results
-            scraping_id = f"scrape_{datetime.now().strftime('%Y%m%d%H%M%S')}"
-            scraping_results_storage[scraping_id] = {
-                "scraping_id": scraping_id,
-                "timestamp": datetime.now().isoformat(),  # Ensure stored as ISO string
-                "url": url,
-                "status": "completed",
-                "results": [result.model_dump() for result in results],
-            }
-
-            # Update status
-            is_scraping = False
-            manager.scraping_status.update(
-                {"is_running": False, "current_url": "", "progress": 100}
-            )
-
-            return {
-                "status": "success",
-                "scraping_id": scraping_id,
-                "results": [result.model_dump() for result in results],
-            }
-        except Exception as e:
-            is_scraping = False
-            manager.scraping_status.update(
-                {"is_running": False, "current_url": "", "progress": 0}
-            )
-            logging.error(f"Error during crawl: {str(e)}", exc_info=True)
-            return {"status": "error", "message": str(e)}
+    async def start_crawl(request: dict, response: Response):
+        """Queue a crawl for a given URL; progress is reported per job."""
+        return await _submit_crawl(request, response)
 
     @app.post("/api/scraping/results")
     async def store_scraping_results(results: dict):
@@ -1151,23 +1285,50 @@ def create_app(config_path: Optional[str] = None) -> FastAPI:
 
     @app.get("/api/libraries/operation/{operation_id}")
     async def get_library_operation_status(operation_id: str):
-        """Get status of a library operation."""
-        if operation_id not in library_operations:
-            raise HTTPException(status_code=404, detail="Operation not found")
-
-        return library_operations[operation_id]
+        """Get status of a library operation or crawl job."""
+        return _get_operation_status(operation_id)
 
     return app
 
 
 async def run_crawler(
-    crawler: DocumentationCrawler, targets: list[CrawlTarget]
+    crawler: DocumentationCrawler,
+    targets: list[CrawlTarget],
+    export_format: str = "json",
 ) -> None:
-    """Run crawler for specified targets."""
+    """
+    Run crawler for specified targets.
+
+    With export_format "parquet" or "arrow", pages, issues and metrics are
+    written to a crawl_result_* directory in row groups while the crawl runs
+    instead of to a single JSON file at the end.
+    """
+    metrics = getattr(crawler, "stage_metrics", None)
+    if not isinstance(metrics, StageMetrics) or not metrics.enabled:
+        metrics = None
     try:
         for target in targets:
             logging.info(f"Starting crawl for target: {target.url}")
-            result = await crawler.crawl(target)
+            if metrics is not None:
+                metrics.reset()
+            exporter = None
+            if export_format != "json":
+                exporter = CrawlResultExporter(
+                    f"crawl_result_{datetime.now():%Y%m%d_%H%M%S}",
+                    format=export_format,
+                )
+                crawler.result_listeners.append(exporter.add_result)
+            result = None
+            try:
+                result = await crawler.crawl(target)
+            finally:
+                if exporter is not None:
+                    crawler.result_listeners.remove(exporter.add_result)
+                    # Write the file footers even if the crawl failed, so the
+                    # pages exported so far stay readable
+                    exporter.close(
+                        target=target, stats=result.stats if result else None
+                    )
 
             logging.info(f"Crawl completed for {target.url}")
             logging.info(f"Pages crawled: {result.stats.pages_crawled}")
@@ -1177,9 +1338,13 @@ async def run_crawler(
             logging.info(
                 f"Average time per page: {result.stats.average_time_per_page:.2f}s"
             )
+            if metrics is not None:
+                logging.info(f"Stage latencies:\n{metrics.format_summary()}")
 
             # Output results
-            from datetime import datetime
+            if exporter is not None:
+                logging.info(f"Results exported to {exporter.output_dir}")
+                continue
 
             start_time = (
                 datetime.fromtimestamp(result.stats.start_time)
@@ -1226,6 +1391,12 @@ Environment Variables:
   LIB2DOCSCRAPE_LOG_LEVEL Override logging level (DEBUG, INFO, WARNING, ERROR)
   LIB2DOCSCRAPE_OUTPUT_DIR Directory for scraped documentation
   LIB2DOCSCRAPE_CACHE_DIR  Directory for caching scraped content
+  LIB2DOCSCRAPE_RESULTS_STORE Web interface results store ("memory" or
+                          sqlite:///path, default sqlite:///scraping_results.db)
+  LIB2DOCSCRAPE_CRAWL_WORKERS Number of web interface crawls run at once
+                          (default 2)
+  LIB2DOCSCRAPE_STAGE_METRICS Set to 0 to stop recording per-stage crawl
+                          latencies (served on /metrics)
 
 Examples:
   # Basic usage with default config
@@ -1328,6 +1499,26 @@ Only used when --distributed is specified.""",
     scrape_parser.add_argument(
         "-o", "--output", type=str, help="Output file for scraped content"
     )
+    scrape_parser.add_argument(
+        "--export-format",
+        choices=["json", "parquet", "arrow"],
+        default="json",
+        help="""Format of crawl results (default: json).
+parquet and arrow write pages, issues and metrics tables while crawling
+and require the pyarrow package.""",
+    )
+    scrape_parser.add_argument(
+        "--trace-file",
+        type=str,
+        help="""Write a span per crawled page, backend request and processing
+step to this file as OpenTelemetry (OTLP/JSON) spans, one per line.""",
+    )
+    scrape_parser.add_argument(
+        "--chrome-trace",
+        type=str,
+        help="""Write the spans to this file as a Chrome trace, viewable as a
+flame timeline in chrome://tracing or https://ui.perfetto.dev.""",
+    )
 
     # Multi-source scraping subcommand
     scrape_subparsers = scrape_parser.add_subparsers(
@@ -1817,6 +2008,8 @@ async def run_benchmark(args) -> None:
 
                 lightpanda_backend = LightpandaBackend(config=LightpandaConfig())
                 benchmark.register_backend(lightpanda_backend)
+            elif backend_name == "hybrid":
+                benchmark.register_backend(HybridBackend())
             elif backend_name == "file":
                 from .backends.file_backend import FileBackend
 
@@ -2621,8 +2814,21 @@ def main() -> None:
 
                 # Run as standard CLI crawler
                 logging.info("Running with standard crawler")
+                tracer = configure_tracing(
+                    getattr(args, "trace_file", None),
+                    getattr(args, "chrome_trace", None),
+                )
                 crawler = setup_crawler(config)
-                asyncio.run(run_crawler(crawler, targets))
+                try:
+                    asyncio.run(
+                        run_crawler(
+                            crawler,
+                            targets,
+                            export_format=getattr(args, "export_format", "json"),
+                        )
+                    )
+                finally:
+                    tracer.shutdown()
 
         elif args.command == "serve":
             # Run as web server
@@ -2,24 +2,55 @@ import hashlib
 import json
 import logging
 import re
-from dataclasses import asdict
+from collections.abc import Mapping
+from dataclasses import fields
 from datetime import datetime
 from typing import Any, Optional
 from urllib.parse import urlparse
 from uuid import uuid4
 
-from pydantic import BaseModel, Field, field_validator
+from pydantic import BaseModel, ConfigDict, Field, PrivateAttr, field_validator
 
 from ..processors.content.models import ProcessedContent
+from ..utils.tracing import traced
+from .minhash import LSHIndex, MinHasher, choose_rows_per_band
+from .version_store import (
+    ChunkStore,
+    EncodedContent,
+    StoredContent,
+    manifest_hash,
+    release_manifest,
+)
+
+# Fields of a processed document that do not count as a content change
+VERSION_HASH_EXCLUDED_FIELDS = ("errors", "timestamp")
 
 
 class DocumentVersion(BaseModel):
-    """Model for document version."""
+    """Model for document version.
+
+    Versions created by DocumentMetadata.add_version keep a manifest of
+    chunks in a shared ChunkStore; versions built directly may still pass
+    their content inline as ``changes``.
+    """
+
+    model_config = ConfigDict(populate_by_name=True)
 
     version_id: str
     timestamp: datetime
     hash: str
-    changes: dict[str, Any]
+    inline_changes: Optional[dict[str, Any]] = Field(default=None, alias="changes")
+    manifest: Optional[dict[str, Any]] = None
+    _store: Optional[ChunkStore] = PrivateAttr(default=None)
+
+    @property
+    def changes(self) -> Mapping[str, Any]:
+        """Processed content of this version, decoded lazily from the store."""
+        if self.inline_changes is not None:
+            return self.inline_changes
+        if self.manifest is None or self._store is None:
+            return {}
+        return StoredContent(self.manifest, self._store)
 
     @field_validator("version_id")
     def validate_version_id(cls, v: str) -> str:
@@ -29,6 +60,34 @@ class DocumentVersion(BaseModel):
         return v
 
 
+class _SearchView:
+    """Lowercased text of a document version that search matches against."""
+
+    __slots__ = ("version", "headings", "texts")
+
+    def __init__(self, version: DocumentVersion):
+        """
+        Decode the searched fields of a version once.
+
+        Args:
+            version: Latest version of the document
+        """
+        self.version = version
+        changes = version.changes
+        headings = changes["headings"] if "headings" in changes else []
+        self.headings = [
+            heading["title"].lower()
+            for heading in headings
+            if isinstance(heading, dict) and "title" in heading
+        ]
+        content = changes["content"] if "content" in changes else None
+        self.texts = []
+        if isinstance(content, dict):
+            for key in ("formatted_content", "text"):
+                if key in content:
+                    self.texts.append(content[key].lower())
+
+
 class DocumentMetadata(BaseModel):
     """Model for document metadata."""
 
@@ -43,45 +102,44 @@ class DocumentMetadata(BaseModel):
 
     def add_version(self, processed_content_dict: dict[str, Any]) -> None:
         """Add new version if content has changed, using a dict representation of ProcessedContent."""
-        # Hash based on the structured content for better change detection
-        # Use json.dumps for consistent hashing of the dictionary
-        try:
-            # Exclude fields that might change without semantic difference (like errors) for hashing
-            hashable_dict = {
-                k: v for k, v in processed_content_dict.items() if k not in ["errors"]
-            }
-            content_str = json.dumps(hashable_dict, sort_keys=True)
-            version_hash = hashlib.sha256(content_str.encode()).hexdigest()
-        except TypeError as e:
-            # Fallback if json serialization fails (e.g., non-serializable objects)
-            version_hash = hashlib.sha256(
-                str(processed_content_dict).encode()
-            ).hexdigest()
-            logging.warning(
-                f"JSON serialization failed for hashing version content for URL {self.url}. Falling back to str(). Error: {e}"
-            )
+        # Versions share the organizer's chunk store when one is attached
+        store = getattr(self, "_chunk_store", None)
+        if store is None:
+            store = self._chunk_store = ChunkStore()
+
+        # Hash the manifest of chunk digests rather than re-serializing the
+        # whole document; errors and processing time are not content changes
+        encoded = EncodedContent(store)
+        manifest = encoded.encode(processed_content_dict)
+        version_hash = manifest_hash(manifest, exclude=VERSION_HASH_EXCLUDED_FIELDS)
 
         # Check if content has changed
         if not self.versions or self.versions[-1].hash != version_hash:
+            encoded.commit()
+            # Number after the latest version so IDs stay unique once old
+            # versions have been trimmed
             version_num = len(self.versions) + 1
+            if self.versions and self.versions[-1].version_id[1:].isdigit():
+                version_num = int(self.versions[-1].version_id[1:]) + 1
             version = DocumentVersion(
                 version_id=f"v{version_num}",
                 timestamp=datetime.now(),
                 hash=version_hash,
-                changes=processed_content_dict,  # Store the whole dict
+                manifest=manifest,
             )
+            version._store = store
             self.versions.append(version)
-            # Enforce max_versions_to_keep (assuming config is accessible or passed)
-            # Implement version limiting based on config.max_versions_to_keep
-            # Note: This assumes the DocumentOrganizer config is accessible through a parent reference
-            # If this method is called from DocumentOrganizer.add_document, the limiting is handled there
-            # This is a fallback for direct calls to add_version
+            # Enforce max_versions_to_keep; DocumentOrganizer sets the limit
+            # from its config before adding versions
             max_versions = getattr(
                 self, "_max_versions_to_keep", 10
             )  # Default fallback
             if len(self.versions) > max_versions:
                 # Remove oldest versions to stay within limit
                 num_to_remove = len(self.versions) - max_versions
+                for removed in self.versions[:num_to_remove]:
+                    if removed._store is store:
+                        release_manifest(removed.manifest, store)
                 self.versions = self.versions[num_to_remove:]
 
             self.last_updated = version.timestamp
@@ -108,6 +166,11 @@ class OrganizationConfig(BaseModel):
     """Configuration for document organization."""
 
     min_similarity_score: float = 0.3
+    # Related-document lookup: longer signatures estimate similarity more
+    # precisely; a higher target recall finds more of the documents near
+    # min_similarity_score at the cost of more candidates to re-rank
+    minhash_permutations: int = 128
+    lsh_target_recall: float = 0.95
     max_versions_to_keep: int = 10
     index_chunk_size: int = 1000
     category_rules: dict[str, list[str]] = Field(default_factory=dict)
@@ -129,8 +192,27 @@ class DocumentOrganizer:
         self.url_to_doc_id: dict[str, str] = {}  # url -> doc_id mapping
         self.collections: dict[str, DocumentCollection] = {}
         self.search_indices: dict[str, dict[str, Any]] = {}
+        self.chunk_store = ChunkStore()  # Version content shared by all documents
+        # Decoded text of each document's latest version, for search
+        self._search_views: dict[str, _SearchView] = {}
         self._setup_default_categories()
 
+        # Similarity index for related-document lookups
+        self._term_sets: dict[str, frozenset[str]] = {}  # doc_id -> index terms
+        self._minhasher = MinHasher(self.config.minhash_permutations)
+        rows_per_band = choose_rows_per_band(
+            self.config.minhash_permutations,
+            self.config.min_similarity_score,
+            self.config.lsh_target_recall,
+        )
+        # Thresholds too low for banding to reach the recall target (such as
+        # 0.0) are served by comparing against every document
+        self._lsh: Optional[LSHIndex] = (
+            LSHIndex(self.config.minhash_permutations, rows_per_band)
+            if rows_per_band is not None
+            else None
+        )
+
     async def organize(self, documents: list[Any]) -> dict[str, Any]:
         """
         Organize a list of documents into a meaningful structure.
@@ -447,6 +529,22 @@ class DocumentOrganizer:
             self.search_indices["code"] = {}
         self.search_indices["code"][doc_id] = code_contents
 
+    def _content_fields(self, content: ProcessedContent) -> dict[str, Any]:
+        """
+        Get the fields of processed content for versioning.
+
+        The version store copies what it keeps, so unlike ``asdict`` this
+        does not deep-copy the content first.
+
+        Args:
+            content: Processed document content
+
+        Returns:
+            Dictionary of field names to values
+        """
+        return {field.name: getattr(content, field.name) for field in fields(content)}
+
+    @traced("organizer.add_document")
     def add_document(self, content: ProcessedContent) -> str:
         """
         Add or update a document in the organizer. If a document with the same URL
@@ -469,27 +567,19 @@ class DocumentOrganizer:
             doc = self.documents[existing_doc_id]
             # Ensure the document has the current max versions limit
             doc._max_versions_to_keep = self.config.max_versions_to_keep
-            # Convert ProcessedContent to dict before adding version
-            content_dict = asdict(content)
-            # Store previous version count to check if a new one was added
-            prev_version_count = len(doc.versions)
-            doc.add_version(content_dict)
+            doc._chunk_store = self.chunk_store
+            # Store previous version to check if a new one was added
+            prev_version = doc.versions[-1] if doc.versions else None
+            doc.add_version(self._content_fields(content))
             # If a new version was added, update search index
-            if len(doc.versions) > prev_version_count:
+            if doc.versions and doc.versions[-1] is not prev_version:
                 logging.info(
                     f"Added new version {doc.versions[-1].version_id} for existing document: {normalized_url} (ID: {existing_doc_id})"
                 )
-                # Trim old versions if limit exceeded
-                if len(doc.versions) > self.config.max_versions_to_keep:
-                    num_to_trim = len(doc.versions) - self.config.max_versions_to_keep
-                    logging.debug(
-                        f"Trimming {num_to_trim} old versions for {normalized_url}. Count before: {len(doc.versions)}, Max: {self.config.max_versions_to_keep}"
-                    )
-                    doc.versions = doc.versions[num_to_trim:]
-                    logging.debug(f"Version count after trimming: {len(doc.versions)}")
                 self._update_search_indices(
                     existing_doc_id, content
                 )  # Update index even if only version was added
+                self._search_views[existing_doc_id] = _SearchView(doc.versions[-1])
             else:
                 logging.info(
                     f"Content unchanged for existing document: {normalized_url} (ID: {existing_doc_id}). No new version added."
@@ -522,15 +612,17 @@ class DocumentOrganizer:
             )
             # Set the max versions limit for this document
             doc._max_versions_to_keep = self.config.max_versions_to_keep
+            doc._chunk_store = self.chunk_store
             # Add the initial version using the dictionary representation
-            content_dict = asdict(content)
-            doc.add_version(content_dict)
+            doc.add_version(self._content_fields(content))
             self.documents[doc_id] = doc
             # Add to URL lookup map - critical for maintaining URL to document mapping
             self.url_to_doc_id[normalized_url] = doc_id
 
             # Update search indices for the new document
             self._update_search_indices(doc_id, content)
+            self._search_views[doc_id] = _SearchView(doc.versions[-1])
+            self._update_similarity_index(doc_id)
 
             return doc_id
 
@@ -627,42 +719,25 @@ class DocumentOrganizer:
 
             # Check for matches in document versions (especially headings)
             if metadata.versions:
-                latest_version = metadata.versions[-1]
-                if "headings" in latest_version.changes:
-                    for heading in latest_version.changes["headings"]:
-                        if isinstance(heading, dict) and "title" in heading:
-                            heading_lower = heading["title"].lower()
-                            # Check for exact phrase match in headings
-                            for phrase in query_phrases:
-                                if phrase in heading_lower:
-                                    score += 4  # Highest weight for heading matches
-                                    matches.append(f"Heading contains: {phrase}")
-                            # Check for individual term matches in headings
-                            for term in query_terms:
-                                if term in heading_lower:
-                                    score += 2
-                                    matches.append(f"Heading contains term: {term}")
-
-                # Check for matches in content text
-                if "content" in latest_version.changes and isinstance(
-                    latest_version.changes["content"], dict
-                ):
-                    content_dict = latest_version.changes["content"]
-                    # Check formatted content
-                    if "formatted_content" in content_dict:
-                        formatted_content = content_dict["formatted_content"].lower()
-                        for phrase in query_phrases:
-                            if phrase in formatted_content:
-                                score += 2
-                                matches.append(f"Content contains: {phrase}")
-
-                    # Check text content
-                    if "text" in content_dict:
-                        text_content = content_dict["text"].lower()
-                        for phrase in query_phrases:
-                            if phrase in text_content:
-                                score += 2
-                                matches.append(f"Content contains: {phrase}")
+                view = self._search_view(doc_id, metadata.versions[-1])
+                for heading_lower in view.headings:
+                    # Check for exact phrase match in headings
+                    for phrase in query_phrases:
+                        if phrase in heading_lower:
+                            score += 4  # Highest weight for heading matches
+                            matches.append(f"Heading contains: {phrase}")
+                    # Check for individual term matches in headings
+                    for term in query_terms:
+                        if term in heading_lower:
+                            score += 2
+                            matches.append(f"Heading contains term: {term}")
+
+                # Check for matches in formatted and plain content text
+                for text_content in view.texts:
+                    for phrase in query_phrases:
+                        if phrase in text_content:
+                            score += 2
+                            matches.append(f"Content contains: {phrase}")
 
             # If we have any matches or the document has relevant content, include it
             if score > 0 or index_term_matches:
@@ -673,6 +748,14 @@ class DocumentOrganizer:
         # Convert scores to float to match return type annotation
         return [(doc_id, float(score), matches) for doc_id, score, matches in results]
 
+    def _search_view(self, doc_id: str, version: DocumentVersion) -> _SearchView:
+        """Get the search view of a document's latest version."""
+        view = self._search_views.get(doc_id)
+        if view is None or view.version is not version:
+            # Versions changed outside add_document
+            view = self._search_views[doc_id] = _SearchView(version)
+        return view
+
     # _tokenize_text method is now redundant and can be removed
     # def _tokenize_text(self, text: str) -> List[str]:
     #     """Tokenize text into words."""
@@ -693,10 +776,30 @@ class DocumentOrganizer:
             return []
         return self.documents[doc_id].versions
 
+    def _update_similarity_index(self, doc_id: str) -> None:
+        """
+        Store a document's term set and MinHash signature for related lookups.
+
+        Args:
+            doc_id: Document ID
+        """
+        terms = frozenset(self.documents[doc_id].index_terms)
+        self._term_sets[doc_id] = terms
+
+        if self._lsh is not None:
+            signature = self._minhasher.signature(terms)
+            if signature is None:
+                self._lsh.remove(doc_id)
+            else:
+                self._lsh.add(doc_id, signature)
+
     def get_related_documents(self, doc_id: str) -> list[tuple[str, float]]:
         """
         Find related documents based on content similarity.
 
+        Candidates are retrieved from the LSH index and re-ranked by exact
+        Jaccard similarity of their index terms.
+
         Args:
             doc_id: Document ID
 
@@ -706,33 +809,38 @@ class DocumentOrganizer:
         if doc_id not in self.documents:
             return []
 
-        source_doc = self.documents[doc_id]
-        related: list[tuple[str, float]] = []
+        if len(self._term_sets) != len(self.documents):
+            # Index documents that were added without add_document
+            for other_id in self.documents.keys() - self._term_sets.keys():
+                self._update_similarity_index(other_id)
+            for other_id in self._term_sets.keys() - self.documents.keys():
+                del self._term_sets[other_id]
+                if self._lsh is not None:
+                    self._lsh.remove(other_id)
+
+        source_terms = self._term_sets[doc_id]
+        if not source_terms:
+            return []
 
-        # Compare with other documents
-        for other_id, other_doc in self.documents.items():
-            if other_id != doc_id:
-                # Calculate similarity based on shared index terms
-                source_terms = set(source_doc.index_terms)
-                other_terms = set(other_doc.index_terms)
+        if self._lsh is not None:
+            candidates = self._lsh.candidates(doc_id)
+        else:
+            candidates = self._term_sets.keys() - {doc_id}
 
-                if source_terms and other_terms:
-                    similarity = len(source_terms & other_terms) / len(
-                        source_terms | other_terms
-                    )
+        related: list[tuple[str, float]] = []
+        for other_id in candidates:
+            other_terms = self._term_sets[other_id]
+            if not other_terms:
+                continue
 
-                    if similarity >= self.config.min_similarity_score:
-                        logging.debug(
-                            f"Comparing {doc_id} ({source_terms}) and {other_id} ({other_terms})"
-                        )
-                        logging.debug(
-                            f"Intersection: {source_terms & other_terms}, Union: {source_terms | other_terms}"
-                        )
-                        logging.debug(
-                            f"Similarity: {similarity:.4f}, Threshold: {self.config.min_similarity_score}"
-                        )
+            shared = len(source_terms & other_terms)
+            similarity = shared / (len(source_terms) + len(other_terms) - shared)
+            if similarity >= self.config.min_similarity_score:
+                related.append((other_id, similarity))
 
-                        related.append((other_id, similarity))
+        logging.debug(
+            f"Found {len(related)} related documents for {doc_id} among {len(candidates)} candidates"
+        )
 
         return sorted(related, key=lambda x: x[1], reverse=True)
 
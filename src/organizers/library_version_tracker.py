@@ -3,10 +3,12 @@ Library version tracking module for managing documentation from different librar
 """
 
 import difflib
+import hashlib
 import json
 import logging
 import os
 import re
+from concurrent.futures import ProcessPoolExecutor
 from dataclasses import asdict
 from datetime import datetime, timezone
 from typing import Any, Optional
@@ -48,6 +50,100 @@ from ..processors.content_processor import ProcessedContent
 
 logger = logging.getLogger(__name__)
 
+# Line-diff algorithms accepted by LibraryVersionTracker
+DIFF_ALGORITHMS = ("difflib", "fast")
+
+
+def _content_hash(content: str) -> str:
+    """Hash page content for cheap equality checks."""
+    return hashlib.blake2b(content.encode("utf-8"), digest_size=16).hexdigest()
+
+
+def _format_range(start: int, stop: int) -> str:
+    """Format a unified diff hunk range."""
+    beginning = start + 1  # Lines start numbering with one
+    length = stop - start
+    if length == 1:
+        return f"{beginning}"
+    if not length:
+        beginning -= 1  # Empty ranges begin at line just before the range
+    return f"{beginning},{length}"
+
+
+def _fast_unified_diff(
+    a: list[str], b: list[str], fromfile: str, tofile: str, n: int = 3
+) -> list[str]:
+    """
+    Produce a unified diff, matching only the lines between the common
+    prefix and suffix of both sides.
+
+    Documentation edits are usually local, so trimming the unchanged head and
+    tail leaves SequenceMatcher a small problem instead of the whole page.
+    """
+    prefix = 0
+    limit = min(len(a), len(b))
+    while prefix < limit and a[prefix] == b[prefix]:
+        prefix += 1
+    suffix = 0
+    while suffix < limit - prefix and a[len(a) - 1 - suffix] == b[len(b) - 1 - suffix]:
+        suffix += 1
+
+    middle = difflib.SequenceMatcher(
+        None, a[prefix : len(a) - suffix], b[prefix : len(b) - suffix]
+    )
+    opcodes = []
+    if prefix:
+        opcodes.append(("equal", 0, prefix, 0, prefix))
+    for tag, i1, i2, j1, j2 in middle.get_opcodes():
+        opcodes.append((tag, i1 + prefix, i2 + prefix, j1 + prefix, j2 + prefix))
+    if suffix:
+        opcodes.append(("equal", len(a) - suffix, len(a), len(b) - suffix, len(b)))
+
+    # Reuse difflib's hunk grouping with the precomputed opcodes
+    matcher = difflib.SequenceMatcher(None, a, b)
+    matcher.opcodes = opcodes or [("equal", 0, 0, 0, 0)]
+
+    lines = []
+    for group in matcher.get_grouped_opcodes(n):
+        if not lines:
+            lines.append(f"--- {fromfile}")
+            lines.append(f"+++ {tofile}")
+        first, last = group[0], group[-1]
+        file1_range = _format_range(first[1], last[2])
+        file2_range = _format_range(first[3], last[4])
+        lines.append(f"@@ -{file1_range} +{file2_range} @@")
+        for tag, i1, i2, j1, j2 in group:
+            if tag == "equal":
+                lines.extend(" " + line for line in a[i1:i2])
+                continue
+            if tag in ("replace", "delete"):
+                lines.extend("-" + line for line in a[i1:i2])
+            if tag in ("replace", "insert"):
+                lines.extend("+" + line for line in b[j1:j2])
+    return lines
+
+
+def _diff_page(task: tuple[str, str, str, str, str]) -> list[str]:
+    """
+    Diff one page; module-level so it can run in worker processes.
+
+    Args:
+        task: Tuple of (content1, content2, fromfile, tofile, algorithm)
+
+    Returns:
+        Unified diff lines
+    """
+    content1, content2, fromfile, tofile, algorithm = task
+    lines1 = content1.splitlines()
+    lines2 = content2.splitlines()
+    if algorithm == "fast":
+        return _fast_unified_diff(lines1, lines2, fromfile, tofile)
+    return list(
+        difflib.unified_diff(
+            lines1, lines2, fromfile=fromfile, tofile=tofile, lineterm=""
+        )
+    )
+
 
 class LibraryVersionInfo(BaseModel):
     """Information about a library version."""
@@ -231,15 +327,34 @@ class LibraryVersionTracker:
     Provides version comparison and diff functionality.
     """
 
-    def __init__(self, registry: Optional[LibraryRegistry] = None):
+    def __init__(
+        self,
+        registry: Optional[LibraryRegistry] = None,
+        diff_algorithm: str = "difflib",
+        max_workers: Optional[int] = None,
+        parallel_threshold: int = 200,
+    ):
         """
         Initialize the library version tracker.
 
         Args:
             registry: Optional library registry
+            diff_algorithm: "difflib" for difflib.unified_diff, or "fast" to
+                only match the lines between common prefixes and suffixes
+            max_workers: Worker processes used for diffs (defaults to the
+                number of CPUs; 1 disables the process pool)
+            parallel_threshold: Minimum number of modified pages before diffs
+                are computed in a process pool
         """
+        if diff_algorithm not in DIFF_ALGORITHMS:
+            raise ValueError(
+                f"Unknown diff algorithm {diff_algorithm!r}, expected one of {DIFF_ALGORITHMS}"
+            )
         self.registry = registry or LibraryRegistry()
         self.version_docs: dict[str, dict[str, dict[str, Any]]] = {}
+        self.diff_algorithm = diff_algorithm
+        self.max_workers = max_workers
+        self.parallel_threshold = parallel_threshold
 
     def add_documentation(
         self, library_name: str, version: str, processed_content: ProcessedContent
@@ -267,10 +382,12 @@ class LibraryVersionTracker:
             self.version_docs[library_name][version] = {}
 
         # Store the processed content
+        content = asdict(processed_content)
         self.version_docs[library_name][version][doc_id] = {
             "url": processed_content.url,
             "title": processed_content.title,
-            "content": asdict(processed_content),
+            "content": content,
+            "content_hash": _content_hash(self._formatted_content(content)),
             "timestamp": datetime.now(timezone.utc),
         }
 
@@ -343,53 +460,46 @@ class LibraryVersionTracker:
         ):
             return VersionDiff(from_version=version1, to_version=version2)
 
-        docs1 = self.version_docs[library_name][version1]
-        docs2 = self.version_docs[library_name][version2]
-
-        # Get URLs for each version
-        urls1 = {doc["url"] for doc in docs1.values()}
-        urls2 = {doc["url"] for doc in docs2.values()}
+        docs1 = self._docs_by_url(self.version_docs[library_name][version1])
+        docs2 = self._docs_by_url(self.version_docs[library_name][version2])
 
         # Find added, removed, and common URLs
-        added_urls = urls2 - urls1
-        removed_urls = urls1 - urls2
-        common_urls = urls1 & urls2
+        added_urls = docs2.keys() - docs1.keys()
+        removed_urls = docs1.keys() - docs2.keys()
+        common_urls = docs1.keys() & docs2.keys()
 
-        # Find modified pages by comparing content
+        # Find modified pages, skipping identical content by hash
         modified_urls = []
-        diff_details = {}
-
+        tasks = []
         for url in common_urls:
-            # Find the documents with this URL in each version
-            doc1 = next((doc for doc in docs1.values() if doc["url"] == url), None)
-            doc2 = next((doc for doc in docs2.values() if doc["url"] == url), None)
-
-            if doc1 and doc2:
-                # Compare content
-                content1 = (
-                    doc1["content"].get("content", {}).get("formatted_content", "")
-                )
-                content2 = (
-                    doc2["content"].get("content", {}).get("formatted_content", "")
-                )
+            doc1 = docs1[url]
+            doc2 = docs2[url]
+            if self._page_hash(doc1) == self._page_hash(doc2):
+                continue
 
-                if content1 != content2:
-                    modified_urls.append(url)
+            content1 = self._formatted_content(doc1["content"])
+            content2 = self._formatted_content(doc2["content"])
+            if content1 == content2:
+                continue
 
-                    # Generate diff
-                    diff = difflib.unified_diff(
-                        content1.splitlines(),
-                        content2.splitlines(),
-                        fromfile=f"{url} ({version1})",
-                        tofile=f"{url} ({version2})",
-                        lineterm="",
-                    )
+            modified_urls.append(url)
+            tasks.append(
+                (
+                    content1,
+                    content2,
+                    f"{url} ({version1})",
+                    f"{url} ({version2})",
+                    self.diff_algorithm,
+                )
+            )
 
-                    diff_details[url] = {
-                        "diff": list(diff),
-                        "title1": doc1["title"],
-                        "title2": doc2["title"],
-                    }
+        diff_details = {}
+        for url, diff in zip(modified_urls, self._run_diffs(tasks)):
+            diff_details[url] = {
+                "diff": diff,
+                "title1": docs1[url]["title"],
+                "title2": docs2[url]["title"],
+            }
 
         return VersionDiff(
             from_version=version1,
@@ -400,6 +510,56 @@ class LibraryVersionTracker:
             diff_details=diff_details,
         )
 
+    def _docs_by_url(
+        self, docs: dict[str, dict[str, Any]]
+    ) -> dict[str, dict[str, Any]]:
+        """
+        Map URLs to documents, keeping the first document for each URL.
+
+        Args:
+            docs: Dictionary of document IDs to documents
+
+        Returns:
+            Dictionary of URLs to documents
+        """
+        by_url: dict[str, dict[str, Any]] = {}
+        for doc in docs.values():
+            by_url.setdefault(doc["url"], doc)
+        return by_url
+
+    def _formatted_content(self, content: dict[str, Any]) -> str:
+        """Get the formatted content of a stored ProcessedContent dict."""
+        return content.get("content", {}).get("formatted_content", "")
+
+    def _page_hash(self, doc: dict[str, Any]) -> str:
+        """Get a document's content hash, computing it if it was not stored."""
+        if "content_hash" not in doc:
+            doc["content_hash"] = _content_hash(self._formatted_content(doc["content"]))
+        return doc["content_hash"]
+
+    def _run_diffs(
+        self, tasks: list[tuple[str, str, str, str, str]]
+    ) -> list[list[str]]:
+        """
+        Compute page diffs, in a process pool when there are enough of them.
+
+        Args:
+            tasks: Arguments for _diff_page
+
+        Returns:
+            Diff lines for each task, in order
+        """
+        workers = self.max_workers or os.cpu_count() or 1
+        if workers > 1 and len(tasks) >= self.parallel_threshold:
+            try:
+                with ProcessPoolExecutor(max_workers=workers) as executor:
+                    chunksize = max(1, len(tasks) // (workers * 4))
+                    return list(executor.map(_diff_page, tasks, chunksize=chunksize))
+            except Exception as e:
+                logger.warning(f"Parallel diff failed, diffing serially: {e}")
+
+        return [_diff_page(task) for task in tasks]
+
     def is_newer_version(self, version1: str, version2: str) -> bool:
         """
         Check if version2 is newer than version1.
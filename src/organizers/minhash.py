@@ -0,0 +1,166 @@
+#!/usr/bin/env python3
+"""
+MinHash signatures and banded LSH for near-duplicate lookups.
+
+A MinHash signature estimates the Jaccard similarity of two term sets in
+constant space. Splitting signatures into bands and bucketing documents by
+band lets a lookup retrieve only the documents likely to be similar instead
+of comparing against the whole corpus.
+"""
+
+import random
+import zlib
+from collections.abc import Iterable
+from typing import Optional
+
+# Mersenne prime used as the modulus of the permutation hashes
+_PRIME = (1 << 61) - 1
+_MAX_HASH = (1 << 32) - 1
+
+
+class MinHasher:
+    """Computes MinHash signatures with a fixed family of hash functions."""
+
+    def __init__(self, num_perm: int = 128, seed: int = 1):
+        """
+        Initialize the hasher.
+
+        Args:
+            num_perm: Number of hash functions, i.e. the signature length
+            seed: Seed for the hash function parameters, so signatures are
+                comparable across instances created with the same arguments
+        """
+        rng = random.Random(seed)
+        self.num_perm = num_perm
+        self._params = [
+            (rng.randrange(1, _PRIME), rng.randrange(0, _PRIME))
+            for _ in range(num_perm)
+        ]
+
+    def signature(self, terms: Iterable[str]) -> Optional[tuple[int, ...]]:
+        """
+        Compute the signature of a set of terms.
+
+        Args:
+            terms: Terms of the document
+
+        Returns:
+            Signature tuple, or None for an empty set
+        """
+        hashes = {zlib.crc32(term.encode("utf-8")) for term in terms}
+        if not hashes:
+            return None
+
+        return tuple(
+            min(((a * h + b) % _PRIME) & _MAX_HASH for h in hashes)
+            for a, b in self._params
+        )
+
+
+def choose_rows_per_band(
+    num_perm: int, threshold: float, target_recall: float
+) -> Optional[int]:
+    """
+    Pick the most selective banding that still meets a recall target.
+
+    A pair with Jaccard similarity ``s`` becomes a candidate with probability
+    ``1 - (1 - s**r) ** b`` for ``b`` bands of ``r`` rows. More rows per band
+    mean fewer false candidates but lower recall near the threshold.
+
+    Args:
+        num_perm: Signature length
+        threshold: Lowest similarity that must be found
+        target_recall: Required candidate probability at the threshold
+
+    Returns:
+        Rows per band, or None if no banding reaches the target
+    """
+    for rows in range(num_perm, 0, -1):
+        if num_perm % rows:
+            continue
+        bands = num_perm // rows
+        if 1 - (1 - threshold**rows) ** bands >= target_recall:
+            return rows
+    return None
+
+
+class LSHIndex:
+    """Banded locality-sensitive hash index over MinHash signatures."""
+
+    def __init__(self, num_perm: int, rows_per_band: int):
+        """
+        Initialize the index.
+
+        Args:
+            num_perm: Signature length
+            rows_per_band: Signature values per band; must divide num_perm
+        """
+        if num_perm % rows_per_band:
+            raise ValueError(
+                f"rows_per_band ({rows_per_band}) must divide num_perm ({num_perm})"
+            )
+        self.rows_per_band = rows_per_band
+        self.num_bands = num_perm // rows_per_band
+        self._buckets: list[dict[tuple[int, ...], set[str]]] = [
+            {} for _ in range(self.num_bands)
+        ]
+        self._keys: dict[str, list[tuple[int, ...]]] = {}
+
+    def __len__(self) -> int:
+        return len(self._keys)
+
+    def __contains__(self, key: str) -> bool:
+        return key in self._keys
+
+    def _bands(self, signature: tuple[int, ...]) -> list[tuple[int, ...]]:
+        """Split a signature into its bands."""
+        rows = self.rows_per_band
+        return [
+            signature[band * rows : (band + 1) * rows] for band in range(self.num_bands)
+        ]
+
+    def add(self, key: str, signature: tuple[int, ...]):
+        """
+        Add or replace a key.
+
+        Args:
+            key: Document key
+            signature: MinHash signature of the document
+        """
+        self.remove(key)
+        bands = self._bands(signature)
+        for buckets, band in zip(self._buckets, bands):
+            buckets.setdefault(band, set()).add(key)
+        self._keys[key] = bands
+
+    def remove(self, key: str):
+        """
+        Remove a key if present.
+
+        Args:
+            key: Document key
+        """
+        bands = self._keys.pop(key, None)
+        if bands is None:
+            return
+        for buckets, band in zip(self._buckets, bands):
+            bucket = buckets[band]
+            bucket.discard(key)
+            if not bucket:
+                del buckets[band]
+
+    def candidates(self, key: str) -> set[str]:
+        """
+        Get the keys sharing at least one band with an indexed key.
+
+        Args:
+            key: Indexed document key
+
+        Returns:
+            Candidate keys, excluding the key itself
+        """
+        found: set[str] = set()
+        for buckets, band in zip(self._buckets, self._keys.get(key, ())):
+            found.update(buckets[band])
+        found.discard(key)
+        return found
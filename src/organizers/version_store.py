@@ -0,0 +1,313 @@
+#!/usr/bin/env python3
+"""
+Content-addressed chunk store for document versions.
+
+Versions are encoded as manifests that reference compressed chunks by
+digest. Long strings are split at content-defined line boundaries, so a
+new version of a page only adds the chunks around what changed, and
+identical sections shared between versions or pages are stored once.
+"""
+
+import hashlib
+import json
+import zlib
+from collections import OrderedDict
+from collections.abc import Iterator, Mapping
+from datetime import date, datetime
+from typing import Any, Optional
+
+# Strings at least this long are chunked instead of stored inline
+MIN_CHUNKED_LENGTH = 256
+
+# Scalar types stored inline in manifests
+_INLINE_TYPES = (type(None), bool, int, float, str, datetime, date)
+
+
+def _digest(data: bytes) -> str:
+    """Return the content address of a chunk."""
+    return hashlib.blake2b(data, digest_size=16).hexdigest()
+
+
+class ChunkStore:
+    """Reference-counted store of zlib-compressed, content-addressed chunks."""
+
+    def __init__(
+        self,
+        target_chunk_size: int = 4096,
+        compression_level: int = 6,
+        cache_size: int = 256,
+    ):
+        """
+        Initialize the store.
+
+        Args:
+            target_chunk_size: Average size in bytes of string chunks
+            compression_level: zlib compression level for new chunks
+            cache_size: Number of decompressed chunks kept for repeated reads
+        """
+        self.target_chunk_size = target_chunk_size
+        self.compression_level = compression_level
+        self.cache_size = cache_size
+        self._chunks: dict[str, bytes] = {}
+        self._refcounts: dict[str, int] = {}
+        self._cache: OrderedDict[str, bytes] = OrderedDict()
+
+    def __len__(self) -> int:
+        return len(self._chunks)
+
+    def __contains__(self, digest: str) -> bool:
+        return digest in self._chunks
+
+    @property
+    def stored_bytes(self) -> int:
+        """Total compressed size of the stored chunks."""
+        return sum(len(chunk) for chunk in self._chunks.values())
+
+    def put(self, digest: str, data: bytes) -> None:
+        """
+        Add a reference to a chunk, storing it if it is new.
+
+        Args:
+            digest: Content address of the chunk
+            data: Uncompressed chunk data
+        """
+        if digest not in self._chunks:
+            self._chunks[digest] = zlib.compress(data, self.compression_level)
+            self._refcounts[digest] = 0
+        self._refcounts[digest] += 1
+
+    def get(self, digest: str) -> bytes:
+        """
+        Get the uncompressed data of a chunk.
+
+        Args:
+            digest: Content address of the chunk
+
+        Returns:
+            Chunk data
+
+        Raises:
+            KeyError: If the chunk is not stored
+        """
+        data = self._cache.get(digest)
+        if data is not None:
+            self._cache.move_to_end(digest)
+            return data
+
+        data = zlib.decompress(self._chunks[digest])
+        self._cache[digest] = data
+        if len(self._cache) > self.cache_size:
+            self._cache.popitem(last=False)
+        return data
+
+    def release(self, digest: str) -> None:
+        """
+        Drop a reference to a chunk, deleting it when none remain.
+
+        Args:
+            digest: Content address of the chunk
+        """
+        refcount = self._refcounts.get(digest)
+        if refcount is None:
+            return
+        if refcount > 1:
+            self._refcounts[digest] = refcount - 1
+            return
+
+        del self._refcounts[digest]
+        del self._chunks[digest]
+        self._cache.pop(digest, None)
+
+    def split(self, text: str) -> list[bytes]:
+        """
+        Split text into chunks at content-defined line boundaries.
+
+        A chunk ends after a line whose checksum matches a boundary pattern,
+        so an edit only changes the chunks around it. Chunks are kept between
+        a quarter and four times the target size.
+
+        Args:
+            text: Text to split
+
+        Returns:
+            UTF-8 encoded chunks
+        """
+        target = self.target_chunk_size
+        min_size = target // 4
+        max_size = target * 4
+
+        chunks = []
+        current: list[bytes] = []
+        size = 0
+        for line in text.splitlines(keepends=True):
+            data = line.encode("utf-8")
+            # Break lines longer than a chunk, such as minified markup
+            while len(data) > max_size:
+                if current:
+                    chunks.append(b"".join(current))
+                    current, size = [], 0
+                chunks.append(data[:max_size])
+                data = data[max_size:]
+
+            current.append(data)
+            size += len(data)
+            if size >= max_size or (
+                size >= min_size and zlib.crc32(data) % target < len(data)
+            ):
+                chunks.append(b"".join(current))
+                current, size = [], 0
+
+        if current:
+            chunks.append(b"".join(current))
+        return chunks
+
+
+class EncodedContent:
+    """Manifest of a value encoded against a ChunkStore, plus its new chunks."""
+
+    def __init__(self, store: ChunkStore):
+        """
+        Initialize an empty encoding.
+
+        Args:
+            store: Store the chunks will be committed to
+        """
+        self.store = store
+        self.chunks: list[tuple[str, bytes]] = []  # (digest, data) in order
+
+    def encode(self, value: Any) -> dict[str, Any]:
+        """
+        Encode a value into a manifest node.
+
+        Dicts become nested nodes, short scalars stay inline, long strings are
+        chunked and any other value is stored as one JSON chunk.
+
+        Args:
+            value: Value to encode
+
+        Returns:
+            Manifest node
+        """
+        if isinstance(value, dict):
+            return {"d": {str(key): self.encode(item) for key, item in value.items()}}
+
+        if isinstance(value, str) and len(value) >= MIN_CHUNKED_LENGTH:
+            return {"s": [self._add(chunk) for chunk in self.store.split(value)]}
+
+        if isinstance(value, _INLINE_TYPES):
+            return {"v": value}
+
+        data = json.dumps(value, separators=(",", ":"), default=str).encode("utf-8")
+        return {"j": self._add(data)}
+
+    def _add(self, data: bytes) -> str:
+        """Record a chunk to commit and return its digest."""
+        digest = _digest(data)
+        self.chunks.append((digest, data))
+        return digest
+
+    def commit(self) -> None:
+        """Add a store reference for every chunk of the encoding."""
+        for digest, data in self.chunks:
+            self.store.put(digest, data)
+
+
+def manifest_hash(manifest: dict[str, Any], exclude: tuple[str, ...] = ()) -> str:
+    """
+    Hash a manifest node.
+
+    Chunks are represented by their digests, so this never re-serializes the
+    encoded content itself.
+
+    Args:
+        manifest: Node produced by EncodedContent.encode
+        exclude: Top-level keys of a dict node left out of the hash
+
+    Returns:
+        Hex digest of the manifest
+    """
+    if "d" in manifest:
+        manifest = {"d": {k: v for k, v in manifest["d"].items() if k not in exclude}}
+    data = json.dumps(manifest, sort_keys=True, separators=(",", ":"), default=str)
+    return hashlib.sha256(data.encode("utf-8")).hexdigest()
+
+
+def manifest_digests(manifest: dict[str, Any]) -> Iterator[str]:
+    """
+    Yield every chunk digest referenced by a manifest node.
+
+    Args:
+        manifest: Node produced by EncodedContent.encode
+    """
+    if "d" in manifest:
+        for node in manifest["d"].values():
+            yield from manifest_digests(node)
+    elif "s" in manifest:
+        yield from manifest["s"]
+    elif "j" in manifest:
+        yield manifest["j"]
+
+
+def decode(manifest: dict[str, Any], store: ChunkStore) -> Any:
+    """
+    Decode a manifest node back into a value.
+
+    Args:
+        manifest: Node produced by EncodedContent.encode
+        store: Store holding the node's chunks
+
+    Returns:
+        Decoded value
+    """
+    if "d" in manifest:
+        return {key: decode(node, store) for key, node in manifest["d"].items()}
+    if "s" in manifest:
+        return b"".join(store.get(digest) for digest in manifest["s"]).decode("utf-8")
+    if "j" in manifest:
+        return json.loads(store.get(manifest["j"]))
+    return manifest["v"]
+
+
+class StoredContent(Mapping):
+    """Read-only mapping that decodes the fields of a stored version on access."""
+
+    def __init__(self, manifest: dict[str, Any], store: ChunkStore):
+        """
+        Initialize the mapping.
+
+        Args:
+            manifest: Dict node produced by EncodedContent.encode
+            store: Store holding the manifest's chunks
+        """
+        self._fields: dict[str, Any] = manifest.get("d", {})
+        self._store = store
+
+    def __getitem__(self, key: str) -> Any:
+        return decode(self._fields[key], self._store)
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._fields)
+
+    def __len__(self) -> int:
+        return len(self._fields)
+
+    def __contains__(self, key: object) -> bool:
+        return key in self._fields
+
+    def to_dict(self) -> dict[str, Any]:
+        """Decode every field into a plain dict."""
+        return {key: self[key] for key in self._fields}
+
+
+def release_manifest(manifest: Optional[dict[str, Any]], store: ChunkStore) -> None:
+    """
+    Drop the store references held by a manifest.
+
+    Args:
+        manifest: Node produced by EncodedContent.encode, or None
+        store: Store holding the manifest's chunks
+    """
+    if manifest is None:
+        return
+    for digest in manifest_digests(manifest):
+        store.release(digest)
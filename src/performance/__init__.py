@@ -11,5 +11,22 @@ from .backend_tracker import (
     MonitoringContext,
     PerformanceMetrics,
 )
+from .bandit import (
+    BanditPolicy,
+    ThompsonSamplingPolicy,
+    UCBPolicy,
+    latency_adjusted_reward,
+)
+from .streaming import MetricWindow, TDigest
 
-__all__ = ["BackendPerformanceTracker", "PerformanceMetrics", "MonitoringContext"]
+__all__ = [
+    "BackendPerformanceTracker",
+    "PerformanceMetrics",
+    "MonitoringContext",
+    "MetricWindow",
+    "TDigest",
+    "BanditPolicy",
+    "ThompsonSamplingPolicy",
+    "UCBPolicy",
+    "latency_adjusted_reward",
+]
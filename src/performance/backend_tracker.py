@@ -3,14 +3,22 @@ Backend performance tracking system.
 
 This module tracks performance metrics for different backends and provides
 automatic backend selection based on resource usage and compute performance.
+
+Statistics are kept as streaming aggregates per (domain, backend): means over
+a bounded window of recent samples maintained with running sums, exponentially
+weighted moving averages, and a t-digest of response times for quantiles, so
+recording a sample costs O(1) and memory per pair is bounded. Saving appends
+the samples recorded since the last save, with the pair's moving averages
+and counters, to a journal next to the snapshot file and only rewrites the
+snapshot when the journal has grown too long.
 """
 
 import json
 import logging
+import os
 import time
 from dataclasses import dataclass
 from pathlib import Path
-from statistics import mean
 from typing import Any, Optional
 
 try:
@@ -21,8 +29,22 @@ except ImportError:
     PSUTIL_AVAILABLE = False
     logging.warning("psutil not available - memory and CPU monitoring will be limited")
 
+from .bandit import BanditPolicy
+from .streaming import MetricWindow, TDigest, ewma
+
 logger = logging.getLogger(__name__)
 
+# Sample fields averaged over the window
+_WINDOW_FIELDS = ("response_time", "memory_usage", "cpu_usage", "success")
+# Fields journaled with the new samples of a pair; the rest follows from
+# the samples
+_JOURNAL_FIELDS = (
+    "total_requests",
+    "last_updated",
+    "ewma_response_time",
+    "ewma_success_rate",
+)
+
 
 @dataclass
 class PerformanceMetrics:
@@ -59,6 +81,10 @@ class BackendPerformanceTracker:
         storage_path: Optional[Path] = None,
         max_history_days: int = 30,
         min_samples_for_recommendation: int = 3,
+        history_size: int = 1000,
+        ewma_alpha: float = 0.2,
+        compact_after: int = 1000,
+        policy: Optional[BanditPolicy] = None,
     ):
         """
         Initialize the performance tracker.
@@ -67,20 +93,37 @@ class BackendPerformanceTracker:
             storage_path: Path to store performance data
             max_history_days: Maximum days to keep performance history
             min_samples_for_recommendation: Minimum samples needed for recommendations
+            history_size: Samples kept per domain and backend; averages are
+                taken over this window
+            ewma_alpha: Weight of a new sample in the moving averages
+            compact_after: Journal entries after which saving rewrites the
+                snapshot instead of appending to the journal
+            policy: Adaptive selection policy fed with every recorded
+                crawl; without one select_backend uses the weighted score
+                of get_best_backend_for_domain
         """
         self.storage_path = storage_path or Path("backend_performance.json")
+        self.journal_path = self.storage_path.with_name(
+            self.storage_path.name + ".journal"
+        )
         self.max_history_days = max_history_days
         self.min_samples_for_recommendation = min_samples_for_recommendation
+        self.history_size = history_size
+        self.ewma_alpha = ewma_alpha
+        self.compact_after = compact_after
+        self.policy = policy
 
         # Performance data structure:
         # {
         #   "domain.com": {
         #     "backend_name": {
-        #       "history": [PerformanceMetrics, ...],
+        #       "history": deque of the last history_size metrics dicts,
         #       "average_response_time": float,
         #       "average_memory_usage": float,
         #       "average_cpu_usage": float,
         #       "success_rate": float,
+        #       "ewma_response_time": float,
+        #       "ewma_success_rate": float,
         #       "total_requests": int,
         #       "last_updated": float
         #     }
@@ -89,6 +132,17 @@ class BackendPerformanceTracker:
         self.domain_performance: dict[str, dict[str, dict[str, Any]]] = {}
         self.performance_data: dict[str, Any] = {}
 
+        # Streaming state behind the averages, per (domain, backend)
+        self._windows: dict[tuple[str, str], MetricWindow] = {}
+        self._digests: dict[tuple[str, str], TDigest] = {}
+        # Pairs changed since the last save, with the samples recorded since
+        # then; pairs whose window was replaced are journaled in full
+        self._dirty: set[tuple[str, str]] = set()
+        self._new_samples: dict[tuple[str, str], list[dict[str, Any]]] = {}
+        self._replaced: set[tuple[str, str]] = set()
+        self._journal_entries = 0
+        self._snapshot_synced = False
+
         # Default backend preference order (fallback)
         self.default_backend_order = [
             "http",
@@ -109,44 +163,91 @@ class BackendPerformanceTracker:
             domain: Domain that was crawled
             metrics: Performance metrics dictionary
         """
-        # Ensure domain exists in tracking
-        if domain not in self.domain_performance:
-            self.domain_performance[domain] = {}
-
-        # Ensure backend exists for domain
-        if backend_name not in self.domain_performance[domain]:
-            self.domain_performance[domain][backend_name] = {
-                "history": [],
-                "average_response_time": 0.0,
-                "average_memory_usage": 0.0,
-                "average_cpu_usage": 0.0,
-                "success_rate": 0.0,
-                "total_requests": 0,
-                "last_updated": time.time(),
-            }
-
-        backend_data = self.domain_performance[domain][backend_name]
+        key = (domain, backend_name)
+        backends = self.domain_performance.setdefault(domain, {})
+        backend_data = backends.get(backend_name)
+        if backend_data is None or key not in self._windows:
+            if backend_data:
+                # Set from outside; the journal has none of it
+                self._replaced.add(key)
+            backend_data = backends[backend_name] = self._restore_backend_data(
+                key, backend_data or {}
+            )
+
+        window = self._windows[key]
+        window.append(metrics)
+        if key not in self._replaced:
+            new_samples = self._new_samples.setdefault(key, [])
+            new_samples.append(metrics)
+            if len(new_samples) > self.history_size:
+                # Cheaper to journal the bounded state than every sample
+                self._replaced.add(key)
+                del self._new_samples[key]
+        self._digests[key].add(metrics["response_time"])
 
-        # Add to history
-        backend_data["history"].append(metrics)
         backend_data["total_requests"] += 1
         backend_data["last_updated"] = time.time()
-
-        # Update averages
-        history = backend_data["history"]
-        backend_data["average_response_time"] = mean(
-            [m["response_time"] for m in history]
-        )
-        backend_data["average_memory_usage"] = mean(
-            [m["memory_usage"] for m in history]
+        self._update_averages(backend_data, window)
+        backend_data["ewma_response_time"] = ewma(
+            backend_data["ewma_response_time"],
+            metrics["response_time"],
+            self.ewma_alpha,
         )
-        backend_data["average_cpu_usage"] = mean([m["cpu_usage"] for m in history])
-        backend_data["success_rate"] = mean(
-            [1.0 if m["success"] else 0.0 for m in history]
+        backend_data["ewma_success_rate"] = ewma(
+            backend_data["ewma_success_rate"],
+            1.0 if metrics["success"] else 0.0,
+            self.ewma_alpha,
         )
+        self._dirty.add(key)
+
+        if self.policy is not None:
+            self.policy.update(
+                domain, backend_name, bool(metrics["success"]), metrics["response_time"]
+            )
 
         logger.debug(f"Recorded performance for {backend_name} on {domain}: {metrics}")
 
+    def get_response_time_quantiles(
+        self,
+        domain: str,
+        backend_name: str,
+        quantiles: tuple[float, ...] = (0.5, 0.95, 0.99),
+    ) -> dict[float, float]:
+        """
+        Estimate response time quantiles of a backend on a domain.
+
+        Args:
+            domain: Domain that was crawled
+            backend_name: Name of the backend
+            quantiles: Quantiles between 0 and 1
+
+        Returns:
+            Estimated response time per quantile, empty if nothing was recorded
+        """
+        digest = self._digests.get((domain, backend_name))
+        if digest is None or not digest.count:
+            return {}
+        return {q: digest.quantile(q) for q in quantiles}
+
+    def select_backend(self, domain: str, candidates: list[str]) -> str:
+        """
+        Choose a backend for a domain among the available ones.
+
+        With a policy the choice keeps exploring, so backends whose results
+        were poor a while ago are tried again; without one it is the
+        backend with the best weighted score.
+
+        Args:
+            domain: Domain to crawl
+            candidates: Names of the available backends
+
+        Returns:
+            Name of the chosen backend
+        """
+        if self.policy is not None and candidates:
+            return self.policy.select(domain, candidates)
+        return self.get_best_backend_for_domain(domain)
+
     def get_best_backend_for_domain(self, domain: str) -> str:
         """
         Get the best performing backend for a specific domain.
@@ -169,8 +270,11 @@ class BackendPerformanceTracker:
             if backend_data["total_requests"] >= self.min_samples_for_recommendation:
                 score = self.calculate_performance_score(backend_data)
                 candidates[backend_name] = score
+                # Not logging backend_data: formatting its history costs more
+                # than the selection itself
                 logger.debug(
-                    f"Backend {backend_name} score: {score:.3f} (data: {backend_data})"
+                    f"Backend {backend_name} score: {score:.3f} "
+                    f"({backend_data['total_requests']} requests)"
                 )
 
         if not candidates:
@@ -227,34 +331,77 @@ class BackendPerformanceTracker:
         return min(1.0, max(0.0, score))
 
     async def save_performance_data(self) -> None:
-        """Save performance data to storage."""
-        try:
-            # Convert to JSON-serializable format
-            data_to_save = {}
-            for domain, backends in self.domain_performance.items():
-                data_to_save[domain] = {}
-                for backend_name, backend_data in backends.items():
-                    data_to_save[domain][backend_name] = backend_data.copy()
-
-            with open(self.storage_path, "w") as f:
-                json.dump(data_to_save, f, indent=2)
+        """
+        Save performance data to storage.
 
-            logger.debug(f"Saved performance data to {self.storage_path}")
+        The first save, and any save that would grow the journal beyond
+        compact_after entries, rewrites the snapshot and clears the journal;
+        other saves append an entry per pair changed since the last save,
+        holding the samples recorded since then.
+        """
+        try:
+            if (
+                not self._snapshot_synced
+                or self._journal_entries + len(self._dirty) > self.compact_after
+            ):
+                self._write_snapshot()
+            elif self._dirty:
+                with open(self.journal_path, "a") as f:
+                    for domain, backend_name in sorted(self._dirty):
+                        f.write(
+                            json.dumps(self._journal_entry(domain, backend_name)) + "\n"
+                        )
+                self._journal_entries += len(self._dirty)
+                logger.debug(
+                    f"Appended {len(self._dirty)} entries to {self.journal_path}"
+                )
+            self._dirty.clear()
+            self._new_samples.clear()
+            self._replaced.clear()
         except Exception as e:
             logger.error(f"Failed to save performance data: {e}")
 
     async def load_performance_data(self) -> None:
-        """Load performance data from storage."""
+        """Load performance data from the snapshot and replay the journal."""
         try:
-            if self.storage_path.exists():
+            self.domain_performance = {}
+            self._windows.clear()
+            self._digests.clear()
+            self._dirty.clear()
+            self._new_samples.clear()
+            self._replaced.clear()
+            self._journal_entries = 0
+            self._snapshot_synced = False
+
+            if self.storage_path.exists() and self.storage_path.stat().st_size:
                 with open(self.storage_path) as f:
-                    self.domain_performance = json.load(f)
+                    snapshot = json.load(f)
+                for domain, backends in snapshot.items():
+                    for backend_name, backend_data in backends.items():
+                        self._load_backend_data(domain, backend_name, backend_data)
+                self._snapshot_synced = True
                 logger.debug(f"Loaded performance data from {self.storage_path}")
             else:
                 logger.debug("No existing performance data found")
+
+            if self.journal_path.exists():
+                with open(self.journal_path) as f:
+                    for line in f:
+                        try:
+                            entry = json.loads(line)
+                        except json.JSONDecodeError:
+                            # An interrupted append leaves a partial last line
+                            logger.warning(
+                                f"Skipping malformed entry in {self.journal_path}"
+                            )
+                            continue
+                        self._replay_journal_entry(entry)
+                        self._journal_entries += 1
         except Exception as e:
             logger.error(f"Failed to load performance data: {e}")
             self.domain_performance = {}
+            self._windows.clear()
+            self._digests.clear()
 
     async def cleanup_old_data(self, current_time: Optional[float] = None) -> None:
         """Remove performance data older than max_history_days."""
@@ -264,48 +411,149 @@ class BackendPerformanceTracker:
 
         for domain in self.domain_performance:
             for backend_name in self.domain_performance[domain]:
+                key = (domain, backend_name)
                 backend_data = self.domain_performance[domain][backend_name]
+                if key not in self._windows:
+                    backend_data = self._restore_backend_data(key, backend_data)
+                    self.domain_performance[domain][backend_name] = backend_data
 
                 # Filter out old entries
-                old_history = backend_data["history"]
+                window = self._windows[key]
+                old_history = window.entries
                 new_history = [
                     entry for entry in old_history if entry["timestamp"] > cutoff_time
                 ]
-
-                if len(new_history) != len(old_history):
-                    backend_data["history"] = new_history
-
-                    # Recalculate averages if we have data
-                    if new_history:
-                        backend_data["average_response_time"] = mean(
-                            [m["response_time"] for m in new_history]
-                        )
-                        backend_data["average_memory_usage"] = mean(
-                            [m["memory_usage"] for m in new_history]
-                        )
-                        backend_data["average_cpu_usage"] = mean(
-                            [m["cpu_usage"] for m in new_history]
-                        )
-                        backend_data["success_rate"] = mean(
-                            [1.0 if m["success"] else 0.0 for m in new_history]
-                        )
-                        backend_data["total_requests"] = len(new_history)
-                    else:
-                        # No data left, reset
-                        backend_data.update(
-                            {
-                                "average_response_time": 0.0,
-                                "average_memory_usage": 0.0,
-                                "average_cpu_usage": 0.0,
-                                "success_rate": 0.0,
-                                "total_requests": 0,
-                            }
-                        )
+                if len(new_history) == len(old_history):
+                    continue
+
+                window.replace(new_history)
+                digest = self._digests[key] = TDigest()
+                for entry in new_history:
+                    digest.add(entry["response_time"])
+                self._update_averages(backend_data, window)
+                backend_data["total_requests"] = len(new_history)
+                self._dirty.add(key)
+                self._replaced.add(key)
+                self._new_samples.pop(key, None)
 
         logger.debug(
             f"Cleaned up performance data older than {self.max_history_days} days"
         )
 
+    def _restore_backend_data(
+        self, key: tuple[str, str], backend_data: dict[str, Any]
+    ) -> dict[str, Any]:
+        """
+        Set up the streaming state of a pair from its (possibly empty) data.
+
+        History beyond history_size is dropped; a digest missing from older
+        data is rebuilt from the history.
+
+        Args:
+            key: (domain, backend) pair
+            backend_data: Saved or externally set data of the pair
+
+        Returns:
+            Data dictionary whose history is the pair's window
+        """
+        data = dict(backend_data)
+        history = list(data.get("history", []))
+        window = self._windows[key] = MetricWindow(self.history_size, _WINDOW_FIELDS)
+        window.replace(history[-self.history_size :])
+
+        digest_data = data.pop("response_time_digest", None)
+        if digest_data:
+            digest = TDigest.from_dict(digest_data)
+        else:
+            digest = TDigest()
+            for entry in history:
+                digest.add(entry["response_time"])
+        self._digests[key] = digest
+
+        data["history"] = window.entries
+        data.setdefault("total_requests", len(history))
+        data.setdefault("last_updated", time.time())
+        data.setdefault("ewma_response_time", None)
+        data.setdefault("ewma_success_rate", None)
+        self._update_averages(data, window)
+        return data
+
+    def _load_backend_data(
+        self, domain: str, backend_name: str, backend_data: dict[str, Any]
+    ) -> None:
+        """Store loaded data of a pair, replacing any earlier state."""
+        self.domain_performance.setdefault(domain, {})[backend_name] = (
+            self._restore_backend_data((domain, backend_name), backend_data)
+        )
+
+    def _serialize_backend_data(self, domain: str, backend_name: str) -> dict[str, Any]:
+        """Convert the data of a pair to a JSON-serializable dictionary."""
+        data = dict(self.domain_performance[domain][backend_name])
+        data["history"] = list(data["history"])
+        digest = self._digests.get((domain, backend_name))
+        if digest is not None:
+            data["response_time_digest"] = digest.to_dict()
+        return data
+
+    def _journal_entry(self, domain: str, backend_name: str) -> dict[str, Any]:
+        """Build the journal entry of a pair changed since the last save."""
+        key = (domain, backend_name)
+        entry: dict[str, Any] = {"domain": domain, "backend": backend_name}
+        if key in self._replaced:
+            entry["data"] = self._serialize_backend_data(domain, backend_name)
+        else:
+            backend_data = self.domain_performance[domain][backend_name]
+            entry["samples"] = self._new_samples.get(key, [])
+            entry["state"] = {field: backend_data[field] for field in _JOURNAL_FIELDS}
+        return entry
+
+    def _replay_journal_entry(self, entry: dict[str, Any]) -> None:
+        """Apply a journal entry to the loaded data."""
+        domain, backend_name = entry["domain"], entry["backend"]
+        if "data" in entry:
+            self._load_backend_data(domain, backend_name, entry["data"])
+            return
+
+        key = (domain, backend_name)
+        backends = self.domain_performance.setdefault(domain, {})
+        backend_data = backends.get(backend_name)
+        if backend_data is None:
+            backend_data = backends[backend_name] = self._restore_backend_data(key, {})
+        window = self._windows[key]
+        digest = self._digests[key]
+        for sample in entry["samples"]:
+            window.append(sample)
+            digest.add(sample["response_time"])
+        backend_data.update(entry["state"])
+        self._update_averages(backend_data, window)
+
+    def _write_snapshot(self) -> None:
+        """Rewrite the snapshot with all pairs and clear the journal."""
+        data_to_save = {
+            domain: {
+                backend_name: self._serialize_backend_data(domain, backend_name)
+                for backend_name in backends
+            }
+            for domain, backends in self.domain_performance.items()
+        }
+        temp_path = self.storage_path.with_name(self.storage_path.name + ".tmp")
+        with open(temp_path, "w") as f:
+            json.dump(data_to_save, f, indent=2)
+        os.replace(temp_path, self.storage_path)
+        if self.journal_path.exists():
+            self.journal_path.unlink()
+        self._journal_entries = 0
+        self._snapshot_synced = True
+        logger.debug(f"Saved performance data to {self.storage_path}")
+
+    @staticmethod
+    def _update_averages(backend_data: dict[str, Any], window: MetricWindow) -> None:
+        """Set the window averages of a pair."""
+        backend_data["average_response_time"] = window.mean("response_time")
+        backend_data["average_memory_usage"] = window.mean("memory_usage")
+        backend_data["average_cpu_usage"] = window.mean("cpu_usage")
+        backend_data["success_rate"] = window.mean("success")
+
     async def start_monitoring(
         self, backend_name: str, domain: str
     ) -> MonitoringContext:
@@ -0,0 +1,224 @@
+"""
+Adaptive backend selection with multi-armed bandits.
+
+Each domain is a separate bandit whose arms are the backends. A crawl earns a
+latency-adjusted reward: zero on failure, otherwise exp(-response_time /
+latency_scale), so a fast success is worth close to 1 and a slow one less.
+Observations decay exponentially with a configurable half-life, so a backend
+that had a bad hour is tried again once its bad results have faded instead
+of being avoided forever.
+
+ThompsonSamplingPolicy samples from a Beta posterior per arm and picks the
+highest sample; UCBPolicy picks the highest upper confidence bound of the
+decayed mean reward.
+"""
+
+import math
+import random
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from typing import Optional
+
+
+def latency_adjusted_reward(
+    success: bool, response_time: float, latency_scale: float
+) -> float:
+    """
+    Compute the reward of a crawl.
+
+    Args:
+        success: Whether the crawl succeeded
+        response_time: Response time in seconds
+        latency_scale: Response time in seconds at which a success is worth
+            1/e
+
+    Returns:
+        Reward between 0 and 1
+    """
+    if not success:
+        return 0.0
+    return math.exp(-max(0.0, response_time) / latency_scale)
+
+
+class _ArmStats:
+    """Decayed observation weight and reward sum of one arm."""
+
+    __slots__ = ("weight", "reward", "updated")
+
+    def __init__(self, now: float):
+        self.weight = 0.0
+        self.reward = 0.0
+        self.updated = now
+
+    def decay(self, now: float, half_life: float) -> None:
+        elapsed = now - self.updated
+        if elapsed > 0:
+            factor = 0.5 ** (elapsed / half_life)
+            self.weight *= factor
+            self.reward *= factor
+        self.updated = now
+
+
+class BanditPolicy(ABC):
+    """Base class of per-domain bandit policies with decaying observations."""
+
+    def __init__(
+        self,
+        half_life: float = 600.0,
+        latency_scale: float = 2.0,
+        clock: Callable[[], float] = time.time,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            half_life: Seconds after which an observation counts half
+            latency_scale: Latency scale of the reward in seconds
+            clock: Source of the current time in seconds
+        """
+        if half_life <= 0:
+            raise ValueError("half_life must be positive")
+        self.half_life = half_life
+        self.latency_scale = latency_scale
+        self.clock = clock
+        self._arms: dict[str, dict[str, _ArmStats]] = {}
+
+    def update(
+        self, domain: str, backend_name: str, success: bool, response_time: float
+    ) -> None:
+        """
+        Record the outcome of a crawl.
+
+        Args:
+            domain: Domain that was crawled
+            backend_name: Backend that crawled it
+            success: Whether the crawl succeeded
+            response_time: Response time in seconds
+        """
+        now = self.clock()
+        arm = self._arm(domain, backend_name, now)
+        arm.weight += 1.0
+        arm.reward += latency_adjusted_reward(
+            success, response_time, self.latency_scale
+        )
+
+    def select(self, domain: str, candidates: list[str]) -> str:
+        """
+        Choose a backend for a domain.
+
+        Args:
+            domain: Domain to crawl
+            candidates: Names of the available backends
+
+        Returns:
+            Name of the chosen backend
+        """
+        if not candidates:
+            raise ValueError("No candidate backends to select from")
+        now = self.clock()
+        arms = [self._arm(domain, name, now) for name in candidates]
+        scores = self._scores(arms)
+        return candidates[max(range(len(candidates)), key=scores.__getitem__)]
+
+    def arm_statistics(self, domain: str) -> dict[str, dict[str, float]]:
+        """
+        Get the decayed statistics of a domain's arms.
+
+        Args:
+            domain: Domain to report
+
+        Returns:
+            Weight and mean reward per backend name
+        """
+        now = self.clock()
+        statistics = {}
+        for name in self._arms.get(domain, {}):
+            arm = self._arm(domain, name, now)
+            statistics[name] = {
+                "weight": arm.weight,
+                "mean_reward": arm.reward / arm.weight if arm.weight else 0.0,
+            }
+        return statistics
+
+    def _arm(self, domain: str, backend_name: str, now: float) -> _ArmStats:
+        arms = self._arms.setdefault(domain, {})
+        arm = arms.get(backend_name)
+        if arm is None:
+            arm = arms[backend_name] = _ArmStats(now)
+        else:
+            arm.decay(now, self.half_life)
+        return arm
+
+    @abstractmethod
+    def _scores(self, arms: list[_ArmStats]) -> list[float]:
+        """Score each arm; the highest score is chosen."""
+        pass
+
+
+class ThompsonSamplingPolicy(BanditPolicy):
+    """Thompson sampling over Beta posteriors of the latency-adjusted reward."""
+
+    def __init__(
+        self,
+        half_life: float = 600.0,
+        latency_scale: float = 2.0,
+        clock: Callable[[], float] = time.time,
+        seed: Optional[int] = None,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            half_life: Seconds after which an observation counts half
+            latency_scale: Latency scale of the reward in seconds
+            clock: Source of the current time in seconds
+            seed: Seed of the sampling random number generator
+        """
+        super().__init__(half_life, latency_scale, clock)
+        self._random = random.Random(seed)
+
+    def _scores(self, arms: list[_ArmStats]) -> list[float]:
+        # Uniform Beta(1, 1) prior; fractional rewards update it like
+        # fractional Bernoulli trials
+        return [
+            self._random.betavariate(1.0 + arm.reward, 1.0 + arm.weight - arm.reward)
+            for arm in arms
+        ]
+
+
+class UCBPolicy(BanditPolicy):
+    """Discounted UCB1 over the latency-adjusted reward."""
+
+    def __init__(
+        self,
+        half_life: float = 600.0,
+        latency_scale: float = 2.0,
+        clock: Callable[[], float] = time.time,
+        exploration: float = 0.5,
+    ):
+        """
+        Initialize the policy.
+
+        Args:
+            half_life: Seconds after which an observation counts half
+            latency_scale: Latency scale of the reward in seconds
+            clock: Source of the current time in seconds
+            exploration: Multiplier of the confidence bound
+        """
+        super().__init__(half_life, latency_scale, clock)
+        self.exploration = exploration
+
+    def _scores(self, arms: list[_ArmStats]) -> list[float]:
+        total = sum(arm.weight for arm in arms)
+        # Floor at 1 so arms keep exploring when all observations have decayed
+        log_total = math.log(max(total, math.e))
+        scores = []
+        for arm in arms:
+            if arm.weight < 1e-6:
+                # Unobserved (or fully decayed) arms are tried first
+                scores.append(math.inf)
+                continue
+            bonus = self.exploration * math.sqrt(2 * log_total / arm.weight)
+            scores.append(arm.reward / arm.weight + bonus)
+        return scores
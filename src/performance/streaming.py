@@ -0,0 +1,224 @@
+"""
+Streaming statistics for backend performance tracking.
+
+TDigest estimates quantiles of an unbounded stream in bounded memory: values
+are merged into at most about compression/2 weighted centroids, kept small
+near the tails so that extreme quantiles (p95, p99) stay accurate. Adding a
+value appends to a buffer that is merged in batches, so recording costs
+amortized O(1).
+"""
+
+import math
+from collections import deque
+from typing import Any, Optional
+
+
+class TDigest:
+    """Merging t-digest for quantile estimates in bounded memory."""
+
+    def __init__(self, compression: float = 100.0):
+        """
+        Initialize the digest.
+
+        Args:
+            compression: Accuracy parameter; the digest keeps at most about
+                compression/2 centroids
+        """
+        self.compression = compression
+        self.count = 0
+        self.min = math.inf
+        self.max = -math.inf
+        self._means: list[float] = []
+        self._weights: list[float] = []
+        self._buffer: list[float] = []
+        self._buffer_size = max(16, int(compression * 5))
+
+    def add(self, value: float) -> None:
+        """
+        Add a value.
+
+        Args:
+            value: Value to add
+        """
+        self._buffer.append(value)
+        self.count += 1
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if len(self._buffer) >= self._buffer_size:
+            self._compress()
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate a quantile.
+
+        Args:
+            q: Quantile between 0 and 1
+
+        Returns:
+            Estimated value, or 0.0 if nothing was added
+        """
+        self._compress()
+        if not self._means:
+            return 0.0
+        if q <= 0:
+            return self.min
+        if q >= 1:
+            return self.max
+
+        means, weights = self._means, self._weights
+        target = q * self.count
+        if target < weights[0] / 2:
+            return self.min + (means[0] - self.min) * target / (weights[0] / 2)
+
+        cumulative = 0.0
+        for i in range(len(means) - 1):
+            center = cumulative + weights[i] / 2
+            next_center = cumulative + weights[i] + weights[i + 1] / 2
+            if target <= next_center:
+                fraction = (target - center) / (next_center - center)
+                return means[i] + fraction * (means[i + 1] - means[i])
+            cumulative += weights[i]
+
+        last_center = self.count - weights[-1] / 2
+        fraction = (target - last_center) / (weights[-1] / 2)
+        return means[-1] + min(1.0, fraction) * (self.max - means[-1])
+
+    def centroid_count(self) -> int:
+        """Get the number of centroids after merging buffered values."""
+        self._compress()
+        return len(self._means)
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the digest to a JSON-serializable dictionary."""
+        self._compress()
+        return {
+            "compression": self.compression,
+            "count": self.count,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "means": list(self._means),
+            "weights": list(self._weights),
+        }
+
+    @classmethod
+    def from_dict(cls, data: dict[str, Any]) -> "TDigest":
+        """
+        Restore a digest saved with to_dict.
+
+        Args:
+            data: Dictionary from to_dict
+
+        Returns:
+            Restored digest
+        """
+        digest = cls(data.get("compression", 100.0))
+        digest._means = [float(m) for m in data.get("means", [])]
+        digest._weights = [float(w) for w in data.get("weights", [])]
+        digest.count = int(data.get("count", sum(digest._weights)))
+        if digest.count:
+            digest.min = float(data["min"])
+            digest.max = float(data["max"])
+        return digest
+
+    def _compress(self) -> None:
+        """Merge buffered values into the centroids."""
+        if not self._buffer:
+            return
+        points = sorted(
+            list(zip(self._means, self._weights))
+            + [(value, 1.0) for value in self._buffer]
+        )
+        self._buffer = []
+        total = sum(weight for _, weight in points)
+
+        means: list[float] = []
+        weights: list[float] = []
+        mean, weight = points[0]
+        before = 0.0  # Weight of the centroids left of the current one
+        k_before = self._scale(0.0)
+        for point_mean, point_weight in points[1:]:
+            q = (before + weight + point_weight) / total
+            if self._scale(q) - k_before <= 1.0:
+                weight += point_weight
+                mean += (point_mean - mean) * point_weight / weight
+            else:
+                means.append(mean)
+                weights.append(weight)
+                before += weight
+                k_before = self._scale(before / total)
+                mean, weight = point_mean, point_weight
+        means.append(mean)
+        weights.append(weight)
+        self._means, self._weights = means, weights
+
+    def _scale(self, q: float) -> float:
+        """Scale function k1, giving small centroids near the tails."""
+        return self.compression / (2 * math.pi) * math.asin(2 * min(q, 1.0) - 1)
+
+
+class MetricWindow:
+    """Ring buffer of recent samples with running sums for O(1) means."""
+
+    def __init__(self, size: int, fields: tuple[str, ...]):
+        """
+        Initialize the window.
+
+        Args:
+            size: Number of samples kept; older samples are evicted
+            fields: Numeric sample fields to keep running sums of
+        """
+        self.fields = fields
+        self.entries: deque[dict[str, Any]] = deque(maxlen=size)
+        self._sums = dict.fromkeys(fields, 0.0)
+
+    def append(self, sample: dict[str, Any]) -> None:
+        """
+        Add a sample, evicting the oldest one when the window is full.
+
+        Args:
+            sample: Sample with a numeric (or boolean) value per field
+        """
+        if len(self.entries) == self.entries.maxlen:
+            evicted = self.entries[0]
+            for field in self.fields:
+                self._sums[field] -= float(evicted.get(field, 0.0))
+        self.entries.append(sample)
+        for field in self.fields:
+            self._sums[field] += float(sample.get(field, 0.0))
+
+    def mean(self, field: str) -> float:
+        """Get the mean of a field over the window, 0.0 when empty."""
+        if not self.entries:
+            return 0.0
+        return self._sums[field] / len(self.entries)
+
+    def replace(self, samples: list[dict[str, Any]]) -> None:
+        """
+        Replace the samples and recompute the sums exactly.
+
+        Args:
+            samples: New samples, oldest first
+        """
+        self.entries.clear()
+        self._sums = dict.fromkeys(self.fields, 0.0)
+        for sample in samples:
+            self.append(sample)
+
+
+def ewma(previous: Optional[float], value: float, alpha: float) -> float:
+    """
+    Update an exponentially weighted moving average.
+
+    Args:
+        previous: Current average, or None before the first sample
+        value: New sample
+        alpha: Weight of the new sample between 0 and 1
+
+    Returns:
+        Updated average
+    """
+    if previous is None:
+        return value
+    return previous + alpha * (value - previous)
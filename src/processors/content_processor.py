@@ -8,6 +8,7 @@ import bleach  # Import bleach
 import markdownify as md  # Added markdownify for HTML to Markdown conversion
 from bs4 import BeautifulSoup
 
+from ..utils.tracing import traced, tracer
 from .content.asset_handler import AssetHandler
 from .content.code_handler import CodeHandler
 from .content.metadata_extractor import extract_metadata
@@ -169,6 +170,14 @@ class ContentProcessor:
         )  # Pass code_handler
 
     # _format_structure_to_markdown method removed as markdown conversion is now handled by markdownify library.
+    @traced(
+        "content.process",
+        attributes=lambda self, content, base_url=None, content_type=None: {
+            "url.full": base_url or "",
+            "content.type": content_type or "",
+            "content.length": len(content or ""),
+        },
+    )
     async def process(
         self, content: str, base_url: str | None = None, content_type: str | None = None
     ) -> ProcessedContent:
@@ -371,7 +380,8 @@ class ContentProcessor:
         try:
             # --- Pre-process to remove unwanted tags ---
             # 1. Parse raw HTML
-            temp_soup = BeautifulSoup(html_content, "html.parser")
+            with tracer.span("html.parse"):
+                temp_soup = BeautifulSoup(html_content, "html.parser")
 
             # 2. Remove script, style, noscript, and iframe tags entirely
             # Also remove headerlink anchors with pilcrow characters
@@ -388,14 +398,15 @@ class ContentProcessor:
 
             # --- Sanitize Remaining HTML ---
             # 4. Sanitize the pre-cleaned HTML string
-            cleaned_html = bleach.clean(
-                pre_cleaned_html,
-                tags=self.ALLOWED_TAGS,
-                attributes=self.ALLOWED_ATTRIBUTES,
-                protocols=bleach.sanitizer.ALLOWED_PROTOCOLS | {"data", "ftp"},
-                strip=True,  # Strip tags not in ALLOWED_TAGS
-                strip_comments=not self.config.extract_comments,
-            )
+            with tracer.span("html.sanitize"):
+                cleaned_html = bleach.clean(
+                    pre_cleaned_html,
+                    tags=self.ALLOWED_TAGS,
+                    attributes=self.ALLOWED_ATTRIBUTES,
+                    protocols=bleach.sanitizer.ALLOWED_PROTOCOLS | {"data", "ftp"},
+                    strip=True,  # Strip tags not in ALLOWED_TAGS
+                    strip_comments=not self.config.extract_comments,
+                )
             # logger.debug(f"Cleaned HTML after bleach:\n{cleaned_html}") # Optional debug
 
             # 5. Check content length (of the final cleaned content) *before* full parsing
@@ -411,7 +422,8 @@ class ContentProcessor:
 
             # --- Parse Cleaned HTML ---
             # 6. Parse the cleaned HTML *once*
-            soup = BeautifulSoup(cleaned_html, "html.parser")
+            with tracer.span("html.parse"):
+                soup = BeautifulSoup(cleaned_html, "html.parser")
 
             # --- Process Cleaned Soup ---
             # 7. Determine the effective base URL
@@ -463,10 +475,11 @@ class ContentProcessor:
                 self.asset_handler.process_images(soup, effective_base_url)
 
             # 10. Extract structure and headings *before* modifying soup further
-            full_structure = self.structure_handler.extract_structure(
-                soup
-            )  # This contains links, text, etc.
-            headings = self.structure_handler.extract_headings(soup)
+            with tracer.span("html.extract_structure"):
+                full_structure = self.structure_handler.extract_structure(
+                    soup
+                )  # This contains links, text, etc.
+                headings = self.structure_handler.extract_headings(soup)
 
             # Fallback for headings if structure handler fails to extract them
             if not headings and self.config.max_heading_level > 0:
@@ -493,9 +506,10 @@ class ContentProcessor:
             # Convert the BeautifulSoup object to string before passing to markdownify.
             # Use effective_base_url for markdownify's basefmt option to handle relative links.
             # Use ATX style headings (e.g., # Heading)
-            formatted_content = md.markdownify(
-                str(soup), basefmt=effective_base_url, heading_style=md.ATX
-            )
+            with tracer.span("markdown.convert"):
+                formatted_content = md.markdownify(
+                    str(soup), basefmt=effective_base_url, heading_style=md.ATX
+                )
 
             # 13. Extract links from the soup
             links = []
@@ -5,6 +5,7 @@ from typing import Any, Optional
 
 from pydantic import BaseModel, Field
 
+from ..utils.tracing import traced
 from .content_processor import ProcessedContent
 
 
@@ -59,6 +60,7 @@ class QualityChecker:
         """Initialize quality checker with configuration."""
         self.config = config or QualityConfig()
 
+    @traced("quality.check")
     async def check_quality(
         self, content: ProcessedContent
     ) -> tuple[list[QualityIssue], dict[str, Any]]:
@@ -0,0 +1,264 @@
+#!/usr/bin/env python3
+"""
+Index structures for search autocomplete.
+
+Provides a weighted prefix trie that caches its best completions at every
+node, and a symmetric-delete index for edit-distance lookups, so suggestion
+latency depends on the length of the typed query rather than on the size of
+the history.
+"""
+
+import heapq
+from typing import Optional
+
+
+def edit_distance(s1: str, s2: str) -> int:
+    """
+    Calculate the Levenshtein distance between two strings.
+
+    Uses Hyyrö's bit-parallel algorithm, which processes a whole column of
+    the dynamic programming matrix per character of the longer string.
+    """
+    if len(s1) > len(s2):
+        s1, s2 = s2, s1
+    if not s1:
+        return len(s2)
+
+    # Bit masks of the positions of each character in the shorter string
+    peq: dict[str, int] = {}
+    for i, char in enumerate(s1):
+        peq[char] = peq.get(char, 0) | (1 << i)
+
+    length = len(s1)
+    full = (1 << length) - 1
+    last = 1 << (length - 1)
+    pv, mv, score = full, 0, length
+
+    for char in s2:
+        eq = peq.get(char, 0)
+        xv = eq | mv
+        xh = (((eq & pv) + pv) ^ pv) | eq
+        ph = mv | (~(xh | pv) & full)
+        mh = pv & xh
+        if ph & last:
+            score += 1
+        elif mh & last:
+            score -= 1
+        ph = ((ph << 1) | 1) & full
+        mh = (mh << 1) & full
+        pv = mh | (~(xv | ph) & full)
+        mv = ph & xv
+
+    return score
+
+
+class _TrieNode:
+    """Node of a PrefixTrie."""
+
+    __slots__ = ("children", "values", "top")
+
+    def __init__(self):
+        self.children: dict[str, _TrieNode] = {}
+        self.values: dict[str, float] = {}  # Values whose key ends here
+        self.top: list[tuple[float, str]] = []  # Best completions, heaviest first
+
+
+class PrefixTrie:
+    """
+    Weighted prefix trie with cached top-k completions per node.
+
+    Several keys may map to the same value (for example every word of a
+    library name), in which case the value is returned once with its
+    highest weight. Weights may only grow; call ``clear`` and re-insert to
+    remove entries.
+    """
+
+    def __init__(self, top_k: int = 10):
+        """
+        Initialize the trie.
+
+        Args:
+            top_k: Number of completions cached at every node
+        """
+        self.top_k = top_k
+        self._root = _TrieNode()
+        self._size = 0
+
+    def __len__(self) -> int:
+        return self._size
+
+    def clear(self):
+        """Remove every entry."""
+        self._root = _TrieNode()
+        self._size = 0
+
+    def insert(self, key: str, weight: float = 1.0, value: Optional[str] = None):
+        """
+        Insert a key or raise its weight.
+
+        Args:
+            key: Key to match prefixes against
+            weight: Weight of the entry; must not be lower than a previous one
+            value: Completion returned for the key (defaults to the key)
+        """
+        value = key if value is None else value
+
+        path = [self._root]
+        node = self._root
+        for char in key:
+            child = node.children.get(char)
+            if child is None:
+                child = node.children[char] = _TrieNode()
+            node = child
+            path.append(node)
+
+        if value not in node.values:
+            self._size += 1
+        node.values[value] = weight
+
+        for node in path:
+            self._update_top(node, value, weight)
+
+    def complete(self, prefix: str, limit: int = 10) -> list[str]:
+        """
+        Return the heaviest completions of a prefix.
+
+        Args:
+            prefix: Prefix to complete
+            limit: Maximum number of completions
+
+        Returns:
+            Completion values, heaviest first
+        """
+        node = self._root
+        for char in prefix:
+            node = node.children.get(char)
+            if node is None:
+                return []
+
+        if limit <= self.top_k:
+            return [value for _, value in node.top[:limit]]
+
+        return self._collect(node, limit)
+
+    def _update_top(self, node: _TrieNode, value: str, weight: float):
+        """Place a value in a node's cached completions."""
+        top = node.top
+        if len(top) >= self.top_k and weight <= top[-1][0]:
+            # Weights only grow, so a value already cached keeps its place
+            return
+
+        for index, (existing_weight, existing_value) in enumerate(top):
+            if existing_value == value:
+                if existing_weight >= weight:
+                    return
+                del top[index]
+                break
+
+        # Insert keeping descending weight order; the list is at most top_k long
+        index = len(top)
+        while index > 0 and top[index - 1][0] < weight:
+            index -= 1
+        top.insert(index, (weight, value))
+        del top[self.top_k :]
+
+    def _collect(self, node: _TrieNode, limit: int) -> list[str]:
+        """Collect the heaviest values below a node by walking the subtree."""
+        best: dict[str, float] = {}
+        stack = [node]
+        while stack:
+            current = stack.pop()
+            for value, weight in current.values.items():
+                if weight > best.get(value, float("-inf")):
+                    best[value] = weight
+            stack.extend(current.children.values())
+
+        return [
+            value
+            for value, _ in heapq.nlargest(limit, best.items(), key=lambda x: x[1])
+        ]
+
+
+def _deletes(word: str, max_deletes: int) -> set[str]:
+    """Return every string obtained by deleting up to ``max_deletes`` characters."""
+    variants = {word}
+    frontier = {word}
+    for _ in range(max_deletes):
+        frontier = {
+            variant[:i] + variant[i + 1 :]
+            for variant in frontier
+            for i in range(len(variant))
+        }
+        variants |= frontier
+    return variants
+
+
+class DeleteIndex:
+    """
+    Symmetric-delete index for edit-distance lookups.
+
+    Every word is indexed under all strings reachable by deleting up to
+    ``max_distance`` characters. Two words within that edit distance always
+    share such a string, so a lookup only has to generate the deletes of the
+    query and verify the few candidates found, independent of vocabulary size.
+    """
+
+    def __init__(self, max_distance: int = 2):
+        """
+        Initialize the index.
+
+        Args:
+            max_distance: Largest edit distance that can be looked up
+        """
+        self.max_distance = max_distance
+        self._words: set[str] = set()
+        self._deletes: dict[str, list[str]] = {}
+
+    def __len__(self) -> int:
+        return len(self._words)
+
+    def clear(self):
+        """Remove every word."""
+        self._words.clear()
+        self._deletes.clear()
+
+    def add(self, word: str):
+        """
+        Add a word to the index.
+
+        Args:
+            word: Word to add; duplicates are ignored
+        """
+        if word in self._words:
+            return
+        self._words.add(word)
+        for variant in _deletes(word, self.max_distance):
+            self._deletes.setdefault(variant, []).append(word)
+
+    def search(self, word: str, max_distance: int) -> list[tuple[int, str]]:
+        """
+        Find words within an edit distance.
+
+        Args:
+            word: Word to look up
+            max_distance: Maximum edit distance, capped at the index's
+
+        Returns:
+            List of (distance, word) tuples, closest first
+        """
+        max_distance = min(max_distance, self.max_distance)
+
+        candidates = set()
+        for variant in _deletes(word, max_distance):
+            candidates.update(self._deletes.get(variant, ()))
+
+        matches = []
+        for candidate in candidates:
+            if abs(len(candidate) - len(word)) > max_distance:
+                continue
+            distance = edit_distance(word, candidate)
+            if distance <= max_distance:
+                matches.append((distance, candidate))
+
+        matches.sort()
+        return matches
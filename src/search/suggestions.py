@@ -6,18 +6,29 @@ Provides intelligent search suggestions and autocomplete functionality.
 """
 
 import logging
+import re
 from collections import Counter
 from typing import Any
 
+from .autocomplete import DeleteIndex, PrefixTrie
+
 logger = logging.getLogger(__name__)
 
 
 class SearchSuggestions:
     """Engine for providing search suggestions and autocomplete."""
 
-    def __init__(self):
-        """Initialize the search suggestions engine."""
-        self.search_history = []
+    def __init__(self, max_history_terms: int = 100000):
+        """
+        Initialize the search suggestions engine.
+
+        Args:
+            max_history_terms: Maximum number of distinct search terms kept;
+                the least frequent terms are pruned beyond this
+        """
+        self.max_history_terms = max_history_terms
+        self.search_history = Counter()  # Distinct search terms -> count
+        self.total_searches = 0
         self.popular_terms = Counter()
         self.library_names = set()
         self.common_queries = [
@@ -34,6 +45,14 @@ class SearchSuggestions:
             "async programming",
         ]
 
+        # Autocomplete indexes
+        self._history_trie = PrefixTrie()
+        self._terms_trie = PrefixTrie()
+        self._names_trie = PrefixTrie()
+        self._fuzzy_index = DeleteIndex()
+        for query in self.common_queries:
+            self._index_name(query.lower(), query)
+
     def add_search_term(self, term: str):
         """
         Add a search term to the history.
@@ -43,12 +62,20 @@ class SearchSuggestions:
         """
         term = term.strip().lower()
         if term:
-            self.search_history.append(term)
+            self.search_history[term] += 1
+            self.total_searches += 1
+            self._history_trie.insert(term, self.search_history[term])
             # Update popular terms
             words = term.split()
             for word in words:
                 if len(word) > 2:  # Ignore very short words
+                    if word not in self.popular_terms:
+                        self._fuzzy_index.add(word)
                     self.popular_terms[word] += 1
+                    self._terms_trie.insert(word, self.popular_terms[word])
+
+            if len(self.search_history) > self.max_history_terms:
+                self._prune_history()
 
     def add_library_name(self, library_name: str):
         """
@@ -57,7 +84,11 @@ class SearchSuggestions:
         Args:
             library_name: Name of the library
         """
-        self.library_names.add(library_name.lower())
+        library_name = library_name.lower()
+        if library_name not in self.library_names:
+            self.library_names.add(library_name)
+            self._index_name(library_name, library_name)
+            self._fuzzy_index.add(library_name)
 
     def get_suggestions(self, partial_query: str, limit: int = 10) -> list[str]:
         """
@@ -76,31 +107,24 @@ class SearchSuggestions:
 
         suggestions = []
 
-        # 1. Exact matches from search history
-        for term in self.search_history:
-            if term.startswith(partial_lower) and term not in suggestions:
-                suggestions.append(term)
+        # 1. Prefix matches from search history, most frequent first
+        for term in self._history_trie.complete(partial_lower, limit):
+            suggestions.append(term)
 
-        # 2. Library name matches
-        for lib_name in self.library_names:
-            if partial_lower in lib_name and lib_name not in suggestions:
-                suggestions.append(lib_name)
-
-        # 3. Common query matches
-        for query in self.common_queries:
-            if partial_lower in query.lower() and query not in suggestions:
-                suggestions.append(query)
+        # 2-3. Library names and common queries with a word starting with the query
+        for name in self._names_trie.complete(partial_lower, limit):
+            if name not in suggestions:
+                suggestions.append(name)
 
         # 4. Word-based suggestions
         words = partial_lower.split()
         if words:
             last_word = words[-1]
-            for term, count in self.popular_terms.most_common(50):
-                if term.startswith(last_word):
-                    # Reconstruct the full suggestion
-                    suggestion = " ".join(words[:-1] + [term])
-                    if suggestion not in suggestions:
-                        suggestions.append(suggestion)
+            for term in self._terms_trie.complete(last_word, limit):
+                # Reconstruct the full suggestion
+                suggestion = " ".join(words[:-1] + [term])
+                if suggestion not in suggestions:
+                    suggestions.append(suggestion)
 
         # 5. Fuzzy matches (simple edit distance)
         if len(suggestions) < limit:
@@ -124,16 +148,15 @@ class SearchSuggestions:
             List of popular search terms with counts
         """
         # Count full search terms
-        term_counts = Counter(self.search_history)
         popular = []
 
-        for term, count in term_counts.most_common(limit):
+        for term, count in self.search_history.most_common(limit):
             popular.append(
                 {
                     "term": term,
                     "count": count,
-                    "percentage": round((count / len(self.search_history)) * 100, 1)
-                    if self.search_history
+                    "percentage": round((count / self.total_searches) * 100, 1)
+                    if self.total_searches
                     else 0,
                 }
             )
@@ -203,39 +226,38 @@ class SearchSuggestions:
     def _get_fuzzy_matches(
         self, partial_query: str, max_distance: int = 2
     ) -> list[str]:
-        """Get fuzzy matches using simple edit distance."""
-        fuzzy_matches = []
+        """Get fuzzy matches against library names and popular terms."""
+        return [
+            match for _, match in self._fuzzy_index.search(partial_query, max_distance)
+        ]
 
-        # Check against library names
-        for lib_name in self.library_names:
-            if self._edit_distance(partial_query, lib_name) <= max_distance:
-                fuzzy_matches.append(lib_name)
-
-        # Check against popular terms
-        for term in self.popular_terms:
-            if self._edit_distance(partial_query, term) <= max_distance:
-                fuzzy_matches.append(term)
-
-        return fuzzy_matches
-
-    def _edit_distance(self, s1: str, s2: str) -> int:
-        """Calculate simple edit distance between two strings."""
-        if len(s1) > len(s2):
-            s1, s2 = s2, s1
-
-        distances = range(len(s1) + 1)
-        for i2, c2 in enumerate(s2):
-            distances_ = [i2 + 1]
-            for i1, c1 in enumerate(s1):
-                if c1 == c2:
-                    distances_.append(distances[i1])
-                else:
-                    distances_.append(
-                        1 + min((distances[i1], distances[i1 + 1], distances_[-1]))
-                    )
-            distances = distances_
-
-        return distances[-1]
+    def _index_name(self, name: str, value: str):
+        """Index a name so that any of its words can be completed to it."""
+        # Shorter names weigh more, as _rank_suggestions prefers them
+        weight = 1.0 / len(value)
+        self._names_trie.insert(name, weight, value)
+        for match in re.finditer(r"(?<=[\s\-_.])\w", name):
+            self._names_trie.insert(name[match.start() :], weight, value)
+
+    def _prune_history(self):
+        """Drop the least frequent terms and rebuild the history indexes."""
+        keep = int(self.max_history_terms * 0.75)
+        self.search_history = Counter(dict(self.search_history.most_common(keep)))
+        self._history_trie.clear()
+        for term, count in self.search_history.items():
+            self._history_trie.insert(term, count)
+
+        if len(self.popular_terms) > self.max_history_terms:
+            self.popular_terms = Counter(dict(self.popular_terms.most_common(keep)))
+            self._terms_trie.clear()
+            self._fuzzy_index.clear()
+            for word, count in self.popular_terms.items():
+                self._terms_trie.insert(word, count)
+                self._fuzzy_index.add(word)
+            for library_name in self.library_names:
+                self._fuzzy_index.add(library_name)
+
+        logger.debug(f"Pruned search history to {len(self.search_history)} terms")
 
     def _rank_suggestions(
         self, suggestions: list[str], partial_query: str
@@ -0,0 +1,19 @@
+"""
+Columnar export of crawl results for lib2docScrape.
+"""
+
+from .exporter import (
+    EXPORT_FORMATS,
+    PYARROW_AVAILABLE,
+    CrawlResultExporter,
+    export_crawl_result,
+    read_crawl_table,
+)
+
+__all__ = [
+    "EXPORT_FORMATS",
+    "PYARROW_AVAILABLE",
+    "CrawlResultExporter",
+    "export_crawl_result",
+    "read_crawl_table",
+]
@@ -0,0 +1,367 @@
+"""
+Columnar Parquet/Arrow export of crawl results.
+
+A crawl is written to a directory holding one file per table (pages,
+issues and metrics) with a fixed schema, plus a small crawl.json with the
+target and stats. Rows are buffered and written one row group at a time, so
+an exporter can be fed per-page results while the crawl runs and analytics
+jobs can read back only the columns they need.
+"""
+
+import json
+import logging
+import os
+from collections.abc import Iterable
+from datetime import datetime
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+try:
+    import pyarrow as pa
+    import pyarrow.parquet as pq
+
+    PYARROW_AVAILABLE = True
+except ImportError:
+    PYARROW_AVAILABLE = False
+
+EXPORT_FORMATS = ("parquet", "arrow")
+TABLE_NAMES = ("pages", "issues", "metrics")
+CRAWL_INFO_FILE = "crawl.json"
+
+if PYARROW_AVAILABLE:
+    PAGES_SCHEMA = pa.schema(
+        [
+            ("url", pa.string()),
+            ("title", pa.string()),
+            ("doc_id", pa.string()),
+            ("content_length", pa.int64()),
+            ("content", pa.large_string()),
+        ]
+    )
+    ISSUES_SCHEMA = pa.schema(
+        [
+            ("type", pa.string()),
+            ("level", pa.string()),
+            ("message", pa.string()),
+            ("location", pa.string()),
+            ("details", pa.string()),  # JSON encoded
+        ]
+    )
+    # One row per metric; numbers and booleans go to value, anything else
+    # to text_value as JSON
+    METRICS_SCHEMA = pa.schema(
+        [
+            ("url", pa.string()),
+            ("name", pa.string()),
+            ("value", pa.float64()),
+            ("text_value", pa.string()),
+        ]
+    )
+    SCHEMAS = {
+        "pages": PAGES_SCHEMA,
+        "issues": ISSUES_SCHEMA,
+        "metrics": METRICS_SCHEMA,
+    }
+else:
+    PAGES_SCHEMA = ISSUES_SCHEMA = METRICS_SCHEMA = None
+    SCHEMAS = {}
+
+
+def _require_pyarrow() -> None:
+    """Raise if the pyarrow package is not installed."""
+    if not PYARROW_AVAILABLE:
+        raise ImportError("pyarrow package is required for columnar export")
+
+
+def _dump(value: Any) -> Any:
+    """Convert a pydantic model to a plain value for JSON."""
+    return value.model_dump() if hasattr(value, "model_dump") else value
+
+
+def _table_path(output_dir: str, table: str, format: str) -> str:
+    """Get the file path of a table."""
+    extension = "parquet" if format == "parquet" else "arrow"
+    return os.path.join(output_dir, f"{table}.{extension}")
+
+
+class _TableWriter:
+    """Buffers rows of one table and writes them in row groups."""
+
+    def __init__(
+        self,
+        path: str,
+        schema: "pa.Schema",
+        format: str,
+        row_group_size: int,
+        compression: str,
+    ):
+        self.path = path
+        self.schema = schema
+        self.format = format
+        self.row_group_size = row_group_size
+        self.compression = compression
+        self.rows_written = 0
+        self._columns: dict[str, list[Any]] = {name: [] for name in schema.names}
+        self._buffered = 0
+        self._writer: Optional[Any] = None
+
+    def append(self, row: dict[str, Any]) -> None:
+        """Buffer a row, writing a row group once enough are buffered."""
+        for name, column in self._columns.items():
+            column.append(row.get(name))
+        self._buffered += 1
+        if self._buffered >= self.row_group_size:
+            self.flush()
+
+    def flush(self) -> None:
+        """Write the buffered rows as one row group."""
+        if not self._buffered:
+            return
+        table = pa.Table.from_pydict(self._columns, schema=self.schema)
+        self._open().write_table(table)
+        self.rows_written += self._buffered
+        self._columns = {name: [] for name in self.schema.names}
+        self._buffered = 0
+
+    def _open(self) -> Any:
+        """Open the file writer on first use."""
+        if self._writer is None:
+            if self.format == "parquet":
+                self._writer = pq.ParquetWriter(
+                    self.path, self.schema, compression=self.compression
+                )
+            else:
+                self._writer = pa.ipc.new_file(
+                    self.path,
+                    self.schema,
+                    options=pa.ipc.IpcWriteOptions(compression=self.compression),
+                )
+        return self._writer
+
+    def close(self) -> None:
+        """Write the remaining rows and close the file."""
+        self.flush()
+        # Tables without rows are still written so every crawl has every file
+        self._open().close()
+
+
+class CrawlResultExporter:
+    """
+    Incremental columnar writer for the pages, issues and metrics of a crawl.
+    """
+
+    def __init__(
+        self,
+        output_dir: str,
+        format: str = "parquet",
+        row_group_size: int = 10000,
+        compression: str = "zstd",
+    ):
+        """
+        Initialize the exporter.
+
+        Args:
+            output_dir: Directory to write the table files to
+            format: "parquet" or "arrow" (Arrow IPC file)
+            row_group_size: Rows buffered per table before a row group is
+                written; bounds the exporter's memory use
+            compression: Column compression codec, e.g. "zstd" or "snappy"
+                (Arrow IPC files support "zstd" and "lz4")
+        """
+        _require_pyarrow()
+        if format not in EXPORT_FORMATS:
+            raise ValueError(
+                f"Unsupported export format: {format}. Use one of {EXPORT_FORMATS}"
+            )
+
+        os.makedirs(output_dir, exist_ok=True)
+        self.output_dir = output_dir
+        self.format = format
+        self._writers = {
+            table: _TableWriter(
+                _table_path(output_dir, table, format),
+                SCHEMAS[table],
+                format,
+                row_group_size,
+                compression,
+            )
+            for table in TABLE_NAMES
+        }
+        self._closed = False
+
+    def __enter__(self) -> "CrawlResultExporter":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    @property
+    def row_counts(self) -> dict[str, int]:
+        """Rows written or buffered per table."""
+        return {
+            table: writer.rows_written + writer._buffered
+            for table, writer in self._writers.items()
+        }
+
+    def add_result(self, result: Any) -> None:
+        """
+        Add the documents, issues and metrics of a crawl result.
+
+        Accepts the per-page results produced during a crawl as well as the
+        final aggregated result.
+
+        Args:
+            result: CrawlResult to add
+        """
+        self.add_documents(result.documents)
+        self.add_issues(result.issues)
+        self.add_metrics(result.metrics)
+
+    def add_documents(self, documents: Iterable[dict[str, Any]]) -> None:
+        """
+        Add crawled documents to the pages table.
+
+        Args:
+            documents: Document dicts with url, title, content and doc_id
+        """
+        pages = self._writers["pages"]
+        for document in documents:
+            content = document.get("content")
+            if content is not None and not isinstance(content, str):
+                content = json.dumps(content, default=str)
+            doc_id = document.get("doc_id")
+            pages.append(
+                {
+                    "url": document.get("url"),
+                    "title": document.get("title"),
+                    "doc_id": str(doc_id) if doc_id is not None else None,
+                    "content_length": len(content) if content is not None else 0,
+                    "content": content,
+                }
+            )
+
+    def add_issues(self, issues: Iterable[Any]) -> None:
+        """
+        Add quality issues to the issues table.
+
+        Args:
+            issues: QualityIssue models or dicts
+        """
+        writer = self._writers["issues"]
+        for issue in issues:
+            issue = _dump(issue)
+            writer.append(
+                {
+                    "type": str(issue.get("type")),
+                    "level": str(issue.get("level")),
+                    "message": issue.get("message"),
+                    "location": issue.get("location"),
+                    "details": json.dumps(issue.get("details") or {}, default=str),
+                }
+            )
+
+    def add_metrics(self, metrics: dict[str, Any]) -> None:
+        """
+        Add metrics to the metrics table.
+
+        Args:
+            metrics: Map of URL (or metric group) to a dict of metric values
+        """
+        writer = self._writers["metrics"]
+        for url, values in metrics.items():
+            values = _dump(values)
+            if not isinstance(values, dict):
+                values = {"value": values}
+            for name, value in values.items():
+                if isinstance(value, (bool, int, float)):
+                    row = {"value": float(value)}
+                else:
+                    row = {"text_value": json.dumps(value, default=str)}
+                writer.append({"url": url, "name": name, **row})
+
+    def close(
+        self, target: Optional[Any] = None, stats: Optional[Any] = None
+    ) -> dict[str, str]:
+        """
+        Flush all tables and write crawl.json.
+
+        Args:
+            target: Optional CrawlTarget of the crawl
+            stats: Optional CrawlStats of the crawl
+
+        Returns:
+            Map of table name (and "crawl") to file path
+        """
+        paths = {table: writer.path for table, writer in self._writers.items()}
+        paths["crawl"] = os.path.join(self.output_dir, CRAWL_INFO_FILE)
+        if self._closed:
+            return paths
+
+        for writer in self._writers.values():
+            writer.close()
+        self._closed = True
+
+        with open(paths["crawl"], "w") as f:
+            json.dump(
+                {
+                    "format": self.format,
+                    "exported_at": datetime.now().isoformat(),
+                    "target": _dump(target),
+                    "stats": _dump(stats),
+                    "row_counts": self.row_counts,
+                },
+                f,
+                indent=2,
+                default=str,
+            )
+
+        logger.info(f"Exported crawl tables to {self.output_dir}: {self.row_counts}")
+        return paths
+
+
+def export_crawl_result(
+    result: Any, output_dir: str, format: str = "parquet", **kwargs: Any
+) -> dict[str, str]:
+    """
+    Export a complete crawl result.
+
+    Args:
+        result: CrawlResult to export
+        output_dir: Directory to write the table files to
+        format: "parquet" or "arrow"
+        **kwargs: Further CrawlResultExporter options
+
+    Returns:
+        Map of table name (and "crawl") to file path
+    """
+    exporter = CrawlResultExporter(output_dir, format=format, **kwargs)
+    exporter.add_result(result)
+    return exporter.close(target=result.target, stats=result.stats)
+
+
+def read_crawl_table(
+    output_dir: str, table: str, columns: Optional[list[str]] = None
+) -> "pa.Table":
+    """
+    Read one table of an exported crawl.
+
+    Args:
+        output_dir: Directory written by CrawlResultExporter
+        table: "pages", "issues" or "metrics"
+        columns: Columns to read; Parquet files only decode these
+
+    Returns:
+        Arrow table
+    """
+    _require_pyarrow()
+    if table not in TABLE_NAMES:
+        raise ValueError(f"Unknown table: {table}. Use one of {TABLE_NAMES}")
+
+    parquet_path = _table_path(output_dir, table, "parquet")
+    if os.path.exists(parquet_path):
+        return pq.read_table(parquet_path, columns=columns)
+
+    with pa.OSFile(_table_path(output_dir, table, "arrow")) as source:
+        data = pa.ipc.open_file(source).read_all()
+    return data.select(columns) if columns else data
@@ -2,6 +2,21 @@
 Compressed storage for lib2docScrape.
 """
 
-from .storage import CompressedStorage, CompressionConfig, CompressionFormat
+from .chunked import ChunkedRecordReader, ChunkedRecordWriter
+from .storage import (
+    ZSTD_AVAILABLE,
+    CompressedStorage,
+    CompressionConfig,
+    CompressionFormat,
+    CompressionPreset,
+)
 
-__all__ = ["CompressedStorage", "CompressionConfig", "CompressionFormat"]
+__all__ = [
+    "ChunkedRecordReader",
+    "ChunkedRecordWriter",
+    "ZSTD_AVAILABLE",
+    "CompressedStorage",
+    "CompressionConfig",
+    "CompressionFormat",
+    "CompressionPreset",
+]
@@ -0,0 +1,212 @@
+"""
+Seekable container of independently compressed record chunks.
+
+Records are written as newline-delimited JSON and grouped into chunks that
+are compressed separately. An index of chunk offsets at the end of the file
+lets a reader decompress only the chunk holding the record it needs.
+
+Layout::
+
+    MAGIC | chunk* | index (JSON) | index length (8 bytes, big endian) | MAGIC
+"""
+
+import bisect
+import json
+import logging
+import os
+import struct
+from collections.abc import Iterator
+from typing import TYPE_CHECKING, Any, Optional
+
+if TYPE_CHECKING:
+    from .storage import CompressedStorage
+
+logger = logging.getLogger(__name__)
+
+MAGIC = b"L2DCHNK1"
+_LENGTH = struct.Struct(">Q")
+_TRAILER_SIZE = _LENGTH.size + len(MAGIC)
+
+
+class ChunkedRecordWriter:
+    """Writes records to a chunked container, one chunk in memory at a time."""
+
+    def __init__(
+        self, storage: "CompressedStorage", file_path: str, chunk_size: int = 65536
+    ):
+        """
+        Initialize the writer.
+
+        Args:
+            storage: Storage whose format and level compress the chunks
+            file_path: Path to write to
+            chunk_size: Uncompressed bytes per chunk
+        """
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        self.storage = storage
+        self.file_path = file_path
+        self.chunk_size = chunk_size
+        self._file = open(file_path, "wb")
+        self._file.write(MAGIC)
+        self._lines: list[bytes] = []
+        self._buffered = 0
+        self._records = 0
+        # [offset, length, first_record, record_count] per chunk
+        self._chunks: list[list[int]] = []
+
+    def __len__(self) -> int:
+        return self._records
+
+    def __enter__(self) -> "ChunkedRecordWriter":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        # An index would make a truncated container look complete
+        if exc_type is None:
+            self.close()
+        else:
+            self.abort()
+
+    def write(self, record: Any) -> None:
+        """
+        Append a record.
+
+        Args:
+            record: JSON-serializable record
+        """
+        line = json.dumps(record).encode("utf-8") + b"\n"
+        self._lines.append(line)
+        self._buffered += len(line)
+        self._records += 1
+        if self._buffered >= self.chunk_size:
+            self._flush_chunk()
+
+    def _flush_chunk(self) -> None:
+        """Compress and write the buffered records as one chunk."""
+        if not self._lines:
+            return
+        data = self.storage.compress_block(b"".join(self._lines))
+        first_record = self._records - len(self._lines)
+        self._chunks.append(
+            [self._file.tell(), len(data), first_record, len(self._lines)]
+        )
+        self._file.write(data)
+        self._lines = []
+        self._buffered = 0
+
+    def abort(self) -> None:
+        """Close and delete the file without writing an index."""
+        if self._file.closed:
+            return
+        self._file.close()
+        os.remove(self.file_path)
+
+    def close(self) -> None:
+        """Write the remaining records and the index, then close the file."""
+        if self._file.closed:
+            return
+        self._flush_chunk()
+        index = json.dumps(
+            {
+                "format": self.storage.format_name,
+                "records": self._records,
+                "chunks": self._chunks,
+            }
+        ).encode("utf-8")
+        self._file.write(index)
+        self._file.write(_LENGTH.pack(len(index)))
+        self._file.write(MAGIC)
+        self._file.close()
+
+
+class ChunkedRecordReader:
+    """Random access to the records of a chunked container."""
+
+    def __init__(self, storage: "CompressedStorage", file_path: str):
+        """
+        Open a container and read its index.
+
+        Args:
+            storage: Storage used to decompress the chunks; a zstd container
+                needs the dictionary it was written with
+            file_path: Path to the container
+
+        Raises:
+            ValueError: If the file is not a chunked container
+        """
+        self.storage = storage
+        self.file_path = file_path
+        self._file = open(file_path, "rb")
+        try:
+            self._read_index()
+        except Exception:
+            self._file.close()
+            raise
+        self._cached_chunk: Optional[int] = None
+        self._cached_lines: list[bytes] = []
+
+    def _read_index(self) -> None:
+        """Load the chunk index from the end of the file."""
+        if self._file.read(len(MAGIC)) != MAGIC:
+            raise ValueError(f"{self.file_path} is not a chunked record file")
+        self._file.seek(-_TRAILER_SIZE, os.SEEK_END)
+        trailer = self._file.read(_TRAILER_SIZE)
+        if trailer[_LENGTH.size :] != MAGIC:
+            raise ValueError(f"{self.file_path} is truncated or still being written")
+        (index_length,) = _LENGTH.unpack(trailer[: _LENGTH.size])
+        self._file.seek(-_TRAILER_SIZE - index_length, os.SEEK_END)
+        index = json.loads(self._file.read(index_length))
+
+        self.format = index["format"]
+        self._records: int = index["records"]
+        self._chunks: list[list[int]] = index["chunks"]
+        self._first_records = [chunk[2] for chunk in self._chunks]
+
+    def __len__(self) -> int:
+        return self._records
+
+    def __enter__(self) -> "ChunkedRecordReader":
+        return self
+
+    def __exit__(self, *exc_info) -> None:
+        self.close()
+
+    def __getitem__(self, index: int) -> Any:
+        """
+        Read one record, decompressing only the chunk that holds it.
+
+        Args:
+            index: Record position; negative values count from the end
+
+        Returns:
+            The record
+        """
+        if index < 0:
+            index += self._records
+        if not 0 <= index < self._records:
+            raise IndexError("record index out of range")
+
+        chunk = bisect.bisect_right(self._first_records, index) - 1
+        lines = self._chunk_lines(chunk)
+        return json.loads(lines[index - self._first_records[chunk]])
+
+    def __iter__(self) -> Iterator[Any]:
+        for chunk in range(len(self._chunks)):
+            for line in self._chunk_lines(chunk):
+                yield json.loads(line)
+
+    def _chunk_lines(self, chunk: int) -> list[bytes]:
+        """Decompress a chunk into its record lines, caching the last one."""
+        if chunk != self._cached_chunk:
+            offset, length, _, _ = self._chunks[chunk]
+            self._file.seek(offset)
+            data = self.storage.decompress_data(
+                self._file.read(length), format=self.format
+            )
+            self._cached_lines = data.splitlines()
+            self._cached_chunk = chunk
+        return self._cached_lines
+
+    def close(self) -> None:
+        """Close the underlying file."""
+        self._file.close()
@@ -4,19 +4,30 @@ Compressed storage implementation.
 
 import bz2
 import gzip
+import io
 import json
 import logging
 import lzma
 import os
 import pickle
 import zlib
+from collections.abc import Iterable, Iterator
 from enum import Enum
-from typing import Any, Optional
+from typing import IO, Any, Optional
 
 from pydantic import BaseModel, ConfigDict
 
+from .chunked import ChunkedRecordReader, ChunkedRecordWriter
+
 logger = logging.getLogger(__name__)
 
+try:
+    import zstandard
+
+    ZSTD_AVAILABLE = True
+except ImportError:
+    ZSTD_AVAILABLE = False
+
 
 class CompressionFormat(str, Enum):
     """Compression format."""
@@ -25,9 +36,93 @@ class CompressionFormat(str, Enum):
     LZMA = "lzma"
     BZ2 = "bz2"
     ZLIB = "zlib"
+    ZSTD = "zstd"
     NONE = "none"
 
 
+class CompressionPreset(str, Enum):
+    """Speed/ratio tradeoff applied on top of the compression format."""
+
+    FAST = "fast"
+    BALANCED = "balanced"
+    MAX = "max"
+
+
+# Maximum size of a dictionary training sample; longer samples are split
+DICTIONARY_SAMPLE_BLOCK_SIZE = 16384
+
+# Largest zstd frame header, which holds the ID of the frame's dictionary
+ZSTD_FRAME_HEADER_MAX_SIZE = 18
+
+# Compression level used by each preset, per format. For LZMA this is the
+# preset number.
+PRESET_LEVELS: dict[str, dict[str, int]] = {
+    CompressionFormat.GZIP.value: {"fast": 1, "balanced": 6, "max": 9},
+    CompressionFormat.ZLIB.value: {"fast": 1, "balanced": 6, "max": 9},
+    CompressionFormat.BZ2.value: {"fast": 1, "balanced": 9, "max": 9},
+    CompressionFormat.LZMA.value: {"fast": 0, "balanced": 6, "max": 9},
+    CompressionFormat.ZSTD.value: {"fast": 1, "balanced": 3, "max": 19},
+}
+
+
+# Size of the reads and writes made by streaming compressors
+STREAM_BUFFER_SIZE = 65536
+
+
+class _ZlibWriter(io.RawIOBase):
+    """Writable stream that zlib-compresses into a file."""
+
+    def __init__(self, file_path: str, level: int, wbits: int):
+        self._file = open(file_path, "wb")
+        self._compressor = zlib.compressobj(level, zlib.DEFLATED, wbits)
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._file.write(self._compressor.compress(data))
+        return len(data)
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.write(self._compressor.flush())
+            self._file.close()
+        super().close()
+
+
+class _ZlibReader(io.RawIOBase):
+    """Readable stream that decompresses a zlib file."""
+
+    def __init__(self, file_path: str, wbits: int):
+        self._file = open(file_path, "rb")
+        self._decompressor = zlib.decompressobj(wbits)
+        self._pending = b""
+
+    def readable(self) -> bool:
+        return True
+
+    def readinto(self, buffer) -> int:
+        while not self._pending:
+            if self._decompressor.eof:
+                return 0
+            data = self._file.read(STREAM_BUFFER_SIZE)
+            if data:
+                self._pending = self._decompressor.decompress(data)
+            else:
+                self._pending = self._decompressor.flush()
+                if not self._pending:
+                    return 0
+        size = min(len(buffer), len(self._pending))
+        buffer[:size] = self._pending[:size]
+        self._pending = self._pending[size:]
+        return size
+
+    def close(self) -> None:
+        if not self.closed:
+            self._file.close()
+        super().close()
+
+
 class CompressionConfig(BaseModel):
     """Configuration for compression."""
 
@@ -42,6 +137,12 @@ class CompressionConfig(BaseModel):
     gzip_wbits: int = 31  # 31 = gzip format with maximum window size
     zlib_wbits: int = 15  # 15 = maximum window size
     lzma_preset: int = 9  # 0-9, higher = more compression
+    zstd_level: int = 3  # 1-22, higher = more compression
+    zstd_dictionary_path: Optional[str] = None  # Dictionary to load at startup
+    zstd_dictionary_size: int = 112640  # Size of trained dictionaries in bytes
+
+    # Overrides the level settings above with tuned per-format values
+    preset: Optional[CompressionPreset] = None
 
     model_config = ConfigDict(use_enum_values=True)
 
@@ -60,9 +161,179 @@ class CompressedStorage:
             config: Optional compression configuration
         """
         self.config = config or CompressionConfig()
+        self._zstd_dict: Optional[Any] = None
+        self._zstd_compressor: Optional[Any] = None
+        self._zstd_compressor_level: Optional[int] = None
+        self._zstd_decompressor: Optional[Any] = None
+
+        if self.config.format == CompressionFormat.ZSTD and not ZSTD_AVAILABLE:
+            raise ImportError(
+                "zstandard package is required for the zstd compression format"
+            )
+        if self.config.zstd_dictionary_path:
+            self.load_dictionary(self.config.zstd_dictionary_path)
+
+        logger.info(
+            f"Initialized compressed storage with format={self.config.format}, level={self.get_level()}"
+        )
+
+    def get_level(self, format: Optional[CompressionFormat] = None) -> int:
+        """
+        Get the compression level for a format.
+
+        Args:
+            format: Optional format override
+
+        Returns:
+            Level from the configured preset, or from the format's level setting
+        """
+        format = CompressionFormat(format or self.config.format)
+        if self.config.preset is not None and format.value in PRESET_LEVELS:
+            return PRESET_LEVELS[format.value][
+                CompressionPreset(self.config.preset).value
+            ]
+        if format == CompressionFormat.LZMA:
+            return self.config.lzma_preset
+        if format == CompressionFormat.ZSTD:
+            return self.config.zstd_level
+        return self.config.level
+
+    @property
+    def dictionary(self) -> Optional[bytes]:
+        """Raw bytes of the zstd dictionary in use, if any."""
+        return self._zstd_dict.as_bytes() if self._zstd_dict is not None else None
+
+    @property
+    def dictionary_id(self) -> int:
+        """ID of the zstd dictionary in use, 0 without one."""
+        return self._zstd_dict.dict_id() if self._zstd_dict is not None else 0
+
+    def train_dictionary(
+        self, samples: Iterable[bytes | str], dict_size: Optional[int] = None
+    ) -> bytes:
+        """
+        Train a zstd dictionary from sample documents and start using it.
+
+        Many small, similar documents such as pages of one documentation
+        site share most of their markup and boilerplate; a dictionary holds
+        that shared content so each document only encodes what differs.
+
+        Data compressed with a dictionary records its ID and can only be
+        read with that dictionary loaded; save the dictionary before
+        training a new one if older files must stay readable.
+
+        Args:
+            samples: Sample documents, typically a few hundred stored pages
+            dict_size: Dictionary size in bytes (defaults to config)
+
+        Returns:
+            Raw dictionary bytes, for saving with save_dictionary
+        """
+        self._require_zstd()
+        # The trainer needs many samples; long pages are split into blocks
+        sample_bytes = []
+        for sample in samples:
+            if isinstance(sample, str):
+                sample = sample.encode("utf-8")
+            for start in range(0, len(sample), DICTIONARY_SAMPLE_BLOCK_SIZE):
+                sample_bytes.append(
+                    sample[start : start + DICTIONARY_SAMPLE_BLOCK_SIZE]
+                )
+
+        # A dictionary should be much smaller than the samples it is built from
+        total_size = sum(len(sample) for sample in sample_bytes)
+        dict_size = min(
+            dict_size or self.config.zstd_dictionary_size, max(total_size // 10, 1024)
+        )
+        try:
+            dictionary = zstandard.train_dictionary(dict_size, sample_bytes)
+        except zstandard.ZstdError as e:
+            raise ValueError(
+                f"Not enough sample data to train a zstd dictionary: {e}"
+            ) from e
+        self._set_dictionary(dictionary)
         logger.info(
-            f"Initialized compressed storage with format={self.config.format}, level={self.config.level}"
+            f"Trained zstd dictionary of {len(dictionary.as_bytes())} bytes from {len(sample_bytes)} samples"
         )
+        return dictionary.as_bytes()
+
+    def save_dictionary(self, file_path: str) -> None:
+        """
+        Save the zstd dictionary in use to a file.
+
+        Args:
+            file_path: Path to save to
+        """
+        if self._zstd_dict is None:
+            raise ValueError("No zstd dictionary to save")
+        os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+        with open(file_path, "wb") as f:
+            f.write(self._zstd_dict.as_bytes())
+
+    def load_dictionary(self, file_path: str) -> None:
+        """
+        Load a zstd dictionary and use it for compression and decompression.
+
+        Args:
+            file_path: Path to a dictionary saved with save_dictionary
+        """
+        self._require_zstd()
+        with open(file_path, "rb") as f:
+            self._set_dictionary(zstandard.ZstdCompressionDict(f.read()))
+
+    def _set_dictionary(self, dictionary: Any) -> None:
+        """Use a dictionary, dropping compressors built without it."""
+        self._zstd_dict = dictionary
+        self._zstd_compressor = None
+        self._zstd_decompressor = None
+
+    def _require_zstd(self) -> None:
+        """Raise if the zstandard package is not installed."""
+        if not ZSTD_AVAILABLE:
+            raise ImportError("zstandard package is required for zstd compression")
+
+    def _get_zstd_compressor(self) -> Any:
+        """Get a cached zstd compressor for the configured level and dictionary."""
+        self._require_zstd()
+        level = self.get_level(CompressionFormat.ZSTD)
+        if self._zstd_compressor is None or self._zstd_compressor_level != level:
+            self._zstd_compressor = zstandard.ZstdCompressor(
+                level=level, dict_data=self._zstd_dict, write_dict_id=True
+            )
+            self._zstd_compressor_level = level
+        return self._zstd_compressor
+
+    def _get_zstd_decompressor(self) -> Any:
+        """Get a cached zstd decompressor for the dictionary in use."""
+        self._require_zstd()
+        if self._zstd_decompressor is None:
+            self._zstd_decompressor = zstandard.ZstdDecompressor(
+                dict_data=self._zstd_dict
+            )
+        return self._zstd_decompressor
+
+    def _check_zstd_dictionary(self, frame: bytes) -> None:
+        """
+        Check that a zstd frame can be read with the dictionary in use.
+
+        Args:
+            frame: Start of the compressed data
+
+        Raises:
+            ValueError: If the frame was written with another dictionary
+        """
+        try:
+            dict_id = zstandard.get_frame_parameters(frame).dict_id
+        except zstandard.ZstdError:
+            # Not a readable frame header; decompression reports the error
+            return
+        if dict_id and dict_id != self.dictionary_id:
+            loaded = self.dictionary_id or "none"
+            raise ValueError(
+                f"Data was compressed with zstd dictionary {dict_id}, but the "
+                f"dictionary in use is {loaded}; load the dictionary it was "
+                "written with"
+            )
 
     def compress_data(self, data: bytes) -> tuple[bytes, bool]:
         """
@@ -78,17 +349,31 @@ class CompressedStorage:
         if len(data) < self.config.min_size_for_compression:
             return data, False
 
-        # Compress based on format
+        return self.compress_block(data), self.config.format != CompressionFormat.NONE
+
+    def compress_block(self, data: bytes) -> bytes:
+        """
+        Compress binary data with the configured format, whatever its size.
+
+        Args:
+            data: Data to compress
+
+        Returns:
+            Compressed data, readable with decompress_data
+        """
+        level = self.get_level()
         if self.config.format == CompressionFormat.GZIP:
-            return gzip.compress(data, compresslevel=self.config.level), True
+            return gzip.compress(data, compresslevel=level)
         elif self.config.format == CompressionFormat.LZMA:
-            return lzma.compress(data, preset=self.config.lzma_preset), True
+            return lzma.compress(data, preset=level)
         elif self.config.format == CompressionFormat.BZ2:
-            return bz2.compress(data, compresslevel=self.config.level), True
+            return bz2.compress(data, compresslevel=level)
         elif self.config.format == CompressionFormat.ZLIB:
-            return zlib.compress(data, level=self.config.level), True
+            return zlib.compress(data, level=level)
+        elif self.config.format == CompressionFormat.ZSTD:
+            return self._get_zstd_compressor().compress(data)
         else:
-            return data, False
+            return data
 
     def decompress_data(
         self,
@@ -123,6 +408,10 @@ class CompressedStorage:
             return bz2.decompress(data)
         elif format == CompressionFormat.ZLIB:
             return zlib.decompress(data)
+        elif format == CompressionFormat.ZSTD:
+            decompressor = self._get_zstd_decompressor()
+            self._check_zstd_dictionary(data)
+            return decompressor.decompress(data)
         else:
             return data
 
@@ -164,6 +453,209 @@ class CompressedStorage:
 
         return self.decompress_data(data, format).decode(encoding)
 
+    @property
+    def format_name(self) -> str:
+        """Configured compression format as a string, e.g. "gzip"."""
+        return (
+            self.config.format
+            if isinstance(self.config.format, str)
+            else self.config.format.value
+        )
+
+    def _compressed_path(self, file_path: str) -> str:
+        """Add the compression extension to a path if it is missing."""
+        format_str = self.format_name
+        if format_str == CompressionFormat.NONE.value or file_path.endswith(
+            f".{format_str}"
+        ):
+            return file_path
+        return f"{file_path}.{format_str}"
+
+    def _resolve_path(self, file_path: str) -> tuple[str, Optional[CompressionFormat]]:
+        """
+        Find a saved file and its compression format.
+
+        Args:
+            file_path: Path as passed to a save method
+
+        Returns:
+            Tuple of (existing_path, format), format being None if uncompressed
+        """
+        # Check if file exists
+        if not os.path.exists(file_path):
+            # Try with compression extension
+            for format in CompressionFormat:
+                if format != CompressionFormat.NONE:
+                    compressed_path = f"{file_path}.{format.value}"
+                    if os.path.exists(compressed_path):
+                        file_path = compressed_path
+                        break
+
+        # Determine if file is compressed
+        for fmt in CompressionFormat:
+            if fmt != CompressionFormat.NONE and file_path.endswith(f".{fmt.value}"):
+                return file_path, fmt
+        return file_path, None
+
+    def open_compressed(
+        self,
+        file_path: str,
+        mode: str = "rb",
+        format: Optional[CompressionFormat] = None,
+    ) -> IO:
+        """
+        Open a file that compresses on write or decompresses on read.
+
+        Data passes through the compressor in small blocks, so neither the
+        whole payload nor its compressed form is held in memory.
+
+        Args:
+            file_path: Path to open (no extension is added)
+            mode: "rb", "wb", "rt" or "wt"
+            format: Optional format override
+
+        Returns:
+            File object, text mode files using UTF-8
+        """
+        if mode not in ("rb", "wb", "rt", "wt"):
+            raise ValueError(f"Unsupported mode: {mode}")
+        format = CompressionFormat(format or self.config.format)
+        binary_mode = mode[0] + "b"
+        writing = mode[0] == "w"
+        if writing:
+            os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
+
+        level = self.get_level(format)
+        if format == CompressionFormat.GZIP:
+            stream = gzip.open(file_path, binary_mode, compresslevel=level)
+        elif format == CompressionFormat.LZMA:
+            stream = lzma.open(
+                file_path, binary_mode, preset=level if writing else None
+            )
+        elif format == CompressionFormat.BZ2:
+            stream = bz2.open(file_path, binary_mode, compresslevel=level)
+        elif format == CompressionFormat.ZLIB:
+            if writing:
+                raw = _ZlibWriter(file_path, level, self.config.zlib_wbits)
+                stream = io.BufferedWriter(raw, STREAM_BUFFER_SIZE)
+            else:
+                raw = _ZlibReader(file_path, self.config.zlib_wbits)
+                stream = io.BufferedReader(raw, STREAM_BUFFER_SIZE)
+        elif format == CompressionFormat.ZSTD:
+            if writing:
+                stream = zstandard.open(
+                    file_path, binary_mode, cctx=self._get_zstd_compressor()
+                )
+            else:
+                decompressor = self._get_zstd_decompressor()
+                with open(file_path, "rb") as f:
+                    self._check_zstd_dictionary(f.read(ZSTD_FRAME_HEADER_MAX_SIZE))
+                stream = zstandard.open(file_path, binary_mode, dctx=decompressor)
+        else:
+            stream = open(file_path, binary_mode)
+
+        if mode[1] == "t":
+            return io.TextIOWrapper(stream, encoding="utf-8")
+        return stream
+
+    def save_ndjson(self, records: Iterable[Any], file_path: str) -> int:
+        """
+        Save records as newline-delimited JSON, compressing as they are written.
+
+        Only one record is serialized at a time, so records can come from a
+        generator over a crawl that never fits in memory at once.
+
+        Args:
+            records: JSON-serializable records
+            file_path: Path to save to (the compression extension is added)
+
+        Returns:
+            Number of records written
+        """
+        file_path = self._compressed_path(file_path)
+        count = 0
+        with self.open_compressed(file_path, "wt") as f:
+            for record in records:
+                f.write(json.dumps(record))
+                f.write("\n")
+                count += 1
+
+        logger.debug(f"Saved {count} NDJSON records to {file_path}")
+        return count
+
+    def iter_ndjson(self, file_path: str) -> Iterator[Any]:
+        """
+        Iterate over the records of a newline-delimited JSON file.
+
+        Args:
+            file_path: Path as passed to save_ndjson
+
+        Yields:
+            Records in the order they were saved
+        """
+        file_path, format = self._resolve_path(file_path)
+        with self.open_compressed(
+            file_path, "rt", format or CompressionFormat.NONE
+        ) as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+    def save_json_stream(self, data: Any, file_path: str) -> None:
+        """
+        Save JSON data, encoding it incrementally through the compressor.
+
+        Unlike save_json, the serialized document is never built in memory.
+        The file is always compressed, and load_json reads it back.
+
+        Args:
+            data: Data to save
+            file_path: Path to save to (the compression extension is added)
+        """
+        file_path = self._compressed_path(file_path)
+        with self.open_compressed(file_path, "wt") as f:
+            for piece in json.JSONEncoder(indent=2).iterencode(data):
+                f.write(piece)
+
+        logger.debug(f"Streamed JSON data to {file_path}")
+
+    def save_chunked(
+        self,
+        records: Iterable[Any],
+        file_path: str,
+        chunk_size: int = 65536,
+    ) -> int:
+        """
+        Save records to a seekable container of independently compressed chunks.
+
+        Args:
+            records: JSON-serializable records
+            file_path: Path to save to
+            chunk_size: Uncompressed bytes per chunk; smaller chunks make
+                single-record reads cheaper at some cost in ratio
+
+        Returns:
+            Number of records written
+        """
+        with ChunkedRecordWriter(self, file_path, chunk_size) as writer:
+            for record in records:
+                writer.write(record)
+
+        logger.debug(f"Saved {len(writer)} records to chunked file {file_path}")
+        return len(writer)
+
+    def open_chunked(self, file_path: str) -> ChunkedRecordReader:
+        """
+        Open a container written by save_chunked for random access.
+
+        Args:
+            file_path: Path to the container
+
+        Returns:
+            Reader supporting len(), indexing and iteration
+        """
+        return ChunkedRecordReader(self, file_path)
+
     def save_json(self, data: Any, file_path: str) -> None:
         """
         Save JSON data to a file with compression.
@@ -220,35 +712,15 @@ class CompressedStorage:
         Returns:
             Loaded data
         """
-        # Check if file exists
-        if not os.path.exists(file_path):
-            # Try with compression extension
-            for format in CompressionFormat:
-                if format != CompressionFormat.NONE:
-                    compressed_path = f"{file_path}.{format.value}"
-                    if os.path.exists(compressed_path):
-                        file_path = compressed_path
-                        break
+        file_path, format = self._resolve_path(file_path)
 
-        # Determine if file is compressed
-        format = None
-        for fmt in CompressionFormat:
-            if fmt != CompressionFormat.NONE and file_path.endswith(f".{fmt.value}"):
-                format = fmt
-                break
-
-        # Load and decompress if needed
+        # Decompress while reading if needed
         if format is not None:
-            with open(file_path, "rb") as f:
-                compressed_data = f.read()
-
-            json_str = self.decompress_text(compressed_data, format=format)
+            with self.open_compressed(file_path, "rt", format) as f:
+                data = json.load(f)
         else:
             with open(file_path, encoding="utf-8") as f:
-                json_str = f.read()
-
-        # Parse JSON
-        data = json.loads(json_str)
+                data = json.load(f)
 
         logger.debug(f"Loaded JSON data from {file_path}")
 
@@ -265,33 +737,15 @@ class CompressedStorage:
         # Create directory if it doesn't exist
         os.makedirs(os.path.dirname(os.path.abspath(file_path)), exist_ok=True)
 
-        # Pickle data
-        pickled_data = pickle.dumps(data)
-
-        # Compress if needed
+        # Compress if needed, pickling straight into the compressor
         if self.config.use_for_binary:
-            # Add compression extension
-            format_str = (
-                self.config.format
-                if isinstance(self.config.format, str)
-                else self.config.format.value
-            )
-            if not file_path.endswith(f".{format_str}"):
-                file_path = f"{file_path}.{format_str}"
-
-            # Compress and save
-            compressed_result = self.compress_data(pickled_data)
-            if isinstance(compressed_result, tuple):
-                compressed_data, was_compressed = compressed_result
-            else:
-                compressed_data, _was_compressed = compressed_result, True
-
-            with open(file_path, "wb") as f:
-                f.write(compressed_data)
+            file_path = self._compressed_path(file_path)
+            with self.open_compressed(file_path, "wb") as f:
+                pickle.dump(data, f)
         else:
             # Save without compression
             with open(file_path, "wb") as f:
-                f.write(pickled_data)
+                pickle.dump(data, f)
 
         logger.debug(f"Saved pickled data to {file_path}")
 
@@ -305,32 +759,13 @@ class CompressedStorage:
         Returns:
             Loaded data
         """
-        # Check if file exists
-        if not os.path.exists(file_path):
-            # Try with compression extension
-            for format in CompressionFormat:
-                if format != CompressionFormat.NONE:
-                    compressed_path = f"{file_path}.{format.value}"
-                    if os.path.exists(compressed_path):
-                        file_path = compressed_path
-                        break
-
-        # Determine if file is compressed
-        format = None
-        for fmt in CompressionFormat:
-            if fmt != CompressionFormat.NONE and file_path.endswith(f".{fmt.value}"):
-                format = fmt
-                break
-
-        # Load and decompress if needed
-        with open(file_path, "rb") as f:
-            data = f.read()
-
-        if format is not None:
-            data = self.decompress_data(data, format=format)
+        file_path, format = self._resolve_path(file_path)
 
-        # Unpickle data
-        unpickled_data = pickle.loads(data)
+        # Decompress while unpickling if needed
+        with self.open_compressed(
+            file_path, "rb", format or CompressionFormat.NONE
+        ) as f:
+            unpickled_data = pickle.load(f)
 
         logger.debug(f"Loaded pickled data from {file_path}")
 
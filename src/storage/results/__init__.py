@@ -0,0 +1,19 @@
+"""
+Scraping results stores for lib2docScrape.
+"""
+
+from .store import (
+    SUMMARY_FIELDS,
+    MemoryResultsStore,
+    ResultsStore,
+    SQLiteResultsStore,
+    create_results_store,
+)
+
+__all__ = [
+    "SUMMARY_FIELDS",
+    "MemoryResultsStore",
+    "ResultsStore",
+    "SQLiteResultsStore",
+    "create_results_store",
+]
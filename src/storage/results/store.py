@@ -0,0 +1,468 @@
+"""
+Stores for scraping results served by the API.
+
+A stored result is a dict whose "results" list holds one entry per scraped
+page. Stores behave like a mapping of scraping ID to result, and add
+paginated listings of result summaries and lazy access to the pages, so a
+listing never has to load page bodies.
+"""
+
+import json
+import logging
+import os
+import sqlite3
+import threading
+from abc import abstractmethod
+from collections.abc import Iterator, MutableMapping
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Fields of a result summary, as returned by list_summaries
+SUMMARY_FIELDS = ("id", "url", "title", "status", "timestamp", "pages_processed")
+
+# Pages read from the database per query when iterating over a result
+PAGE_BATCH_SIZE = 100
+
+# Environment variable selecting the store, e.g. "memory" or
+# "sqlite:///path/to/results.db"
+RESULTS_STORE_ENV = "LIB2DOCSCRAPE_RESULTS_STORE"
+DEFAULT_RESULTS_STORE = "sqlite:///scraping_results.db"
+
+
+def _summary(result_id: str, result: dict[str, Any], pages: Optional[int]) -> dict:
+    """Build the summary of a result."""
+    return {
+        "id": result_id,
+        "url": result.get("url", ""),
+        "title": result.get("title", ""),
+        "status": result.get("status", "unknown"),
+        "timestamp": result.get("timestamp"),
+        "pages_processed": pages or 0,
+    }
+
+
+def _text(value: Any) -> Optional[str]:
+    """Convert a summary value to text for an indexed column."""
+    return None if value is None else str(value)
+
+
+def _project(summary: dict[str, Any], fields: Optional[list[str]]) -> dict:
+    """Keep only the requested summary fields."""
+    if not fields:
+        return summary
+    return {field: summary[field] for field in fields if field in summary}
+
+
+class ResultsStore(MutableMapping):
+    """Base class for scraping result stores."""
+
+    @abstractmethod
+    def list_summaries(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[list[str]] = None,
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        """
+        List result summaries in insertion order.
+
+        Args:
+            limit: Maximum number of summaries, or None for all
+            cursor: Cursor returned by the previous page
+            fields: Summary fields to include (defaults to SUMMARY_FIELDS)
+
+        Returns:
+            Tuple of (summaries, cursor of the next page or None)
+        """
+        pass
+
+    @abstractmethod
+    def get_summary(self, result_id: str) -> Optional[dict[str, Any]]:
+        """
+        Get a result without its pages.
+
+        Args:
+            result_id: Scraping ID
+
+        Returns:
+            Result fields other than "results", plus pages_processed, or None
+        """
+        pass
+
+    @abstractmethod
+    def iter_pages(
+        self, result_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Iterate over the pages of a result.
+
+        Args:
+            result_id: Scraping ID
+            offset: Number of pages to skip
+            limit: Maximum number of pages, or None for all
+
+        Yields:
+            Page entries of the result's "results" list
+        """
+        pass
+
+    def latest_id(self) -> Optional[str]:
+        """Get the greatest scraping ID, i.e. the latest generated one."""
+        return max(self, default=None)
+
+    def close(self) -> None:
+        """Release resources held by the store."""
+
+
+class MemoryResultsStore(ResultsStore):
+    """Process-local store keeping results in a dict."""
+
+    def __init__(self):
+        self._results: dict[str, dict[str, Any]] = {}
+
+    def __getitem__(self, result_id: str) -> dict[str, Any]:
+        return self._results[result_id]
+
+    def __setitem__(self, result_id: str, result: dict[str, Any]) -> None:
+        self._results[result_id] = result
+
+    def __delitem__(self, result_id: str) -> None:
+        del self._results[result_id]
+
+    def __iter__(self) -> Iterator[str]:
+        return iter(self._results)
+
+    def __len__(self) -> int:
+        return len(self._results)
+
+    def list_summaries(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[list[str]] = None,
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        ids = list(self._results)
+        start = int(cursor) if cursor else 0
+        end = len(ids) if limit is None else min(start + limit, len(ids))
+        summaries = [
+            _project(self._summary(result_id), fields) for result_id in ids[start:end]
+        ]
+        return summaries, str(end) if end < len(ids) else None
+
+    def _summary(self, result_id: str) -> dict[str, Any]:
+        result = self._results[result_id]
+        pages = result.get("results")
+        return _summary(
+            result_id, result, len(pages) if isinstance(pages, list) else None
+        )
+
+    def get_summary(self, result_id: str) -> Optional[dict[str, Any]]:
+        result = self._results.get(result_id)
+        if result is None:
+            return None
+        summary = {key: value for key, value in result.items() if key != "results"}
+        summary["pages_processed"] = self._summary(result_id)["pages_processed"]
+        return summary
+
+    def iter_pages(
+        self, result_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> Iterator[dict[str, Any]]:
+        pages = self._results.get(result_id, {}).get("results")
+        if not isinstance(pages, list):
+            return iter(())
+        end = None if limit is None else offset + limit
+        return iter(pages[offset:end])
+
+
+class SQLiteResultsStore(ResultsStore):
+    """
+    SQLite-backed store shared by every process using the same database.
+
+    Summary fields are stored in indexed columns and pages in their own
+    table, so listings and summaries never read page bodies.
+    """
+
+    def __init__(self, db_path: str):
+        """
+        Initialize the store. The database is created on first use.
+
+        Args:
+            db_path: Path to the SQLite database file
+        """
+        self.db_path = db_path
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+
+    def _connect(self) -> sqlite3.Connection:
+        """Get the database connection, opening it on first use."""
+        if self._db is None:
+            directory = os.path.dirname(os.path.abspath(self.db_path))
+            os.makedirs(directory, exist_ok=True)
+            db = sqlite3.connect(self.db_path, check_same_thread=False, timeout=30)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.execute("PRAGMA foreign_keys=ON")
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS results (
+                    seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                    id TEXT NOT NULL UNIQUE,
+                    url TEXT,
+                    title TEXT,
+                    status TEXT,
+                    timestamp TEXT,
+                    page_count INTEGER,
+                    data TEXT NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS pages (
+                    result_seq INTEGER NOT NULL
+                        REFERENCES results(seq) ON DELETE CASCADE,
+                    position INTEGER NOT NULL,
+                    data TEXT NOT NULL,
+                    PRIMARY KEY (result_seq, position)
+                );
+                CREATE INDEX IF NOT EXISTS idx_results_timestamp
+                    ON results (timestamp);
+                """
+            )
+            self._db = db
+        return self._db
+
+    def close(self) -> None:
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
+
+    def __getitem__(self, result_id: str) -> dict[str, Any]:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT seq, page_count, data FROM results WHERE id = ?",
+                    (result_id,),
+                )
+                .fetchone()
+            )
+        if row is None:
+            raise KeyError(result_id)
+
+        seq, page_count, data = row
+        result = json.loads(data)
+        if page_count is not None:
+            result["results"] = list(self._iter_page_rows(seq, 0, None))
+        return result
+
+    def __setitem__(self, result_id: str, result: dict[str, Any]) -> None:
+        pages = result.get("results")
+        if not isinstance(pages, list):
+            pages = None
+        data = {
+            key: value
+            for key, value in result.items()
+            if pages is None or key != "results"
+        }
+        summary = _summary(result_id, result, None)
+
+        with self._lock:
+            db = self._connect()
+            with db:
+                # Updating in place keeps the result's position in listings
+                seq = db.execute(
+                    """
+                    INSERT INTO results
+                        (id, url, title, status, timestamp, page_count, data)
+                    VALUES (?, ?, ?, ?, ?, ?, ?)
+                    ON CONFLICT (id) DO UPDATE SET
+                        url = excluded.url,
+                        title = excluded.title,
+                        status = excluded.status,
+                        timestamp = excluded.timestamp,
+                        page_count = excluded.page_count,
+                        data = excluded.data
+                    RETURNING seq
+                    """,
+                    (
+                        result_id,
+                        _text(summary["url"]),
+                        _text(summary["title"]),
+                        _text(summary["status"]),
+                        _text(summary["timestamp"]),
+                        None if pages is None else len(pages),
+                        json.dumps(data, default=str),
+                    ),
+                ).fetchone()[0]
+                db.execute("DELETE FROM pages WHERE result_seq = ?", (seq,))
+                if pages:
+                    db.executemany(
+                        "INSERT INTO pages (result_seq, position, data) VALUES (?, ?, ?)",
+                        (
+                            (seq, position, json.dumps(page, default=str))
+                            for position, page in enumerate(pages)
+                        ),
+                    )
+
+    def __delitem__(self, result_id: str) -> None:
+        with self._lock:
+            db = self._connect()
+            with db:
+                cursor = db.execute("DELETE FROM results WHERE id = ?", (result_id,))
+        if cursor.rowcount == 0:
+            raise KeyError(result_id)
+
+    def __iter__(self) -> Iterator[str]:
+        with self._lock:
+            rows = (
+                self._connect()
+                .execute("SELECT id FROM results ORDER BY seq")
+                .fetchall()
+            )
+        return iter([row[0] for row in rows])
+
+    def __len__(self) -> int:
+        with self._lock:
+            return self._connect().execute("SELECT COUNT(*) FROM results").fetchone()[0]
+
+    def __contains__(self, result_id: object) -> bool:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT 1 FROM results WHERE id = ?", (result_id,))
+                .fetchone()
+            )
+        return row is not None
+
+    def clear(self) -> None:
+        with self._lock:
+            db = self._connect()
+            with db:
+                db.execute("DELETE FROM results")
+
+    def list_summaries(
+        self,
+        limit: Optional[int] = None,
+        cursor: Optional[str] = None,
+        fields: Optional[list[str]] = None,
+    ) -> tuple[list[dict[str, Any]], Optional[str]]:
+        query = (
+            "SELECT seq, id, url, title, status, timestamp, page_count "
+            "FROM results WHERE seq > ? ORDER BY seq"
+        )
+        params: list[Any] = [int(cursor) if cursor else 0]
+        if limit is not None:
+            # One extra row tells whether another page follows
+            query += " LIMIT ?"
+            params.append(limit + 1)
+
+        with self._lock:
+            rows = self._connect().execute(query, params).fetchall()
+
+        next_cursor = None
+        if limit is not None and len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = str(rows[-1][0])
+
+        summaries = [
+            _project(
+                {
+                    "id": result_id,
+                    "url": url,
+                    "title": title,
+                    "status": status,
+                    "timestamp": timestamp,
+                    "pages_processed": page_count or 0,
+                },
+                fields,
+            )
+            for _, result_id, url, title, status, timestamp, page_count in rows
+        ]
+        return summaries, next_cursor
+
+    def get_summary(self, result_id: str) -> Optional[dict[str, Any]]:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute(
+                    "SELECT page_count, data FROM results WHERE id = ?", (result_id,)
+                )
+                .fetchone()
+            )
+        if row is None:
+            return None
+        summary = json.loads(row[1])
+        summary["pages_processed"] = row[0] or 0
+        return summary
+
+    def iter_pages(
+        self, result_id: str, offset: int = 0, limit: Optional[int] = None
+    ) -> Iterator[dict[str, Any]]:
+        with self._lock:
+            row = (
+                self._connect()
+                .execute("SELECT seq FROM results WHERE id = ?", (result_id,))
+                .fetchone()
+            )
+        if row is None:
+            return iter(())
+        return self._iter_page_rows(row[0], offset, limit)
+
+    def _iter_page_rows(
+        self, seq: int, offset: int, limit: Optional[int]
+    ) -> Iterator[dict[str, Any]]:
+        """
+        Load the pages of a result by its row sequence number.
+
+        Pages are read PAGE_BATCH_SIZE at a time, continuing after the last
+        position read, so only one batch is in memory at once and the lock is
+        released between batches.
+        """
+        position = offset
+        remaining = limit
+        while remaining is None or remaining > 0:
+            batch_size = PAGE_BATCH_SIZE
+            if remaining is not None:
+                batch_size = min(batch_size, remaining)
+            with self._lock:
+                rows = (
+                    self._connect()
+                    .execute(
+                        "SELECT position, data FROM pages "
+                        "WHERE result_seq = ? AND position >= ? "
+                        "ORDER BY position LIMIT ?",
+                        (seq, position, batch_size),
+                    )
+                    .fetchall()
+                )
+            for _, data in rows:
+                yield json.loads(data)
+            if len(rows) < batch_size:
+                return
+            position = rows[-1][0] + 1
+            if remaining is not None:
+                remaining -= len(rows)
+
+    def latest_id(self) -> Optional[str]:
+        with self._lock:
+            return self._connect().execute("SELECT MAX(id) FROM results").fetchone()[0]
+
+
+def create_results_store(spec: Optional[str] = None) -> ResultsStore:
+    """
+    Create a results store from a store specification.
+
+    Args:
+        spec: "memory", "sqlite:///path/to/db" or a database path; defaults to
+            the LIB2DOCSCRAPE_RESULTS_STORE environment variable, then to
+            scraping_results.db in the working directory
+
+    Returns:
+        Results store
+    """
+    spec = spec or os.environ.get(RESULTS_STORE_ENV) or DEFAULT_RESULTS_STORE
+    if spec == "memory":
+        return MemoryResultsStore()
+    if spec.startswith("sqlite:///"):
+        spec = spec[len("sqlite:///") :]
+    logger.info(f"Using SQLite results store at {spec}")
+    return SQLiteResultsStore(spec)
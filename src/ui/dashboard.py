@@ -12,6 +12,8 @@ from fastapi.staticfiles import StaticFiles
 from fastapi.templating import Jinja2Templates
 from pydantic import BaseModel
 
+from ..utils.broadcast import BroadcastHub
+
 logger = logging.getLogger(__name__)
 
 
@@ -24,6 +26,8 @@ class DashboardConfig(BaseModel):
     refresh_interval: int = 5  # seconds
     max_items_per_page: int = 20
     enable_websockets: bool = True
+    broadcast_max_rate: float = 10.0  # coalesced updates per second
+    broadcast_queue_size: int = 100  # messages buffered per client
     enable_charts: bool = True
     enable_notifications: bool = True
     enable_search: bool = True
@@ -187,24 +191,33 @@ class Dashboard:
 
         # Connection manager
         class ConnectionManager:
-            def __init__(self):
+            def __init__(self, max_rate: float, queue_size: int):
                 self.active_connections: list[WebSocket] = []
+                self.hub = BroadcastHub(
+                    max_rate=max_rate,
+                    queue_size=queue_size,
+                    on_disconnect=self.disconnect,
+                )
 
             async def connect(self, websocket: WebSocket):
                 await websocket.accept()
                 self.active_connections.append(websocket)
+                self.hub.add(websocket)
 
             def disconnect(self, websocket: WebSocket):
-                self.active_connections.remove(websocket)
-
-            async def broadcast(self, message: dict[str, Any]):
-                for connection in self.active_connections:
-                    try:
-                        await connection.send_json(message)
-                    except WebSocketDisconnect:
-                        self.disconnect(connection)
-
-        self.connection_manager = ConnectionManager()
+                if websocket in self.active_connections:
+                    self.active_connections.remove(websocket)
+                self.hub.remove(websocket)
+
+            async def broadcast(
+                self, message: dict[str, Any], key: Optional[str] = None
+            ):
+                # Queued per client; slow clients never hold up the others
+                self.hub.publish(message, key=key)
+
+        self.connection_manager = ConnectionManager(
+            self.config.broadcast_max_rate, self.config.broadcast_queue_size
+        )
 
         # WebSocket endpoint
         @self.app.websocket("/ws")
@@ -226,12 +239,14 @@ class Dashboard:
             data: Update data
         """
         if self.config.enable_websockets:
+            # Updates are coalesced: clients get the latest at the capped rate
             await self.connection_manager.broadcast(
                 {
                     "type": "update",
                     "timestamp": datetime.now().isoformat(),
                     "data": data,
-                }
+                },
+                key="update",
             )
 
     async def broadcast_notification(self, message: str, level: str = "info") -> None:
@@ -5,6 +5,7 @@ Search interface for lib2docScrape.
 import json
 import logging
 import re
+import sys
 from datetime import datetime
 from typing import Any, Optional
 
@@ -13,6 +14,12 @@ from pydantic import BaseModel, Field
 
 logger = logging.getLogger(__name__)
 
+# Length of the character n-grams used to find fuzzy candidates
+NGRAM_SIZE = 3
+
+# Document fields that are never used as facets
+NON_FACET_FIELDS = ["id", "title", "url", "content"]
+
 
 class SearchConfig(BaseModel):
     """Configuration for the search interface."""
@@ -95,7 +102,11 @@ class SearchInterface:
 
         # Set up search index
         self.documents: dict[str, dict[str, Any]] = {}
-        self.index: dict[str, dict[str, list[str]]] = {}
+        self.index: dict[str, dict[str, set[str]]] = {}  # token -> field -> doc ids
+        self.ngram_index: dict[str, set[str]] = {}  # n-gram -> tokens containing it
+        self.facet_index: dict[
+            str, dict[str, set[str]]
+        ] = {}  # field -> value -> doc ids
 
         # Set up search history
         self.search_history: list[str] = []
@@ -270,6 +281,8 @@ class SearchInterface:
         """
         Add a document to the search index.
 
+        Adding a document with an existing ID replaces the previous one.
+
         Args:
             document: Document to add
         """
@@ -278,11 +291,81 @@ class SearchInterface:
             document["id"] = str(len(self.documents) + 1)
 
         doc_id = document["id"]
+        if isinstance(doc_id, str):
+            # Postings share a single copy of each ID string
+            doc_id = document["id"] = sys.intern(doc_id)
+
+        if doc_id in self.documents:
+            self._unindex_document(doc_id)
 
         # Add document to documents store
         self.documents[doc_id] = document
 
         # Index document
+        for field, tokens in self._field_tokens(document):
+            for token in tokens:
+                postings = self.index.get(token)
+                if postings is None:
+                    postings = self.index[token] = {}
+                    for ngram in self._ngrams(token):
+                        self.ngram_index.setdefault(ngram, set()).add(token)
+
+                postings.setdefault(field, set()).add(doc_id)
+
+        # Update facet counts
+        for field, value in self._facet_values(document):
+            self.facet_index.setdefault(field, {}).setdefault(value, set()).add(doc_id)
+
+        logger.debug(f"Added document {doc_id} to search index")
+
+    def _unindex_document(self, doc_id: str) -> None:
+        """
+        Remove a document's postings and facet counts.
+
+        Args:
+            doc_id: ID of an indexed document
+        """
+        document = self.documents[doc_id]
+
+        for field, tokens in self._field_tokens(document):
+            for token in tokens:
+                postings = self.index.get(token)
+                if postings is None or field not in postings:
+                    continue
+
+                postings[field].discard(doc_id)
+                if not postings[field]:
+                    del postings[field]
+                if not postings:
+                    del self.index[token]
+                    for ngram in self._ngrams(token):
+                        tokens_with_ngram = self.ngram_index.get(ngram)
+                        if tokens_with_ngram is not None:
+                            tokens_with_ngram.discard(token)
+                            if not tokens_with_ngram:
+                                del self.ngram_index[ngram]
+
+        for field, value in self._facet_values(document):
+            doc_ids = self.facet_index.get(field, {}).get(value)
+            if doc_ids is None:
+                continue
+            doc_ids.discard(doc_id)
+            if not doc_ids:
+                del self.facet_index[field][value]
+                if not self.facet_index[field]:
+                    del self.facet_index[field]
+
+    def _field_tokens(self, document: dict[str, Any]) -> list[tuple[str, set[str]]]:
+        """
+        Get the distinct tokens of each searchable field of a document.
+
+        Args:
+            document: Document to tokenize
+
+        Returns:
+            List of (field, tokens) pairs
+        """
+        field_tokens = []
         for field in self.config.search_fields:
             if field in document:
                 # Get field value
@@ -290,19 +373,69 @@ class SearchInterface:
                 if not isinstance(value, str):
                     value = json.dumps(value)
 
-                # Tokenize and index
-                tokens = self._tokenize(value)
-                for token in tokens:
-                    if token not in self.index:
-                        self.index[token] = {}
+                field_tokens.append((field, set(self._tokenize(value))))
 
-                    if field not in self.index[token]:
-                        self.index[token][field] = []
+        return field_tokens
 
-                    if doc_id not in self.index[token][field]:
-                        self.index[token][field].append(doc_id)
+    def _facet_values(self, document: dict[str, Any]) -> list[tuple[str, str]]:
+        """
+        Get the facet field/value pairs of a document.
 
-        logger.debug(f"Added document {doc_id} to search index")
+        Args:
+            document: Document to inspect
+
+        Returns:
+            List of (field, value) pairs with values as strings
+        """
+        return [
+            (field, str(value))
+            for field, value in document.items()
+            if field not in NON_FACET_FIELDS
+            and isinstance(value, (str, int, float, bool))
+        ]
+
+    def _ngrams(self, token: str) -> set[str]:
+        """
+        Get the character n-grams of a token.
+
+        Args:
+            token: Token to split
+
+        Returns:
+            Set of n-grams; empty for tokens shorter than NGRAM_SIZE
+        """
+        return {token[i : i + NGRAM_SIZE] for i in range(len(token) - NGRAM_SIZE + 1)}
+
+    def _fuzzy_candidates(self, token: str) -> list[str]:
+        """
+        Find indexed tokens that fuzzy match a query token.
+
+        Args:
+            token: Query token
+
+        Returns:
+            Indexed tokens containing the query token
+        """
+        ngrams = self._ngrams(token)
+        if not ngrams:
+            # Too short for the n-gram index
+            return [
+                indexed for indexed in self.index if self._fuzzy_match(token, indexed)
+            ]
+
+        # Intersect the smallest posting sets first
+        postings = sorted(
+            (self.ngram_index.get(ngram, set()) for ngram in ngrams), key=len
+        )
+        candidates = set(postings[0])
+        for tokens_with_ngram in postings[1:]:
+            if not candidates:
+                break
+            candidates &= tokens_with_ngram
+
+        return [
+            candidate for candidate in candidates if self._fuzzy_match(token, candidate)
+        ]
 
     def _tokenize(self, text: str) -> list[str]:
         """
@@ -382,28 +515,25 @@ class SearchInterface:
 
         # Apply fuzzy matching if enabled
         if fuzzy:
-            for doc_id, doc in self.documents.items():
-                if doc_id in matching_docs:
-                    continue  # Already matched exactly
-
+            exact_matches = set(matching_docs)
+            for token in tokens:
+                fuzzy_tokens = self._fuzzy_candidates(token)
                 for field in fields:
-                    if field in doc:
-                        value = doc[field]
-                        if not isinstance(value, str):
-                            value = json.dumps(value)
+                    # Each query token scores at most once per field
+                    field_docs = set()
+                    for fuzzy_token in fuzzy_tokens:
+                        field_docs.update(self.index[fuzzy_token].get(field, ()))
 
-                        # Check fuzzy match
-                        for token in tokens:
-                            if self._fuzzy_match(token, value):
-                                if doc_id not in matching_docs:
-                                    matching_docs[doc_id] = {}
+                    for doc_id in field_docs - exact_matches:
+                        if doc_id not in matching_docs:
+                            matching_docs[doc_id] = {}
 
-                                if field not in matching_docs[doc_id]:
-                                    matching_docs[doc_id][field] = 0.0
+                        if field not in matching_docs[doc_id]:
+                            matching_docs[doc_id][field] = 0.0
 
-                                # Calculate score (lower for fuzzy matches)
-                                boost = self.config.boost_fields.get(field, 1.0) * 0.5
-                                matching_docs[doc_id][field] += boost
+                        # Calculate score (lower for fuzzy matches)
+                        boost = self.config.boost_fields.get(field, 1.0) * 0.5
+                        matching_docs[doc_id][field] += boost
 
         # Apply filters
         filtered_docs = matching_docs.copy()
@@ -575,33 +705,35 @@ class SearchInterface:
         if not self.config.enable_facets:
             return {}
 
-        facets = {}
+        if not filters:
+            return {
+                field: {value: len(doc_ids) for value, doc_ids in values.items()}
+                for field, values in self.facet_index.items()
+            }
 
-        # Get all documents that match the current filters
-        matching_docs = []
-        for _doc_id, doc in self.documents.items():
-            match = True
-            for field, value in filters.items():
-                if field not in doc or doc[field] != value:
-                    match = False
-                    break
+        # Narrow to documents that can match the current filters
+        candidates = None
+        for field, value in filters.items():
+            doc_ids = self.facet_index.get(field, {}).get(str(value))
+            if doc_ids is None:
+                if isinstance(value, (str, int, float, bool)):
+                    return {}
+                # Values that are never faceted need a full scan
+                doc_ids = self.documents.keys()
+            candidates = set(doc_ids) if candidates is None else candidates & doc_ids
 
-            if match:
-                matching_docs.append(doc)
+        facets = {}
 
         # Calculate facets
-        for doc in matching_docs:
-            for field, value in doc.items():
-                if field in ["id", "title", "url", "content"]:
-                    continue
-
-                if not isinstance(value, (str, int, float, bool)):
-                    continue
+        for doc_id in candidates:
+            doc = self.documents[doc_id]
+            if any(field not in doc or doc[field] != v for field, v in filters.items()):
+                continue
 
+            for field, str_value in self._facet_values(doc):
                 if field not in facets:
                     facets[field] = {}
 
-                str_value = str(value)
                 if str_value not in facets[field]:
                     facets[field][str_value] = 0
 
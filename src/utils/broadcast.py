@@ -0,0 +1,223 @@
+"""
+Rate-capped fan-out of websocket messages.
+
+Each connected client gets a bounded queue drained by its own sender task,
+so a slow socket only delays itself. Messages published under a key (for
+example one crawl job's progress) are coalesced: only the latest message per
+key is kept and pending keys are flushed at most max_rate times per second.
+"""
+
+import asyncio
+import logging
+from typing import Any, Callable, Optional
+
+from fastapi import WebSocket
+
+logger = logging.getLogger(__name__)
+
+# What to do with a client whose queue is full
+OVERFLOW_POLICIES = ("drop_oldest", "disconnect")
+
+
+class _Client:
+    """A connected websocket and its outgoing queue."""
+
+    def __init__(self, websocket: WebSocket, queue_size: int):
+        self.websocket = websocket
+        self.queue: asyncio.Queue = asyncio.Queue(maxsize=queue_size)
+        self.task: Optional[asyncio.Task] = None
+        self.dropped = 0
+
+
+class BroadcastHub:
+    """Coalescing, rate-capped broadcaster with per-client bounded queues."""
+
+    def __init__(
+        self,
+        max_rate: float = 10.0,
+        queue_size: int = 100,
+        send_timeout: float = 5.0,
+        overflow: str = "drop_oldest",
+        on_disconnect: Optional[Callable[[WebSocket], None]] = None,
+    ):
+        """
+        Initialize the hub.
+
+        Args:
+            max_rate: Maximum flushes of coalesced messages per second; 0
+                sends keyed messages immediately
+            queue_size: Messages buffered per client
+            send_timeout: Seconds a single send may take before the client
+                is disconnected
+            overflow: "drop_oldest" to drop a lagging client's oldest queued
+                message, or "disconnect" to disconnect the client
+            on_disconnect: Called with each websocket the hub drops
+        """
+        if overflow not in OVERFLOW_POLICIES:
+            raise ValueError(f"Unsupported overflow policy: {overflow}")
+        self.max_rate = max_rate
+        self.queue_size = queue_size
+        self.send_timeout = send_timeout
+        self.overflow = overflow
+        self.on_disconnect = on_disconnect
+
+        self._clients: dict[WebSocket, _Client] = {}
+        self._pending: dict[str, Any] = {}
+        self._wakeup: Optional[asyncio.Event] = None
+        self._flusher: Optional[asyncio.Task] = None
+        self.stats = {"sent": 0, "coalesced": 0, "dropped": 0, "disconnected": 0}
+
+    def __len__(self) -> int:
+        return len(self._clients)
+
+    def add(self, websocket: WebSocket) -> None:
+        """
+        Start delivering broadcasts to an accepted websocket.
+
+        Args:
+            websocket: Accepted websocket
+        """
+        if websocket in self._clients:
+            return
+        client = _Client(websocket, self.queue_size)
+        client.task = asyncio.create_task(self._sender(client))
+        self._clients[websocket] = client
+
+    def remove(self, websocket: WebSocket) -> None:
+        """
+        Stop delivering broadcasts to a websocket.
+
+        Args:
+            websocket: Websocket passed to add
+        """
+        client = self._clients.pop(websocket, None)
+        if client is not None and client.task is not None:
+            if client.task is not asyncio.current_task():
+                client.task.cancel()
+
+    def publish(
+        self, message: Any, key: Optional[str] = None, urgent: bool = False
+    ) -> None:
+        """
+        Broadcast a JSON-serializable message.
+
+        Args:
+            message: Message to send
+            key: Coalescing key; of several messages published under one key
+                before the next flush, only the latest is sent
+            urgent: Send at once, replacing any pending message for the key
+        """
+        if not self._clients:
+            self._pending.clear()
+            return
+
+        if key is None or self.max_rate <= 0 or urgent:
+            if key is not None:
+                self._pending.pop(key, None)
+            self._deliver(message)
+            return
+
+        if key in self._pending:
+            self.stats["coalesced"] += 1
+        self._pending[key] = message
+        self._ensure_flusher()
+        self._wakeup.set()
+
+    async def flush(self) -> None:
+        """Send pending coalesced messages now and wait for queues to drain."""
+        self._flush_pending()
+        await asyncio.gather(
+            *(client.queue.join() for client in list(self._clients.values()))
+        )
+
+    async def close(self) -> None:
+        """Stop the flusher and every sender task."""
+        tasks = [client.task for client in self._clients.values() if client.task]
+        if self._flusher is not None:
+            tasks.append(self._flusher)
+        for task in tasks:
+            task.cancel()
+        await asyncio.gather(*tasks, return_exceptions=True)
+        self._clients.clear()
+        self._pending.clear()
+        self._flusher = None
+
+    def _ensure_flusher(self) -> None:
+        """Start the flusher on the running loop if it is not running there."""
+        loop = asyncio.get_running_loop()
+        if (
+            self._flusher is not None
+            and not self._flusher.done()
+            and self._flusher.get_loop() is loop
+        ):
+            return
+        self._wakeup = asyncio.Event()
+        self._flusher = loop.create_task(self._flush_loop())
+
+    async def _flush_loop(self) -> None:
+        interval = 1.0 / self.max_rate
+        while True:
+            await self._wakeup.wait()
+            self._wakeup.clear()
+            self._flush_pending()
+            await asyncio.sleep(interval)
+
+    def _flush_pending(self) -> None:
+        pending, self._pending = self._pending, {}
+        for message in pending.values():
+            self._deliver(message)
+
+    def _deliver(self, message: Any) -> None:
+        """Queue a message for every client without waiting on any socket."""
+        for client in list(self._clients.values()):
+            try:
+                client.queue.put_nowait(message)
+            except asyncio.QueueFull:
+                if self.overflow == "disconnect":
+                    self._evict(client, "too far behind")
+                    continue
+                client.queue.get_nowait()
+                client.queue.task_done()
+                client.queue.put_nowait(message)
+                client.dropped += 1
+                self.stats["dropped"] += 1
+
+    async def _sender(self, client: _Client) -> None:
+        """Send a client's queued messages in order."""
+        while True:
+            message = await client.queue.get()
+            try:
+                await asyncio.wait_for(
+                    client.websocket.send_json(message), self.send_timeout
+                )
+                self.stats["sent"] += 1
+            except asyncio.TimeoutError:
+                self._evict(client, "send timed out")
+                return
+            except Exception as e:
+                self._evict(client, f"send failed: {str(e)}")
+                return
+            finally:
+                client.queue.task_done()
+
+    def _evict(self, client: _Client, reason: str) -> None:
+        """Drop a lagging or broken client and close its socket."""
+        if self._clients.get(client.websocket) is not client:
+            return
+        logger.warning(f"Disconnecting websocket client: {reason}")
+        self.remove(client.websocket)
+        self.stats["disconnected"] += 1
+        # Release anyone waiting in flush() on this client's queue
+        while not client.queue.empty():
+            client.queue.get_nowait()
+            client.queue.task_done()
+        asyncio.create_task(self._close(client.websocket))
+        if self.on_disconnect is not None:
+            self.on_disconnect(client.websocket)
+
+    async def _close(self, websocket: WebSocket) -> None:
+        try:
+            # 1013: try again later
+            await asyncio.wait_for(websocket.close(code=1013), self.send_timeout)
+        except Exception:
+            pass
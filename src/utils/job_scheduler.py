@@ -0,0 +1,359 @@
+"""
+In-process background job scheduler.
+
+Jobs are coroutine functions queued by priority and run by a fixed pool of
+worker tasks on the running event loop. Each job has an ID, a status,
+progress counters and a handle to its result, and can be cancelled while it
+is queued or running.
+"""
+
+import asyncio
+import itertools
+import logging
+import uuid
+from collections.abc import Awaitable
+from datetime import datetime
+from enum import Enum
+from typing import Any, Callable, Optional
+
+logger = logging.getLogger(__name__)
+
+
+class JobStatus(str, Enum):
+    """Lifecycle states of a job."""
+
+    PENDING = "pending"
+    RUNNING = "running"
+    COMPLETED = "completed"
+    FAILED = "failed"
+    CANCELLED = "cancelled"
+
+
+FINISHED_STATUSES = frozenset(
+    {JobStatus.COMPLETED, JobStatus.FAILED, JobStatus.CANCELLED}
+)
+
+
+class JobQueueFullError(Exception):
+    """Raised when a job is submitted while the queue is at capacity."""
+
+
+class Job:
+    """A unit of background work and the handle to its outcome."""
+
+    def __init__(
+        self,
+        job_id: str,
+        kind: str,
+        func: Callable[["JobContext"], Awaitable[Any]],
+        priority: int = 0,
+        params: Optional[dict[str, Any]] = None,
+    ):
+        """
+        Initialize the job.
+
+        Args:
+            job_id: Unique job ID
+            kind: Job type, e.g. "crawl"
+            func: Coroutine function run with the job's context
+            priority: Higher priorities are started first
+            params: JSON-serializable parameters reported with the job
+        """
+        self.job_id = job_id
+        self.kind = kind
+        self.priority = priority
+        self.params = params or {}
+        self.status = JobStatus.PENDING
+        self.progress = 0.0
+        self.counters: dict[str, int] = {}
+        self.result: Any = None
+        self.error: Optional[str] = None
+        self.created_at = datetime.now()
+        self.started_at: Optional[datetime] = None
+        self.finished_at: Optional[datetime] = None
+
+        self._func = func
+        self._seq = 0
+        self._task: Optional[asyncio.Task] = None
+        self._cancel_requested = False
+        self._done = asyncio.Event()
+
+    @property
+    def done(self) -> bool:
+        """Whether the job has completed, failed or been cancelled."""
+        return self.status in FINISHED_STATUSES
+
+    async def wait(self) -> Any:
+        """
+        Wait for the job to finish.
+
+        Returns:
+            The job's result, or None if it failed or was cancelled
+        """
+        await self._done.wait()
+        return self.result
+
+    def _finish(self, status: JobStatus, error: Optional[str] = None) -> None:
+        self.status = status
+        self.error = error
+        self.finished_at = datetime.now()
+        if status is JobStatus.COMPLETED:
+            self.progress = 100.0
+        self._done.set()
+
+    def to_dict(self) -> dict[str, Any]:
+        """Describe the job in the shape of an operation status."""
+        return {
+            "operation_id": self.job_id,
+            "job_id": self.job_id,
+            "operation": self.kind,
+            "status": self.status.value,
+            "priority": self.priority,
+            "params": self.params,
+            "progress": self.progress,
+            "counters": dict(self.counters),
+            "result": self.result,
+            "error": self.error or "",
+            "created_time": self.created_at.isoformat(),
+            "start_time": self.started_at.isoformat() if self.started_at else None,
+            "end_time": self.finished_at.isoformat() if self.finished_at else None,
+        }
+
+
+class JobContext:
+    """What a running job sees of itself: progress reporting and cancellation."""
+
+    def __init__(self, job: Job, scheduler: "JobScheduler"):
+        self.job = job
+        self._scheduler = scheduler
+
+    @property
+    def cancelled(self) -> bool:
+        """Whether cancellation of the job has been requested."""
+        return self.job._cancel_requested
+
+    async def update(self, progress: Optional[float] = None, **counters: int) -> None:
+        """
+        Report progress and notify listeners.
+
+        Args:
+            progress: Percentage complete
+            **counters: Counter values to set, e.g. pages_crawled=10
+        """
+        if progress is not None:
+            self.job.progress = max(0.0, min(100.0, float(progress)))
+        self.job.counters.update(counters)
+        await self._scheduler._notify(self.job)
+
+
+class JobScheduler:
+    """Priority queue of jobs served by a bounded pool of worker tasks."""
+
+    def __init__(
+        self,
+        max_workers: int = 2,
+        max_pending: int = 100,
+        max_finished: int = 1000,
+        on_update: Optional[Callable[[Job], Awaitable[None]]] = None,
+    ):
+        """
+        Initialize the scheduler.
+
+        Workers are started on the running event loop by the first submit.
+
+        Args:
+            max_workers: Number of jobs run concurrently
+            max_pending: Number of queued jobs accepted before submit fails
+            max_finished: Number of finished jobs kept for status queries
+            on_update: Coroutine called whenever a job changes state or
+                reports progress
+        """
+        if max_workers < 1:
+            raise ValueError("max_workers must be at least 1")
+        self.max_workers = max_workers
+        self.max_pending = max_pending
+        self.max_finished = max_finished
+        self.on_update = on_update
+
+        self._jobs: dict[str, Job] = {}
+        self._seq = itertools.count()
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._queue: Optional[asyncio.PriorityQueue] = None
+        self._workers: list[asyncio.Task] = []
+
+    def __contains__(self, job_id: str) -> bool:
+        return job_id in self._jobs
+
+    def get(self, job_id: str) -> Optional[Job]:
+        """Get a job by ID."""
+        return self._jobs.get(job_id)
+
+    def list_jobs(
+        self, kind: Optional[str] = None, status: Optional[JobStatus] = None
+    ) -> list[Job]:
+        """
+        List jobs in submission order.
+
+        Args:
+            kind: Only jobs of this type
+            status: Only jobs in this state
+
+        Returns:
+            Matching jobs
+        """
+        return [
+            job
+            for job in self._jobs.values()
+            if (kind is None or job.kind == kind)
+            and (status is None or job.status is status)
+        ]
+
+    def active_jobs(self, kind: Optional[str] = None) -> list[Job]:
+        """List pending and running jobs."""
+        return [job for job in self.list_jobs(kind) if not job.done]
+
+    async def submit(
+        self,
+        kind: str,
+        func: Callable[[JobContext], Awaitable[Any]],
+        priority: int = 0,
+        params: Optional[dict[str, Any]] = None,
+    ) -> Job:
+        """
+        Queue a job.
+
+        Args:
+            kind: Job type, also used as the job ID prefix
+            func: Coroutine function run with the job's context; its return
+                value becomes the job's result
+            priority: Higher priorities are started first
+            params: JSON-serializable parameters reported with the job
+
+        Returns:
+            The queued job
+
+        Raises:
+            JobQueueFullError: If max_pending jobs are already queued
+        """
+        self._ensure_workers()
+        if len(self.list_jobs(status=JobStatus.PENDING)) >= self.max_pending:
+            raise JobQueueFullError(
+                f"Job queue is full ({self.max_pending} jobs pending)"
+            )
+
+        job_id = (
+            f"{kind}_{datetime.now().strftime('%Y%m%d%H%M%S')}_{uuid.uuid4().hex[:8]}"
+        )
+        job = Job(job_id, kind, func, priority=priority, params=params)
+        job._seq = next(self._seq)
+        self._jobs[job_id] = job
+        self._queue.put_nowait((-priority, job._seq, job))
+        logger.info(f"Queued job {job_id} with priority {priority}")
+        await self._notify(job)
+        return job
+
+    async def cancel(self, job_id: str) -> bool:
+        """
+        Cancel a queued or running job.
+
+        Args:
+            job_id: ID of the job
+
+        Returns:
+            bool: True if the job was cancelled, False if it is unknown or
+            already finished
+        """
+        job = self._jobs.get(job_id)
+        if job is None or job.done:
+            return False
+
+        job._cancel_requested = True
+        if job._task is not None:
+            # The worker records the cancellation once the task unwinds
+            job._task.cancel()
+        else:
+            # Still queued; the worker skips it when it is dequeued
+            job._finish(JobStatus.CANCELLED)
+            await self._notify(job)
+        logger.info(f"Cancelled job {job_id}")
+        return True
+
+    async def shutdown(self) -> None:
+        """Cancel all unfinished jobs and stop the workers."""
+        for job in self.active_jobs():
+            await self.cancel(job.job_id)
+        for worker in self._workers:
+            worker.cancel()
+        await asyncio.gather(*self._workers, return_exceptions=True)
+        self._workers = []
+        self._loop = None
+
+    def _ensure_workers(self) -> None:
+        """Start the workers on the running loop, moving over queued jobs."""
+        loop = asyncio.get_running_loop()
+        if self._loop is loop:
+            return
+
+        # Jobs running on a previous loop can no longer finish
+        for job in self.list_jobs(status=JobStatus.RUNNING):
+            job._task = None
+            job._finish(JobStatus.FAILED, "Interrupted: event loop stopped")
+
+        self._loop = loop
+        self._queue = asyncio.PriorityQueue()
+        for job in self.list_jobs(status=JobStatus.PENDING):
+            self._queue.put_nowait((-job.priority, job._seq, job))
+        self._workers = [
+            loop.create_task(self._worker()) for _ in range(self.max_workers)
+        ]
+
+    async def _worker(self) -> None:
+        queue = self._queue
+        while True:
+            _, _, job = await queue.get()
+            try:
+                if job.status is JobStatus.PENDING:
+                    await self._run(job)
+            finally:
+                queue.task_done()
+
+    async def _run(self, job: Job) -> None:
+        """Run one job and record its outcome."""
+        job.status = JobStatus.RUNNING
+        job.started_at = datetime.now()
+        await self._notify(job)
+        if job.done:
+            # Cancelled while listeners were being notified
+            return
+
+        job._task = asyncio.create_task(job._func(JobContext(job, self)))
+        try:
+            job.result = await job._task
+            job._finish(JobStatus.COMPLETED)
+            logger.info(f"Job {job.job_id} completed")
+        except asyncio.CancelledError:
+            job._finish(JobStatus.CANCELLED)
+            if not job._cancel_requested:
+                # The worker itself is being cancelled
+                raise
+        except Exception as e:
+            logger.error(f"Job {job.job_id} failed: {str(e)}", exc_info=True)
+            job._finish(JobStatus.FAILED, str(e))
+        finally:
+            job._task = None
+            self._prune()
+        await self._notify(job)
+
+    def _prune(self) -> None:
+        """Forget the oldest finished jobs beyond max_finished."""
+        finished = [job_id for job_id, job in self._jobs.items() if job.done]
+        for job_id in finished[: max(0, len(finished) - self.max_finished)]:
+            del self._jobs[job_id]
+
+    async def _notify(self, job: Job) -> None:
+        if self.on_update is None:
+            return
+        try:
+            await self.on_update(job)
+        except Exception as e:
+            logger.error(f"Job update callback failed for {job.job_id}: {str(e)}")
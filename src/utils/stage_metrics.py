@@ -0,0 +1,368 @@
+"""
+Per-stage latency histograms for the crawl pipeline.
+
+Durations are recorded into HDR-style histograms: values are bucketed by
+power of two with a fixed number of linear sub-buckets each, so the
+relative error of any percentile is bounded (about 3% with the default
+precision) regardless of the range of the values, and recording is a dict
+increment. Histograms are kept per stage, backend and host, can be rendered
+in the OpenMetrics text format for scraping, and summarized per stage for
+the CLI.
+
+Recording can be switched off with StageMetrics.enabled; a disabled
+registry hands out a shared no-op timer, so instrumented code pays for one
+attribute check per stage.
+"""
+
+import logging
+import time
+from contextlib import nullcontext
+from typing import Any, Optional
+
+logger = logging.getLogger(__name__)
+
+# Stages of a page's way through the crawler, in pipeline order
+STAGES = (
+    "frontier_wait",
+    "rate_limit_wait",
+    "fetch",
+    "decode",
+    "process",
+    "quality",
+    "organize",
+)
+
+# Histogram bucket bounds in seconds used for OpenMetrics exposition
+DEFAULT_BUCKETS = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+METRIC_NAME = "lib2docscrape_crawl_stage_seconds"
+
+OPENMETRICS_CONTENT_TYPE = "application/openmetrics-text; version=1.0.0; charset=utf-8"
+
+# Label value used for hosts beyond StageMetrics.max_hosts
+OTHER_HOST = "other"
+
+_NULL_TIMER = nullcontext()
+
+
+class LatencyHistogram:
+    """Log-linear histogram of durations with bounded relative error."""
+
+    def __init__(self, precision_bits: int = 5):
+        """
+        Initialize the histogram.
+
+        Args:
+            precision_bits: Each power-of-two range of microseconds is split
+                into 2**precision_bits buckets; the relative error is at
+                most 2**-precision_bits
+        """
+        self.precision_bits = precision_bits
+        self._sub_buckets = 1 << precision_bits
+        self.counts: dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min: Optional[float] = None
+        self.max: Optional[float] = None
+
+    def record(self, seconds: float) -> None:
+        """
+        Record a duration.
+
+        Args:
+            seconds: Duration in seconds; negative values count as zero
+        """
+        seconds = max(0.0, seconds)
+        index = self._index(int(seconds * 1_000_000))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        if self.min is None or seconds < self.min:
+            self.min = seconds
+        if self.max is None or seconds > self.max:
+            self.max = seconds
+
+    def merge(self, other: "LatencyHistogram") -> None:
+        """
+        Add the values of another histogram of the same precision.
+
+        Args:
+            other: Histogram to add
+        """
+        if other.precision_bits != self.precision_bits:
+            raise ValueError("Cannot merge histograms of different precision")
+        for index, count in other.counts.items():
+            self.counts[index] = self.counts.get(index, 0) + count
+        self.count += other.count
+        self.sum += other.sum
+        if other.min is not None and (self.min is None or other.min < self.min):
+            self.min = other.min
+        if other.max is not None and (self.max is None or other.max > self.max):
+            self.max = other.max
+
+    def percentile(self, pct: float) -> float:
+        """
+        Estimate a percentile.
+
+        Args:
+            pct: Percentile between 0 and 100
+
+        Returns:
+            Duration in seconds, or 0.0 if nothing was recorded
+        """
+        if not self.count:
+            return 0.0
+        if pct >= 100:
+            return self.max
+        rank = max(1, round(pct / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                lower, upper = self._bounds(index)
+                value = (lower + upper) / 2 / 1_000_000
+                return min(max(value, self.min), self.max)
+        return self.max
+
+    def cumulative_counts(self, bounds: tuple[float, ...]) -> list[int]:
+        """
+        Count the values at or below each bound.
+
+        A bucket is counted below a bound when its midpoint is, so counts
+        are exact up to the histogram's resolution.
+
+        Args:
+            bounds: Ascending bounds in seconds
+
+        Returns:
+            Cumulative count per bound
+        """
+        midpoints = sorted(
+            (sum(self._bounds(index)) / 2 / 1_000_000, count)
+            for index, count in self.counts.items()
+        )
+        result = []
+        position = cumulative = 0
+        for bound in bounds:
+            while position < len(midpoints) and midpoints[position][0] <= bound:
+                cumulative += midpoints[position][1]
+                position += 1
+            result.append(cumulative)
+        return result
+
+    def _index(self, micros: int) -> int:
+        if micros < self._sub_buckets:
+            return micros
+        shift = micros.bit_length() - self.precision_bits - 1
+        return (shift + 1) * self._sub_buckets + (micros >> shift) - self._sub_buckets
+
+    def _bounds(self, index: int) -> tuple[int, int]:
+        """Lower and upper edge in microseconds of a bucket."""
+        if index < 2 * self._sub_buckets:
+            return index, index + 1
+        shift = index // self._sub_buckets - 1
+        lower = (index % self._sub_buckets + self._sub_buckets) << shift
+        return lower, lower + (1 << shift)
+
+
+class _StageTimer:
+    """Context manager recording the time spent in its block."""
+
+    __slots__ = ("_registry", "_key", "_start")
+
+    def __init__(self, registry: "StageMetrics", key: tuple[str, str, str]):
+        self._registry = registry
+        self._key = key
+
+    def __enter__(self) -> "_StageTimer":
+        self._start = time.perf_counter()
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        self._registry._record(self._key, time.perf_counter() - self._start)
+
+
+class StageMetrics:
+    """Registry of latency histograms labeled by stage, backend and host."""
+
+    def __init__(
+        self, enabled: bool = True, max_hosts: int = 100, precision_bits: int = 5
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            enabled: Whether durations are recorded
+            max_hosts: Distinct host labels kept; further hosts are recorded
+                as "other" to bound the number of series
+            precision_bits: Precision of the histograms
+        """
+        self.enabled = enabled
+        self.max_hosts = max_hosts
+        self.precision_bits = precision_bits
+        self._histograms: dict[tuple[str, str, str], LatencyHistogram] = {}
+        self._hosts: set[str] = set()
+
+    def time(self, stage: str, backend: str = "", host: str = ""):
+        """
+        Time a block of code.
+
+        Args:
+            stage: Stage name, one of STAGES
+            backend: Name of the backend handling the page
+            host: Host of the page
+
+        Returns:
+            Context manager recording the block's duration, or a no-op one
+            when the registry is disabled
+        """
+        if not self.enabled:
+            return _NULL_TIMER
+        return _StageTimer(self, (stage, backend, self._host_label(host)))
+
+    def record(
+        self, stage: str, seconds: float, backend: str = "", host: str = ""
+    ) -> None:
+        """
+        Record a duration measured elsewhere.
+
+        Args:
+            stage: Stage name, one of STAGES
+            seconds: Duration in seconds
+            backend: Name of the backend handling the page
+            host: Host of the page
+        """
+        if self.enabled:
+            self._record((stage, backend, self._host_label(host)), seconds)
+
+    def histograms(self) -> dict[tuple[str, str, str], LatencyHistogram]:
+        """Get the histograms keyed by (stage, backend, host)."""
+        return dict(self._histograms)
+
+    def reset(self) -> None:
+        """Forget all recorded durations."""
+        self._histograms.clear()
+        self._hosts.clear()
+
+    def summary(self) -> list[dict[str, Any]]:
+        """
+        Summarize each stage over all backends and hosts.
+
+        Returns:
+            One row per recorded stage in pipeline order, with count,
+            total_s, p50_ms, p95_ms, p99_ms and max_ms
+        """
+        merged: dict[str, LatencyHistogram] = {}
+        for (stage, _, _), histogram in self._histograms.items():
+            merged.setdefault(stage, LatencyHistogram(self.precision_bits)).merge(
+                histogram
+            )
+
+        order = {stage: i for i, stage in enumerate(STAGES)}
+        rows = []
+        for stage in sorted(merged, key=lambda s: (order.get(s, len(order)), s)):
+            histogram = merged[stage]
+            rows.append(
+                {
+                    "stage": stage,
+                    "count": histogram.count,
+                    "total_s": histogram.sum,
+                    "p50_ms": histogram.percentile(50) * 1000,
+                    "p95_ms": histogram.percentile(95) * 1000,
+                    "p99_ms": histogram.percentile(99) * 1000,
+                    "max_ms": (histogram.max or 0.0) * 1000,
+                }
+            )
+        return rows
+
+    def format_summary(self) -> str:
+        """
+        Format the per-stage summary as a plain text table.
+
+        Returns:
+            Table, or a note that nothing was recorded
+        """
+        rows = self.summary()
+        if not rows:
+            return "No stage latencies recorded."
+        lines = [
+            f"{'Stage':<16}{'Count':>8}{'Total s':>10}{'p50 ms':>10}"
+            f"{'p95 ms':>10}{'p99 ms':>10}{'Max ms':>10}"
+        ]
+        for row in rows:
+            lines.append(
+                f"{row['stage']:<16}{row['count']:>8}{row['total_s']:>10.2f}"
+                f"{row['p50_ms']:>10.1f}{row['p95_ms']:>10.1f}"
+                f"{row['p99_ms']:>10.1f}{row['max_ms']:>10.1f}"
+            )
+        return "\n".join(lines)
+
+    def render_openmetrics(self, buckets: tuple[float, ...] = DEFAULT_BUCKETS) -> str:
+        """
+        Render the histograms in the OpenMetrics text format.
+
+        Args:
+            buckets: Ascending bucket bounds in seconds
+
+        Returns:
+            Exposition text, terminated by "# EOF"
+        """
+        lines = [
+            f"# TYPE {METRIC_NAME} histogram",
+            f"# UNIT {METRIC_NAME} seconds",
+            f"# HELP {METRIC_NAME} Time spent in each crawl pipeline stage.",
+        ]
+        for (stage, backend, host), histogram in sorted(self._histograms.items()):
+            labels = (
+                f'stage="{_escape(stage)}",backend="{_escape(backend)}",'
+                f'host="{_escape(host)}"'
+            )
+            for bound, count in zip(buckets, histogram.cumulative_counts(buckets)):
+                lines.append(f'{METRIC_NAME}_bucket{{{labels},le="{bound}"}} {count}')
+            lines.append(
+                f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} {histogram.count}'
+            )
+            lines.append(f"{METRIC_NAME}_count{{{labels}}} {histogram.count}")
+            lines.append(f"{METRIC_NAME}_sum{{{labels}}} {histogram.sum}")
+        lines.append("# EOF")
+        return "\n".join(lines) + "\n"
+
+    def _record(self, key: tuple[str, str, str], seconds: float) -> None:
+        histogram = self._histograms.get(key)
+        if histogram is None:
+            histogram = self._histograms[key] = LatencyHistogram(self.precision_bits)
+        histogram.record(seconds)
+
+    def _host_label(self, host: str) -> str:
+        if not host or host in self._hosts:
+            return host
+        if len(self._hosts) >= self.max_hosts:
+            return OTHER_HOST
+        self._hosts.add(host)
+        return host
+
+
+def _escape(value: str) -> str:
+    """Escape a label value for the OpenMetrics text format."""
+    return value.replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+# Registry shared by crawlers that are not given their own
+stage_metrics = StageMetrics()
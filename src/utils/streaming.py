@@ -0,0 +1,265 @@
+"""
+Chunk generators for streaming exports of scraping results.
+
+Each generator yields bytes as soon as they are produced, so a download
+response can start immediately and only holds one chunk (or, for ZIP
+archives, one piece of one entry) in memory at a time.
+"""
+
+import io
+import json
+import logging
+import time
+import zipfile
+from collections.abc import Iterable, Iterator
+from typing import Any, Union
+from urllib.parse import urlparse
+
+logger = logging.getLogger(__name__)
+
+# Target size of the chunks yielded to the response
+STREAM_CHUNK_SIZE = 65536
+
+
+def _batched(
+    pieces: Iterable[str], chunk_size: int = STREAM_CHUNK_SIZE
+) -> Iterator[bytes]:
+    """Join small text pieces into UTF-8 chunks of roughly chunk_size bytes."""
+    buffer: list[str] = []
+    size = 0
+    for piece in pieces:
+        buffer.append(piece)
+        size += len(piece)
+        if size >= chunk_size:
+            yield "".join(buffer).encode("utf-8")
+            buffer, size = [], 0
+    if buffer:
+        yield "".join(buffer).encode("utf-8")
+
+
+def iter_json(data: Any) -> Iterator[bytes]:
+    """
+    Encode a value as JSON incrementally.
+
+    Args:
+        data: JSON-serializable value
+
+    Yields:
+        UTF-8 chunks of the JSON document
+    """
+    yield from _batched(json.JSONEncoder(default=str).iterencode(data))
+
+
+def iter_json_object(items: Iterable[tuple[str, Any]]) -> Iterator[bytes]:
+    """
+    Encode key/value pairs as a JSON object, one value at a time.
+
+    Args:
+        items: (key, JSON-serializable value) pairs, e.g. from a lazy mapping
+
+    Yields:
+        UTF-8 chunks of the JSON object
+    """
+    encoder = json.JSONEncoder(default=str)
+
+    def pieces() -> Iterator[str]:
+        yield "{"
+        for index, (key, value) in enumerate(items):
+            yield f"{', ' if index else ''}{json.dumps(str(key))}: "
+            yield from encoder.iterencode(value)
+        yield "}"
+
+    yield from _batched(pieces())
+
+
+def iter_json_result(summary: dict[str, Any], pages: Iterable[Any]) -> Iterator[bytes]:
+    """
+    Encode a scraping result as a JSON object, one page at a time.
+
+    Args:
+        summary: Result fields other than "results"
+        pages: Pages to encode as the "results" list, e.g. from iter_pages
+
+    Yields:
+        UTF-8 chunks of the JSON object, with "results" as its last key
+    """
+    encoder = json.JSONEncoder(default=str)
+
+    def pieces() -> Iterator[str]:
+        yield "{"
+        for key, value in summary.items():
+            yield f"{json.dumps(str(key))}: "
+            yield from encoder.iterencode(value)
+            yield ", "
+        yield '"results": ['
+        for index, page in enumerate(pages):
+            if index:
+                yield ", "
+            yield from encoder.iterencode(page)
+        yield "]}"
+
+    yield from _batched(pieces())
+
+
+def iter_ndjson(records: Iterable[Any]) -> Iterator[bytes]:
+    """
+    Encode records as newline-delimited JSON.
+
+    Args:
+        records: JSON-serializable records
+
+    Yields:
+        UTF-8 chunks of one or more complete lines
+    """
+    yield from _batched(json.dumps(record, default=str) + "\n" for record in records)
+
+
+def _doc_field(doc: dict[str, Any], field: str, default: str) -> Any:
+    """Get a field of a stored result document's content."""
+    content = doc.get("content")
+    if isinstance(content, dict):
+        return content.get(field, default)
+    return default
+
+
+def iter_markdown(docs: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Render stored result documents as one markdown document.
+
+    Args:
+        docs: Documents with a content dict holding title and text
+
+    Yields:
+        UTF-8 markdown chunks
+    """
+
+    def pieces() -> Iterator[str]:
+        yield "# Documentation Export\n\n"
+        for doc in docs:
+            yield f"## {_doc_field(doc, 'title', 'Untitled')}\n\n"
+            yield f"{_doc_field(doc, 'text', '')}\n\n"
+
+    yield from _batched(pieces())
+
+
+def iter_html(docs: Iterable[dict[str, Any]]) -> Iterator[bytes]:
+    """
+    Render stored result documents as one HTML page.
+
+    Args:
+        docs: Documents with a content dict holding title and text
+
+    Yields:
+        UTF-8 HTML chunks
+    """
+
+    def pieces() -> Iterator[str]:
+        yield "<html><body>"
+        for doc in docs:
+            yield f"<h2>{_doc_field(doc, 'title', 'Untitled')}</h2>"
+            yield f"<div>{_doc_field(doc, 'text', '')}</div>"
+        yield "</body></html>"
+
+    yield from _batched(pieces())
+
+
+class _ZipOutput(io.RawIOBase):
+    """Unseekable sink that collects archive bytes until they are drained."""
+
+    def __init__(self):
+        self._chunks: list[bytes] = []
+
+    def writable(self) -> bool:
+        return True
+
+    def write(self, data) -> int:
+        self._chunks.append(bytes(data))
+        return len(data)
+
+    def drain(self) -> bytes:
+        data = b"".join(self._chunks)
+        self._chunks.clear()
+        return data
+
+
+def iter_zip(
+    entries: Iterable[tuple[str, Union[str, bytes]]],
+    compression: int = zipfile.ZIP_DEFLATED,
+) -> Iterator[bytes]:
+    """
+    Build a ZIP archive on the fly.
+
+    Entries are compressed and yielded in pieces as they are produced; the
+    archive's central directory follows the last entry. Because the output
+    is not seekable, sizes are recorded in data descriptors after each entry.
+
+    Args:
+        entries: (archive name, content) pairs; text is encoded as UTF-8
+        compression: zipfile compression method
+
+    Yields:
+        Archive chunks
+    """
+    output = _ZipOutput()
+    with zipfile.ZipFile(output, "w", compression=compression) as zf:
+        for name, content in entries:
+            if isinstance(content, str):
+                content = content.encode("utf-8")
+            info = zipfile.ZipInfo(name, date_time=time.localtime()[:6])
+            info.compress_type = compression
+            with zf.open(info, "w") as entry:
+                for start in range(0, len(content), STREAM_CHUNK_SIZE):
+                    entry.write(content[start : start + STREAM_CHUNK_SIZE])
+                    data = output.drain()
+                    if data:
+                        yield data
+            # The entry's trailing compressed bytes and data descriptor
+            yield output.drain()
+    # The central directory
+    yield output.drain()
+
+
+def iter_docs_archive_entries(
+    base_url: str, results: dict[str, str]
+) -> Iterator[tuple[str, str]]:
+    """
+    Lay out scraped pages as a markdown documentation tree.
+
+    Each page becomes a markdown file whose path mirrors its URL path, with
+    its source URL in front matter; a README.md linking every page is added
+    last.
+
+    Args:
+        base_url: URL the documentation was exported from
+        results: Map of page URL to markdown content
+
+    Yields:
+        (archive name, content) pairs for iter_zip
+    """
+    domain = urlparse(base_url).netloc
+    root = f"{domain}_Documentation"
+    links: list[str] = []
+    used_paths: set[str] = set()
+
+    for url, content in results.items():
+        try:
+            path_parts = [p for p in urlparse(url).path.split("/") if p] or ["index"]
+            rel_path = "/".join(path_parts) + ".md"
+            # Pages mapping to the same file get a numbered suffix
+            suffix = 2
+            while rel_path in used_paths:
+                rel_path = "/".join(path_parts) + f"-{suffix}.md"
+                suffix += 1
+            used_paths.add(rel_path)
+
+            yield f"{root}/{rel_path}", f"---\nsource: {url}\n---\n\n{content}"
+            links.append(f"- [{' > '.join(path_parts)}]({rel_path})\n")
+        except Exception as e:
+            logger.error(f"Error processing URL {url}: {str(e)}")
+
+    readme = (
+        f"# {domain} Documentation\n\n"
+        f"Documentation exported from {base_url}\n\n"
+        "## Contents\n\n" + "".join(links)
+    )
+    yield f"{root}/README.md", readme
@@ -0,0 +1,557 @@
+"""
+Lightweight span tracing for the crawl pipeline.
+
+Spans follow the OpenTelemetry data model (trace and span ids, parent span
+id, kind, start and end time in Unix nanoseconds, attributes and status) and
+are propagated through a context variable, so nested spans find their parent
+across awaits without being passed around. Finished spans are handed to
+exporters: JSONLinesSpanExporter writes one OTLP/JSON span per line,
+ChromeTraceExporter writes a Chrome trace that chrome://tracing and Perfetto
+show as a flame timeline per asyncio task.
+
+A tracer without exporters is disabled and hands out a shared no-op span, so
+instrumented code pays for one attribute check per span.
+"""
+
+import asyncio
+import functools
+import inspect
+import json
+import logging
+import os
+import threading
+import time
+from abc import ABC, abstractmethod
+from collections.abc import Callable
+from contextvars import ContextVar
+from typing import Any, Optional
+
+import aiohttp
+
+logger = logging.getLogger(__name__)
+
+# Span kinds and status codes as numbered in the OpenTelemetry protocol
+SPAN_KIND_INTERNAL = 1
+SPAN_KIND_CLIENT = 3
+
+STATUS_UNSET = 0
+STATUS_OK = 1
+STATUS_ERROR = 2
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = (
+        "name",
+        "trace_id",
+        "span_id",
+        "parent_span_id",
+        "kind",
+        "start_time_unix_nano",
+        "end_time_unix_nano",
+        "attributes",
+        "status_code",
+        "status_message",
+        "lane",
+        "_start_perf_ns",
+    )
+
+    def __init__(
+        self,
+        name: str,
+        parent: Optional["Span"] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[dict[str, Any]] = None,
+    ):
+        """
+        Start a span.
+
+        Args:
+            name: Operation name
+            parent: Parent span; a span without one starts a new trace
+            kind: OpenTelemetry span kind
+            attributes: Initial attributes
+        """
+        self.name = name
+        self.trace_id = parent.trace_id if parent else os.urandom(16).hex()
+        self.span_id = os.urandom(8).hex()
+        self.parent_span_id = parent.span_id if parent else ""
+        self.kind = kind
+        self.attributes = dict(attributes) if attributes else {}
+        self.status_code = STATUS_UNSET
+        self.status_message = ""
+        self.lane = _current_lane()
+        self.start_time_unix_nano = time.time_ns()
+        self.end_time_unix_nano: Optional[int] = None
+        self._start_perf_ns = time.perf_counter_ns()
+
+    @property
+    def duration_ns(self) -> int:
+        """Duration in nanoseconds, zero while the span is running."""
+        if self.end_time_unix_nano is None:
+            return 0
+        return self.end_time_unix_nano - self.start_time_unix_nano
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        """Set an attribute."""
+        self.attributes[key] = value
+
+    def set_status(self, code: int, message: str = "") -> None:
+        """Set the status code and an optional description."""
+        self.status_code = code
+        self.status_message = message
+
+    def record_exception(self, exc: BaseException) -> None:
+        """Mark the span as failed by an exception."""
+        self.set_status(STATUS_ERROR, str(exc))
+        self.attributes["exception.type"] = type(exc).__name__
+
+    def end(self) -> None:
+        """End the span; the end time is measured with the monotonic clock."""
+        if self.end_time_unix_nano is None:
+            elapsed = time.perf_counter_ns() - self._start_perf_ns
+            self.end_time_unix_nano = self.start_time_unix_nano + elapsed
+
+    def to_dict(self) -> dict[str, Any]:
+        """Convert the span to its OTLP/JSON representation."""
+        return {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "parentSpanId": self.parent_span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_time_unix_nano),
+            "endTimeUnixNano": str(self.end_time_unix_nano or 0),
+            "attributes": [
+                {"key": key, "value": _otlp_value(value)}
+                for key, value in self.attributes.items()
+            ],
+            "status": {"code": self.status_code, "message": self.status_message},
+        }
+
+
+class _NullSpan:
+    """Span handed out by a disabled tracer; records nothing."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> "_NullSpan":
+        return self
+
+    def __exit__(self, *exc_info: Any) -> None:
+        return None
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        pass
+
+    def set_status(self, code: int, message: str = "") -> None:
+        pass
+
+    def record_exception(self, exc: BaseException) -> None:
+        pass
+
+
+NULL_SPAN = _NullSpan()
+
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+def current_span() -> Any:
+    """Get the active span, or a no-op span when none is active."""
+    return _current_span.get() or NULL_SPAN
+
+
+class _ActiveSpan:
+    """Context manager making a new span the current one for its block."""
+
+    __slots__ = ("_tracer", "_name", "_kind", "_attributes", "_span", "_token")
+
+    def __init__(
+        self,
+        tracer: "Tracer",
+        name: str,
+        kind: int,
+        attributes: Optional[dict[str, Any]],
+    ):
+        self._tracer = tracer
+        self._name = name
+        self._kind = kind
+        self._attributes = attributes
+
+    def __enter__(self) -> Span:
+        self._span = self._tracer.start_span(self._name, self._kind, self._attributes)
+        self._token = _current_span.set(self._span)
+        return self._span
+
+    def __exit__(self, exc_type: Any, exc: Any, tb: Any) -> None:
+        _current_span.reset(self._token)
+        if exc is not None:
+            self._span.record_exception(exc)
+        self._tracer.end_span(self._span)
+
+
+class SpanExporter(ABC):
+    """Receives finished spans."""
+
+    @abstractmethod
+    def export(self, span: Span) -> None:
+        """Export a finished span."""
+        pass
+
+    def shutdown(self) -> None:  # noqa: B027 - optional for exporters
+        """Flush and release resources."""
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps finished spans in a list."""
+
+    def __init__(self):
+        self.spans: list[Span] = []
+
+    def export(self, span: Span) -> None:
+        self.spans.append(span)
+
+
+class JSONLinesSpanExporter(SpanExporter):
+    """Writes each finished span as an OTLP/JSON object on its own line."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the exporter.
+
+        Args:
+            path: File to write; an existing file is replaced
+        """
+        self.path = path
+        self._file = open(path, "w", encoding="utf-8")
+
+    def export(self, span: Span) -> None:
+        self._file.write(json.dumps(span.to_dict(), default=str) + "\n")
+
+    def shutdown(self) -> None:
+        if not self._file.closed:
+            self._file.close()
+
+
+class ChromeTraceExporter(SpanExporter):
+    """Collects spans and writes them in the Chrome trace event format."""
+
+    def __init__(self, path: str):
+        """
+        Initialize the exporter.
+
+        Args:
+            path: File the trace is written to on shutdown
+        """
+        self.path = path
+        self._events: list[dict[str, Any]] = []
+        self._lanes: dict[str, int] = {}
+        self._pid = os.getpid()
+
+    def export(self, span: Span) -> None:
+        tid = self._lanes.get(span.lane)
+        if tid is None:
+            tid = self._lanes[span.lane] = len(self._lanes) + 1
+        args = dict(span.attributes)
+        if span.status_code == STATUS_ERROR:
+            args["error"] = span.status_message
+        self._events.append(
+            {
+                "name": span.name,
+                "cat": span.name.split(".", 1)[0],
+                "ph": "X",
+                "ts": span.start_time_unix_nano / 1000,
+                "dur": span.duration_ns / 1000,
+                "pid": self._pid,
+                "tid": tid,
+                "args": args,
+            }
+        )
+
+    def trace_events(self) -> list[dict[str, Any]]:
+        """Get the collected events preceded by process and lane names."""
+        metadata = [
+            {
+                "name": "process_name",
+                "ph": "M",
+                "pid": self._pid,
+                "args": {"name": "lib2docscrape"},
+            }
+        ]
+        for lane, tid in self._lanes.items():
+            metadata.append(
+                {
+                    "name": "thread_name",
+                    "ph": "M",
+                    "pid": self._pid,
+                    "tid": tid,
+                    "args": {"name": lane},
+                }
+            )
+        return metadata + self._events
+
+    def shutdown(self) -> None:
+        with open(self.path, "w", encoding="utf-8") as f:
+            json.dump(
+                {"traceEvents": self.trace_events(), "displayTimeUnit": "ms"},
+                f,
+                default=str,
+            )
+        logger.info(
+            f"Chrome trace with {len(self._events)} spans written to {self.path}"
+        )
+
+
+class Tracer:
+    """Creates spans and hands finished ones to its exporters."""
+
+    def __init__(self, exporters: Optional[list[SpanExporter]] = None):
+        """
+        Initialize the tracer.
+
+        Args:
+            exporters: Exporters receiving finished spans; without any the
+                tracer is disabled
+        """
+        self.exporters: list[SpanExporter] = list(exporters or [])
+
+    @property
+    def enabled(self) -> bool:
+        """Whether spans are recorded."""
+        return bool(self.exporters)
+
+    def add_exporter(self, exporter: SpanExporter) -> None:
+        """Add an exporter, enabling the tracer."""
+        self.exporters.append(exporter)
+
+    def span(
+        self,
+        name: str,
+        attributes: Optional[dict[str, Any]] = None,
+        kind: int = SPAN_KIND_INTERNAL,
+    ):
+        """
+        Trace a block of code as a child of the current span.
+
+        Args:
+            name: Operation name
+            attributes: Initial attributes
+            kind: OpenTelemetry span kind
+
+        Returns:
+            Context manager yielding the span, or a no-op one when the
+            tracer is disabled
+        """
+        if not self.exporters:
+            return NULL_SPAN
+        return _ActiveSpan(self, name, kind, attributes)
+
+    def start_span(
+        self,
+        name: str,
+        kind: int = SPAN_KIND_INTERNAL,
+        attributes: Optional[dict[str, Any]] = None,
+        parent: Optional[Span] = None,
+    ) -> Span:
+        """
+        Start a span without making it current; end it with end_span.
+
+        Args:
+            name: Operation name
+            kind: OpenTelemetry span kind
+            attributes: Initial attributes
+            parent: Parent span, by default the current one
+
+        Returns:
+            The started span
+        """
+        return Span(name, parent or _current_span.get(), kind, attributes)
+
+    def end_span(self, span: Span) -> None:
+        """End a span and export it."""
+        span.end()
+        for exporter in self.exporters:
+            try:
+                exporter.export(span)
+            except Exception as e:
+                logger.warning(f"Span exporter {type(exporter).__name__} failed: {e}")
+
+    def shutdown(self) -> None:
+        """Flush and remove all exporters, disabling the tracer."""
+        exporters, self.exporters = self.exporters, []
+        for exporter in exporters:
+            exporter.shutdown()
+
+
+# Tracer used by the instrumented crawler, backends and processors
+tracer = Tracer()
+
+
+def configure_tracing(
+    trace_file: Optional[str] = None, chrome_trace: Optional[str] = None
+) -> Tracer:
+    """
+    Enable the shared tracer with file exporters.
+
+    Args:
+        trace_file: Path of a JSON lines file of OTLP/JSON spans
+        chrome_trace: Path of a Chrome trace (Perfetto) JSON file
+
+    Returns:
+        The shared tracer; call its shutdown() to write the files
+    """
+    if trace_file:
+        tracer.add_exporter(JSONLinesSpanExporter(trace_file))
+    if chrome_trace:
+        tracer.add_exporter(ChromeTraceExporter(chrome_trace))
+    return tracer
+
+
+def traced(
+    name: Optional[str] = None,
+    kind: int = SPAN_KIND_INTERNAL,
+    attributes: Optional[Callable[..., dict[str, Any]]] = None,
+) -> Callable:
+    """
+    Decorate a function or coroutine function to run in a span.
+
+    Args:
+        name: Span name, by default the function's qualified name
+        kind: OpenTelemetry span kind
+        attributes: Called with the function's arguments to get the span's
+            initial attributes
+
+    Returns:
+        Decorator
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+
+            @functools.wraps(func)
+            async def async_wrapper(*args: Any, **kwargs: Any) -> Any:
+                if not tracer.exporters:
+                    return await func(*args, **kwargs)
+                initial = attributes(*args, **kwargs) if attributes else None
+                with tracer.span(span_name, initial, kind):
+                    return await func(*args, **kwargs)
+
+            return async_wrapper
+
+        @functools.wraps(func)
+        def wrapper(*args: Any, **kwargs: Any) -> Any:
+            if not tracer.exporters:
+                return func(*args, **kwargs)
+            initial = attributes(*args, **kwargs) if attributes else None
+            with tracer.span(span_name, initial, kind):
+                return func(*args, **kwargs)
+
+        return wrapper
+
+    return decorator
+
+
+def aiohttp_trace_config() -> aiohttp.TraceConfig:
+    """
+    Create an aiohttp trace config recording request phases as spans.
+
+    Each request gets an "http.request" span with "http.dns" (host
+    resolution), "http.connect" (TCP connect and TLS handshake) and
+    "http.wait" (from sending the request headers to receiving the response
+    headers, i.e. server latency) children.
+
+    Returns:
+        Trace config to pass to aiohttp.ClientSession
+    """
+
+    async def on_request_start(session, ctx, params):
+        ctx.request_span = None
+        if tracer.exporters:
+            ctx.request_span = tracer.start_span(
+                "http.request",
+                SPAN_KIND_CLIENT,
+                {"http.request.method": params.method, "url.full": str(params.url)},
+            )
+
+    def phase_start(name: str, attr: str):
+        async def hook(session, ctx, params):
+            request_span = getattr(ctx, "request_span", None)
+            if request_span is not None:
+                setattr(ctx, attr, tracer.start_span(name, parent=request_span))
+
+        return hook
+
+    def phase_end(attr: str):
+        async def hook(session, ctx, params):
+            span = getattr(ctx, attr, None)
+            if span is not None:
+                setattr(ctx, attr, None)
+                tracer.end_span(span)
+
+        return hook
+
+    def flag(key: str):
+        async def hook(session, ctx, params):
+            request_span = getattr(ctx, "request_span", None)
+            if request_span is not None:
+                request_span.set_attribute(key, True)
+
+        return hook
+
+    async def on_request_end(session, ctx, params):
+        await phase_end("wait_span")(session, ctx, params)
+        request_span = getattr(ctx, "request_span", None)
+        if request_span is not None:
+            request_span.set_attribute(
+                "http.response.status_code", params.response.status
+            )
+            ctx.request_span = None
+            tracer.end_span(request_span)
+
+    async def on_request_exception(session, ctx, params):
+        for attr in ("dns_span", "connect_span", "wait_span", "request_span"):
+            span = getattr(ctx, attr, None)
+            if span is not None:
+                setattr(ctx, attr, None)
+                span.record_exception(params.exception)
+                tracer.end_span(span)
+
+    trace_config = aiohttp.TraceConfig()
+    trace_config.on_request_start.append(on_request_start)
+    trace_config.on_dns_resolvehost_start.append(phase_start("http.dns", "dns_span"))
+    trace_config.on_dns_resolvehost_end.append(phase_end("dns_span"))
+    trace_config.on_dns_cache_hit.append(flag("dns.cache_hit"))
+    trace_config.on_connection_create_start.append(
+        phase_start("http.connect", "connect_span")
+    )
+    trace_config.on_connection_create_end.append(phase_end("connect_span"))
+    trace_config.on_connection_reuseconn.append(flag("http.connection.reused"))
+    trace_config.on_request_headers_sent.append(phase_start("http.wait", "wait_span"))
+    trace_config.on_request_end.append(on_request_end)
+    trace_config.on_request_exception.append(on_request_exception)
+    return trace_config
+
+
+def _current_lane() -> str:
+    """Name of the asyncio task or thread the caller runs in."""
+    try:
+        task = asyncio.current_task()
+    except RuntimeError:
+        task = None
+    if task is not None:
+        return task.get_name()
+    return threading.current_thread().name
+
+
+def _otlp_value(value: Any) -> dict[str, Any]:
+    """Wrap an attribute value in its OTLP/JSON AnyValue form."""
+    if isinstance(value, bool):
+        return {"boolValue": value}
+    if isinstance(value, int):
+        return {"intValue": str(value)}
+    if isinstance(value, float):
+        return {"doubleValue": value}
+    return {"stringValue": str(value)}
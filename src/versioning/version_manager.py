@@ -3,10 +3,15 @@ Version management for library documentation.
 """
 
 import datetime
+import hashlib
 import json
 import logging
 import os
 import re
+import sqlite3
+import threading
+import zlib
+from collections import OrderedDict
 from enum import Enum
 from typing import Any, Optional
 
@@ -88,6 +93,7 @@ class VersionConfig(BaseModel):
     track_metadata_changes: bool = True
     auto_detect_version: bool = True
     version_pattern: str = r"(\d+\.\d+\.\d+)"
+    diff_cache_size: int = 128
 
 
 class VersionManager:
@@ -98,153 +104,241 @@ class VersionManager:
     different versions of library documentation.
     """
 
+    DB_FILENAME = "versions.db"
+    LEGACY_INDEX_FILENAME = "version_index.json"
+
     def __init__(self, config: Optional[VersionConfig] = None):
         """
         Initialize the version manager.
 
+        History is kept in a single SQLite database in the storage directory,
+        holding each distinct content once as a compressed blob. A document's
+        history is only read when it is first accessed.
+
         Args:
             config: Optional configuration for version management
         """
         self.config = config or VersionConfig()
-        self.versions: dict[str, list[DocumentVersion]] = {}
+        self.versions: dict[str, list[DocumentVersion]] = {}  # Loaded histories
+        self.db_path = os.path.join(self.config.storage_dir, self.DB_FILENAME)
+        self._db: Optional[sqlite3.Connection] = None
+        self._lock = threading.RLock()
+        self._diff_cache: OrderedDict[tuple, VersionDiff] = OrderedDict()
 
         # Create storage directory if it doesn't exist
         os.makedirs(self.config.storage_dir, exist_ok=True)
 
-        # Load existing versions
+        # Import history written by the previous file-per-version layout
         self._load_versions()
 
-    def _load_versions(self) -> None:
-        """Load existing versions from storage."""
-        try:
-            index_path = os.path.join(self.config.storage_dir, "version_index.json")
-            if os.path.exists(index_path):
-                with open(index_path) as f:
-                    data = json.load(f)
-
-                for doc_id, versions in data.items():
-                    self.versions[doc_id] = [
-                        DocumentVersion(
-                            document_id=doc_id,
-                            version=v["version"],
-                            content_hash=v["content_hash"],
-                            timestamp=datetime.datetime.fromisoformat(v["timestamp"]),
-                            metadata=v["metadata"],
-                        )
-                        for v in versions
-                    ]
+    def _connect(self, create: bool = True) -> Optional[sqlite3.Connection]:
+        """
+        Get the database connection, opening it on first use.
 
-                logger.info(
-                    f"Loaded version history for {len(self.versions)} documents"
-                )
-        except Exception as e:
-            error_details = {"storage_dir": self.config.storage_dir}
-            handle_error(
-                e,
-                "VersionManager",
-                "_load_versions",
-                details=error_details,
-                level=ErrorLevel.WARNING,
-                category=ErrorCategory.RESOURCE,
+        Args:
+            create: Whether to create the database if it does not exist
+
+        Returns:
+            Database connection, or None if it does not exist and create is False
+        """
+        if self._db is None:
+            if not create and not os.path.exists(self.db_path):
+                return None
+
+            db = sqlite3.connect(self.db_path, check_same_thread=False)
+            db.execute("PRAGMA journal_mode=WAL")
+            db.execute("PRAGMA synchronous=NORMAL")
+            db.executescript(
+                """
+                CREATE TABLE IF NOT EXISTS blobs (
+                    content_hash TEXT PRIMARY KEY,
+                    compressed INTEGER NOT NULL,
+                    data BLOB NOT NULL,
+                    refcount INTEGER NOT NULL
+                );
+                CREATE TABLE IF NOT EXISTS versions (
+                    id INTEGER PRIMARY KEY AUTOINCREMENT,
+                    document_id TEXT NOT NULL,
+                    version TEXT NOT NULL,
+                    content_hash TEXT NOT NULL,
+                    timestamp TEXT NOT NULL,
+                    metadata TEXT NOT NULL
+                );
+                CREATE INDEX IF NOT EXISTS versions_by_document
+                    ON versions (document_id, timestamp);
+                """
             )
-            logger.warning(f"Failed to load version history: {str(e)}")
+            self._db = db
+        return self._db
 
-    def _save_versions(self) -> None:
-        """Save versions to storage."""
-        try:
-            index_path = os.path.join(self.config.storage_dir, "version_index.json")
-
-            # Convert to serializable format
-            data = {}
-            for doc_id, versions in self.versions.items():
-                data[doc_id] = [
-                    {
-                        "version": v.version,
-                        "content_hash": v.content_hash,
-                        "timestamp": v.timestamp.isoformat(),
-                        "metadata": v.metadata,
-                    }
-                    for v in versions
-                ]
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            if self._db is not None:
+                self._db.close()
+                self._db = None
 
-            with open(index_path, "w") as f:
-                json.dump(data, f, indent=2)
+    def _load_versions(self) -> None:
+        """Import a legacy version index and content files into the database."""
+        index_path = os.path.join(self.config.storage_dir, self.LEGACY_INDEX_FILENAME)
+        if not os.path.exists(index_path):
+            return
 
-            logger.debug(f"Saved version history for {len(self.versions)} documents")
+        try:
+            with open(index_path) as f:
+                data = json.load(f)
+
+            with self._lock:
+                db = self._connect()
+                with db:
+                    for doc_id, versions in data.items():
+                        for v in versions:
+                            content = self._read_legacy_content(doc_id, v["version"])
+                            if content is not None:
+                                self._put_blob(db, v["content_hash"], content)
+                            self._insert_version(
+                                db,
+                                DocumentVersion(
+                                    document_id=doc_id,
+                                    version=v["version"],
+                                    content_hash=v["content_hash"],
+                                    timestamp=datetime.datetime.fromisoformat(
+                                        v["timestamp"]
+                                    ),
+                                    metadata=v["metadata"],
+                                ),
+                            )
+
+            os.replace(index_path, index_path + ".migrated")
+            logger.info(
+                f"Imported version history for {len(data)} documents into {self.db_path}"
+            )
         except Exception as e:
             error_details = {"storage_dir": self.config.storage_dir}
             handle_error(
                 e,
                 "VersionManager",
-                "_save_versions",
+                "_load_versions",
                 details=error_details,
-                level=ErrorLevel.ERROR,
+                level=ErrorLevel.WARNING,
                 category=ErrorCategory.RESOURCE,
             )
-            logger.error(f"Failed to save version history: {str(e)}")
+            logger.warning(f"Failed to load version history: {str(e)}")
 
-    def _compute_content_hash(self, content: str) -> str:
+    def _read_legacy_content(self, doc_id: str, version: str) -> Optional[str]:
         """
-        Compute a hash of the content.
+        Read a content file written by the file-per-version layout.
 
         Args:
-            content: Content to hash
+            doc_id: Document ID
+            version: Version string
 
         Returns:
-            Hash of the content
+            Content of the file, or None if it does not exist
         """
-        import hashlib
-
-        return hashlib.sha256(content.encode()).hexdigest()
+        content_path = os.path.join(self.config.storage_dir, doc_id, f"{version}.txt")
+        if not os.path.exists(content_path):
+            return None
+        with open(content_path) as f:
+            return f.read()
 
-    def _get_content_path(self, doc_id: str, version: str) -> str:
+    def _history(self, doc_id: str) -> list[DocumentVersion]:
         """
-        Get the path to the content file for a document version.
+        Get the history of a document, loading it on first access.
 
         Args:
             doc_id: Document ID
-            version: Version string
 
         Returns:
-            Path to the content file
+            Versions of the document, oldest first
         """
-        return os.path.join(self.config.storage_dir, doc_id, f"{version}.txt")
+        history = self.versions.get(doc_id)
+        if history is not None:
+            return history
+
+        history = []
+        with self._lock:
+            db = self._connect(create=False)
+            if db is not None:
+                rows = db.execute(
+                    "SELECT version, content_hash, timestamp, metadata FROM versions "
+                    "WHERE document_id = ? ORDER BY timestamp, id",
+                    (doc_id,),
+                ).fetchall()
+                history = [
+                    DocumentVersion(
+                        document_id=doc_id,
+                        version=version,
+                        content_hash=content_hash,
+                        timestamp=datetime.datetime.fromisoformat(timestamp),
+                        metadata=json.loads(metadata),
+                    )
+                    for version, content_hash, timestamp, metadata in rows
+                ]
 
-    def _store_content(self, doc_id: str, version: str, content: str) -> None:
-        """
-        Store content for a document version.
+        self.versions[doc_id] = history
+        return history
+
+    def _insert_version(
+        self, db: sqlite3.Connection, doc_version: DocumentVersion
+    ) -> None:
+        """Insert a version row."""
+        db.execute(
+            "INSERT INTO versions "
+            "(document_id, version, content_hash, timestamp, metadata) "
+            "VALUES (?, ?, ?, ?, ?)",
+            (
+                doc_version.document_id,
+                doc_version.version,
+                doc_version.content_hash,
+                doc_version.timestamp.isoformat(),
+                json.dumps(doc_version.metadata, default=str),
+            ),
+        )
 
-        Args:
-            doc_id: Document ID
-            version: Version string
-            content: Content to store
-        """
-        if not self.config.store_full_content:
+    def _put_blob(
+        self, db: sqlite3.Connection, content_hash: str, content: str
+    ) -> None:
+        """Store a content blob or add a reference to an identical one."""
+        updated = db.execute(
+            "UPDATE blobs SET refcount = refcount + 1 WHERE content_hash = ?",
+            (content_hash,),
+        ).rowcount
+        if updated:
             return
 
-        try:
-            # Create directory if it doesn't exist
-            os.makedirs(os.path.join(self.config.storage_dir, doc_id), exist_ok=True)
+        data = content.encode("utf-8")
+        compressed = self.config.compress_old_versions
+        if compressed:
+            data = zlib.compress(data, 6)
+        db.execute(
+            "INSERT INTO blobs (content_hash, compressed, data, refcount) "
+            "VALUES (?, ?, ?, 1)",
+            (content_hash, int(compressed), data),
+        )
 
-            # Write content to file
-            content_path = self._get_content_path(doc_id, version)
-            with open(content_path, "w") as f:
-                f.write(content)
+    def _release_blob(self, db: sqlite3.Connection, content_hash: str) -> None:
+        """Drop a reference to a content blob, deleting it when none remain."""
+        db.execute(
+            "UPDATE blobs SET refcount = refcount - 1 WHERE content_hash = ?",
+            (content_hash,),
+        )
+        db.execute(
+            "DELETE FROM blobs WHERE content_hash = ? AND refcount <= 0",
+            (content_hash,),
+        )
 
-            logger.debug(f"Stored content for {doc_id} version {version}")
-        except Exception as e:
-            error_details = {"doc_id": doc_id, "version": version}
-            handle_error(
-                e,
-                "VersionManager",
-                "_store_content",
-                details=error_details,
-                level=ErrorLevel.ERROR,
-                category=ErrorCategory.RESOURCE,
-            )
-            logger.error(
-                f"Failed to store content for {doc_id} version {version}: {str(e)}"
-            )
+    def _compute_content_hash(self, content: str) -> str:
+        """
+        Compute a hash of the content.
+
+        Args:
+            content: Content to hash
+
+        Returns:
+            Hash of the content
+        """
+        return hashlib.sha256(content.encode()).hexdigest()
 
     def _get_content(self, doc_id: str, version: str) -> Optional[str]:
         """
@@ -260,12 +354,27 @@ class VersionManager:
         if not self.config.store_full_content:
             return None
 
-        try:
-            content_path = self._get_content_path(doc_id, version)
-            if os.path.exists(content_path):
-                with open(content_path) as f:
-                    return f.read()
+        doc_version = self._find_version(doc_id, version)
+        if doc_version is None:
             return None
+
+        try:
+            with self._lock:
+                db = self._connect(create=False)
+                if db is None:
+                    return None
+                row = db.execute(
+                    "SELECT compressed, data FROM blobs WHERE content_hash = ?",
+                    (doc_version.content_hash,),
+                ).fetchone()
+
+            if row is None:
+                return None
+
+            compressed, data = row
+            if compressed:
+                data = zlib.decompress(data)
+            return data.decode("utf-8")
         except Exception as e:
             error_details = {"doc_id": doc_id, "version": version}
             handle_error(
@@ -281,6 +390,22 @@ class VersionManager:
             )
             return None
 
+    def _find_version(self, doc_id: str, version: str) -> Optional[DocumentVersion]:
+        """
+        Find the latest entry of a version in a document's history.
+
+        Args:
+            doc_id: Document ID
+            version: Version string
+
+        Returns:
+            Document version, or None if not found
+        """
+        for doc_version in reversed(self._history(doc_id)):
+            if doc_version.version == version:
+                return doc_version
+        return None
+
     def detect_version(self, content: str) -> Optional[str]:
         """
         Detect version from content.
@@ -336,7 +461,7 @@ class VersionManager:
         content_hash = self._compute_content_hash(content)
 
         # Get existing versions for this document
-        doc_versions = self.versions.get(doc_id, [])
+        doc_versions = self._history(doc_id)
 
         # Check if this content already exists
         for existing in doc_versions:
@@ -362,31 +487,51 @@ class VersionManager:
             metadata=metadata or {},
         )
 
-        # Store content
-        self._store_content(doc_id, version, content)
-
         # Add to versions
-        if doc_id not in self.versions:
-            self.versions[doc_id] = []
-        self.versions[doc_id].append(doc_version)
+        doc_versions.append(doc_version)
 
         # Sort versions
-        self.versions[doc_id].sort(key=lambda v: v.timestamp)
+        doc_versions.sort(key=lambda v: v.timestamp)
 
         # Limit number of versions
-        if len(self.versions[doc_id]) > self.config.max_versions:
+        to_remove = []
+        if len(doc_versions) > self.config.max_versions:
             # Remove oldest versions
-            to_remove = self.versions[doc_id][: -self.config.max_versions]
-            self.versions[doc_id] = self.versions[doc_id][-self.config.max_versions :]
+            to_remove = doc_versions[: -self.config.max_versions]
+            del doc_versions[: -self.config.max_versions]
 
-            # Remove content files
-            for old_version in to_remove:
-                content_path = self._get_content_path(doc_id, old_version.version)
-                if os.path.exists(content_path):
-                    os.remove(content_path)
+        try:
+            with self._lock:
+                db = self._connect()
+                with db:
+                    # Store content
+                    if self.config.store_full_content:
+                        self._put_blob(db, content_hash, content)
+                    self._insert_version(db, doc_version)
+
+                    for old_version in to_remove:
+                        db.execute(
+                            "DELETE FROM versions WHERE id = ("
+                            "SELECT id FROM versions WHERE document_id = ? "
+                            "AND version = ? AND content_hash = ? ORDER BY id LIMIT 1)",
+                            (doc_id, old_version.version, old_version.content_hash),
+                        )
+                        self._release_blob(db, old_version.content_hash)
 
-        # Save versions
-        self._save_versions()
+            logger.debug(f"Stored content for {doc_id} version {version}")
+        except Exception as e:
+            error_details = {"doc_id": doc_id, "version": version}
+            handle_error(
+                e,
+                "VersionManager",
+                "add_version",
+                details=error_details,
+                level=ErrorLevel.ERROR,
+                category=ErrorCategory.RESOURCE,
+            )
+            logger.error(
+                f"Failed to store content for {doc_id} version {version}: {str(e)}"
+            )
 
         logger.info(f"Added version {version} for {doc_id}")
         return doc_version
@@ -401,7 +546,7 @@ class VersionManager:
         Returns:
             List of document versions
         """
-        return self.versions.get(doc_id, [])
+        return self._history(doc_id)
 
     def get_latest_version(self, doc_id: str) -> Optional[DocumentVersion]:
         """
@@ -441,6 +586,26 @@ class VersionManager:
             logger.warning("Cannot compare versions: store_full_content is disabled")
             return None
 
+        format = format or self.config.diff_format
+
+        # Diffs depend only on the two contents and the format
+        old_entry = self._find_version(doc_id, old_version)
+        new_entry = self._find_version(doc_id, new_version)
+        cache_key = None
+        if old_entry is not None and new_entry is not None:
+            cache_key = (
+                doc_id,
+                old_version,
+                new_version,
+                old_entry.content_hash,
+                new_entry.content_hash,
+                format,
+            )
+            cached = self._diff_cache.get(cache_key)
+            if cached is not None:
+                self._diff_cache.move_to_end(cache_key)
+                return cached.model_copy()
+
         # Get content for both versions
         old_content = self._get_content(doc_id, old_version)
         new_content = self._get_content(doc_id, new_version)
@@ -456,8 +621,6 @@ class VersionManager:
             change_type = VersionChangeType.MODIFIED
 
         # Generate diff
-        format = format or self.config.diff_format
-
         if format == VersionDiffFormat.UNIFIED:
             diff = difflib.unified_diff(
                 old_content.splitlines(),
@@ -517,7 +680,7 @@ class VersionManager:
             raise ValueError(f"Unsupported diff format: {format}")
 
         # Create diff object
-        return VersionDiff(
+        version_diff = VersionDiff(
             document_id=doc_id,
             old_version=old_version,
             new_version=new_version,
@@ -525,3 +688,10 @@ class VersionManager:
             diff_content=diff_content,
             metadata={},
         )
+
+        if cache_key is not None and self.config.diff_cache_size > 0:
+            self._diff_cache[cache_key] = version_diff.model_copy()
+            if len(self._diff_cache) > self.config.diff_cache_size:
+                self._diff_cache.popitem(last=False)
+
+        return version_diff
@@ -9,6 +9,7 @@ class ScrapingDashboard {
         this.isConnected = false;
         this.scrapingInProgress = false;
         this.currentScrapingId = null;
+        this.currentJobId = null;
         this.metrics = {
             pages_scraped: 0,
             successful_requests: 0,
@@ -176,10 +177,10 @@ class ScrapingDashboard {
 
             const result = await response.json();
 
-            if (result.status === 'success') {
-                this.currentScrapingId = result.scraping_id;
+            if (result.status === 'accepted') {
+                // The crawl runs as a background job; completion arrives over the websocket
+                this.currentJobId = result.job_id;
                 this.showSuccess('Scraping started successfully');
-                this.displayResults(result.results);
             } else {
                 throw new Error(result.message || 'Scraping failed');
             }
@@ -536,7 +537,7 @@ class ScrapingDashboard {
         if (this.ws && this.ws.readyState === WebSocket.OPEN) {
             this.ws.send(JSON.stringify({
                 type: 'stop_scraping',
-                scraping_id: this.currentScrapingId
+                job_id: this.currentJobId
             }));
         }
         
@@ -639,13 +640,20 @@ class ScrapingDashboard {
         }
     }
 
-    handleScrapingComplete(data) {
+    async handleScrapingComplete(data) {
         this.scrapingInProgress = false;
         this.updateUI(false);
         this.showSuccess('Scraping completed successfully');
-        
+
         if (data.results) {
             this.displayResults(data.results);
+        } else if (data.scraping_id) {
+            this.currentScrapingId = data.scraping_id;
+            const response = await fetch(`/api/scraping/results/${data.scraping_id}`);
+            if (response.ok) {
+                const stored = await response.json();
+                this.displayResults(stored.results);
+            }
         }
     }
 
@@ -0,0 +1,144 @@
+"""
+Tests for the HTTP-first hybrid backend.
+"""
+
+import pytest
+
+from src.backends.base import CrawlerBackend, CrawlResult
+from src.backends.hybrid_backend import (
+    RENDER_BROWSER,
+    RENDER_HTTP,
+    HybridBackend,
+    HybridConfig,
+    detect_client_rendered,
+    path_prefix,
+)
+from src.utils.url import create_url_info
+
+ARTICLE = "<p>" + "Static documentation explains the API in detail. " * 20 + "</p>"
+STATIC_PAGE = f"<html><head><title>Guide</title></head><body>{ARTICLE}</body></html>"
+SPA_SHELL = (
+    '<html><head><script src="/static/js/main.4f1c.js"></script></head>'
+    "<body><noscript>You need to enable JavaScript to run this app.</noscript>"
+    '<div id="root"></div></body></html>'
+)
+RENDERED_PAGE = f'<html><body><div id="root">{ARTICLE}</div></body></html>'
+
+
+class FakeBackend(CrawlerBackend):
+    """Backend serving fixed pages and recording the URLs it was asked for."""
+
+    def __init__(self, name, pages, fail=False):
+        super().__init__(name=name)
+        self.pages = pages
+        self.fail = fail
+        self.requests = []
+
+    async def crawl(self, url_info, config=None):
+        url = url_info.normalized_url
+        self.requests.append(url)
+        if self.fail:
+            return CrawlResult(url=url, content={}, metadata={}, status=500, error="x")
+        return CrawlResult(
+            url=url,
+            content={"html": self.pages(url)},
+            metadata={"content_type": "text/html; charset=utf-8"},
+            status=200,
+        )
+
+    async def validate(self, content):
+        return True
+
+    async def process(self, content):
+        return {}
+
+
+def site_page(url):
+    """Static pages under /guide/, client-rendered shells under /app/."""
+    return SPA_SHELL if "/app/" in url else STATIC_PAGE
+
+
+@pytest.mark.parametrize(
+    "html,reason",
+    [
+        (STATIC_PAGE, None),
+        (SPA_SHELL, "empty_mount_point"),
+        (
+            "<html><body><noscript>Please enable JavaScript</noscript>"
+            "<script>window.__NUXT__={}</script><main></main></body></html>",
+            "framework_bootstrap",
+        ),
+        (
+            "<html><head><style>" + "body{margin:0}" * 500 + "</style></head>"
+            "<body><span>Loading</span></body></html>",
+            "low_text_ratio",
+        ),
+        ("<html><body><p>Moved to the new docs.</p></body></html>", None),
+        (RENDERED_PAGE, None),
+    ],
+)
+def test_detect_client_rendered(html, reason):
+    """Test shell detection on static, shell and tiny pages."""
+    assert detect_client_rendered(html) == reason
+
+
+def test_path_prefix():
+    """Test that prefixes keep the host and leading directories only."""
+    assert path_prefix("https://d.io/api/v2/users/get", 2) == "d.io/api/v2/"
+    assert path_prefix("https://d.io/api/index.html", 2) == "d.io/api/"
+    assert path_prefix("https://d.io/index.html", 2) == "d.io/"
+
+
+@pytest.mark.asyncio
+async def test_escalates_shells_and_remembers_prefixes():
+    """Test escalation and that decided prefixes skip the other backend."""
+    http = FakeBackend("http", site_page)
+    browser = FakeBackend("browser", lambda url: RENDERED_PAGE)
+    hybrid = HybridBackend(http, browser, HybridConfig(remember_after=2))
+
+    for page in range(4):
+        url = f"https://docs.example.com/guide/page{page}"
+        result = await hybrid.crawl(create_url_info(url))
+        assert result.metadata["rendering"] == RENDER_HTTP
+        assert result.content["html"] == STATIC_PAGE
+    for page in range(4):
+        url = f"https://docs.example.com/app/page{page}"
+        result = await hybrid.crawl(create_url_info(url))
+        assert result.metadata["rendering"] == RENDER_BROWSER
+        assert result.content["html"] == RENDERED_PAGE
+
+    assert hybrid.get_prefix_decisions() == {
+        "docs.example.com/guide/": RENDER_HTTP,
+        "docs.example.com/app/": RENDER_BROWSER,
+    }
+    # Static pages never went to the browser; after two shells the app
+    # section skips the HTTP fetch
+    assert all("/app/" in url for url in browser.requests)
+    assert len(browser.requests) == 4
+    assert sum("/app/" in url for url in http.requests) == 2
+    assert hybrid.render_stats == {
+        "http": 4,
+        "escalated": 2,
+        "browser_direct": 2,
+        "false_escalations": 0,
+    }
+
+
+@pytest.mark.asyncio
+async def test_failed_or_pointless_rendering_keeps_http_result():
+    """Test fallbacks when the browser fails or finds no more text."""
+    url_info = create_url_info("https://docs.example.com/app/page")
+
+    broken = FakeBackend("browser", lambda url: RENDERED_PAGE, fail=True)
+    hybrid = HybridBackend(FakeBackend("http", site_page), broken)
+    result = await hybrid.crawl(url_info)
+    assert result.content["html"] == SPA_SHELL
+    assert result.metadata["render_reason"] == "empty_mount_point"
+
+    # The browser rendered nothing more, so the prefix counts as static
+    same = FakeBackend("browser", lambda url: SPA_SHELL)
+    hybrid = HybridBackend(FakeBackend("http", site_page), same)
+    result = await hybrid.crawl(url_info)
+    assert result.metadata["rendering"] == RENDER_BROWSER
+    assert hybrid.render_stats["false_escalations"] == 1
+    assert hybrid._prefixes["docs.example.com/app/"].outcome == RENDER_HTTP
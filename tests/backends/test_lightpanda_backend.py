@@ -2,13 +2,20 @@
 Tests for the Lightpanda backend.
 """
 
+import asyncio
 from unittest.mock import AsyncMock, MagicMock, patch
 
 import aiohttp
 import pytest
 
 from src.backends.base import CrawlResult
-from src.backends.lightpanda_backend import LightpandaBackend, LightpandaConfig
+from src.backends.cdp import CDPError
+from src.backends.lightpanda_backend import (
+    LightpandaBackend,
+    LightpandaConfig,
+    _BrowserEndpoint,
+)
+from src.benchmarking.fixture_browser import FixtureBrowser
 from src.processors.content.models import ProcessedContent
 from src.utils.url.info import URLInfo
 
@@ -224,21 +231,117 @@ async def test_close():
     backend = LightpandaBackend()
 
     # Mock the resources
-    ws = AsyncMock()
+    connection = AsyncMock()
     session = AsyncMock()
     process = MagicMock()
 
     # Set the mocked resources
-    backend._ws = ws
+    endpoint = _BrowserEndpoint("http://127.0.0.1:9222", process)
+    endpoint.connection = connection
+    backend._browsers = [endpoint]
     backend._session = session
-    backend._process = process
 
     # Call close
     await backend.close()
 
     # Verify resources were closed
-    ws.close.assert_called_once()
+    connection.close.assert_called_once()
     session.close.assert_called_once()
-    assert backend._ws is None
+    process.terminate.assert_called_once()
+    assert endpoint.connection is None
+    assert endpoint.process is None
+    assert backend._browsers == []
     assert backend._session is None
-    assert backend._process is None
+
+
+def _standin_config(*urls, **kwargs):
+    return LightpandaConfig(
+        cdp_urls=list(urls),
+        rate_limit=0,
+        wait_for_load=False,
+        timeout=5.0,
+        **kwargs,
+    )
+
+
+@pytest.mark.asyncio
+async def test_concurrent_targets_share_one_connection():
+    """Test that pages render concurrently and each gets its own content."""
+    async with FixtureBrowser(render_delay=0.2) as browser:
+        backend = LightpandaBackend(_standin_config(browser.url, concurrent_requests=8))
+        try:
+            urls = [f"https://example.com/page{n}" for n in range(8)]
+            results = await asyncio.gather(
+                *(backend._navigate_with_retry(url) for url in urls)
+            )
+        finally:
+            await backend.close()
+
+    for url, result in zip(urls, results):
+        assert result["success"]
+        assert f"<h1>{url}</h1>" in result["content"]
+    assert browser.peak_navigations == 8
+    assert browser.open_targets == set()
+
+
+@pytest.mark.asyncio
+async def test_targets_spread_over_browsers():
+    """Test that several browser endpoints share the pages."""
+    async with FixtureBrowser(render_delay=0.1) as first:
+        async with FixtureBrowser(render_delay=0.1) as second:
+            backend = LightpandaBackend(
+                _standin_config(first.url, second.url, concurrent_requests=4)
+            )
+            try:
+                results = await asyncio.gather(
+                    *(
+                        backend._navigate_with_retry(f"https://example.com/{n}")
+                        for n in range(8)
+                    )
+                )
+            finally:
+                await backend.close()
+
+    assert all(result["success"] for result in results)
+    assert first.navigations == second.navigations == 4
+
+
+@pytest.mark.asyncio
+async def test_cdp_error_response():
+    """Test that error responses fail only their own command."""
+    async with FixtureBrowser() as browser:
+        backend = LightpandaBackend(_standin_config(browser.url))
+        try:
+            await backend._connect_browser()
+            connection = backend._browsers[0].connection
+            with pytest.raises(CDPError, match="wasn't found"):
+                await connection.send("Browser.getVersion")
+            result = await connection.send("Target.createBrowserContext")
+            assert result["browserContextId"]
+        finally:
+            await backend.close()
+
+
+@pytest.mark.asyncio
+async def test_connect_failure_closes_open_connections():
+    """Test that connections already opened are closed when a browser fails."""
+    async with FixtureBrowser() as browser:
+        backend = LightpandaBackend(_standin_config(browser.url, "http://127.0.0.1:9"))
+        get_ws_endpoint = backend._get_ws_endpoint
+        connections = []
+
+        async def fail_second(endpoint):
+            if endpoint.url == "http://127.0.0.1:9":
+                connections.append(backend._browsers[0].connection)
+                raise RuntimeError("Failed to start Lightpanda browser")
+            return await get_ws_endpoint(endpoint)
+
+        try:
+            with patch.object(backend, "_get_ws_endpoint", fail_second):
+                with pytest.raises(RuntimeError):
+                    await backend._connect_browser()
+        finally:
+            await backend.close()
+
+    assert connections[0] is not None and connections[0].closed
+    assert backend._browsers == []
@@ -404,8 +404,8 @@ class TestPlaywrightBackend:
             mock_makedirs.assert_called_once_with("test_screenshots", exist_ok=True)
             page.screenshot.assert_called_once()
 
-            # Verify page was closed
-            page.close.assert_called_once()
+            # Verify page was returned to the pool instead of closed
+            page.close.assert_not_called()
 
             # Verify circuit breaker was updated
             playwright_backend.circuit_breaker.record_success.assert_called_once()
@@ -806,3 +806,104 @@ class TestPlaywrightBackend:
         assert playwright_backend._context is None
         assert len(playwright_backend._crawled_urls) == 0
         assert playwright_backend._last_request == 0.0
+
+
+class TestPagePoolAndBlocking:
+    """Tests for page pooling, request blocking and per-host rate limits."""
+
+    @pytest.mark.asyncio
+    async def test_pages_are_pooled_across_contexts(self, playwright_backend):
+        """Test per-context concurrency and page reuse."""
+        config = playwright_backend.config
+        config.browser_contexts = 2
+        config.pages_per_context = 2
+        config.concurrent_requests = 10
+        config.wait_for_load = False
+        config.screenshots = False
+        config.rate_limit = 0
+        playwright_backend._processing_semaphore = asyncio.Semaphore(10)
+        playwright_backend._ensure_browser = AsyncMock()
+
+        running = []
+        peak = 0
+
+        def new_page():
+            page = AsyncMock()
+
+            async def goto(url, **kwargs):
+                nonlocal peak
+                running.append(url)
+                peak = max(peak, len(running))
+                await asyncio.sleep(0.01)
+                running.remove(url)
+                return Mock(status=200, url=url, headers={})
+
+            page.goto.side_effect = goto
+            page.content.return_value = "<html></html>"
+            return page
+
+        def new_context(**kwargs):
+            context = AsyncMock()
+            context.new_page.side_effect = new_page
+            return context
+
+        playwright_backend._browser = AsyncMock()
+        playwright_backend._browser.new_context.side_effect = new_context
+        playwright_backend._context = await playwright_backend._new_context()
+
+        results = await asyncio.gather(
+            *(
+                playwright_backend._navigate_with_retry(f"https://example.com/{i}")
+                for i in range(12)
+            )
+        )
+
+        assert all(result["success"] for result in results)
+        assert peak == 4
+        assert playwright_backend._browser.new_context.call_count == 2
+        pool = playwright_backend._page_pool
+        assert sum(len(slot.idle) for slot in pool._slots) == 4
+        # Every context intercepts requests
+        for slot in pool._slots:
+            slot.context.route.assert_called_once()
+
+        await playwright_backend.close()
+        assert playwright_backend._page_pool is None
+
+    @pytest.mark.asyncio
+    async def test_route_blocks_non_essential_requests(self, playwright_backend):
+        """Test blocking by resource type, tracker host and third-party site."""
+
+        def request(url, resource_type, page_url="https://docs.example.com/"):
+            return Mock(url=url, resource_type=resource_type, frame=Mock(url=page_url))
+
+        block = playwright_backend._should_block
+        assert block(request("https://docs.example.com/logo.png", "image"))
+        assert block(request("https://www.google-analytics.com/a.js", "script"))
+        assert not block(request("https://docs.example.com/app.js", "script"))
+        assert not block(request("https://cdn.other.net/app.js", "script"))
+        assert not block(request("https://docs.example.com/", "document"))
+
+        playwright_backend.config.block_third_party = True
+        assert block(request("https://cdn.other.net/app.js", "script"))
+        assert not block(request("https://static.example.com/app.js", "script"))
+
+        route = AsyncMock()
+        route.request = request("https://docs.example.com/font.woff2", "font")
+        await playwright_backend._route_request(route)
+        route.abort.assert_called_once()
+        route.continue_.assert_not_called()
+        assert playwright_backend.blocked_requests == 1
+
+    @pytest.mark.asyncio
+    async def test_rate_limit_is_per_host(self, playwright_backend):
+        """Test that requests to other hosts do not wait for each other."""
+        await playwright_backend._wait_rate_limit("a.example.com")
+        start_time = time.time()
+        await asyncio.gather(
+            *(
+                playwright_backend._wait_rate_limit(f"host{i}.example.com")
+                for i in range(5)
+            )
+        )
+        assert time.time() - start_time < 0.1
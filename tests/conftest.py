@@ -1,3 +1,4 @@
+import os
 import platform
 from collections.abc import AsyncGenerator  # Added AsyncGenerator
 from typing import Optional
@@ -9,6 +10,9 @@ import pytest_asyncio
 if platform.system() != "Windows":
     pass
 
+# Keep API results in memory so parallel test workers do not share a database
+os.environ.setdefault("LIB2DOCSCRAPE_RESULTS_STORE", "memory")
+
 from bs4 import BeautifulSoup
 
 from src.backends.base import CrawlerBackend, CrawlResult
@@ -2,7 +2,9 @@
 Tests for the library version tracker.
 """
 
+import difflib
 import os
+import random
 import tempfile
 from datetime import datetime, timezone
 from unittest.mock import patch
@@ -12,6 +14,7 @@ import pytest
 from src.organizers.library_version_tracker import (
     LibraryRegistry,
     LibraryVersionTracker,
+    _fast_unified_diff,
 )
 from src.processors.content_processor import ProcessedContent
 
@@ -269,6 +272,81 @@ def test_tracker_compare_versions(tracker, processed_content):
     assert "title2" in diff.diff_details[processed_content.url]
 
 
+def _add_pages(tracker, version, pages):
+    """Add pages mapping URLs to formatted content for a version."""
+    for url, text in pages.items():
+        content = ProcessedContent()
+        content.url = url
+        content.title = url.rsplit("/", 1)[-1]
+        content.content = {"formatted_content": text}
+        tracker.add_documentation("test_lib", version, content)
+
+
+@pytest.mark.parametrize(
+    "options",
+    [
+        {},
+        {"diff_algorithm": "fast"},
+        {"max_workers": 2, "parallel_threshold": 1},
+    ],
+)
+def test_tracker_compare_versions_many_pages(registry, options):
+    """Test comparing versions across diff algorithms and the process pool."""
+    tracker = LibraryVersionTracker(registry, **options)
+    base = "\n".join(f"line {i}" for i in range(50))
+    pages1 = {f"https://docs.test-lib.com/page{i}": base for i in range(20)}
+    pages2 = dict(pages1)
+    pages2["https://docs.test-lib.com/page3"] = base.replace("line 10", "line ten")
+    pages2["https://docs.test-lib.com/page7"] = base + "\nline 50"
+    del pages2["https://docs.test-lib.com/page0"]
+    pages2["https://docs.test-lib.com/new"] = base
+    _add_pages(tracker, "1.0.0", pages1)
+    _add_pages(tracker, "2.0.0", pages2)
+
+    diff = tracker.compare_versions("test_lib", "1.0.0", "2.0.0")
+
+    assert sorted(diff.modified_pages) == [
+        "https://docs.test-lib.com/page3",
+        "https://docs.test-lib.com/page7",
+    ]
+    assert diff.added_pages == ["https://docs.test-lib.com/new"]
+    assert diff.removed_pages == ["https://docs.test-lib.com/page0"]
+    expected = list(
+        difflib.unified_diff(
+            base.splitlines(),
+            pages2["https://docs.test-lib.com/page3"].splitlines(),
+            fromfile="https://docs.test-lib.com/page3 (1.0.0)",
+            tofile="https://docs.test-lib.com/page3 (2.0.0)",
+            lineterm="",
+        )
+    )
+    assert diff.diff_details["https://docs.test-lib.com/page3"]["diff"] == expected
+
+
+def test_fast_diff_reconstructs_new_content():
+    """Test that fast diffs are valid unified diffs of random edits."""
+    rng = random.Random(3)
+    for _ in range(200):
+        old = [rng.choice("abcde") for _ in range(rng.randint(0, 20))]
+        new = list(old)
+        for _ in range(rng.randint(0, 4)):
+            position = rng.randint(0, len(new))
+            if rng.random() < 0.5 and position < len(new):
+                del new[position]
+            else:
+                new.insert(position, rng.choice("xyz"))
+
+        lines = _fast_unified_diff(old, new, "old", "new", n=len(old) + len(new))
+        if old == new:
+            assert lines == []
+            continue
+
+        # With full context the single hunk spells out both files
+        body = lines[3:]
+        assert [line[1:] for line in body if line[0] in " -"] == old
+        assert [line[1:] for line in body if line[0] in " +"] == new
+
+
 def test_tracker_is_newer_version():
     """Test checking if a version is newer."""
     tracker = LibraryVersionTracker()
@@ -0,0 +1,102 @@
+"""
+Tests for MinHash signatures and LSH-backed related-document lookups.
+"""
+
+import random
+
+from src.organizers.doc_organizer import (
+    DocumentMetadata,
+    DocumentOrganizer,
+    OrganizationConfig,
+)
+from src.organizers.minhash import LSHIndex, MinHasher, choose_rows_per_band
+
+
+def _jaccard(a: set[str], b: set[str]) -> float:
+    return len(a & b) / len(a | b)
+
+
+def test_minhash_estimates_jaccard_similarity():
+    """Test that signature agreement approximates Jaccard similarity."""
+    hasher = MinHasher(num_perm=256)
+    a = {f"term{i}" for i in range(100)}
+    b = {f"term{i}" for i in range(50, 150)}
+
+    sig_a = hasher.signature(a)
+    sig_b = hasher.signature(b)
+    estimate = sum(x == y for x, y in zip(sig_a, sig_b)) / 256
+
+    assert abs(estimate - _jaccard(a, b)) < 0.1
+    assert hasher.signature(set()) is None
+    assert MinHasher(num_perm=256).signature(a) == sig_a
+
+
+def test_choose_rows_per_band_trades_recall_for_selectivity():
+    """Test that a higher recall target picks fewer rows per band."""
+    strict = choose_rows_per_band(128, 0.5, 0.5)
+    lenient = choose_rows_per_band(128, 0.5, 0.999)
+
+    assert lenient < strict
+    assert choose_rows_per_band(128, 0.0, 0.95) is None
+
+
+def test_lsh_index_remove_and_replace():
+    """Test that replacing or removing a key updates its buckets."""
+    hasher = MinHasher(num_perm=16)
+    index = LSHIndex(num_perm=16, rows_per_band=2)
+    index.add("a", hasher.signature({"x", "y", "z"}))
+    index.add("b", hasher.signature({"x", "y", "z"}))
+
+    assert index.candidates("a") == {"b"}
+
+    index.add("b", hasher.signature({"p", "q", "r"}))
+    assert index.candidates("a") == set()
+
+    index.remove("b")
+    assert "b" not in index
+    assert len(index) == 1
+
+
+def _organizer_with_corpus(config: OrganizationConfig, size: int = 300):
+    rng = random.Random(7)
+    vocabulary = [f"word{i}" for i in range(2000)]
+    organizer = DocumentOrganizer(config=config)
+    base = rng.sample(vocabulary, 40)
+    for i in range(size):
+        if i < 10:
+            # Near duplicates of a shared base document
+            terms = base[: 40 - i] + rng.sample(vocabulary, i)
+        else:
+            terms = rng.sample(vocabulary, 40)
+        organizer.documents[f"doc{i}"] = DocumentMetadata(
+            title=f"Doc {i}", url=f"https://example.com/{i}", index_terms=terms
+        )
+    return organizer
+
+
+def test_related_documents_match_exact_scan():
+    """Test that LSH candidates re-ranked exactly match a full comparison."""
+    organizer = _organizer_with_corpus(OrganizationConfig(min_similarity_score=0.5))
+    related = organizer.get_related_documents("doc0")
+
+    source = set(organizer.documents["doc0"].index_terms)
+    expected = {
+        other_id: _jaccard(source, set(doc.index_terms))
+        for other_id, doc in organizer.documents.items()
+        if other_id != "doc0" and _jaccard(source, set(doc.index_terms)) >= 0.5
+    }
+
+    assert dict(related) == expected
+    scores = [score for _, score in related]
+    assert scores == sorted(scores, reverse=True)
+    assert len(organizer._lsh.candidates("doc0")) < len(organizer.documents) - 1
+
+
+def test_related_documents_zero_threshold_compares_everything():
+    """Test that a zero threshold falls back to comparing every document."""
+    organizer = _organizer_with_corpus(
+        OrganizationConfig(min_similarity_score=0.0), size=20
+    )
+
+    assert organizer._lsh is None
+    assert len(organizer.get_related_documents("doc5")) == 19
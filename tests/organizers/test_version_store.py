@@ -0,0 +1,158 @@
+"""
+Tests for the content-addressed document version store.
+"""
+
+from unittest.mock import patch
+
+from src.organizers.doc_organizer import (
+    DocumentOrganizer,
+    DocumentVersion,
+    OrganizationConfig,
+)
+from src.organizers.version_store import (
+    ChunkStore,
+    EncodedContent,
+    StoredContent,
+    decode,
+    manifest_hash,
+    release_manifest,
+)
+from src.processors.content.models import ProcessedContent
+
+
+def _page(url: str, body: str) -> ProcessedContent:
+    return ProcessedContent(
+        url=url,
+        title="Guide",
+        raw=f"<html><body>{body}</body></html>",
+        content={"formatted_content": body, "text": body},
+        structure=[{"type": "paragraph", "text": "intro"}],
+    )
+
+
+def _long_text(lines: int, marker: str = "") -> str:
+    return "".join(
+        f"line {i} of the guide {marker if i == 0 else ''}\n" for i in range(lines)
+    )
+
+
+def test_round_trip_preserves_values():
+    """Test that encoded content decodes to the original value."""
+    store = ChunkStore(target_chunk_size=256)
+    value = {
+        "title": "Guide",
+        "body": _long_text(200),
+        "nested": {"count": 3, "items": [1, 2, {"a": None}]},
+    }
+
+    encoded = EncodedContent(store)
+    manifest = encoded.encode(value)
+    encoded.commit()
+
+    assert decode(manifest, store) == value
+
+
+def test_edit_only_adds_nearby_chunks():
+    """Test that a small edit reuses the unchanged chunks of a long string."""
+    store = ChunkStore(target_chunk_size=256)
+    first = EncodedContent(store)
+    first.encode(_long_text(500))
+    first.commit()
+    chunks_before = len(store)
+
+    second = EncodedContent(store)
+    second.encode(_long_text(500, marker="edited"))
+    second.commit()
+
+    assert chunks_before > 10
+    assert len(store) - chunks_before <= 2
+
+
+def test_release_drops_unreferenced_chunks():
+    """Test that chunks are deleted once no manifest references them."""
+    store = ChunkStore()
+    manifests = []
+    for _ in range(2):
+        encoded = EncodedContent(store)
+        manifests.append(encoded.encode({"items": [1, 2, 3]}))
+        encoded.commit()
+
+    release_manifest(manifests[0], store)
+    assert len(store) == 1
+    release_manifest(manifests[1], store)
+    assert len(store) == 0
+
+
+def test_manifest_hash_ignores_excluded_fields():
+    """Test that excluded fields do not affect the version hash."""
+    store = ChunkStore()
+    a = EncodedContent(store).encode({"body": "x", "errors": ["one"]})
+    b = EncodedContent(store).encode({"body": "x", "errors": []})
+    c = EncodedContent(store).encode({"body": "y", "errors": []})
+
+    assert manifest_hash(a, exclude=("errors",)) == manifest_hash(
+        b, exclude=("errors",)
+    )
+    assert manifest_hash(a, exclude=("errors",)) != manifest_hash(
+        c, exclude=("errors",)
+    )
+
+
+def test_organizer_shares_chunks_across_versions_and_pages():
+    """Test that versions and pages reference shared chunks in one store."""
+    organizer = DocumentOrganizer(config=OrganizationConfig(max_versions_to_keep=2))
+    body = _long_text(400)
+
+    doc_id = organizer.add_document(_page("https://example.com/a", body))
+    single_page = organizer.chunk_store.stored_bytes
+    organizer.add_document(_page("https://example.com/b", body))
+    # Only the URL differs, and URLs are stored inline
+    assert organizer.chunk_store.stored_bytes == single_page
+
+    # Re-adding identical content does not create a version
+    organizer.add_document(_page("https://example.com/a", body))
+    assert len(organizer.documents[doc_id].versions) == 1
+
+    for marker in ("v2", "v3", "v4"):
+        organizer.add_document(_page("https://example.com/a", _long_text(400, marker)))
+
+    versions = organizer.get_document_versions(doc_id)
+    assert [v.version_id for v in versions] == ["v3", "v4"]
+    assert versions[-1].changes["content"]["formatted_content"] == _long_text(400, "v4")
+    assert versions[-1].changes["structure"] == [{"type": "paragraph", "text": "intro"}]
+    # Trimmed versions release their chunks
+    assert organizer.chunk_store.stored_bytes < 2 * single_page
+
+
+def test_inline_changes_still_supported():
+    """Test that versions built directly keep their inline changes."""
+    version = DocumentVersion(
+        version_id="1",
+        timestamp="2024-01-01T00:00:00",
+        hash="abc",
+        changes={"content": {"formatted_content": "text"}},
+    )
+
+    assert version.version_id == "v1"
+    assert version.changes["content"]["formatted_content"] == "text"
+
+
+def test_search_does_not_decode_stored_versions():
+    """Test that search matches the latest version without decoding it."""
+    organizer = DocumentOrganizer()
+    doc_id = organizer.add_document(_page("https://example.com/a", "install guide"))
+    organizer.add_document(_page("https://example.com/a", "upgrade notes here"))
+
+    with patch.object(
+        StoredContent, "__getitem__", side_effect=AssertionError("decoded")
+    ):
+        results = organizer.search("upgrade notes")
+        stale = organizer.search("install guide")
+
+    # Only the latest version's content is searched
+    assert not any(
+        "Content contains: install guide" in matches for _, _, matches in stale
+    )
+
+    assert results[0][0] == doc_id
+    assert "Content contains: upgrade notes" in results[0][2]
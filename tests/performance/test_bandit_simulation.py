@@ -0,0 +1,54 @@
+"""
+Tests for adaptive backend selection and its simulation harness.
+"""
+
+import pytest
+
+from src.benchmarking.bandit_simulation import BanditSimulation, SimulatedClock
+from src.performance.bandit import ThompsonSamplingPolicy, UCBPolicy
+
+
+@pytest.mark.asyncio
+async def test_bandits_recover_from_a_degraded_backend():
+    """Test that bandit policies beat the fixed score in the default scenario."""
+    simulation = BanditSimulation(requests=4000, interval=2.0)
+    results = {r.policy: r for r in await simulation.run()}
+
+    static = results["static"]
+    assert static.selections["http"] == 4000
+    for policy in ("thompson", "ucb"):
+        result = results[policy]
+        assert result.regret < static.regret / 2
+        assert result.best_choice_rate > static.best_choice_rate
+        assert result.selections["http"] > result.selections["crawl4ai"]
+    assert "| thompson |" in simulation.generate_report()
+
+
+@pytest.mark.parametrize(
+    "make_policy",
+    [
+        lambda clock: UCBPolicy(half_life=60, clock=clock),
+        lambda clock: ThompsonSamplingPolicy(half_life=60, clock=clock, seed=1),
+    ],
+)
+def test_old_observations_decay(make_policy):
+    """Test that a backend avoided after failures is tried again later."""
+    clock = SimulatedClock()
+    policy = make_policy(clock)
+    for _ in range(50):
+        policy.update("example.com", "http", False, 5.0)
+        policy.update("example.com", "playwright", True, 1.0)
+        clock.now += 1
+
+    picks = [policy.select("example.com", ["http", "playwright"]) for _ in range(50)]
+    assert picks.count("playwright") >= 45
+    assert policy.arm_statistics("example.com")["http"]["mean_reward"] == 0.0
+
+    # http has recovered; traffic keeps flowing one request per second
+    picks = []
+    for _ in range(60 * 20):
+        backend = policy.select("example.com", ["http", "playwright"])
+        picks.append(backend)
+        policy.update("example.com", backend, True, 0.2 if backend == "http" else 1.0)
+        clock.now += 1
+    assert picks[-100:].count("http") > 80
@@ -0,0 +1,81 @@
+"""
+Tests for the offline crawl benchmark harness.
+"""
+
+import json
+
+import aiohttp
+import pytest
+
+from src.benchmarking.crawl_benchmark import (
+    CrawlBenchmark,
+    FixtureSite,
+    FixtureSiteConfig,
+    percentile,
+)
+
+
+@pytest.mark.asyncio
+async def test_fixture_site_serves_offline():
+    """Test that the site is reachable under its host name and nothing else is."""
+    config = FixtureSiteConfig(pages=10, fan_out=3, error_rate=0.2, seed=1)
+    async with FixtureSite(config) as site:
+        assert site.max_depth == 2
+        async with site.client_session() as session:
+            async with session.get(site.start_url) as response:
+                html = await response.text()
+            assert response.status == 200
+            assert 'href="/docs/page1.html"' in html
+
+            error_page = site.page_path(min(site.error_pages))
+            async with session.get(site.base_url + error_page) as response:
+                assert response.status == 500
+
+            with pytest.raises(aiohttp.ClientError):
+                await session.get("http://example.org/")
+
+    # Pages are generated deterministically from the seed
+    assert FixtureSite(config).render_page(3) == site.render_page(3)
+
+
+def test_fixture_site_full_error_rate_spares_index():
+    """Test that an error rate of 1.0 fails every page but the index."""
+    site = FixtureSite(FixtureSiteConfig(pages=10, error_rate=1.0))
+
+    assert site.error_pages == set(range(1, 10))
+
+
+@pytest.mark.asyncio
+async def test_benchmark_crawls_site_and_compares_baseline(tmp_path):
+    """Test full crawls per concurrency level and baseline comparison."""
+    benchmark = CrawlBenchmark(
+        FixtureSiteConfig(pages=15, page_size=512, fan_out=4, latency=0.002),
+        concurrency_levels=[1, 2],
+    )
+    results = await benchmark.run()
+
+    assert [(r.backend, r.concurrency) for r in results] == [("http", 1), ("http", 2)]
+    for result in results:
+        assert result.pages_crawled == 15 and result.errors == 0
+        assert result.requests == 15
+        assert result.latency_p50_ms >= 2.0
+        assert result.latency_p50_ms <= result.latency_p95_ms <= result.latency_p99_ms
+        assert result.peak_rss_mb > 0 and result.pages_per_second > 0
+
+    path = tmp_path / "baseline.json"
+    benchmark.save_baseline(str(path))
+    baseline = json.loads(path.read_text())
+    assert benchmark.compare_to_baseline(baseline) == []
+
+    baseline["results"][0]["pages_per_second"] *= 10
+    regressions = benchmark.compare_to_baseline(baseline)
+    assert len(regressions) == 1 and "http x1 pages_per_second" in regressions[0]
+    assert "| http | 2 | 15 | 0 |" in benchmark.generate_report()
+
+
+def test_percentile_interpolates():
+    """Test percentiles between closest ranks."""
+    values = [float(v) for v in range(1, 101)]
+    assert percentile(values, 50) == pytest.approx(50.5)
+    assert percentile(values, 99) == pytest.approx(99.01)
+    assert percentile([], 95) == 0.0
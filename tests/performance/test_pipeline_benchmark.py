@@ -0,0 +1,73 @@
+"""
+Tests for the content pipeline benchmark runner.
+"""
+
+import json
+
+import pytest
+
+from src.benchmarking.pipeline_benchmark import (
+    PipelineBenchmark,
+    load_corpus,
+)
+
+
+def test_shipped_corpus_covers_doc_generators_and_sources():
+    """Test that the checked-in corpus loads with a content type per page."""
+    pages = {page.name: page.content_type for page in load_corpus()}
+
+    for name in (
+        "sphinx.html",
+        "mkdocs.html",
+        "docusaurus.html",
+        "rustdoc.html",
+        "javadoc.html",
+        "api_reference.html",
+    ):
+        assert pages[name] == "text/html"
+    assert pages["guide.md"] == "text/markdown"
+    assert pages["guide.rst"] == "text/x-rst"
+    assert pages["guide.adoc"] == "text/asciidoc"
+
+    only = load_corpus(names=["guide.md"])
+    assert [page.name for page in only] == ["guide.md"]
+
+
+@pytest.mark.asyncio
+async def test_benchmark_reports_stages_and_compares_baseline(tmp_path):
+    """Test per-stage timings and allocations, the report and the baseline."""
+    benchmark = PipelineBenchmark(
+        load_corpus(names=["sphinx.html", "guide.md"]), repeat=2
+    )
+    results = await benchmark.run()
+
+    stages = {(r.page, r.stage) for r in results}
+    assert ("sphinx.html", "handler") not in stages
+    assert {("guide.md", s) for s in ("detect", "handler", "process")} <= stages
+    assert {("sphinx.html", s) for s in ("process", "quality", "organize")} <= stages
+    for result in results:
+        assert 0 < result.min_ms <= result.median_ms
+    process = next(
+        r for r in results if r.page == "sphinx.html" and r.stage == "process"
+    )
+    assert process.format == "HTML" and process.peak_kb > 0
+
+    path = tmp_path / "baseline.json"
+    benchmark.save_baseline(str(path))
+    baseline = json.loads(path.read_text())
+    assert benchmark.compare_to_baseline(baseline, tolerance=100) == []
+
+    for entry in baseline["results"]:
+        if entry["page"] == "sphinx.html" and entry["stage"] == "process":
+            entry["median_ms"] /= 1000
+    regressions = benchmark.compare_to_baseline(baseline, tolerance=100)
+    assert len(regressions) == 1 and "sphinx.html process median_ms" in regressions[0]
+
+    report = benchmark.generate_report()
+    assert "| guide.md | Markdown |" in report and "| organize |" in report
+
+
+def test_benchmark_requires_pages():
+    """Test that an empty corpus is rejected."""
+    with pytest.raises(ValueError):
+        PipelineBenchmark([])
@@ -0,0 +1,123 @@
+"""
+Tests for the columnar crawl result exporter.
+"""
+
+import json
+import os
+
+import pytest
+
+from src.crawler.models import CrawlResult, CrawlStats, CrawlTarget, QualityIssue
+
+pa = pytest.importorskip("pyarrow")
+pq = pytest.importorskip("pyarrow.parquet")
+
+from src.storage.columnar import (  # noqa: E402
+    CrawlResultExporter,
+    export_crawl_result,
+    read_crawl_table,
+)
+
+
+def _page_result(i: int) -> CrawlResult:
+    url = f"https://docs.example.com/page{i}"
+    return CrawlResult(
+        target=CrawlTarget(url="https://docs.example.com/"),
+        stats=CrawlStats(),
+        documents=[
+            {
+                "url": url,
+                "title": f"Page {i}",
+                "content": f"Content of page {i}",
+                "doc_id": None,
+            }
+        ],
+        issues=[
+            QualityIssue(
+                type="content_length",
+                level="warning",
+                message="Short page",
+                location=url,
+                details={"length": i},
+            )
+        ]
+        if i % 2
+        else [],
+        metrics={url: {"processed_at": "2024-01-01T00:00:00", "word_count": i * 10}},
+    )
+
+
+@pytest.mark.parametrize("format", ["parquet", "arrow"])
+def test_incremental_export_round_trip(format, tmp_path):
+    """Test that per-page results are written in row groups and read back."""
+    output_dir = str(tmp_path / "crawl")
+    exporter = CrawlResultExporter(output_dir, format=format, row_group_size=25)
+    for i in range(100):
+        exporter.add_result(_page_result(i))
+    paths = exporter.close(target=CrawlTarget(url="https://docs.example.com/"))
+
+    assert exporter.row_counts == {"pages": 100, "issues": 50, "metrics": 200}
+    if format == "parquet":
+        assert pq.ParquetFile(paths["pages"]).num_row_groups == 4
+
+    pages = read_crawl_table(output_dir, "pages", columns=["url", "content_length"])
+    assert pages.column_names == ["url", "content_length"]
+    assert pages.num_rows == 100
+    assert pages.column("url")[42].as_py() == "https://docs.example.com/page42"
+
+    metrics = read_crawl_table(output_dir, "metrics").to_pylist()
+    word_count = [m for m in metrics if m["name"] == "word_count"][3]
+    assert word_count["value"] == 30.0 and word_count["text_value"] is None
+
+    issues = read_crawl_table(output_dir, "issues").to_pylist()
+    assert json.loads(issues[0]["details"]) == {"length": 1}
+
+    with open(paths["crawl"]) as f:
+        info = json.load(f)
+    assert info["target"]["url"] == "https://docs.example.com/"
+    assert info["row_counts"]["pages"] == 100
+
+
+def test_export_without_issues_keeps_schema(tmp_path):
+    """Test that empty tables are still written with their schema."""
+    paths = export_crawl_result(_page_result(0), str(tmp_path))
+
+    issues = pq.read_table(paths["issues"])
+    assert issues.num_rows == 0
+    assert "message" in issues.column_names
+    assert os.path.exists(paths["crawl"])
+
+
+def test_unsupported_format_rejected(tmp_path):
+    """Test that unknown export formats raise a ValueError."""
+    with pytest.raises(ValueError):
+        CrawlResultExporter(str(tmp_path), format="csv")
+
+
+@pytest.mark.asyncio
+async def test_failed_crawl_leaves_readable_tables(tmp_path, monkeypatch):
+    """Test that run_crawler closes the exporter when the crawl raises."""
+    from src.main import run_crawler
+
+    class FailingCrawler:
+        def __init__(self):
+            self.result_listeners = []
+
+        async def crawl(self, target):
+            for i in range(3):
+                for listener in self.result_listeners:
+                    listener(_page_result(i))
+            raise RuntimeError("connection lost")
+
+    monkeypatch.chdir(tmp_path)
+    crawler = FailingCrawler()
+    with pytest.raises(RuntimeError):
+        await run_crawler(
+            crawler, [CrawlTarget(url="https://docs.example.com/")], "parquet"
+        )
+
+    assert crawler.result_listeners == []
+    (output_dir,) = [p for p in os.listdir(tmp_path) if p.startswith("crawl_result_")]
+    assert read_crawl_table(output_dir, "pages").num_rows == 3
+    with open(os.path.join(output_dir, "crawl.json")) as f:
+        assert json.load(f)["stats"] is None
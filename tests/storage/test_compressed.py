@@ -8,11 +8,33 @@ import tempfile
 import pytest
 
 from src.storage.compressed.storage import (
+    ZSTD_AVAILABLE,
     CompressedStorage,
     CompressionConfig,
     CompressionFormat,
+    CompressionPreset,
 )
 
+requires_zstd = pytest.mark.skipif(
+    not ZSTD_AVAILABLE, reason="zstandard package not installed"
+)
+
+
+def _doc_pages(count: int) -> list[bytes]:
+    """Create small, similar documentation pages."""
+    return [
+        (
+            "<html><head><title>Library docs</title>"
+            '<link rel="stylesheet" href="/static/theme.css"></head>'
+            '<body><nav class="sidebar"><ul><li>Home</li><li>API</li>'
+            f"<li>Guides</li></ul></nav><main><h1>Function f{i}</h1>"
+            f"<p>Call f{i}(x) to transform x by {i * 7 % 13}.</p></main>"
+            "<footer>Copyright Example Project. Built with Sphinx.</footer>"
+            "</body></html>"
+        ).encode()
+        for i in range(count)
+    ]
+
 
 @pytest.fixture
 def temp_dir():
@@ -170,6 +192,8 @@ def test_different_compression_formats(temp_dir):
     for format in CompressionFormat:
         if format == CompressionFormat.NONE:
             continue
+        if format == CompressionFormat.ZSTD and not ZSTD_AVAILABLE:
+            continue
 
         # Create storage with this format
         config = CompressionConfig(format=format)
@@ -212,3 +236,185 @@ def test_load_nonexistent_file(storage, temp_dir):
     # Should raise FileNotFoundError
     with pytest.raises(FileNotFoundError):
         storage.load_json(file_path)
+
+
+def test_presets_select_per_format_levels():
+    """Test that presets override the configured levels per format."""
+    storage = CompressedStorage(
+        CompressionConfig(format=CompressionFormat.GZIP, preset=CompressionPreset.FAST)
+    )
+    assert storage.get_level() == 1
+    assert storage.get_level(CompressionFormat.LZMA) == 0
+
+    # Without a preset the configured levels are used
+    storage = CompressedStorage(CompressionConfig(format=CompressionFormat.LZMA))
+    assert storage.get_level() == storage.config.lzma_preset
+
+
+@requires_zstd
+def test_zstd_round_trip():
+    """Test compressing and decompressing with zstd."""
+    storage = CompressedStorage(
+        CompressionConfig(format=CompressionFormat.ZSTD, preset=CompressionPreset.MAX)
+    )
+    data = b"Hello, world!" * 1000
+
+    compressed, was_compressed = storage.compress_data(data)
+
+    assert was_compressed
+    assert len(compressed) < len(data)
+    assert storage.decompress_data(compressed) == data
+
+
+@requires_zstd
+def test_zstd_dictionary_improves_small_pages(temp_dir):
+    """Test that a trained dictionary compresses small similar pages better."""
+    pages = _doc_pages(600)
+    samples, test_pages = pages[:500], pages[500:]
+    config = CompressionConfig(
+        format=CompressionFormat.ZSTD, min_size_for_compression=0
+    )
+
+    plain = CompressedStorage(config)
+    plain_size = sum(len(plain.compress_data(page)[0]) for page in test_pages)
+
+    trained = CompressedStorage(config)
+    trained.train_dictionary(samples, dict_size=4096)
+    compressed = [trained.compress_data(page)[0] for page in test_pages]
+
+    assert sum(len(data) for data in compressed) < plain_size * 0.6
+
+    # A saved dictionary decompresses data from another instance
+    dictionary_path = os.path.join(temp_dir, "pages.dict")
+    trained.save_dictionary(dictionary_path)
+    loaded = CompressedStorage(
+        CompressionConfig(
+            format=CompressionFormat.ZSTD, zstd_dictionary_path=dictionary_path
+        )
+    )
+    assert loaded.dictionary == trained.dictionary
+    assert loaded.decompress_data(compressed[0]) == test_pages[0]
+
+
+@requires_zstd
+def test_zstd_data_requires_its_dictionary(temp_dir):
+    """Test that data written with another dictionary fails with a clear error."""
+    pages = _doc_pages(600)
+    storage = CompressedStorage(
+        CompressionConfig(format=CompressionFormat.ZSTD, min_size_for_compression=0)
+    )
+    storage.train_dictionary(pages[:300], dict_size=4096)
+    old_id = storage.dictionary_id
+    compressed = storage.compress_data(pages[500])[0]
+    path = os.path.join(temp_dir, "pages.ndjson.zstd")
+    storage.save_ndjson([{"page": 1}], path)
+
+    # Retraining replaces the dictionary the data was written with
+    storage.train_dictionary(pages[300:500], dict_size=2048)
+    assert storage.dictionary_id not in (0, old_id)
+    with pytest.raises(ValueError, match=f"dictionary {old_id}"):
+        storage.decompress_data(compressed)
+    with pytest.raises(ValueError, match=f"dictionary {old_id}"):
+        list(storage.iter_ndjson(path))
+
+
+@requires_zstd
+def test_compression_benchmark_reports_all_variants():
+    """Test that the benchmark measures formats, presets and dictionaries."""
+    from src.benchmarking.compression_benchmark import CompressionBenchmark
+
+    benchmark = CompressionBenchmark(_doc_pages(200), repeat=1)
+    results = benchmark.run(
+        formats=[CompressionFormat.ZLIB, CompressionFormat.ZSTD],
+        presets=[CompressionPreset.FAST],
+    )
+
+    assert [(r.format, r.dictionary) for r in results] == [
+        ("zlib", False),
+        ("zstd", False),
+        ("zstd", True),
+    ]
+    assert all(r.documents == 160 and r.ratio > 1 for r in results)
+    assert "| zstd | fast | 1 | yes |" in benchmark.generate_report()
+
+
+def _available_formats() -> list[CompressionFormat]:
+    return [
+        fmt
+        for fmt in CompressionFormat
+        if fmt != CompressionFormat.ZSTD or ZSTD_AVAILABLE
+    ]
+
+
+@pytest.mark.parametrize("format", _available_formats())
+def test_ndjson_stream_round_trip(format, temp_dir):
+    """Test streaming records through each compression format."""
+    storage = CompressedStorage(CompressionConfig(format=format))
+    records = ({"url": f"https://example.com/{i}", "n": i} for i in range(2000))
+    file_path = os.path.join(temp_dir, "results.ndjson")
+
+    assert storage.save_ndjson(records, file_path) == 2000
+
+    loaded = list(storage.iter_ndjson(file_path))
+    assert len(loaded) == 2000
+    assert loaded[1234] == {"url": "https://example.com/1234", "n": 1234}
+
+
+@pytest.mark.parametrize("format", _available_formats())
+def test_streamed_json_and_pickle_load(format, temp_dir):
+    """Test that streamed JSON and pickles load with the regular loaders."""
+    storage = CompressedStorage(CompressionConfig(format=format))
+    data = {"pages": [{"title": f"Page {i}"} for i in range(500)]}
+
+    json_path = os.path.join(temp_dir, "data.json")
+    storage.save_json_stream(data, json_path)
+    assert storage.load_json(json_path) == data
+
+    # Small pickles are compressed too, and still load
+    pickle_path = os.path.join(temp_dir, "small.pkl")
+    storage.save_pickle({"a": 1}, pickle_path)
+    assert storage.load_pickle(pickle_path) == {"a": 1}
+
+
+def test_chunked_container_random_access(storage, temp_dir):
+    """Test reading single records without decompressing the whole file."""
+    file_path = os.path.join(temp_dir, "results.chunks")
+    records = [{"id": i, "text": f"content {i} " * 20} for i in range(1000)]
+
+    assert storage.save_chunked(iter(records), file_path, chunk_size=4096) == 1000
+
+    with storage.open_chunked(file_path) as reader:
+        assert len(reader) == 1000
+        assert len(reader._chunks) > 10
+        assert reader[0] == records[0]
+        assert reader[537] == records[537]
+        assert reader[-1] == records[-1]
+        # Only the chunk holding the record was decompressed
+        assert len(reader._cached_lines) < 100
+        assert list(reader) == records
+        with pytest.raises(IndexError):
+            reader[1000]
+
+
+def test_chunked_container_rejects_other_files(storage, temp_dir):
+    """Test that opening a file that is not a container fails clearly."""
+    file_path = os.path.join(temp_dir, "plain.txt")
+    with open(file_path, "wb") as f:
+        f.write(b"not a container" * 10)
+
+    with pytest.raises(ValueError):
+        storage.open_chunked(file_path)
+
+
+def test_chunked_container_removed_when_writing_fails(storage, temp_dir):
+    """Test that an interrupted write leaves no container behind."""
+    file_path = os.path.join(temp_dir, "partial.chunks")
+
+    def records():
+        for i in range(500):
+            yield {"id": i, "text": f"content {i} " * 20}
+        raise RuntimeError("source failed")
+
+    with pytest.raises(RuntimeError):
+        storage.save_chunked(records(), file_path, chunk_size=4096)
+    assert not os.path.exists(file_path)
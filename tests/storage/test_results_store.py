@@ -0,0 +1,141 @@
+"""
+Tests for the scraping results stores.
+"""
+
+import pytest
+
+from src.storage.results import (
+    MemoryResultsStore,
+    ResultsStore,
+    SQLiteResultsStore,
+    create_results_store,
+)
+from src.storage.results import store as results_store
+
+
+@pytest.fixture(params=["memory", "sqlite"])
+def store(request, tmp_path):
+    """Create each kind of results store."""
+    if request.param == "memory":
+        store = MemoryResultsStore()
+    else:
+        store = SQLiteResultsStore(str(tmp_path / "results.db"))
+    yield store
+    store.close()
+
+
+def _result(url: str, pages: int) -> dict:
+    return {
+        "url": url,
+        "status": "completed",
+        "timestamp": "2024-01-01T00:00:00",
+        "results": [
+            {"url": f"{url}/{i}", "content": {"text": "x" * 50}} for i in range(pages)
+        ],
+    }
+
+
+def test_mapping_round_trip(store):
+    """Test that stored results read back unchanged."""
+    store["scrape_1"] = _result("https://a.example", 3)
+    store["scrape_2"] = {"url": "https://b.example", "status": "running"}
+
+    assert store["scrape_1"] == _result("https://a.example", 3)
+    assert store["scrape_2"] == {"url": "https://b.example", "status": "running"}
+    assert list(store) == ["scrape_1", "scrape_2"]
+    assert "scrape_2" in store and "missing" not in store
+    assert store.latest_id() == "scrape_2"
+
+    del store["scrape_1"]
+    assert len(store) == 1
+    with pytest.raises(KeyError):
+        store["scrape_1"]
+
+    store.clear()
+    assert len(store) == 0
+    assert store.latest_id() is None
+
+
+def test_cursor_pagination_and_projection(store):
+    """Test that listings page through results in insertion order."""
+    for i in range(7):
+        store[f"scrape_{i}"] = _result(f"https://{i}.example", i)
+    # Replacing a result keeps its position
+    store["scrape_2"] = _result("https://2.example", 9)
+
+    seen = []
+    cursor = None
+    while True:
+        page, cursor = store.list_summaries(
+            limit=3, cursor=cursor, fields=["id", "pages_processed"]
+        )
+        seen.extend(page)
+        if cursor is None:
+            break
+
+    assert [s["id"] for s in seen] == [f"scrape_{i}" for i in range(7)]
+    assert seen[2] == {"id": "scrape_2", "pages_processed": 9}
+
+
+def test_summary_and_lazy_pages(store):
+    """Test reading a result's summary and a range of its pages."""
+    store["scrape_1"] = _result("https://a.example", 10)
+
+    summary = store.get_summary("scrape_1")
+    assert "results" not in summary
+    assert summary["pages_processed"] == 10
+    assert summary["url"] == "https://a.example"
+
+    pages = list(store.iter_pages("scrape_1", offset=4, limit=3))
+    assert [p["url"] for p in pages] == [f"https://a.example/{i}" for i in (4, 5, 6)]
+    assert store.get_summary("missing") is None
+    assert list(store.iter_pages("missing")) == []
+
+
+def test_sqlite_pages_read_in_batches(tmp_path, monkeypatch):
+    """Test that page iteration queries one bounded batch at a time."""
+    monkeypatch.setattr(results_store, "PAGE_BATCH_SIZE", 4)
+    store = SQLiteResultsStore(str(tmp_path / "results.db"))
+    store["scrape_1"] = _result("https://a.example", 10)
+    queries = []
+    store._connect().set_trace_callback(queries.append)
+
+    pages = store.iter_pages("scrape_1", offset=1)
+    assert next(pages)["url"] == "https://a.example/1"
+    page_queries = [q for q in queries if "FROM pages" in q]
+    assert len(page_queries) == 1
+
+    rest = [page["url"] for page in pages]
+    assert rest == [f"https://a.example/{i}" for i in range(2, 10)]
+    assert len([q for q in queries if "FROM pages" in q]) == 3
+    assert [
+        page["url"] for page in store.iter_pages("scrape_1", offset=3, limit=5)
+    ] == [f"https://a.example/{i}" for i in range(3, 8)]
+    assert store["scrape_1"]["results"][9]["url"] == "https://a.example/9"
+    store.close()
+
+
+def test_sqlite_store_shared_between_instances(tmp_path):
+    """Test that results persist and are visible to other store instances."""
+    db_path = str(tmp_path / "shared.db")
+    writer = create_results_store(f"sqlite:///{db_path}")
+    reader = create_results_store(db_path)
+
+    writer["scrape_1"] = _result("https://a.example", 2)
+
+    assert isinstance(reader, SQLiteResultsStore)
+    assert reader["scrape_1"]["results"][1]["url"] == "https://a.example/1"
+    writer.close()
+    reader.close()
+    assert isinstance(create_results_store("memory"), MemoryResultsStore)
+
+
+def test_incomplete_store_cannot_be_created():
+    """Test that a store without the listing methods fails at instantiation."""
+
+    class MappingOnlyStore(ResultsStore):
+        # Defines the mapping methods but none of the listing methods
+        __getitem__ = __setitem__ = __delitem__ = __iter__ = __len__ = None
+
+    with pytest.raises(TypeError, match="list_summaries"):
+        MappingOnlyStore()
@@ -0,0 +1,192 @@
+"""Tests for analytics event logging, rollups and bounded counters."""
+
+import json
+from datetime import datetime, timedelta
+
+from src.analytics.counters import DecayedCounter, RollingCounter
+from src.analytics.event_log import EventLog
+from src.analytics.search_analytics import SearchAnalytics
+from src.analytics.trending_tracker import TrendingLibrariesTracker
+
+
+def test_event_log_batches_appends(tmp_path):
+    log = EventLog(str(tmp_path / "events.json"), batch_size=3, flush_interval=60)
+
+    log.append({"n": 1})
+    log.append({"n": 2})
+    assert not log.log_path.exists()
+
+    log.append({"n": 3})
+    lines = log.log_path.read_text().splitlines()
+    assert [json.loads(line)["n"] for line in lines] == [1, 2, 3]
+
+
+def test_event_log_compaction_truncates_log(tmp_path):
+    log = EventLog(str(tmp_path / "events.json"), batch_size=1, compact_threshold=2)
+
+    log.append({"n": 1})
+    assert not log.needs_compaction
+    log.append({"n": 2})
+    assert log.needs_compaction
+
+    log.compact({"state": 2})
+    snapshot, events = EventLog(str(tmp_path / "events.json")).load()
+    assert snapshot == {"state": 2}
+    assert events == []
+
+
+def test_event_log_skips_torn_tail(tmp_path):
+    log = EventLog(str(tmp_path / "events.json"), batch_size=1)
+    log.append({"n": 1})
+    with open(log.log_path, "a") as f:
+        f.write('{"n": ')
+
+    _, events = log.load()
+    assert events == [{"n": 1}]
+
+
+def test_search_analytics_does_not_rewrite_history(tmp_path):
+    data_file = tmp_path / "analytics.json"
+    analytics = SearchAnalytics(str(data_file), batch_size=1)
+
+    for i in range(5):
+        analytics.record_query(f"query {i}", results_count=i)
+
+    # Events only go to the append-only log until compaction
+    assert not data_file.exists()
+    assert len(analytics._event_log.log_path.read_text().splitlines()) == 5
+
+
+def test_search_analytics_round_trip(tmp_path):
+    data_file = str(tmp_path / "analytics.json")
+    analytics = SearchAnalytics(data_file, compact_threshold=4)
+    analytics.record_query("http client", results_count=5, filters={"lang": "py"})
+    analytics.record_query("http client", results_count=3)
+    analytics.record_query("missing thing", results_count=0)
+    analytics.record_click_through("http client", {"title": "requests"}, position=1)
+    analytics.record_query("web framework", results_count=2)  # triggers compaction
+    analytics.record_query("web framework", results_count=4)
+    analytics.flush()
+
+    reloaded = SearchAnalytics(data_file)
+    insights = reloaded.get_insights()
+
+    assert insights["total_queries"] == 5
+    assert insights["unique_queries"] == 3
+    assert insights["popular_queries"][0]["count"] == 2
+    assert insights["zero_result_queries"]["count"] == 1
+    assert insights["zero_result_queries"]["sample_queries"] == ["missing thing"]
+    assert insights["filter_usage"]["queries_with_filters"] == 1
+    assert insights["query_length_stats"]["multi_word_queries"] == 5
+
+    performance = reloaded.get_query_performance("http client")
+    assert performance["total_searches"] == 2
+    assert performance["min_results"] == 3
+    assert performance["max_results"] == 5
+    assert performance["click_through_rate"] == 0.5
+
+
+def test_search_analytics_loads_legacy_format(tmp_path):
+    data_file = tmp_path / "analytics.json"
+    timestamp = datetime.now().isoformat()
+    data_file.write_text(
+        json.dumps(
+            {
+                "queries": [
+                    {
+                        "query": "legacy query",
+                        "results_count": 0,
+                        "timestamp": timestamp,
+                        "user_id": None,
+                        "filters": {},
+                    }
+                ],
+                "zero_result_queries": [],
+            }
+        )
+    )
+
+    analytics = SearchAnalytics(str(data_file))
+
+    assert analytics.get_insights()["total_queries"] == 1
+    assert len(analytics.zero_result_queries) == 1
+
+
+def test_search_analytics_insights_exclude_old_buckets():
+    analytics = SearchAnalytics()
+    analytics.record_query("old", 1, timestamp=datetime.now() - timedelta(days=40))
+    analytics.record_query("new", 1)
+
+    insights = analytics.get_insights(period_days=30)
+
+    assert insights["total_queries"] == 1
+    assert insights["popular_queries"][0]["query"] == "new"
+
+
+def test_trending_tracker_round_trip(tmp_path):
+    data_file = str(tmp_path / "trending.json")
+    tracker = TrendingLibrariesTracker(data_file, compact_threshold=3)
+    tracker.record_search("requests")
+    tracker.record_download("requests")
+    tracker.record_view("fastapi")  # triggers compaction
+    tracker.record_rating("requests", 5)
+    tracker.flush()
+
+    reloaded = TrendingLibrariesTracker(data_file)
+    trending = reloaded.get_trending_libraries(period="day")
+
+    assert trending[0]["library"] == "requests"
+    assert trending[0]["interactions"] == {"searches": 1, "views": 0, "downloads": 1}
+    assert reloaded.get_library_analytics("requests")["average_rating"] == 5
+
+
+def test_trending_tracker_ignores_interactions_outside_period():
+    tracker = TrendingLibrariesTracker()
+    tracker.record_download("old", timestamp=datetime.now() - timedelta(days=3))
+    tracker.record_search("new")
+
+    trending = tracker.get_trending_libraries(period="day")
+
+    assert [entry["library"] for entry in trending] == ["new"]
+    assert tracker.get_library_analytics("old")["total_downloads"] == 1
+
+
+def test_rolling_counter_drops_slots_outside_window():
+    counter = RollingCounter(num_slots=3, slot_seconds=10)
+    counter.add(5)
+    counter.add(15, count=2)
+    counter.add(25, count=3)
+
+    assert counter.total(now=25, num_slots=3) == 6
+    assert counter.total(now=25, num_slots=1) == 3
+
+    # Advancing past the window recycles the oldest slot
+    counter.add(35)
+    assert counter.total(now=35, num_slots=3) == 6
+    # Events older than the window are ignored
+    counter.add(0, count=100)
+    assert counter.total(now=35, num_slots=3) == 6
+
+
+def test_decayed_counter_halves_per_half_life():
+    counter = DecayedCounter(half_life=10)
+    counter.add(0, weight=4)
+    counter.add(10, weight=2)
+
+    assert counter.value_at(10) == 4
+    # Out-of-order contributions are decayed to the latest update
+    counter.add(0, weight=4)
+    assert counter.value_at(20) == 3
+
+
+def test_trending_tracker_memory_is_bounded():
+    tracker = TrendingLibrariesTracker()
+    start = datetime.now() - timedelta(days=60)
+    for hour in range(60 * 24):
+        tracker.record_search("requests", timestamp=start + timedelta(hours=hour))
+
+    activity = tracker.activity["requests"]
+    assert len(activity.hourly["searches"].counts) == 25
+    assert len(activity.daily["searches"].counts) == 31
+    assert tracker.get_library_analytics("requests")["total_searches"] == 60 * 24
+    assert tracker.get_trending_libraries("day")[0]["interactions"]["searches"] >= 24
@@ -7,6 +7,7 @@ backend based on resource and compute performance.
 """
 
 import asyncio
+import json
 import tempfile
 from pathlib import Path
 from unittest.mock import MagicMock, patch
@@ -276,9 +277,10 @@ class TestBackendPerformanceTracker:
         tracker = BackendPerformanceTracker(storage_path=temp_storage_path)
 
         # Mock system resource monitoring
-        with patch("src.performance.backend_tracker.PSUTIL_AVAILABLE", True), patch(
-            "psutil.Process"
-        ) as mock_process_class:
+        with (
+            patch("src.performance.backend_tracker.PSUTIL_AVAILABLE", True),
+            patch("psutil.Process") as mock_process_class,
+        ):
             # Create mock process instance
             mock_process = MagicMock()
             mock_process_class.return_value = mock_process
@@ -313,3 +315,135 @@ class TestBackendPerformanceTracker:
             assert metrics["response_time"] >= 0.1
             assert metrics["memory_usage"] == 10.0  # 60MB - 50MB = 10MB
             assert metrics["cpu_usage"] == 15.5
+
+
+class TestStreamingStatistics:
+    """Test suite for the tracker's streaming aggregates and persistence."""
+
+    @staticmethod
+    def _metrics(response_time, success=True, timestamp=1640995200.0):
+        return {
+            "response_time": response_time,
+            "memory_usage": 10.0,
+            "cpu_usage": 5.0,
+            "success": success,
+            "content_size": 512,
+            "timestamp": timestamp,
+        }
+
+    def test_tdigest_quantiles_are_accurate_in_bounded_memory(self):
+        """Test t-digest quantiles against exact values of a skewed stream."""
+        import bisect
+        import random
+
+        from src.performance.streaming import TDigest
+
+        rng = random.Random(7)
+        values = [rng.lognormvariate(0, 1) for _ in range(50000)]
+        digest = TDigest(compression=100)
+        for value in values:
+            digest.add(value)
+
+        assert digest.centroid_count() <= 100
+        values.sort()
+        for q in (0.01, 0.5, 0.9, 0.99, 0.999):
+            rank = bisect.bisect(values, digest.quantile(q)) / len(values)
+            assert rank == pytest.approx(q, abs=0.002)
+        assert digest.quantile(0) == values[0]
+        assert digest.quantile(1) == values[-1]
+
+        restored = TDigest.from_dict(digest.to_dict())
+        assert restored.quantile(0.99) == digest.quantile(0.99)
+
+    @pytest.mark.asyncio
+    async def test_window_bounds_history_and_averages(self, tmp_path):
+        """Test that averages cover the window and EWMA tracks recent samples."""
+        from src.performance.backend_tracker import BackendPerformanceTracker
+
+        tracker = BackendPerformanceTracker(
+            storage_path=tmp_path / "perf.json", history_size=10, ewma_alpha=0.5
+        )
+        for i in range(25):
+            await tracker.record_performance(
+                "http", "example.com", self._metrics(float(i), success=i % 5 != 0)
+            )
+
+        data = tracker.domain_performance["example.com"]["http"]
+        assert len(data["history"]) == 10
+        assert data["total_requests"] == 25
+        assert data["average_response_time"] == pytest.approx(19.5)
+        assert data["success_rate"] == pytest.approx(0.8)
+        assert 22.0 < data["ewma_response_time"] < 24.0
+
+        quantiles = tracker.get_response_time_quantiles("example.com", "http")
+        assert quantiles[0.5] == pytest.approx(12.0, abs=1.0)
+        assert tracker.get_response_time_quantiles("example.com", "other") == {}
+
+    @pytest.mark.asyncio
+    async def test_incremental_persistence_appends_changed_pairs(self, tmp_path):
+        """Test that saves after the first append to the journal only."""
+        from src.performance.backend_tracker import BackendPerformanceTracker
+
+        path = tmp_path / "perf.json"
+        tracker = BackendPerformanceTracker(storage_path=path, compact_after=3)
+        await tracker.record_performance("http", "a.com", self._metrics(1.0))
+        await tracker.record_performance("http", "b.com", self._metrics(2.0))
+        await tracker.save_performance_data()
+        assert not tracker.journal_path.exists()
+
+        snapshot = path.read_text()
+        await tracker.record_performance("http", "a.com", self._metrics(3.0))
+        await tracker.save_performance_data()
+        await tracker.save_performance_data()
+        assert path.read_text() == snapshot
+        assert len(tracker.journal_path.read_text().splitlines()) == 1
+
+        loaded = BackendPerformanceTracker(storage_path=path)
+        await loaded.load_performance_data()
+        data = loaded.domain_performance["a.com"]["http"]
+        assert data["total_requests"] == 2
+        assert data["average_response_time"] == pytest.approx(2.0)
+        assert loaded.get_response_time_quantiles("a.com", "http", (1.0,)) == {1.0: 3.0}
+
+        # Growing the journal past compact_after rewrites the snapshot
+        for domain in ("a.com", "b.com", "c.com"):
+            await tracker.record_performance("http", domain, self._metrics(4.0))
+        await tracker.save_performance_data()
+        assert not tracker.journal_path.exists()
+        assert set(json.loads(path.read_text())) == {"a.com", "b.com", "c.com"}
+
+    @pytest.mark.asyncio
+    async def test_journal_holds_only_new_samples(self, tmp_path):
+        """Test that journal entries do not repeat the window of a pair."""
+        from src.performance.backend_tracker import BackendPerformanceTracker
+
+        path = tmp_path / "perf.json"
+        tracker = BackendPerformanceTracker(storage_path=path)
+        for i in range(300):
+            await tracker.record_performance(
+                "http",
+                "a.com",
+                self._metrics(float(i % 7), i % 3 != 0, timestamp=1000.0 + i),
+            )
+            await tracker.save_performance_data()
+
+        # One sample per entry, not the whole window
+        entries = tracker.journal_path.read_text().splitlines()
+        assert len(entries) == 299
+        assert max(len(entry) for entry in entries) < 500
+
+        # Dropping old samples replaces the window, which is journaled whole
+        await tracker.cleanup_old_data(current_time=1000.0 + 30 * 86400 + 150)
+        await tracker.record_performance("http", "a.com", self._metrics(1.0))
+        await tracker.save_performance_data()
+
+        loaded = BackendPerformanceTracker(storage_path=path)
+        await loaded.load_performance_data()
+        expected = tracker.domain_performance["a.com"]["http"]
+        data = loaded.domain_performance["a.com"]["http"]
+        assert list(data["history"]) == list(expected["history"])
+        for field in ("total_requests", "average_response_time", "success_rate"):
+            assert data[field] == pytest.approx(expected[field])
+        assert data["ewma_response_time"] == pytest.approx(
+            expected["ewma_response_time"]
+        )
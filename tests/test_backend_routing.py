@@ -0,0 +1,83 @@
+"""
+Tests for the precompiled backend routing table.
+"""
+
+from unittest.mock import AsyncMock
+
+import pytest
+
+from src.backends.routing import RoutingTable
+from src.backends.selector import BackendCriteria, BackendSelector
+
+
+def _criteria(priority, **kwargs):
+    kwargs.setdefault("content_types", ["text/html"])
+    kwargs.setdefault("url_patterns", ["*"])
+    return BackendCriteria(priority=priority, **kwargs)
+
+
+def test_routes_by_scheme_host_path_and_pattern():
+    """Test that the best matching route wins for each kind of criterion."""
+    table = RoutingTable(
+        {
+            "fallback": _criteria(0),
+            "files": _criteria(1, schemes=["file"]),
+            "docs": _criteria(2, domains=["docs.example.com"]),
+            "api": _criteria(3, domains=["docs.example.com"], paths=["/api"]),
+            "wiki": _criteria(2, url_patterns=["*.wiki.org"]),
+            "json": _criteria(5, content_types=["application/*"]),
+        }
+    )
+
+    assert table.select("https://docs.example.com/api/v1") == "api"
+    assert table.select("https://docs.example.com/guide") == "docs"
+    assert table.select("https://docs.example.com:8443/guide") == "docs"
+    assert table.select("https://en.wiki.org/page") == "wiki"
+    assert table.select("file:///tmp/index.html") == "files"
+    assert table.select("https://example.com/") == "fallback"
+    assert table.select("https://example.com/", "application/json") == "json"
+    assert table.select("https://example.com/", "image/png") is None
+    # XML falls back to the best instantiated backend
+    assert table.select("https://example.com/", "text/xml", {"docs", "files"}) == (
+        "docs"
+    )
+
+
+def test_only_path_independent_decisions_are_cached():
+    """Test that the decision cache never answers for a different path."""
+    table = RoutingTable(
+        {
+            "host": _criteria(1, domains=["example.com"]),
+            "blog": _criteria(2, domains=["example.com"], paths=["/blog"]),
+        }
+    )
+
+    assert table.select("https://example.com/blog/post") == "blog"
+    assert table.select("https://example.com/about") == "host"
+    assert table.select("https://example.com/blog/other") == "blog"
+
+    assert table.select("https://other.com/") is None
+    assert ("https", "other.com", None) in table._decisions
+    assert ("https", "example.com", None) not in table._decisions
+
+
+@pytest.mark.asyncio
+async def test_selector_recompiles_after_registration_changes():
+    """Test that registering, replacing and removing criteria take effect."""
+    selector = BackendSelector()
+    low, high = AsyncMock(), AsyncMock()
+    selector.register_backend("low", low, _criteria(1))
+    assert selector.select_backend_for_url("https://example.com/") is low
+
+    selector.register_backend("high", high, _criteria(2))
+    assert selector.select_backend_for_url("https://example.com/") is high
+
+    selector.register_backend("high", high, _criteria(0))
+    assert selector.select_backend_for_url("https://example.com/") is low
+
+    del selector.criteria["low"]
+    await selector.unregister_backend("low")
+    assert selector.select_backend_for_url("https://example.com/") is high
+
+    selector.criteria = {}
+    assert selector.select_backend_for_url("https://example.com/") is None
@@ -362,3 +362,42 @@ class TestBackendSelectorIntegration:
 
             # Should fallback gracefully
             assert backend is not None
+
+    @pytest.mark.asyncio
+    async def test_policy_explores_registered_backends(
+        self, temp_storage_path, default_criteria
+    ):
+        """Test that a tracker policy chooses among the registered backends."""
+        from src.performance.bandit import UCBPolicy
+
+        tracker = BackendPerformanceTracker(
+            storage_path=temp_storage_path, policy=UCBPolicy()
+        )
+        selector = BackendSelector()
+        selector.performance_tracker = tracker
+        for name in ("backend_a", "backend_b"):
+            backend = MagicMock(spec=CrawlerBackend)
+            backend.name = name
+            selector.register_backend(name, backend, default_criteria)
+
+        chosen = []
+        for _ in range(2):
+            backend = await selector.get_backend_with_performance(
+                "https://policy-test.com/docs"
+            )
+            chosen.append(backend.name)
+            await tracker.record_performance(
+                backend.name,
+                "policy-test.com",
+                {
+                    "response_time": 0.5,
+                    "memory_usage": 10.0,
+                    "cpu_usage": 5.0,
+                    "success": True,
+                    "content_size": 1024,
+                    "timestamp": 1640995200.0,
+                },
+            )
+
+        # Each backend is tried once before any is exploited
+        assert sorted(chosen) == ["backend_a", "backend_b"]
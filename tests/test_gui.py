@@ -1,10 +1,11 @@
+import time
 from unittest.mock import AsyncMock, patch
 
 import pytest
 from fastapi.testclient import TestClient
 
 from src.backends.base import CrawlResult
-from src.main import ConnectionManager, app
+from src.main import ConnectionManager, app, scraping_results_storage
 
 
 @pytest.fixture
@@ -42,13 +43,23 @@ def test_crawl_request(client):
 
         mock_crawl.side_effect = mock_side_effect
 
-        response = client.post("/crawl", json={"url": test_url})
-        assert response.status_code == 200
-        response_json = response.json()
-        assert response_json["status"] == "success"
-        assert len(response_json["results"]) == 1
-        assert response_json["results"][0]["url"] == test_url
-        assert response_json["results"][0]["status"] == 200
+        # Keep one event loop alive so the background crawl job can finish
+        with client:
+            response = client.post("/crawl", json={"url": test_url})
+            assert response.status_code == 202
+
+            job_id = response.json()["job_id"]
+            for _ in range(500):
+                status = client.get(f"/api/libraries/operation/{job_id}").json()
+                if status["status"] == "completed":
+                    break
+                time.sleep(0.01)
+
+        assert status["status"] == "completed"
+        result = scraping_results_storage[status["result"]["scraping_id"]]
+        assert len(result["results"]) == 1
+        assert result["results"][0]["url"] == test_url
+        assert result["results"][0]["status"] == 200
 
 
 def test_connection_manager():
@@ -82,6 +82,18 @@ def test_download_results_no_results():
     assert "No scraping results available" in response.json()["detail"]
 
 
+def test_download_results_json_streams_all_results():
+    """Test that the JSON download contains every stored result."""
+    scraping_results_storage["scrape_1"] = {"url": "https://example.com", "results": []}
+    scraping_results_storage["scrape_2"] = {"url": "https://example.org", "results": []}
+
+    response = client.get("/api/scraping/download/json")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/json"
+    assert response.json() == scraping_results_storage
+
+
 def test_libraries_route():
     """Test the libraries route returns HTML."""
     response = client.get("/libraries")
@@ -2,6 +2,8 @@
 Tests for the main application API endpoints.
 """
 
+import asyncio
+import time
 from datetime import datetime
 from unittest.mock import AsyncMock, MagicMock, patch
 
@@ -71,19 +73,42 @@ def test_store_scraping_results():
     assert response.json()["scraping_id"] in scraping_results_storage
 
 
+def _wait_for_job(client, job_id, timeout=5.0):
+    """Poll the operation status route until a crawl job has finished."""
+    deadline = time.monotonic() + timeout
+    while True:
+        status = client.get(f"/api/libraries/operation/{job_id}").json()
+        if status["status"] not in ("pending", "running"):
+            return status
+        assert time.monotonic() < deadline, f"job still {status['status']}"
+        time.sleep(0.01)
+
+
 @patch("src.main.Crawl4AIBackend")
 def test_start_crawl_success(mock_backend_class, mock_backend):
-    """Test starting a crawl successfully."""
+    """Test that a crawl is accepted at once and completes in the background."""
     mock_backend_class.return_value = mock_backend
 
-    response = client.post(
-        "/crawl", json={"url": "https://example.com", "backend": "crawl4ai"}
-    )
-
-    assert response.status_code == 200
-    assert response.json()["status"] == "success"
-    assert "scraping_id" in response.json()
-    assert "results" in response.json()
+    # Keep one event loop alive across requests so the job workers keep running
+    with TestClient(app) as job_client:
+        response = job_client.post(
+            "/crawl", json={"url": "https://example.com", "backend": "crawl4ai"}
+        )
+
+        assert response.status_code == 202
+        assert response.json()["status"] == "accepted"
+        job_id = response.json()["job_id"]
+        assert response.headers["Location"] == f"/api/libraries/operation/{job_id}"
+
+        status = _wait_for_job(job_client, job_id)
+
+    assert status["status"] == "completed"
+    assert status["operation"] == "crawl"
+    assert status["counters"] == {"pages_crawled": 1}
+    scraping_id = status["result"]["scraping_id"]
+    assert scraping_results_storage[scraping_id]["results"] == [
+        {"url": "https://example.com", "status": 200}
+    ]
     mock_backend.crawl.assert_called_once_with("https://example.com", max_depth=10)
 
 
@@ -115,17 +140,42 @@ def test_start_crawl_invalid_backend(mock_backend_class):
 
 @patch("src.main.Crawl4AIBackend")
 def test_start_crawl_backend_error(mock_backend_class, mock_backend):
-    """Test starting a crawl with a backend that raises an error."""
+    """Test that a backend error fails the job rather than the request."""
     mock_backend.crawl.side_effect = Exception("Backend error")
     mock_backend_class.return_value = mock_backend
 
-    response = client.post(
-        "/crawl", json={"url": "https://example.com", "backend": "crawl4ai"}
-    )
+    with TestClient(app) as job_client:
+        response = job_client.post(
+            "/crawl", json={"url": "https://example.com", "backend": "crawl4ai"}
+        )
+        assert response.status_code == 202
+        status = _wait_for_job(job_client, response.json()["job_id"])
 
-    assert response.status_code == 200  # Note: The API returns 200 even for errors
-    assert response.json()["status"] == "error"
-    assert "Backend error" in response.json()["message"]
+    assert status["status"] == "failed"
+    assert "Backend error" in status["error"]
+
+
+@patch("src.main.Crawl4AIBackend")
+def test_stop_cancels_running_crawl(mock_backend_class, mock_backend):
+    """Test that /api/scraping/stop cancels a running crawl job."""
+
+    async def slow_crawl(url, max_depth):
+        await asyncio.sleep(30)
+
+    mock_backend.crawl.side_effect = slow_crawl
+    mock_backend_class.return_value = mock_backend
+
+    with TestClient(app) as job_client:
+        job_id = job_client.post("/crawl", json={"url": "https://example.com"}).json()[
+            "job_id"
+        ]
+        response = job_client.post("/api/scraping/stop", json={"job_id": job_id})
+        assert response.status_code == 200
+        assert response.json()["cancelled"] == [job_id]
+        status = _wait_for_job(job_client, job_id)
+
+        assert status["status"] == "cancelled"
+        assert job_client.post("/api/scraping/stop").status_code == 400
 
 
 @patch("src.main.validate_package_name")
@@ -225,3 +275,101 @@ def test_get_library_operation_status():
     assert response.json()["operation_id"] == operation_id
     assert response.json()["package_name"] == "test-package"
     assert response.json()["status"] == "completed"
+
+
+@pytest.fixture
+def full_app_client():
+    """Create a client for the app built by create_app."""
+    from src.main import create_app
+
+    # The app's crawler binds to the current event loop when it is created
+    loop = asyncio.new_event_loop()
+    asyncio.set_event_loop(loop)
+    try:
+        yield TestClient(create_app())
+    finally:
+        asyncio.set_event_loop(None)
+        loop.close()
+
+
+@pytest.mark.parametrize(
+    "format, expected",
+    [
+        ("ndjson", '{"content": {"title": "Intro", "text": "Hello"}}\n'),
+        ("markdown", "# Documentation Export\n\n## Intro\n\nHello\n\n"),
+        ("html", "<html><body><h2>Intro</h2><div>Hello</div></body></html>"),
+    ],
+)
+def test_download_latest_results_formats(full_app_client, format, expected):
+    """Test the streamed download formats of the latest results."""
+    scraping_results_storage.clear()
+    scraping_results_storage["scrape_1"] = {
+        "results": [{"content": {"title": "Intro", "text": "Hello"}}]
+    }
+    try:
+        response = full_app_client.get(f"/api/scraping/download/{format}")
+    finally:
+        scraping_results_storage.clear()
+
+    assert response.status_code == 200
+    assert response.text == expected
+
+
+def test_results_listing_with_sqlite_store(tmp_path, monkeypatch):
+    """Test paginated listing and lazy page access backed by SQLite."""
+    from src.storage.results import SQLiteResultsStore
+
+    store = SQLiteResultsStore(str(tmp_path / "results.db"))
+    monkeypatch.setattr("src.main.scraping_results_storage", store)
+    for i in range(5):
+        store[f"scrape_{i}"] = {
+            "url": f"https://{i}.example",
+            "status": "completed",
+            "results": [{"url": f"https://{i}.example/{n}"} for n in range(i)],
+        }
+
+    response = client.get(
+        "/api/scraping/results", params={"limit": 2, "fields": "id,url"}
+    )
+    assert response.json() == [
+        {"id": "scrape_0", "url": "https://0.example"},
+        {"id": "scrape_1", "url": "https://1.example"},
+    ]
+    cursor = response.headers["X-Next-Cursor"]
+
+    response = client.get(
+        "/api/scraping/results", params={"limit": 10, "cursor": cursor}
+    )
+    assert [r["id"] for r in response.json()] == ["scrape_2", "scrape_3", "scrape_4"]
+    assert "X-Next-Cursor" not in response.headers
+
+    summary = client.get(
+        "/api/scraping/results/scrape_4", params={"include_pages": False}
+    )
+    assert summary.json()["pages_processed"] == 4
+    assert "results" not in summary.json()
+
+    pages = client.get(
+        "/api/scraping/results/scrape_4/pages", params={"offset": 1, "limit": 2}
+    )
+    assert pages.json()["total"] == 4
+    assert [p["url"] for p in pages.json()["results"]] == [
+        "https://4.example/1",
+        "https://4.example/2",
+    ]
+    store.close()
+
+
+def test_metrics_endpoint_serves_openmetrics():
+    """Test that stage latencies are exposed in the OpenMetrics format."""
+    from src.utils.stage_metrics import stage_metrics
+
+    stage_metrics.record("fetch", 0.01, "http_backend", "docs.example.com")
+    response = client.get("/metrics")
+
+    assert response.status_code == 200
+    assert response.headers["content-type"].startswith("application/openmetrics-text")
+    assert 'stage="fetch",backend="http_backend",host="docs.example.com"' in (
+        response.text
+    )
+    assert response.text.endswith("# EOF\n")
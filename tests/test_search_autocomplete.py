@@ -0,0 +1,119 @@
+"""Tests for the autocomplete indexes behind SearchSuggestions."""
+
+import random
+
+import pytest
+
+from src.search.autocomplete import DeleteIndex, PrefixTrie, edit_distance
+from src.search.suggestions import SearchSuggestions
+
+
+def _reference_edit_distance(s1: str, s2: str) -> int:
+    previous = list(range(len(s2) + 1))
+    for i, c1 in enumerate(s1, 1):
+        current = [i]
+        for j, c2 in enumerate(s2, 1):
+            current.append(
+                min(previous[j] + 1, current[-1] + 1, previous[j - 1] + (c1 != c2))
+            )
+        previous = current
+    return previous[-1]
+
+
+@pytest.mark.parametrize(
+    "s1,s2,expected",
+    [("", "", 0), ("", "abc", 3), ("kitten", "sitting", 3), ("flask", "flask", 0)],
+)
+def test_edit_distance_known_values(s1, s2, expected):
+    assert edit_distance(s1, s2) == expected
+
+
+def test_edit_distance_matches_reference():
+    rng = random.Random(42)
+    for _ in range(500):
+        s1 = "".join(rng.choices("abc", k=rng.randint(0, 10)))
+        s2 = "".join(rng.choices("abc", k=rng.randint(0, 10)))
+        assert edit_distance(s1, s2) == _reference_edit_distance(s1, s2)
+
+
+def test_prefix_trie_returns_heaviest_completions():
+    trie = PrefixTrie(top_k=2)
+    trie.insert("http client", 3)
+    trie.insert("http requests", 5)
+    trie.insert("httpx", 1)
+    trie.insert("flask", 10)
+
+    assert trie.complete("http", limit=2) == ["http requests", "http client"]
+    # Raising a weight reorders the cached completions
+    trie.insert("httpx", 7)
+    assert trie.complete("http", limit=2) == ["httpx", "http requests"]
+    # Limits beyond the cache size walk the subtree
+    assert trie.complete("http", limit=3) == ["httpx", "http requests", "http client"]
+    assert trie.complete("nothing") == []
+
+
+def test_prefix_trie_deduplicates_values():
+    trie = PrefixTrie()
+    trie.insert("python-dateutil", value="python-dateutil")
+    trie.insert("dateutil", value="python-dateutil")
+
+    assert trie.complete("") == ["python-dateutil"]
+    assert trie.complete("date") == ["python-dateutil"]
+
+
+def test_delete_index_finds_words_within_distance():
+    index = DeleteIndex(max_distance=2)
+    for word in ["requests", "request", "httpx", "numpy", "pandas"]:
+        index.add(word)
+
+    assert index.search("reqests", 1) == [(1, "requests")]
+    assert index.search("reqests", 2) == [(1, "requests"), (2, "request")]
+    assert index.search("pnadas", 2) == [(2, "pandas")]
+    assert index.search("django", 2) == []
+
+
+def test_suggestions_deduplicate_history():
+    suggestions = SearchSuggestions()
+    for _ in range(3):
+        suggestions.add_search_term("http client")
+    suggestions.add_search_term("http requests")
+
+    completions = suggestions.get_suggestions("http")
+    assert completions.count("http client") == 1
+    assert completions.index("http client") < completions.index("http requests")
+    assert suggestions.get_popular_searches()[0] == {
+        "term": "http client",
+        "count": 3,
+        "percentage": 75.0,
+    }
+
+
+def test_suggestions_history_is_bounded():
+    suggestions = SearchSuggestions(max_history_terms=100)
+    for i in range(250):
+        suggestions.add_search_term(f"query {i}")
+    suggestions.add_search_term("query 249")
+
+    assert len(suggestions.search_history) <= 100
+    assert "query 249" in suggestions.get_suggestions("query 24")
+
+
+def test_suggestions_complete_library_name_words():
+    suggestions = SearchSuggestions()
+    suggestions.add_library_name("python-dateutil")
+    suggestions.add_library_name("requests")
+
+    assert "python-dateutil" in suggestions.get_suggestions("dateu")
+    assert "requests" in suggestions.get_suggestions("reqests")
+
+
+def test_suggestions_prefer_short_names_beyond_cached_completions():
+    """Test that names added after a prefix's cache filled up still surface."""
+    suggestions = SearchSuggestions()
+    for i in range(12):
+        suggestions.add_library_name(f"pyaaaaaaaaaaaa{i}")
+    suggestions.add_library_name("pytest")
+
+    results = suggestions.get_suggestions("py")
+    assert results[0] == "pytest"
+    assert len(results) == 10
@@ -142,6 +142,59 @@ def test_suggestions_api():
     assert "suggestions" in data
 
 
+def _indexed_interface():
+    """Create a search interface with a few documents indexed."""
+    interface = SearchInterface(FastAPI())
+    interface.add_document(
+        {"id": "a", "title": "Asyncio Guide", "content": "event loops", "lang": "py"}
+    )
+    interface.add_document(
+        {"id": "b", "title": "Async Rust", "content": "futures", "lang": "rust"}
+    )
+    interface.add_document(
+        {"id": "c", "title": "Python Typing", "content": "generics", "lang": "py"}
+    )
+    return interface
+
+
+def test_fuzzy_search_uses_ngram_candidates():
+    """Test fuzzy search finds tokens containing the query token."""
+    interface = _indexed_interface()
+    fields = ["title", "content"]
+
+    exact = interface._search("sync", fields, {}, "relevance", 10, 0, fuzzy=False)
+    assert exact == []
+
+    fuzzy = interface._search("sync", fields, {}, "relevance", 10, 0, fuzzy=True)
+    assert sorted(result.id for result in fuzzy) == ["a", "b"]
+    assert interface.ngram_index["syn"] == {"async", "asyncio"}
+
+
+def test_readding_document_replaces_postings_and_facets():
+    """Test re-adding a document removes its stale postings and facet counts."""
+    interface = _indexed_interface()
+    assert interface._get_facets({})["lang"] == {"py": 2, "rust": 1}
+
+    interface.add_document({"id": "b", "title": "Python Packaging", "lang": "py"})
+
+    assert "rust" not in interface.index
+    assert "rus" not in interface.ngram_index
+    assert interface.index["python"]["title"] == {"b", "c"}
+    assert interface._get_facets({})["lang"] == {"py": 3}
+    assert interface._get_facets({"lang": "rust"}) == {}
+
+
+def test_facets_with_filters_count_matching_documents():
+    """Test facets are restricted to documents matching the filters."""
+    interface = _indexed_interface()
+    interface.add_document({"id": "d", "title": "Numbers", "lang": "py", "stars": 5})
+
+    facets = interface._get_facets({"lang": "py"})
+    assert facets["lang"] == {"py": 3}
+    assert facets["stars"] == {"5": 1}
+    assert interface._get_facets({"stars": 5}) == {"lang": {"py": 1}, "stars": {"5": 1}}
+
+
 # Further tests would involve:
 # - Setting up SearchInterface with known documents.
 # - Testing different query parameters (fields, filters, sort, fuzzy).
@@ -0,0 +1,107 @@
+"""
+Tests for the coalescing websocket broadcast hub.
+"""
+
+import asyncio
+
+import pytest
+
+from src.utils.broadcast import BroadcastHub
+
+
+class FakeWebSocket:
+    """Websocket stand-in that records sent messages."""
+
+    def __init__(self, delay: float = 0.0):
+        self.delay = delay
+        self.sent = []
+        self.closed_with = None
+
+    async def send_json(self, message):
+        if self.delay:
+            await asyncio.sleep(self.delay)
+        self.sent.append(message)
+
+    async def close(self, code=1000):
+        self.closed_with = code
+
+
+@pytest.mark.asyncio
+async def test_keyed_updates_coalesce_to_latest_state():
+    """Test that only the latest message per key is sent each flush."""
+    hub = BroadcastHub(max_rate=20)
+    ws = FakeWebSocket()
+    hub.add(ws)
+
+    for progress in range(100):
+        hub.publish({"job": "a", "progress": progress}, key="a")
+        hub.publish({"job": "b", "progress": progress}, key="b")
+    await asyncio.sleep(0.01)
+    await hub.flush()
+
+    assert ws.sent[-2:] == [{"job": "a", "progress": 99}, {"job": "b", "progress": 99}]
+    assert len(ws.sent) <= 4
+    assert hub.stats["coalesced"] >= 196
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_urgent_message_replaces_pending_update():
+    """Test that a final message supersedes the key's pending progress."""
+    hub = BroadcastHub(max_rate=1)
+    ws = FakeWebSocket()
+    hub.add(ws)
+
+    hub.publish({"progress": 1}, key="job")
+    await asyncio.sleep(0.01)
+    hub.publish({"progress": 2}, key="job")
+    hub.publish({"done": True}, key="job", urgent=True)
+    await hub.flush()
+
+    assert ws.sent == [{"progress": 1}, {"done": True}]
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_slow_client_does_not_stall_others():
+    """Test that a lagging client drops old messages while others keep up."""
+    hub = BroadcastHub(max_rate=0, queue_size=2)
+    fast, slow = FakeWebSocket(), FakeWebSocket(delay=0.05)
+    hub.add(fast)
+    hub.add(slow)
+
+    for i in range(10):
+        hub.publish({"n": i})
+        await asyncio.sleep(0.001)
+
+    assert [m["n"] for m in fast.sent] == list(range(10))
+    await hub.flush()
+    assert slow.sent[-1] == {"n": 9}
+    assert len(slow.sent) < 10
+    assert hub.stats["dropped"] > 0
+    await hub.close()
+
+
+@pytest.mark.asyncio
+async def test_laggards_are_disconnected():
+    """Test the disconnect overflow policy and the send timeout."""
+    dropped = []
+    hub = BroadcastHub(
+        max_rate=0, queue_size=1, overflow="disconnect", on_disconnect=dropped.append
+    )
+    stuck = FakeWebSocket(delay=10)
+    hub.add(stuck)
+    for i in range(3):
+        hub.publish({"n": i})
+    await asyncio.sleep(0.01)
+
+    assert dropped == [stuck] and len(hub) == 0
+    assert stuck.closed_with == 1013
+
+    hub = BroadcastHub(max_rate=0, send_timeout=0.01, on_disconnect=dropped.append)
+    slow = FakeWebSocket(delay=1)
+    hub.add(slow)
+    hub.publish({"n": 0})
+    await asyncio.sleep(0.05)
+    assert dropped[-1] is slow and len(hub) == 0
+    await hub.close()
@@ -0,0 +1,124 @@
+"""
+Tests for the background job scheduler.
+"""
+
+import asyncio
+
+import pytest
+
+from src.utils.job_scheduler import (
+    JobContext,
+    JobQueueFullError,
+    JobScheduler,
+    JobStatus,
+)
+
+
+@pytest.mark.asyncio
+async def test_jobs_start_in_priority_order():
+    """Test that queued jobs are started highest priority first."""
+    scheduler = JobScheduler(max_workers=1)
+    started = []
+    gate = asyncio.Event()
+
+    def make_task(name):
+        async def task(context: JobContext):
+            started.append(name)
+            await gate.wait()
+            return name
+
+        return task
+
+    blocker = await scheduler.submit("test", make_task("blocker"))
+    await asyncio.sleep(0)
+    low = await scheduler.submit("test", make_task("low"), priority=0)
+    high = await scheduler.submit("test", make_task("high"), priority=5)
+    gate.set()
+
+    assert await low.wait() == "low"
+    assert started == ["blocker", "high", "low"]
+    assert blocker.status is JobStatus.COMPLETED and high.result == "high"
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_progress_failure_and_notifications():
+    """Test progress counters, failures and update callbacks."""
+    updates = []
+
+    async def on_update(job):
+        updates.append((job.job_id, job.status, job.progress))
+
+    scheduler = JobScheduler(on_update=on_update)
+
+    async def counting(context: JobContext):
+        await context.update(progress=50, pages=3)
+        return "ok"
+
+    async def failing(context: JobContext):
+        raise RuntimeError("boom")
+
+    ok = await scheduler.submit("test", counting)
+    bad = await scheduler.submit("test", failing)
+    await ok.wait()
+    await bad.wait()
+
+    assert ok.counters == {"pages": 3} and ok.progress == 100.0
+    assert bad.status is JobStatus.FAILED and bad.error == "boom"
+    assert [u[1:] for u in updates if u[0] == ok.job_id] == [
+        (JobStatus.PENDING, 0.0),
+        (JobStatus.RUNNING, 0.0),
+        (JobStatus.RUNNING, 50.0),
+        (JobStatus.COMPLETED, 100.0),
+    ]
+    assert bad.to_dict()["status"] == "failed"
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_cancel_pending_and_running_jobs():
+    """Test that cancellation works both before and while a job runs."""
+    scheduler = JobScheduler(max_workers=1)
+
+    async def sleeper(context: JobContext):
+        await asyncio.sleep(30)
+
+    running = await scheduler.submit("test", sleeper)
+    pending = await scheduler.submit("test", sleeper)
+    await asyncio.sleep(0.01)
+    assert running.status is JobStatus.RUNNING
+
+    assert await scheduler.cancel(pending.job_id)
+    assert await scheduler.cancel(running.job_id)
+    await running.wait()
+
+    assert running.status is JobStatus.CANCELLED
+    assert pending.status is JobStatus.CANCELLED
+    assert not await scheduler.cancel(running.job_id)
+    assert scheduler.active_jobs() == []
+    await scheduler.shutdown()
+
+
+@pytest.mark.asyncio
+async def test_queue_bound_and_finished_job_retention():
+    """Test that the pending queue is bounded and old jobs are forgotten."""
+    scheduler = JobScheduler(max_workers=1, max_pending=1, max_finished=2)
+    gate = asyncio.Event()
+
+    async def wait_for_gate(context: JobContext):
+        await gate.wait()
+
+    first = await scheduler.submit("test", wait_for_gate)
+    await asyncio.sleep(0)
+    second = await scheduler.submit("test", wait_for_gate)
+    with pytest.raises(JobQueueFullError):
+        await scheduler.submit("test", wait_for_gate)
+
+    gate.set()
+    await second.wait()
+    third = await scheduler.submit("test", wait_for_gate)
+    await third.wait()
+
+    assert first.job_id not in scheduler
+    assert scheduler.list_jobs() == [second, third]
+    await scheduler.shutdown()
@@ -0,0 +1,107 @@
+"""
+Tests for the per-stage latency histograms.
+"""
+
+import random
+
+import pytest
+
+from src.backends.http_backend import HTTPBackend, HTTPBackendConfig
+from src.benchmarking.crawl_benchmark import FixtureSite, FixtureSiteConfig
+from src.crawler.crawler import Crawler
+from src.crawler.models import CrawlConfig, CrawlTarget
+from src.utils.stage_metrics import (
+    METRIC_NAME,
+    OTHER_HOST,
+    LatencyHistogram,
+    StageMetrics,
+)
+
+
+def test_histogram_percentiles_within_resolution():
+    """Test percentile estimates against exact values over a wide range."""
+    rng = random.Random(3)
+    values = sorted(rng.lognormvariate(-4, 1.5) for _ in range(20000))
+    histogram = LatencyHistogram()
+    for value in values:
+        histogram.record(value)
+
+    assert histogram.count == len(values)
+    assert histogram.sum == pytest.approx(sum(values))
+    assert histogram.max == values[-1]
+    for pct in (50, 95, 99):
+        exact = values[round(pct / 100 * len(values)) - 1]
+        assert histogram.percentile(pct) == pytest.approx(exact, rel=0.04)
+
+    other = LatencyHistogram()
+    other.record(100.0)
+    histogram.merge(other)
+    assert histogram.max == 100.0 and histogram.percentile(100) == 100.0
+
+
+def test_disabled_registry_records_nothing():
+    """Test that a disabled registry hands out a no-op timer."""
+    metrics = StageMetrics(enabled=False)
+    with metrics.time("fetch", "http", "docs.example.com"):
+        pass
+    metrics.record("process", 0.5)
+    assert metrics.histograms() == {}
+    assert metrics.format_summary() == "No stage latencies recorded."
+
+
+def test_openmetrics_exposition_and_host_cap():
+    """Test labels, cumulative buckets and the bound on host labels."""
+    metrics = StageMetrics(max_hosts=1)
+    metrics.record("fetch", 0.002, "http_backend", "a.example.com")
+    metrics.record("fetch", 0.2, "http_backend", "a.example.com")
+    metrics.record("fetch", 0.003, "http_backend", "b.example.com")
+
+    assert ("fetch", "http_backend", OTHER_HOST) in metrics.histograms()
+    text = metrics.render_openmetrics(buckets=(0.001, 0.01, 1.0))
+    labels = 'stage="fetch",backend="http_backend",host="a.example.com"'
+    assert f'{METRIC_NAME}_bucket{{{labels},le="0.001"}} 0' in text
+    assert f'{METRIC_NAME}_bucket{{{labels},le="0.01"}} 1' in text
+    assert f'{METRIC_NAME}_bucket{{{labels},le="+Inf"}} 2' in text
+    assert f"{METRIC_NAME}_count{{{labels}}} 2" in text
+    assert text.startswith(f"# TYPE {METRIC_NAME} histogram")
+    assert text.endswith("# EOF\n")
+
+    [row] = metrics.summary()
+    assert row["stage"] == "fetch" and row["count"] == 3
+
+
+@pytest.mark.asyncio
+async def test_crawler_records_every_stage():
+    """Test that a crawl records each pipeline stage per backend and host."""
+    metrics = StageMetrics()
+    async with FixtureSite(FixtureSiteConfig(pages=5, fan_out=2)) as site:
+        backend = HTTPBackend(HTTPBackendConfig())
+        backend.session = site.client_session()
+        crawler = Crawler(
+            config=CrawlConfig(use_duckduckgo=False, rate_limit=1e-6),
+            backend=backend,
+            stage_metrics=metrics,
+        )
+        try:
+            result = await crawler.crawl(
+                CrawlTarget(url=site.start_url, depth=site.max_depth, max_pages=5)
+            )
+        finally:
+            await backend.session.close()
+
+    assert result.stats.successful_crawls == 5
+    counts = {row["stage"]: row["count"] for row in metrics.summary()}
+    assert list(counts) == [
+        "frontier_wait",
+        "rate_limit_wait",
+        "fetch",
+        "decode",
+        "process",
+        "quality",
+        "organize",
+    ]
+    # Every dequeued URL waited in the frontier, including ones then skipped
+    assert counts.pop("frontier_wait") >= 5
+    assert all(count == 5 for count in counts.values())
+    assert ("fetch", "http_backend", "docs.example.com") in metrics.histograms()
+    assert ("frontier_wait", "", "docs.example.com") in metrics.histograms()
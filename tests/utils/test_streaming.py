@@ -0,0 +1,114 @@
+"""
+Tests for the streaming export generators.
+"""
+
+import io
+import json
+import zipfile
+
+from src.utils.streaming import (
+    STREAM_CHUNK_SIZE,
+    iter_docs_archive_entries,
+    iter_json,
+    iter_json_result,
+    iter_markdown,
+    iter_ndjson,
+    iter_zip,
+)
+
+
+def test_iter_json_matches_json_dumps():
+    """Test that incremental JSON decodes to the original value."""
+    data = {"results": [{"id": i, "text": "x" * 100} for i in range(2000)]}
+
+    chunks = list(iter_json(data))
+
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == data
+
+
+def test_iter_json_result_streams_pages():
+    """Test that a result is encoded from its summary and a lazy page iterator."""
+    summary = {"url": "https://example.com", "status": "completed"}
+    pages = ({"id": i, "text": "z" * 100} for i in range(2000))
+
+    chunks = list(iter_json_result(summary, pages))
+
+    assert len(chunks) > 1
+    assert json.loads(b"".join(chunks)) == {
+        **summary,
+        "results": [{"id": i, "text": "z" * 100} for i in range(2000)],
+    }
+    assert json.loads(b"".join(iter_json_result({}, []))) == {"results": []}
+
+
+def test_iter_ndjson_yields_complete_lines():
+    """Test that every chunk ends on a record boundary."""
+    records = [{"id": i, "text": "y" * 200} for i in range(1000)]
+
+    chunks = list(iter_ndjson(records))
+
+    assert all(chunk.endswith(b"\n") for chunk in chunks)
+    lines = b"".join(chunks).splitlines()
+    assert [json.loads(line) for line in lines] == records
+
+
+def test_iter_markdown_output():
+    """Test the markdown export layout."""
+    docs = [
+        {"content": {"title": "Intro", "text": "Hello"}},
+        {"content": "not a dict"},
+    ]
+
+    markdown = b"".join(iter_markdown(docs)).decode()
+
+    assert markdown == (
+        "# Documentation Export\n\n## Intro\n\nHello\n\n## Untitled\n\n\n\n"
+    )
+
+
+def test_iter_zip_streams_entries_before_the_end():
+    """Test that archive bytes are yielded before all entries are produced."""
+    produced = []
+
+    def entries():
+        for i in range(3):
+            produced.append(i)
+            yield f"page{i}.md", "content " * (STREAM_CHUNK_SIZE // 4)
+
+    chunks = iter_zip(entries())
+    first = next(chunks)
+
+    assert first.startswith(b"PK")
+    assert produced == [0]
+
+    archive = zipfile.ZipFile(io.BytesIO(first + b"".join(chunks)))
+    assert archive.namelist() == ["page0.md", "page1.md", "page2.md"]
+    assert archive.testzip() is None
+
+
+def test_docs_archive_layout():
+    """Test the documentation tree and README of an exported archive."""
+    results = {
+        "https://docs.example.com/": "Home",
+        "https://docs.example.com/guide/install": "Install",
+        "https://docs.example.com/guide/install/": "Duplicate path",
+    }
+
+    data = b"".join(
+        iter_zip(iter_docs_archive_entries("https://docs.example.com/", results))
+    )
+    archive = zipfile.ZipFile(io.BytesIO(data))
+    root = "docs.example.com_Documentation"
+
+    assert sorted(archive.namelist()) == [
+        f"{root}/README.md",
+        f"{root}/guide/install-2.md",
+        f"{root}/guide/install.md",
+        f"{root}/index.md",
+    ]
+    page = archive.read(f"{root}/guide/install.md").decode()
+    assert page == "---\nsource: https://docs.example.com/guide/install\n---\n\nInstall"
+    readme = archive.read(f"{root}/README.md").decode()
+    assert "- [guide > install](guide/install.md)\n" in readme
+    assert readme.startswith("# docs.example.com Documentation\n\n")
@@ -0,0 +1,148 @@
+"""
+Tests for span tracing and its exporters.
+"""
+
+import asyncio
+import json
+
+import pytest
+
+from src.backends.http_backend import HTTPBackend, HTTPBackendConfig
+from src.benchmarking.crawl_benchmark import FixtureSite, FixtureSiteConfig
+from src.crawler.crawler import Crawler
+from src.crawler.models import CrawlConfig, CrawlTarget
+from src.utils.stage_metrics import StageMetrics
+from src.utils.tracing import (
+    NULL_SPAN,
+    STATUS_ERROR,
+    ChromeTraceExporter,
+    InMemorySpanExporter,
+    JSONLinesSpanExporter,
+    Tracer,
+    aiohttp_trace_config,
+    current_span,
+    traced,
+    tracer,
+)
+
+
+@pytest.mark.asyncio
+async def test_spans_nest_across_tasks_and_export(tmp_path):
+    """Test parent propagation, error status and both file formats."""
+    jsonl_path = tmp_path / "spans.jsonl"
+    chrome_path = tmp_path / "trace.json"
+    local = Tracer(
+        [JSONLinesSpanExporter(str(jsonl_path)), ChromeTraceExporter(str(chrome_path))]
+    )
+
+    async def child(index):
+        with local.span("child", {"index": index}):
+            await asyncio.sleep(0)
+
+    with local.span("root") as root:
+        await asyncio.gather(child(0), child(1))
+        with pytest.raises(ValueError):
+            with local.span("failing"):
+                raise ValueError("boom")
+    local.shutdown()
+    assert not local.enabled
+
+    spans = [json.loads(line) for line in jsonl_path.read_text().splitlines()]
+    by_name = {}
+    for span in spans:
+        by_name.setdefault(span["name"], []).append(span)
+    assert len(by_name["child"]) == 2
+    for span in by_name["child"] + by_name["failing"]:
+        assert span["traceId"] == root.trace_id
+        assert span["parentSpanId"] == root.span_id
+    assert by_name["root"][0]["parentSpanId"] == ""
+    assert by_name["failing"][0]["status"] == {"code": STATUS_ERROR, "message": "boom"}
+    assert {"key": "index", "value": {"intValue": "1"}} in by_name["child"][1][
+        "attributes"
+    ]
+
+    events = json.loads(chrome_path.read_text())["traceEvents"]
+    complete = [event for event in events if event["ph"] == "X"]
+    assert len(complete) == 4
+    # Children run in their own tasks, so they get their own lanes
+    lanes = {event["name"]: event["tid"] for event in complete}
+    assert lanes["root"] == lanes["failing"] != lanes["child"]
+    assert any(event["name"] == "thread_name" for event in events)
+    root_event = next(event for event in complete if event["name"] == "root")
+    for event in complete:
+        assert root_event["ts"] <= event["ts"]
+        assert event["ts"] + event["dur"] <= root_event["ts"] + root_event["dur"]
+
+
+@pytest.mark.asyncio
+async def test_disabled_tracer_records_nothing():
+    """Test that without exporters spans are no-ops."""
+    local = Tracer()
+    assert local.span("anything") is NULL_SPAN
+    assert current_span() is NULL_SPAN
+
+    @traced("decorated")
+    async def decorated(value):
+        current_span().set_attribute("value", value)
+        return value * 2
+
+    assert await decorated(21) == 42
+
+
+@pytest.mark.asyncio
+async def test_crawl_produces_span_tree():
+    """Test that a crawl traces pages, requests and processing steps."""
+    exporter = InMemorySpanExporter()
+    tracer.add_exporter(exporter)
+    try:
+        async with FixtureSite(FixtureSiteConfig(pages=3, fan_out=2)) as site:
+            backend = HTTPBackend(HTTPBackendConfig())
+            backend.session = site.client_session(
+                trace_configs=[aiohttp_trace_config()]
+            )
+            crawler = Crawler(
+                config=CrawlConfig(use_duckduckgo=False, rate_limit=1e-6),
+                backend=backend,
+                stage_metrics=StageMetrics(enabled=False),
+            )
+            try:
+                result = await crawler.crawl(
+                    CrawlTarget(url=site.start_url, depth=site.max_depth, max_pages=3)
+                )
+            finally:
+                await backend.session.close()
+    finally:
+        tracer.exporters.remove(exporter)
+
+    assert result.stats.successful_crawls == 3
+    spans = {span.span_id: span for span in exporter.spans}
+
+    def parent_name(span):
+        return spans[span.parent_span_id].name
+
+    pages = [
+        span
+        for span in spans.values()
+        if span.name == "crawler.process_url" and "backend.name" in span.attributes
+    ]
+    assert len(pages) == 3
+    assert pages[0].attributes["url.full"] == site.start_url
+
+    by_name = {}
+    for span in spans.values():
+        by_name.setdefault(span.name, []).append(span)
+    assert len(by_name["backend.crawl"]) == 3
+    for name, parent in (
+        ("backend.crawl", "crawler.process_url"),
+        ("http.request", "backend.crawl"),
+        ("http.wait", "http.request"),
+        ("content.process", "crawler.process_url"),
+        ("html.sanitize", "content.process"),
+        ("markdown.convert", "content.process"),
+        ("quality.check", "crawler.process_url"),
+        ("organizer.add_document", "crawler.process_url"),
+    ):
+        assert by_name[name], name
+        assert all(parent_name(span) == parent for span in by_name[name]), name
+    assert by_name["http.request"][0].attributes["http.response.status_code"] == 200
+    assert len(by_name["http.connect"]) >= 1
@@ -5,6 +5,7 @@ Tests for the version management system.
 import os
 import shutil
 import tempfile
+from unittest.mock import patch
 
 import pytest
 
@@ -263,3 +264,85 @@ def test_save_and_load_versions(temp_dir):
 
     content = manager2._get_content(doc_id, "1.1.0")
     assert content == "Content 2"
+
+
+def test_history_is_stored_in_single_database(temp_dir):
+    """Test that versions go to one database with deduplicated blobs."""
+    storage_dir = os.path.join(temp_dir, "versions")
+    manager = VersionManager(VersionConfig(storage_dir=storage_dir))
+
+    for doc_id in ("doc_a", "doc_b"):
+        manager.add_version(doc_id, "Shared content", "1.0.0")
+        manager.add_version(doc_id, f"Content of {doc_id}", "1.1.0")
+
+    assert set(os.listdir(storage_dir)) <= {
+        "versions.db",
+        "versions.db-wal",
+        "versions.db-shm",
+    }
+    blob_count = manager._connect().execute("SELECT COUNT(*) FROM blobs").fetchone()
+    assert blob_count == (3,)
+
+
+def test_history_is_loaded_lazily(temp_dir):
+    """Test that a new manager only reads the histories it is asked for."""
+    config = VersionConfig(storage_dir=os.path.join(temp_dir, "versions"))
+    manager1 = VersionManager(config)
+    for i in range(3):
+        manager1.add_version(f"doc_{i}", f"Content {i}", "1.0.0")
+    manager1.close()
+
+    manager2 = VersionManager(config)
+    assert manager2.versions == {}
+
+    assert manager2.get_latest_version("doc_1").version == "1.0.0"
+    assert list(manager2.versions) == ["doc_1"]
+
+
+def test_version_limit_releases_blobs(temp_dir):
+    """Test that trimmed versions delete content no longer referenced."""
+    config = VersionConfig(
+        storage_dir=os.path.join(temp_dir, "versions"), max_versions=2
+    )
+    manager = VersionManager(config)
+    for i in range(5):
+        manager.add_version("doc", f"Content {i}", f"1.0.{i}")
+
+    assert manager._get_content("doc", "1.0.0") is None
+    assert manager._get_content("doc", "1.0.4") == "Content 4"
+    db = manager._connect()
+    assert db.execute("SELECT COUNT(*) FROM blobs").fetchone() == (2,)
+    assert db.execute("SELECT COUNT(*) FROM versions").fetchone() == (2,)
+
+
+def test_legacy_index_is_imported(temp_dir):
+    """Test that history from the file-per-version layout is migrated."""
+    storage_dir = os.path.join(temp_dir, "versions")
+    os.makedirs(os.path.join(storage_dir, "doc"))
+    with open(os.path.join(storage_dir, "doc", "1.0.0.txt"), "w") as f:
+        f.write("Legacy content")
+    with open(os.path.join(storage_dir, "version_index.json"), "w") as f:
+        f.write(
+            '{"doc": [{"version": "1.0.0", "content_hash": "abc", '
+            '"timestamp": "2024-01-01T00:00:00", "metadata": {}}]}'
+        )
+
+    manager = VersionManager(VersionConfig(storage_dir=storage_dir))
+
+    assert [v.version for v in manager.get_versions("doc")] == ["1.0.0"]
+    assert manager._get_content("doc", "1.0.0") == "Legacy content"
+    assert not os.path.exists(os.path.join(storage_dir, "version_index.json"))
+
+
+def test_compare_versions_caches_diffs(version_manager):
+    """Test that repeated comparisons reuse the computed diff."""
+    version_manager.add_version("doc", "line one\nline two", "1.0.0")
+    version_manager.add_version("doc", "line one\nline 2", "1.1.0")
+
+    first = version_manager.compare_versions("doc", "1.0.0", "1.1.0")
+    with patch.object(version_manager, "_get_content") as get_content:
+        second = version_manager.compare_versions("doc", "1.0.0", "1.1.0")
+    get_content.assert_not_called()
+
+    assert second.diff_content == first.diff_content
+    assert second is not first